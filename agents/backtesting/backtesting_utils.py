@@ -767,12 +767,15 @@ def get_markets_with_orderbooks(
     market_fetcher: Optional[HistoricalMarketFetcher] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    max_markets: Optional[int] = None
+    max_markets: Optional[int] = None,
+    archive_path: Optional[str] = None,
 ) -> List[Dict]:
     """
     Get markets that have orderbook data recorded from btc_15_min_table and/or btc_1_hour_table.
     
     This is a general-purpose function that can be used by any backtesting strategy.
+    With archive_path, markets come from the Parquet archive (scripts/python/archive_orderbooks.py)
+    and the database is not queried.
     
     Args:
         use_15m_table: If True, query btc_15_min_table
@@ -783,6 +786,7 @@ def get_markets_with_orderbooks(
         start_date: Optional start date filter
         end_date: Optional end date filter
         max_markets: Optional maximum number of markets to return
+        archive_path: Optional Parquet archive root to read instead of the database
         
     Returns:
         List of market dicts with orderbook data
@@ -794,10 +798,29 @@ def get_markets_with_orderbooks(
     
     markets_by_id = {}
     
+    if archive_path:
+        from agents.polymarket.orderbook_archive import ParquetSnapshotStore
+        store = ParquetSnapshotStore(archive_path)
+        durations = [d for d, enabled in (("15m", use_15m_table), ("1h", use_1h_table)) if enabled]
+        for duration in durations:
+            for summary in store.market_summaries(duration=duration, start_time=start_date, end_time=end_date):
+                market_id = str(summary["market_id"])
+                # Prefer 15m data when a market is in both (same as the database path)
+                if market_id in markets_by_id:
+                    continue
+                markets_by_id[market_id] = {
+                    "id": market_id,
+                    "first_snapshot": summary["first_snapshot"],
+                    "last_snapshot": summary["last_snapshot"],
+                    "_snapshot_count": summary["snapshot_count"],
+                    "_market_type": duration,
+                }
+        use_15m_table = use_1h_table = False
+    
     # Query 15-minute table if enabled
     if use_15m_table:
         if orderbook_db_15m is None:
-            orderbook_db_15m = OrderbookDatabase(use_btc_15_min_table=True)
+            orderbook_db_15m = OrderbookDatabase(use_btc_15_min_table=True, sqlite_mode="read_only")
         
         with orderbook_db_15m.get_session() as session:
             query = """
@@ -839,7 +862,7 @@ def get_markets_with_orderbooks(
     # Query 1-hour table if enabled
     if use_1h_table:
         if orderbook_db_1h is None:
-            orderbook_db_1h = OrderbookDatabase(use_btc_1_hour_table=True)
+            orderbook_db_1h = OrderbookDatabase(use_btc_1_hour_table=True, sqlite_mode="read_only")
         
         with orderbook_db_1h.get_session() as session:
             query = """
@@ -59,7 +59,7 @@ class OrderbookBacktester:
         self.btc_fetcher = BTCDataFetcher(proxy=proxy)
         
         # Initialize orderbook database (uses btc_eth_table)
-        self.orderbook_db = OrderbookDatabase(use_btc_eth_table=True)
+        self.orderbook_db = OrderbookDatabase(use_btc_eth_table=True, sqlite_mode="read_only")
         self.orderbook_query = OrderbookQuery(db=self.orderbook_db)
         
         # Initialize predictor
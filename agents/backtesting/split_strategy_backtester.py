@@ -71,9 +71,9 @@ class SplitStrategyBacktester:
         self.orderbook_db_1h = None
         
         if use_15m_table:
-            self.orderbook_db_15m = OrderbookDatabase(use_btc_15_min_table=True)
+            self.orderbook_db_15m = OrderbookDatabase(use_btc_15_min_table=True, sqlite_mode="read_only")
         if use_1h_table:
-            self.orderbook_db_1h = OrderbookDatabase(use_btc_1_hour_table=True)
+            self.orderbook_db_1h = OrderbookDatabase(use_btc_1_hour_table=True, sqlite_mode="read_only")
         
         self.market_fetcher = market_fetcher or HistoricalMarketFetcher()
     
@@ -587,6 +587,8 @@ class SplitStrategyBacktester:
             snapshots = session.query(snapshot_class).filter(
                 snapshot_class.market_id == market_id
             ).order_by(snapshot_class.timestamp).all()
+        # Outcome labels are stored in the market dimension table
+        orderbook_db.attach_market_fields(snapshots)
         
         if not snapshots:
             return None
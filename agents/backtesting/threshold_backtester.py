@@ -59,8 +59,8 @@ class ThresholdBacktester:
         self.use_1h_table = use_1h_table
         
         # Initialize database connections for the tables we'll use
-        self.orderbook_db_15m = OrderbookDatabase(use_btc_15_min_table=True) if use_15m_table else None
-        self.orderbook_db_1h = OrderbookDatabase(use_btc_1_hour_table=True) if use_1h_table else None
+        self.orderbook_db_15m = OrderbookDatabase(use_btc_15_min_table=True, sqlite_mode="read_only") if use_15m_table else None
+        self.orderbook_db_1h = OrderbookDatabase(use_btc_1_hour_table=True, sqlite_mode="read_only") if use_1h_table else None
         
         # For querying snapshots, we'll use the appropriate db based on market type
         # Default to 15m table for OrderbookQuery (will be overridden per-market)
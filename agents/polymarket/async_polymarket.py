@@ -0,0 +1,325 @@
+"""
+Async facade over the synchronous Polymarket client.
+
+Every blocking Polymarket method is exposed as an awaitable. Calls are routed to one
+of two dedicated, sized thread pools:
+- CLOB pool: CLOB/Gamma HTTP calls (order placement, status, cancels, trades)
+- RPC pool: Web3 RPC calls (balances, allowances, split/merge with receipt waits)
+
+Keeping the pools separate means a split/merge blocked on a receipt for minutes can
+never starve order status checks or cancels. Per-method latency is recorded for
+every call routed through the facade.
+
+Every signed transaction goes through the wallet's shared TransactionManager (local
+nonces, cached gas price, shared receipt polling). With enable_transaction_manager(),
+split_position and merge_positions await it directly instead of holding an RPC thread
+for the receipt wait, so several can be in flight at once.
+
+Usage:
+    pm = Polymarket()
+    async_pm = AsyncPolymarket(pm)
+    status = await async_pm.get_order_status(order_id)
+    stats = async_pm.get_latency_stats()
+"""
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.transaction_manager import TransactionManager
+
+logger = logging.getLogger(__name__)
+
+# Polymarket methods that hit the CLOB / Gamma HTTP APIs
+CLOB_METHODS = frozenset({
+    "get_all_markets",
+    "get_market",
+    "get_all_events",
+    "get_all_tradeable_events",
+    "get_sampling_simplified_markets",
+    "get_orderbook",
+    "get_orderbook_price",
+    "execute_order",
+    "execute_market_order",
+    "get_order_status",
+    "get_open_orders",
+    "get_trades",
+    "cancel_order",
+    "cancel_orders_batch",
+    "place_orders_batch",
+    "get_notifications",
+})
+
+# Polymarket methods that hit the Polygon RPC (and may block on receipts)
+RPC_METHODS = frozenset({
+    "get_usdc_balance",
+    "get_polymarket_balance",
+    "approve_usdc_for_ctf",
+    "get_conditional_token_balance",
+    "get_conditional_token_balances",
+    "check_conditional_token_allowance",
+    "check_conditional_token_allowances",
+    "get_usdc_balances",
+    "ensure_conditional_token_allowances",
+    "split_position",
+    "merge_positions",
+})
+
+
+class MethodLatency:
+    """Rolling latency statistics for a single facade method."""
+
+    def __init__(self, window: int = 256):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, elapsed_ms: float, error: bool = False):
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self._samples.append(elapsed_ms)
+
+    def _percentile(self, pct: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return a dict of the current statistics (milliseconds)."""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self._percentile(50),
+            "p95_ms": self._percentile(95),
+            "max_ms": self.max_ms,
+            "last_ms": self.last_ms,
+        }
+
+
+class AsyncPolymarket:
+    """
+    Awaitable wrapper around a Polymarket instance.
+
+    Methods listed in CLOB_METHODS / RPC_METHODS are returned as coroutine functions
+    that run on the matching executor. Any other attribute (addresses, credentials,
+    web3, pure helpers like extract_order_id) is passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        pm: Optional[Polymarket] = None,
+        clob_workers: int = 8,
+        rpc_workers: int = 4,
+    ):
+        """
+        Initialize async facade.
+
+        Args:
+            pm: Existing Polymarket instance to wrap (created if not provided)
+            clob_workers: Thread pool size for CLOB HTTP calls (default: 8)
+            rpc_workers: Thread pool size for Web3 RPC calls (default: 4)
+        """
+        self.pm = pm if pm is not None else Polymarket()
+        self._clob_executor = ThreadPoolExecutor(
+            max_workers=clob_workers, thread_name_prefix="polymarket-clob"
+        )
+        self._rpc_executor = ThreadPoolExecutor(
+            max_workers=rpc_workers, thread_name_prefix="polymarket-rpc"
+        )
+        self._latency: Dict[str, MethodLatency] = {}
+        self._wrappers: Dict[str, Callable] = {}
+        self.tx_manager: Optional[TransactionManager] = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the facade itself
+        if name.startswith("_") or name == "pm":
+            raise AttributeError(name)
+        wrapper = self._wrappers.get(name)
+        if wrapper is not None:
+            return wrapper
+        if name in CLOB_METHODS:
+            wrapper = self._make_async(name, self._clob_executor)
+        elif name in RPC_METHODS:
+            wrapper = self._make_async(name, self._rpc_executor)
+        else:
+            return getattr(self.pm, name)
+        self._wrappers[name] = wrapper
+        return wrapper
+
+    def _make_async(self, name: str, executor: ThreadPoolExecutor) -> Callable:
+        func = getattr(self.pm, name)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self._run(executor, name, func, *args, **kwargs)
+
+        return wrapper
+
+    async def _run(self, executor: ThreadPoolExecutor, name: str, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        start = time.perf_counter()
+        error = False
+        try:
+            return await loop.run_in_executor(executor, call)
+        except Exception:
+            error = True
+            raise
+        finally:
+            self._record(name, start, error=error)
+
+    async def run_clob(self, func: Callable, *args, name: Optional[str] = None, **kwargs) -> Any:
+        """Run an arbitrary blocking CLOB/HTTP callable on the CLOB pool."""
+        return await self._run(self._clob_executor, name or getattr(func, "__name__", "clob_call"), func, *args, **kwargs)
+
+    async def run_rpc(self, func: Callable, *args, name: Optional[str] = None, **kwargs) -> Any:
+        """Run an arbitrary blocking Web3 callable (e.g. w3.eth.get_transaction) on the RPC pool."""
+        return await self._run(self._rpc_executor, name or getattr(func, "__name__", "rpc_call"), func, *args, **kwargs)
+
+    def enable_transaction_manager(self, **kwargs) -> Optional[TransactionManager]:
+        """
+        Await split_position / merge_positions on the wallet's TransactionManager.
+
+        The manager is the same one Polymarket's synchronous approval/split/merge methods
+        use, so sends from either side share one nonce sequence. It keeps its own small
+        RPC pool: sync callers running on the RPC pool block on it, so it must not need
+        an RPC pool thread itself.
+
+        Args:
+            **kwargs: Passed to TransactionManager if it is created here (gas_price_ttl, receipt_timeout, ...)
+
+        Returns:
+            The TransactionManager instance (None if the wallet has no private key)
+        """
+        if self.tx_manager is None:
+            if not self.pm.private_key:
+                logger.warning("⚠️ No private key configured - transaction manager not enabled")
+                return None
+            self.tx_manager = self.pm.get_transaction_manager(**kwargs)
+        return self.tx_manager
+
+    def _record(self, name: str, start: float, error: bool = False):
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        stats = self._latency.get(name)
+        if stats is None:
+            stats = self._latency[name] = MethodLatency()
+        stats.record(elapsed_ms, error=error)
+
+    async def _send_ctf_call(self, name: str, call: Any, gas: int, result: Dict) -> Optional[Dict]:
+        """Send a CTF contract call via the transaction manager and await its receipt."""
+        start = time.perf_counter()
+        try:
+            receipt = await self.tx_manager.send_and_wait(call, gas=gas, description=name)
+        except Exception as e:
+            self._record(name, start, error=True)
+            logger.error(f"❌ Error in {name}: {e}", exc_info=True)
+            return None
+        self._record(name, start, error=receipt.get("status") != 1)
+        tx_hash = receipt.get("transactionHash")
+        tx_hash_hex = tx_hash.hex() if hasattr(tx_hash, "hex") else str(tx_hash)
+        if receipt.get("status") != 1:
+            logger.error(f"❌ {name} failed! Transaction: {tx_hash_hex} (receipt status {receipt.get('status')})")
+            return None
+        return {"transaction_hash": tx_hash_hex, "receipt": receipt, "status": "success", **result}
+
+    async def merge_positions(self, condition_id: str, amount_usdc: float) -> Optional[Dict]:
+        """
+        Merge X YES + X NO shares back into $X USDC.
+
+        Uses the transaction manager when enabled (non-blocking, concurrent-safe nonces),
+        otherwise runs Polymarket.merge_positions on the RPC pool.
+        """
+        if self.tx_manager is None:
+            return await self._run(self._rpc_executor, "merge_positions", self.pm.merge_positions, condition_id, amount_usdc)
+        logger.info(f"Merging {amount_usdc:.2f} YES + {amount_usdc:.2f} NO → ${amount_usdc:.2f} USDC (condition_id: {condition_id[:20]}...)")
+        call = self.pm.build_merge_call(condition_id, amount_usdc)
+        return await self._send_ctf_call("merge_positions", call, gas=500000, result={"amount_usdc": amount_usdc})
+
+    async def split_position(self, condition_id: str, amount_usdc: float, check_approval: bool = True) -> Optional[Dict]:
+        """
+        Split $X USDC into X YES + X NO shares.
+
+        Uses the transaction manager when enabled (balance/allowance reads on the RPC pool,
+        approval and split sent without blocking), otherwise runs Polymarket.split_position
+        on the RPC pool.
+        """
+        if self.tx_manager is None:
+            return await self._run(
+                self._rpc_executor, "split_position", self.pm.split_position, condition_id, amount_usdc, check_approval
+            )
+        wallet_address = self.tx_manager.address
+        amount_raw = int(amount_usdc * 1e6)
+        try:
+            usdc_balance = await self.run_rpc(self.pm.usdc.functions.balanceOf(wallet_address).call, name="usdc_balance_of")
+            if usdc_balance < amount_raw:
+                logger.error(
+                    f"Insufficient USDC balance: have ${usdc_balance / 1e6:.2f}, need ${amount_usdc:.2f}"
+                )
+                return None
+            if check_approval:
+                allowance = await self.run_rpc(
+                    self.pm.usdc.functions.allowance(wallet_address, self.pm.ctf_address).call, name="usdc_allowance"
+                )
+                if allowance < amount_raw:
+                    logger.warning(
+                        f"USDC allowance insufficient: ${allowance / 1e6:.2f} < ${amount_usdc:.2f}. "
+                        f"Approving unlimited USDC for CTF contract..."
+                    )
+                    approve_call = self.pm.usdc.functions.approve(self.pm.ctf_address, 2**256 - 1)
+                    receipt = await self.tx_manager.send_and_wait(approve_call, gas=100000, description="approve_usdc_for_ctf")
+                    if receipt.get("status") != 1:
+                        logger.error("Failed to approve USDC for CTF contract")
+                        return None
+        except Exception as e:
+            logger.error(f"❌ Error preparing split: {e}", exc_info=True)
+            return None
+        logger.info(f"Splitting ${amount_usdc:.2f} USDC into YES + NO shares (condition_id: {condition_id[:20]}...)")
+        call = self.pm.build_split_call(condition_id, amount_usdc)
+        return await self._send_ctf_call(
+            "split_position", call, gas=500000, result={"amount_usdc": amount_usdc, "shares_per_side": amount_usdc}
+        )
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-method latency statistics.
+
+        Returns:
+            Dict mapping method name -> {count, errors, avg_ms, p50_ms, p95_ms, max_ms, last_ms}
+        """
+        return {name: stats.snapshot() for name, stats in sorted(self._latency.items())}
+
+    def log_latency_stats(self, level: int = logging.INFO):
+        """Log a one-line latency summary per method."""
+        for name, stats in self.get_latency_stats().items():
+            logger.log(
+                level,
+                f"  {name}: n={stats['count']} err={stats['errors']} "
+                f"avg={stats['avg_ms']:.0f}ms p50={stats['p50_ms']:.0f}ms "
+                f"p95={stats['p95_ms']:.0f}ms max={stats['max_ms']:.0f}ms",
+            )
+
+    async def close(self):
+        """Stop the transaction manager (if enabled) and shut down both executors."""
+        if self.tx_manager is not None:
+            await self.tx_manager.close()
+        self.shutdown()
+
+    def shutdown(self, wait: bool = False):
+        """Shut down both executors."""
+        self._clob_executor.shutdown(wait=wait)
+        self._rpc_executor.shutdown(wait=wait)
@@ -13,6 +13,7 @@ from agents.polymarket.market_finder import (
     get_market_info_for_logging,
 )
 from agents.polymarket.orderbook_db import OrderbookDatabase
+from agents.polymarket.orderbook_poller import OrderbookPoller
 from agents.polymarket.orderbook_stream import OrderbookLogger
 from typing import Optional
 
@@ -32,6 +33,7 @@ class AutoMarketMonitor:
         monitor_15min: bool = True,
         monitor_1hour: bool = True,
         mode: str = "websocket",
+        poll_interval: float = 1.0,
     ):
         """
         Initialize auto monitor.
@@ -42,12 +44,14 @@ class AutoMarketMonitor:
             monitor_15min: Monitor 15-minute markets
             monitor_1hour: Monitor 1-hour markets
             mode: "websocket" or "poll" (default: websocket)
+            poll_interval: Seconds between orderbook polls in poll mode (default: 1.0)
         """
         self.db = db
         self.check_interval = check_interval
         self.monitor_15min = monitor_15min
         self.monitor_1hour = monitor_1hour
         self.mode = mode
+        self.poll_interval = poll_interval
         
         # Track which markets we're already monitoring
         self.monitored_market_ids: Set[str] = set()
@@ -56,6 +60,11 @@ class AutoMarketMonitor:
         # Current logger instance
         self.logger_service: Optional[OrderbookLogger] = None
         self.logger_task: Optional[asyncio.Task] = None
+        
+        # Poll mode: one long-lived poller; new markets are added to its token set and
+        # ended markets expire at their market_end_date
+        self.poller: Optional[OrderbookPoller] = None
+        self.poller_task: Optional[asyncio.Task] = None
         self.running = False
     
     async def _check_for_new_markets(self):
@@ -134,24 +143,32 @@ class AutoMarketMonitor:
             else:
                 # Add new subscriptions to existing stream
                 if self.logger_service.stream and self.logger_service.stream.websocket:
-                    for token_id in token_ids:
-                        try:
-                            await self.logger_service.stream.subscribe_to_orderbook(token_id)
-                            # Update market info
-                            self.logger_service.market_info.update(market_info)
-                            # Add to token_ids list
+                    # Update market info before the first books arrive
+                    self.logger_service.market_info.update(market_info)
+                    try:
+                        await self.logger_service.stream.subscribe_to_orderbooks(token_ids)
+                        # Add to token_ids list
+                        for token_id in token_ids:
                             if token_id not in self.logger_service.token_ids:
                                 self.logger_service.token_ids.append(token_id)
-                            logger.info(f"Added subscription for token {token_id}")
-                        except Exception as e:
-                            logger.error(f"Error subscribing to {token_id}: {e}")
+                        logger.info(f"Added subscriptions for {len(token_ids)} token(s)")
+                    except Exception as e:
+                        logger.error(f"Error subscribing to {len(token_ids)} token(s): {e}")
                 else:
                     logger.warning("WebSocket not connected, cannot add subscriptions")
         else:
-            # For polling mode, we'd need to restart with all tokens
-            # This is simpler but less efficient
-            logger.warning("Polling mode with dynamic tokens not fully implemented")
-            logger.info(f"Would monitor {len(token_ids)} new tokens in polling mode")
+            if self.poller is None or self.poller_task is None or self.poller_task.done():
+                self.poller = OrderbookPoller(
+                    self.db,
+                    token_ids,
+                    poll_interval=self.poll_interval,
+                    market_info=market_info,
+                )
+                self.poller_task = asyncio.create_task(self.poller.poll_loop())
+                logger.info(f"Started polling {len(token_ids)} token(s) (interval: {self.poll_interval}s)")
+            else:
+                added = self.poller.add_tokens(token_ids, market_info=market_info)
+                logger.info(f"Added {len(added)} token(s) to running poller")
     
     async def run(self):
         """Main monitoring loop."""
@@ -179,6 +196,8 @@ class AutoMarketMonitor:
     def stop(self):
         """Stop monitoring."""
         self.running = False
+        if self.poller:
+            self.poller.stop()
         if self.logger_service:
             # Create task to stop (in case we're not in async context)
             try:
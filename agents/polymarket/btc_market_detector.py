@@ -8,6 +8,8 @@ from typing import List, Optional, Dict
 from datetime import datetime, timezone, timedelta
 import re
 
+from agents.polymarket.market_cache import get_market_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,25 +71,25 @@ def find_btc_updown_15m_events(limit: int = 100) -> List[Dict]:
     all_events = []
     
     # Approach 1: Search with filters
-    response = httpx.get(events_url, params={
+    cache = get_market_cache()
+    events1 = cache.get_json(events_url, {
         "active": True,
         "closed": False,
         "archived": False,
         "limit": limit,
     })
     
-    if response.status_code == 200:
-        all_events.extend(response.json())
+    if events1:
+        all_events.extend(events1)
     
     # Approach 2: Search without closed filter (recently closed might still be active)
-    response2 = httpx.get(events_url, params={
+    events2 = cache.get_json(events_url, {
         "active": True,
         "archived": False,
         "limit": limit,
     })
     
-    if response2.status_code == 200:
-        events2 = response2.json()
+    if events2:
         # Add events not already in list
         existing_slugs = {e.get("slug") for e in all_events}
         for event in events2:
@@ -96,14 +98,13 @@ def find_btc_updown_15m_events(limit: int = 100) -> List[Dict]:
     
     # Approach 3: Search markets directly (might find them there)
     markets_url = "https://gamma-api.polymarket.com/markets"
-    response3 = httpx.get(markets_url, params={
+    markets = cache.get_json(markets_url, {
         "active": True,
         "limit": limit * 2,  # Check more markets
         "enableOrderBook": True,
     })
     
-    if response3.status_code == 200:
-        markets = response3.json()
+    if markets:
         # Look for BTC markets in question/slug
         for market in markets:
             question = (market.get("question") or "").lower()
@@ -157,37 +158,11 @@ def get_market_by_event_slug(slug: str) -> Optional[Dict]:
     Returns:
         Market dict or None
     """
-    events_url = "https://gamma-api.polymarket.com/events"
-    response = httpx.get(events_url, params={"slug": slug, "limit": 1})
-    
-    if response.status_code == 200:
-        events = response.json()
-        if events:
-            event = events[0]
-            markets = event.get("markets", [])
-            if markets:
-                market = markets[0]
-                market_id = market.get("id")
-                
-                # Fetch full market details to ensure we have clobTokenIds
-                # Events API might not include all fields
-                if market_id:
-                    markets_url = "https://gamma-api.polymarket.com/markets"
-                    market_response = httpx.get(markets_url, params={"id": market_id, "limit": 1})
-                    if market_response.status_code == 200:
-                        full_markets = market_response.json()
-                        if full_markets:
-                            full_market = full_markets[0]
-                            # Merge full market data with event data
-                            market.update(full_market)
-                            logger.debug(f"Fetched full market details for ID={market_id}")
-                
-                market["_event_slug"] = event.get("slug")
-                market["_event_title"] = event.get("title")
-                logger.debug(f"Found market via slug {slug}: ID={market.get('id')}, clobTokenIds={market.get('clobTokenIds')}")
-                return market
-    
-    return None
+    # Shared cache: concurrent callers coalesce, missing slugs are negative-cached
+    market = get_market_cache().get_market_by_slug(slug)
+    if market:
+        logger.debug(f"Found market via slug {slug}: ID={market.get('id')}, clobTokenIds={market.get('clobTokenIds')}")
+    return market
 
 
 def _parse_datetime_safe(date_str_or_obj) -> Optional[datetime]:
@@ -590,35 +565,11 @@ def get_market_by_slug(slug: str) -> Optional[Dict]:
     Returns:
         Market dict or None
     """
-    events_url = "https://gamma-api.polymarket.com/events"
-    response = httpx.get(events_url, params={"slug": slug, "limit": 1}, timeout=10.0)
-    
-    if response.status_code == 200:
-        events = response.json()
-        if events:
-            event = events[0]
-            markets = event.get("markets", [])
-            if markets:
-                market = markets[0]
-                market_id = market.get("id")
-                
-                # Fetch full market details to ensure we have clobTokenIds
-                if market_id:
-                    markets_url = "https://gamma-api.polymarket.com/markets"
-                    market_response = httpx.get(markets_url, params={"id": market_id, "limit": 1}, timeout=10.0)
-                    if market_response.status_code == 200:
-                        full_markets = market_response.json()
-                        if full_markets:
-                            full_market = full_markets[0]
-                            market.update(full_market)
-                            logger.debug(f"Fetched full market details for ID={market_id}")
-                
-                market["_event_slug"] = event.get("slug")
-                market["_event_title"] = event.get("title")
-                logger.debug(f"Found market via slug {slug}: ID={market.get('id')}, clobTokenIds={market.get('clobTokenIds')}")
-                return market
-    
-    return None
+    # Shared cache: concurrent callers coalesce, missing slugs are negative-cached
+    market = get_market_cache().get_market_by_slug(slug)
+    if market:
+        logger.debug(f"Found market via slug {slug}: ID={market.get('id')}, clobTokenIds={market.get('clobTokenIds')}")
+    return market
 
 
 def _construct_1h_slug_from_utc(utc_time: datetime) -> str:
@@ -697,10 +648,9 @@ def get_latest_btc_1h_market() -> Optional[Dict]:
     
     # Fallback: search Events API
     events_url = "https://gamma-api.polymarket.com/events"
-    response = httpx.get(events_url, params={"active": True, "limit": 500}, timeout=30.0)
+    events = get_market_cache().get_json(events_url, {"active": True, "limit": 500}, timeout=30.0)
     
-    if response.status_code == 200:
-        events = response.json()
+    if events:
         
         # Filter for BTC 1-hour markets
         btc_1h_events = []
@@ -744,13 +694,11 @@ def get_all_active_btc_1h_markets() -> List[Dict]:
         List of market dicts for active BTC updown 1-hour markets
     """
     events_url = "https://gamma-api.polymarket.com/events"
-    response = httpx.get(events_url, params={"active": True, "limit": 500}, timeout=30.0)
+    events = get_market_cache().get_json(events_url, {"active": True, "limit": 500}, timeout=30.0)
     
-    if response.status_code != 200:
+    if not events:
         return []
     
-    events = response.json()
-    
     all_markets = []
     for event in events:
         slug = (event.get("slug") or "").lower()
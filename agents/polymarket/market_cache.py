@@ -0,0 +1,357 @@
+"""
+Process-wide Gamma market metadata cache.
+
+Market detectors, order managers and monitors all look up the same markets by slug.
+This cache sits in front of the Gamma API so those lookups share results:
+- Markets are indexed by event slug, market id and condition_id
+- TTL depends on market state: upcoming and resolved markets change rarely, live
+  markets are refreshed often and expire no later than their end time
+- Concurrent identical requests are coalesced into one in-flight HTTP call
+- Slugs that don't exist (yet) are negative-cached briefly, so proactive detection
+  probing future windows doesn't hit Gamma on every loop
+
+Usage:
+    from agents.polymarket.market_cache import get_market_cache
+    market = get_market_cache().get_market_by_slug("btc-updown-15m-1767393900")
+"""
+import copy
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+GAMMA_URL = "https://gamma-api.polymarket.com"
+GAMMA_EVENTS_URL = f"{GAMMA_URL}/events"
+GAMMA_MARKETS_URL = f"{GAMMA_URL}/markets"
+
+# Default TTLs in seconds per market state
+DEFAULT_TTLS = {
+    "upcoming": 120.0,
+    "live": 15.0,
+    "resolved": 3600.0,
+    "missing": 20.0,  # Negative cache for slugs/ids Gamma doesn't know
+    "listing": 10.0,  # Event/market list queries
+}
+
+_MISSING = object()
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        if isinstance(value, datetime):
+            dt = value
+        else:
+            dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    except ValueError:
+        return None
+
+
+def market_state(market: Dict) -> str:
+    """Classify a Gamma market dict as 'upcoming', 'live' or 'resolved'."""
+    if market.get("closed") is True or market.get("umaResolutionStatus") == "resolved":
+        return "resolved"
+    now = datetime.now(timezone.utc)
+    start_dt = _parse_datetime(market.get("startDate") or market.get("startDateIso"))
+    if start_dt and now < start_dt:
+        return "upcoming"
+    # Past end but not yet closed is still "live" - resolution is imminent
+    return "live"
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: Any, expires_at: float):
+        self.value = value
+        self.expires_at = expires_at
+
+
+class _InFlight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class MarketMetadataCache:
+    """Thread-safe TTL cache for Gamma markets with request coalescing."""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, timeout: float = 10.0, max_entries: int = 4096):
+        """
+        Initialize market cache.
+
+        Args:
+            ttls: Overrides for DEFAULT_TTLS (upcoming, live, resolved, missing, listing)
+            timeout: HTTP timeout for Gamma requests in seconds (default: 10.0)
+            max_entries: Entry count that triggers a sweep of expired entries; if the cache is
+                still over it, the oldest entries are evicted (default: 4096)
+        """
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.timeout = timeout
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, _Entry] = {}
+        self._in_flight: Dict[Tuple, _InFlight] = {}
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "coalesced": 0, "errors": 0, "evictions": 0}
+
+    # ========== Core ==========
+
+    def _ttl_for_market(self, market: Optional[Dict]) -> float:
+        if market is None:
+            return self.ttls["missing"]
+        state = market_state(market)
+        ttl = self.ttls[state]
+        if state == "live":
+            # Don't serve a live market past its end time from cache
+            end_dt = _parse_datetime(market.get("endDate") or market.get("endDateIso"))
+            if end_dt:
+                seconds_to_end = (end_dt - datetime.now(timezone.utc)).total_seconds()
+                if seconds_to_end > 0:
+                    ttl = min(ttl, seconds_to_end)
+        return ttl
+
+    def _lookup(self, key: Tuple) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return _MISSING
+        return entry.value
+
+    def _store(self, key: Tuple, entry: _Entry):
+        """
+        Insert an entry (caller holds _lock), keeping the cache bounded.
+
+        Expired entries are otherwise only dropped when their own key is looked up again, so a
+        long-running monitor that resolves a new market every few minutes would grow forever.
+        """
+        # Re-insert so dict order stays oldest-written first
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        if len(self._entries) <= self.max_entries:
+            return
+        now = time.monotonic()
+        expired = [k for k, e in self._entries.items() if e.expires_at <= now]
+        for k in expired:
+            del self._entries[k]
+        if len(self._entries) > self.max_entries:
+            # Still full of live entries: evict the oldest down to 3/4 so sweeps stay amortized
+            target = self.max_entries * 3 // 4
+            for k in list(itertools.islice(self._entries, len(self._entries) - target)):
+                del self._entries[k]
+                self.stats["evictions"] += 1
+
+    def _get_or_fetch(self, key: Tuple, fetch: Callable[[], Any], ttl_for: Callable[[Any], float]) -> Any:
+        """Return a cached value, or fetch it once even if many threads ask at the same time."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.stats["negative_hits" if value is None else "hits"] += 1
+                return value
+            in_flight = self._in_flight.get(key)
+            leader = in_flight is None
+            if leader:
+                in_flight = self._in_flight[key] = _InFlight()
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            in_flight.event.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.value
+
+        try:
+            value = fetch()
+            in_flight.value = value
+            with self._lock:
+                self._store(key, _Entry(value, time.monotonic() + ttl_for(value)))
+            return value
+        except BaseException as e:
+            # Errors are not cached - waiting callers see the same error, the next call retries
+            in_flight.error = e
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            in_flight.event.set()
+
+    def _index_market(self, market: Dict):
+        """Store a market under its id and condition_id keys."""
+        expires_at = time.monotonic() + self._ttl_for_market(market)
+        with self._lock:
+            if market.get("id") is not None:
+                self._store(("id", str(market["id"])), _Entry(market, expires_at))
+            if market.get("conditionId"):
+                self._store(("condition_id", market["conditionId"].lower()), _Entry(market, expires_at))
+
+    def _http_get_json(self, url: str, params: Dict, timeout: Optional[float] = None) -> Any:
+        response = httpx.get(url, params=params, timeout=timeout or self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    # ========== Fetchers ==========
+
+    def _fetch_market_by_slug(self, slug: str) -> Optional[Dict]:
+        events = self._http_get_json(GAMMA_EVENTS_URL, {"slug": slug, "limit": 1})
+        if not events:
+            return None
+        event = events[0]
+        markets = event.get("markets", [])
+        if not markets:
+            return None
+        market = markets[0]
+        market_id = market.get("id")
+
+        # Fetch full market details to ensure we have clobTokenIds
+        # Events API might not include all fields
+        if market_id:
+            try:
+                full_markets = self._http_get_json(GAMMA_MARKETS_URL, {"id": market_id, "limit": 1})
+            except httpx.HTTPStatusError as e:
+                logger.debug(f"Could not fetch full market details for ID={market_id}: {e}")
+                full_markets = None
+            if full_markets:
+                market.update(full_markets[0])
+
+        market["_event_slug"] = event.get("slug")
+        market["_event_title"] = event.get("title")
+        self._index_market(market)
+        return market
+
+    # ========== Public API ==========
+
+    def get_market_by_slug(self, slug: str) -> Optional[Dict]:
+        """
+        Get a market by event slug (events API + full market details).
+
+        Returns:
+            Copy of the market dict (with _event_slug/_event_title), or None if not found
+        """
+        try:
+            market = self._get_or_fetch(
+                ("slug", slug), lambda: self._fetch_market_by_slug(slug), self._ttl_for_market
+            )
+        except httpx.HTTPStatusError as e:
+            logger.debug(f"Gamma error fetching slug {slug}: {e}")
+            return None
+        return copy.deepcopy(market) if market is not None else None
+
+    def get_market_by_id(self, market_id: str) -> Optional[Dict]:
+        """Get a market by Gamma market id."""
+        def fetch():
+            markets = self._http_get_json(GAMMA_MARKETS_URL, {"id": market_id, "limit": 1})
+            return markets[0] if markets else None
+
+        try:
+            market = self._get_or_fetch(("id", str(market_id)), fetch, self._ttl_for_market)
+        except httpx.HTTPStatusError as e:
+            logger.debug(f"Gamma error fetching market {market_id}: {e}")
+            return None
+        if market is not None:
+            self._index_market(market)
+        return copy.deepcopy(market) if market is not None else None
+
+    def get_market_by_condition_id(self, condition_id: str) -> Optional[Dict]:
+        """Get a market by condition id."""
+        def fetch():
+            markets = self._http_get_json(GAMMA_MARKETS_URL, {"condition_ids": condition_id, "limit": 1})
+            return markets[0] if markets else None
+
+        try:
+            market = self._get_or_fetch(("condition_id", condition_id.lower()), fetch, self._ttl_for_market)
+        except httpx.HTTPStatusError as e:
+            logger.debug(f"Gamma error fetching condition {condition_id}: {e}")
+            return None
+        if market is not None:
+            self._index_market(market)
+        return copy.deepcopy(market) if market is not None else None
+
+    def get_json(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        ttl: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Cached, coalesced GET for list queries (events/markets search).
+
+        Args:
+            url: Gamma endpoint URL
+            params: Query parameters (part of the cache key)
+            ttl: Seconds to cache the response (default: ttls['listing'])
+            timeout: HTTP timeout override for large listings
+
+        Returns:
+            Copy of the decoded JSON response, or None on 404 / HTTP error
+        """
+        params = params or {}
+        key = ("get", url, tuple(sorted((k, str(v)) for k, v in params.items())))
+        listing_ttl = self.ttls["listing"] if ttl is None else ttl
+        try:
+            data = self._get_or_fetch(key, lambda: self._http_get_json(url, params, timeout), lambda _: listing_ttl)
+        except httpx.HTTPStatusError as e:
+            logger.debug(f"Gamma error for {url} {params}: {e}")
+            return None
+        return copy.deepcopy(data)
+
+    def put_markets(self, markets: List[Dict]):
+        """Index markets fetched elsewhere (e.g. a topic listing) so id/condition_id lookups hit."""
+        for market in markets:
+            if isinstance(market, dict):
+                self._index_market(copy.deepcopy(market))
+
+    def invalidate(self, slug: Optional[str] = None, market_id: Optional[str] = None):
+        """Drop cached entries for a slug and/or market id."""
+        with self._lock:
+            if slug:
+                self._entries.pop(("slug", slug), None)
+            if market_id is not None:
+                self._entries.pop(("id", str(market_id)), None)
+
+    def clear(self):
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss counters plus current entry count."""
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries)}
+
+
+_market_cache: Optional[MarketMetadataCache] = None
+_market_cache_lock = threading.Lock()
+
+
+def get_market_cache() -> MarketMetadataCache:
+    """Get the process-wide market metadata cache."""
+    global _market_cache
+    if _market_cache is None:
+        with _market_cache_lock:
+            if _market_cache is None:
+                _market_cache = MarketMetadataCache()
+    return _market_cache
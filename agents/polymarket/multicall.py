@@ -0,0 +1,120 @@
+"""
+Batched on-chain reads via Multicall3.
+
+Aggregates many view calls (ERC1155 balanceOf / isApprovedForAll, ERC20 balanceOf)
+into a single eth_call against the Multicall3 contract, so checking N token balances
+costs one RPC round-trip instead of N. Each sub-call is sent with allowFailure=True,
+so one reverting call yields None for that entry instead of failing the batch.
+
+Multicall3 is deployed at the same address on Polygon and most EVM chains:
+https://github.com/mds1/multicall
+"""
+import logging
+from typing import Any, List, Optional, Sequence, Tuple
+
+from eth_abi import decode
+
+logger = logging.getLogger(__name__)
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = """[
+    {"inputs": [{"components": [{"internalType": "address", "name": "target", "type": "address"}, {"internalType": "bool", "name": "allowFailure", "type": "bool"}, {"internalType": "bytes", "name": "callData", "type": "bytes"}], "internalType": "struct Multicall3.Call3[]", "name": "calls", "type": "tuple[]"}], "name": "aggregate3", "outputs": [{"components": [{"internalType": "bool", "name": "success", "type": "bool"}, {"internalType": "bytes", "name": "returnData", "type": "bytes"}], "internalType": "struct Multicall3.Result[]", "name": "returnData", "type": "tuple[]"}], "stateMutability": "payable", "type": "function"}
+]"""
+
+# (target address, ABI-encoded calldata, output types to decode)
+Call = Tuple[str, str, Sequence[str]]
+
+
+class MulticallReader:
+    """
+    Reads many contract view functions in one eth_call.
+
+    Usage:
+        reader = MulticallReader(web3)
+        balances = reader.erc1155_balances(ctf_contract, wallet, [yes_token_id, no_token_id])
+    """
+
+    def __init__(self, web3, multicall_address: str = MULTICALL3_ADDRESS, max_calls_per_batch: int = 500):
+        """
+        Initialize multicall reader.
+
+        Args:
+            web3: Web3 instance connected to the chain
+            multicall_address: Multicall3 contract address (default: canonical deployment)
+            max_calls_per_batch: Sub-calls per eth_call; larger batches are split (default: 500)
+        """
+        self.web3 = web3
+        self.max_calls_per_batch = max_calls_per_batch
+        self.multicall = web3.eth.contract(
+            address=web3.to_checksum_address(multicall_address), abi=MULTICALL3_ABI
+        )
+
+    def aggregate(self, calls: List[Call]) -> List[Optional[Tuple[Any, ...]]]:
+        """
+        Execute view calls through Multicall3.
+
+        Args:
+            calls: List of (target, calldata, output_types)
+
+        Returns:
+            Decoded outputs per call, in order (None where the sub-call reverted or
+            returned undecodable data). Exceptions from the eth_call itself (e.g. rate
+            limits) propagate so callers can apply their retry policy.
+        """
+        results: List[Optional[Tuple[Any, ...]]] = []
+        for start in range(0, len(calls), self.max_calls_per_batch):
+            chunk = calls[start:start + self.max_calls_per_batch]
+            call3 = [
+                (self.web3.to_checksum_address(target), True, calldata)
+                for target, calldata, _ in chunk
+            ]
+            raw_results = self.multicall.functions.aggregate3(call3).call()
+            for (_, _, output_types), (success, return_data) in zip(chunk, raw_results):
+                if not success or not return_data:
+                    results.append(None)
+                    continue
+                try:
+                    results.append(decode(list(output_types), return_data))
+                except Exception as e:
+                    logger.debug(f"Could not decode multicall result: {e}")
+                    results.append(None)
+        batches = (len(calls) + self.max_calls_per_batch - 1) // self.max_calls_per_batch
+        logger.debug(f"Multicall: {len(calls)} calls in {batches} eth_call(s)")
+        return results
+
+    def erc1155_balances(self, token_contract, owner: str, token_ids: Sequence) -> List[Optional[int]]:
+        """Raw ERC1155 balanceOf(owner, id) for each token id (None on failure)."""
+        owner = self.web3.to_checksum_address(owner)
+        calls = [
+            (token_contract.address, token_contract.encodeABI(fn_name="balanceOf", args=[owner, int(token_id)]), ["uint256"])
+            for token_id in token_ids
+        ]
+        return [r[0] if r is not None else None for r in self.aggregate(calls)]
+
+    def erc1155_approvals(self, token_contract, owner: str, operators: Sequence[str]) -> List[Optional[bool]]:
+        """ERC1155 isApprovedForAll(owner, operator) for each operator (None on failure)."""
+        owner = self.web3.to_checksum_address(owner)
+        calls = [
+            (
+                token_contract.address,
+                token_contract.encodeABI(
+                    fn_name="isApprovedForAll", args=[owner, self.web3.to_checksum_address(operator)]
+                ),
+                ["bool"],
+            )
+            for operator in operators
+        ]
+        return [bool(r[0]) if r is not None else None for r in self.aggregate(calls)]
+
+    def erc20_balances(self, token_contract, owners: Sequence[str]) -> List[Optional[int]]:
+        """Raw ERC20 balanceOf(owner) for each owner (None on failure)."""
+        calls = [
+            (
+                token_contract.address,
+                token_contract.encodeABI(fn_name="balanceOf", args=[self.web3.to_checksum_address(owner)]),
+                ["uint256"],
+            )
+            for owner in owners
+        ]
+        return [r[0] if r is not None else None for r in self.aggregate(calls)]
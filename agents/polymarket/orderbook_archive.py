@@ -0,0 +1,472 @@
+"""
+Parquet archive tier for closed BTC markets.
+
+ParquetArchiver exports every market whose market_end_date has passed (plus a settle margin that
+covers the poller's post-expiry grace) from btc_15_min_table / btc_1_hour_table into
+hive-partitioned Parquet files, one file per market:
+
+    <root>/asset=BTC/duration=15m/date=2026-01-02/market_<market_id>.parquet
+
+Book levels are stored as list columns (bid_prices, bid_sizes, ask_prices, ask_sizes).
+
+ParquetSnapshotStore queries the archive with DuckDB when it is installed, otherwise with
+pyarrow datasets, so historical scans (OrderbookQuery(backend="parquet"),
+get_markets_with_orderbooks(archive_path=...)) never touch the transactional database.
+
+Usage:
+    archiver = ParquetArchiver("data/orderbook_archive", OrderbookDatabase(use_btc_15_min_table=True))
+    archiver.export_closed_markets()
+
+    store = ParquetSnapshotStore("data/orderbook_archive")
+    df = store.query(market_id="123456", columns=["timestamp", "best_bid_price", "best_ask_price"])
+"""
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import select, func
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+from agents.polymarket.orderbook_db import BTC15MinOrderbookSnapshot, BTC1HourOrderbookSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Snapshot table -> (asset, duration) partition values
+ARCHIVE_TABLES = {
+    BTC15MinOrderbookSnapshot.__tablename__: ("BTC", "15m"),
+    BTC1HourOrderbookSnapshot.__tablename__: ("BTC", "1h"),
+}
+
+# Scalar columns copied as-is from the snapshot tables
+SCALAR_COLUMNS = [
+    "token_id", "market_id", "timestamp",
+    "best_bid_price", "best_bid_size", "best_ask_price", "best_ask_size",
+    "spread", "spread_bps", "outcome_price", "last_trade_price", "market_price",
+    "outcome", "market_start_date", "market_end_date",
+    "time_remaining_seconds", "time_since_start_seconds",
+]
+LEVEL_COLUMNS = ["bid_prices", "bid_sizes", "ask_prices", "ask_sizes"]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the Parquet archive. Install with: pip install pyarrow")
+
+
+def archive_schema():
+    """Arrow schema of an archived market file (partition columns excluded)."""
+    _require_pyarrow()
+    timestamp = pa.timestamp("us", tz="UTC")
+    levels = pa.list_(pa.float64())
+    return pa.schema([
+        ("token_id", pa.string()),
+        ("market_id", pa.string()),
+        ("timestamp", timestamp),
+        ("best_bid_price", pa.float64()),
+        ("best_bid_size", pa.float64()),
+        ("best_ask_price", pa.float64()),
+        ("best_ask_size", pa.float64()),
+        ("spread", pa.float64()),
+        ("spread_bps", pa.float64()),
+        ("outcome_price", pa.float64()),
+        ("last_trade_price", pa.float64()),
+        ("market_price", pa.float64()),
+        ("outcome", pa.string()),
+        ("market_start_date", timestamp),
+        ("market_end_date", timestamp),
+        ("time_remaining_seconds", pa.float64()),
+        ("time_since_start_seconds", pa.float64()),
+        ("bid_prices", levels),
+        ("bid_sizes", levels),
+        ("ask_prices", levels),
+        ("ask_sizes", levels),
+    ])
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Database datetimes are naive UTC; Arrow columns are UTC-aware."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+class ParquetArchiver:
+    """Exports closed markets from a snapshot table to the Parquet archive."""
+
+    def __init__(self, root: str, db, compression: str = "zstd", settle_seconds: float = 60.0):
+        """
+        Initialize archiver.
+
+        Args:
+            root: Archive root directory
+            db: OrderbookDatabase with use_btc_15_min_table or use_btc_1_hour_table
+                (read_only SQLite mode is enough)
+            compression: Parquet compression codec (default: zstd)
+            settle_seconds: Only export markets that ended at least this long ago, so late
+                snapshots are in the table before the file is written; keep it >= the
+                poller's expiry_grace (default: 60.0)
+        """
+        _require_pyarrow()
+        self.root = root
+        self.db = db
+        self.compression = compression
+        self.settle_seconds = settle_seconds
+        if db.use_btc_15_min_table:
+            self.table_class = BTC15MinOrderbookSnapshot
+        elif db.use_btc_1_hour_table:
+            self.table_class = BTC1HourOrderbookSnapshot
+        else:
+            raise ValueError("ParquetArchiver needs an OrderbookDatabase on btc_15_min_table or btc_1_hour_table")
+        self.asset, self.duration = ARCHIVE_TABLES[self.table_class.__tablename__]
+
+    def _duration_dir(self) -> str:
+        return os.path.join(self.root, f"asset={self.asset}", f"duration={self.duration}")
+
+    def archived_market_ids(self) -> Set[str]:
+        """Markets that already have a file in the archive (one directory walk)."""
+        archived = set()
+        for _, _, files in os.walk(self._duration_dir()):
+            for name in files:
+                if name.startswith("market_") and name.endswith(".parquet"):
+                    archived.add(name[len("market_"):-len(".parquet")])
+        return archived
+
+    def closed_markets(self, before: Optional[datetime] = None) -> Dict[str, datetime]:
+        """
+        market_id -> market_end_date for markets that ended settle_seconds before `before` (default: now).
+
+        The poller keeps writing snapshots for expiry_grace seconds after market_end_date, so a
+        market is only closed once that window has passed.
+        """
+        before = before or datetime.now(timezone.utc)
+        if before.tzinfo is not None:
+            before = before.astimezone(timezone.utc).replace(tzinfo=None)
+        before -= timedelta(seconds=self.settle_seconds)
+        table = self.table_class.__table__
+        query = (
+            select(table.c.market_id, func.max(table.c.market_end_date))
+            .where(table.c.market_end_date < before)
+            .group_by(table.c.market_id)
+        )
+        with self.db.engine.connect() as conn:
+            return {str(market_id): end for market_id, end in conn.execute(query)}
+
+    def export_market(self, market_id: str, market_end_date: datetime) -> int:
+        """
+        Write one market's snapshots to <root>/asset=/duration=/date=<end date>/market_<id>.parquet.
+
+        Returns:
+            Rows written
+        """
+        table = self.table_class.__table__
+        query = (
+            select(*[table.c[name] for name in SCALAR_COLUMNS if name in table.c], table.c.bids, table.c.asks)
+            .where(table.c.market_id == market_id)
+            .order_by(table.c.timestamp)
+        )
+        columns: Dict[str, List[Any]] = {name: [] for name in SCALAR_COLUMNS + LEVEL_COLUMNS}
+        with self.db.engine.connect() as conn:
+            for row in conn.execute(query).mappings():
+                for name in SCALAR_COLUMNS:
+                    columns[name].append(row.get(name))
+                bids = row["bids"] or []
+                asks = row["asks"] or []
+                columns["bid_prices"].append([level[0] for level in bids])
+                columns["bid_sizes"].append([level[1] for level in bids])
+                columns["ask_prices"].append([level[0] for level in asks])
+                columns["ask_sizes"].append([level[1] for level in asks])
+        if not columns["token_id"]:
+            return 0
+        # Outcome text lives in the market dimension table unless the rows carry it
+        dimension = self.db.get_market_dimensions([market_id]).get(market_id)
+        token_outcomes = (dimension.token_outcomes or {}) if dimension is not None else {}
+        columns["outcome"] = [
+            outcome or token_outcomes.get(token_id)
+            for outcome, token_id in zip(columns["outcome"], columns["token_id"])
+        ]
+        for name in ("timestamp", "market_start_date", "market_end_date"):
+            columns[name] = [_utc(value) for value in columns[name]]
+
+        arrow_table = pa.Table.from_pydict(columns, schema=archive_schema())
+        directory = os.path.join(self._duration_dir(), f"date={_utc(market_end_date):%Y-%m-%d}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"market_{market_id}.parquet")
+        # Write then rename so readers never see a half-written file. The dot-prefixed temp
+        # name is skipped by pyarrow datasets (ignore_prefixes) and never matches *.parquet
+        tmp_path = os.path.join(directory, f".market_{market_id}.parquet.tmp")
+        try:
+            pq.write_table(arrow_table, tmp_path, compression=self.compression)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return arrow_table.num_rows
+
+    def export_closed_markets(self, before: Optional[datetime] = None, overwrite: bool = False) -> Dict[str, int]:
+        """
+        Export every closed market that isn't archived yet.
+
+        Args:
+            before: Export markets that ended before this time (default: now)
+            overwrite: Re-export markets that already have a file
+
+        Returns:
+            market_id -> rows written
+        """
+        started = time.perf_counter()
+        closed = self.closed_markets(before)
+        skip = set() if overwrite else self.archived_market_ids()
+        exported = {}
+        for market_id, end_date in sorted(closed.items(), key=lambda item: item[1]):
+            if market_id in skip:
+                continue
+            exported[market_id] = self.export_market(market_id, end_date)
+        logger.info(f"📦 Archived {len(exported)} closed {self.duration} markets "
+                    f"({sum(exported.values())} snapshots) to {self.root} in {time.perf_counter() - started:.1f}s")
+        return exported
+
+
+class ParquetSnapshotStore:
+    """Read-only queries over the Parquet archive (DuckDB if installed, else pyarrow datasets)."""
+
+    def __init__(self, root: str, engine: Optional[str] = None):
+        """
+        Initialize store.
+
+        Args:
+            root: Archive root directory written by ParquetArchiver
+            engine: "duckdb" or "pyarrow" (default: duckdb when installed)
+        """
+        _require_pyarrow()
+        self.root = root
+        if engine is None:
+            engine = "duckdb" if duckdb is not None else "pyarrow"
+        if engine == "duckdb" and duckdb is None:
+            raise ImportError("duckdb not installed. Install with: pip install duckdb")
+        self.engine = engine
+        self._conn = duckdb.connect() if engine == "duckdb" else None
+
+    def _files_glob(self) -> str:
+        return os.path.join(self.root, "**", "*.parquet").replace("'", "''")
+
+    def _has_files(self) -> bool:
+        return any(name.endswith(".parquet") for _, _, files in os.walk(self.root) for name in files)
+
+    def _dataset(self):
+        # Skip in-progress .tmp files left by an interrupted export
+        return ds.dataset(self.root, format="parquet", partitioning="hive", ignore_prefixes=[".", "_"])
+
+    @staticmethod
+    def _filters(
+        token_id: Optional[str],
+        market_id: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        duration: Optional[str] = None,
+    ) -> List[tuple]:
+        filters = []
+        if token_id:
+            filters.append(("token_id", "=", token_id))
+        if market_id:
+            filters.append(("market_id", "=", str(market_id)))
+        if start_time:
+            filters.append(("timestamp", ">=", _utc(start_time)))
+        if end_time:
+            filters.append(("timestamp", "<=", _utc(end_time)))
+        if duration:
+            filters.append(("duration", "=", duration))
+        return filters
+
+    def _duckdb_where(self, filters: List[tuple]):
+        if not filters:
+            return "", []
+        return " WHERE " + " AND ".join(f"{name} {op} ?" for name, op, _ in filters), [value for _, _, value in filters]
+
+    def _pyarrow_expression(self, filters: List[tuple]):
+        expression = None
+        for name, op, value in filters:
+            field = ds.field(name)
+            term = {"=": field == value, ">=": field >= value, "<=": field <= value}[op]
+            expression = term if expression is None else expression & term
+        return expression
+
+    def query_table(
+        self,
+        token_id: Optional[str] = None,
+        market_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        newest_first: bool = True,
+    ):
+        """
+        Archived snapshots as a pyarrow Table.
+
+        Args:
+            token_id: Filter by token ID
+            market_id: Filter by market ID
+            start_time: Start of time range
+            end_time: End of time range
+            limit: Maximum number of rows (after ordering)
+            columns: Columns to read (default: all, incl. asset/duration/date partition columns)
+            newest_first: Order by timestamp descending (like OrderbookDatabase.get_snapshots)
+        """
+        if not self._has_files():
+            return archive_schema().empty_table()
+        filters = self._filters(token_id, market_id, start_time, end_time)
+        order = "DESC" if newest_first else "ASC"
+
+        if self.engine == "duckdb":
+            select_list = ", ".join(columns) if columns else "*"
+            where, params = self._duckdb_where(filters)
+            sql = (f"SELECT {select_list} FROM read_parquet('{self._files_glob()}', hive_partitioning = true)"
+                   f"{where} ORDER BY timestamp {order}")
+            if limit:
+                sql += f" LIMIT {int(limit)}"
+            return self._conn.execute(sql, params).fetch_arrow_table()
+
+        read_columns = list(columns) if columns else None
+        if read_columns and "timestamp" not in read_columns:
+            read_columns.append("timestamp")  # Needed for ordering
+        table = self._dataset().to_table(columns=read_columns, filter=self._pyarrow_expression(filters))
+        table = table.sort_by([("timestamp", "descending" if newest_first else "ascending")])
+        if limit:
+            table = table.slice(0, limit)
+        if columns and "timestamp" not in columns:
+            table = table.drop_columns(["timestamp"])
+        return table
+
+    def query(self, *args, **kwargs):
+        """Archived snapshots as a pandas DataFrame (same arguments as query_table)."""
+        return self.query_table(*args, **kwargs).to_pandas()
+
+    def get_snapshots(
+        self,
+        token_id: Optional[str] = None,
+        market_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 1000,
+    ) -> List[SimpleNamespace]:
+        """
+        Archived snapshots shaped like OrderbookDatabase.get_snapshots() rows (newest first).
+
+        bids/asks are rebuilt as [[price, size], ...] lists; other columns are attributes.
+        """
+        table = self.query_table(token_id, market_id, start_time, end_time, limit=limit)
+        snapshots = []
+        for row in table.to_pylist():
+            row["bids"] = [list(level) for level in zip(row.pop("bid_prices") or [], row.pop("bid_sizes") or [])]
+            row["asks"] = [list(level) for level in zip(row.pop("ask_prices") or [], row.pop("ask_sizes") or [])]
+            snapshots.append(SimpleNamespace(**row))
+        return snapshots
+
+    def asof(
+        self,
+        probes: List[tuple],
+        tolerance_seconds: Optional[float] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Last archived snapshot at or before each (token_id, timestamp) probe.
+
+        Reads each probed token once (filter pushed down to the files), sorted by timestamp,
+        and matches all of its probes against it.
+
+        Returns:
+            One row dict (or None) per probe, in probe order (same as OrderbookDatabase.get_snapshots_asof)
+        """
+        from bisect import bisect_right
+
+        by_token: Dict[str, List[int]] = {}
+        utc_probes = [(token_id, _utc(timestamp)) for token_id, timestamp in probes]
+        for index, (token_id, _) in enumerate(utc_probes):
+            by_token.setdefault(token_id, []).append(index)
+
+        drop_timestamp = bool(columns) and "timestamp" not in columns
+        read_columns = list(columns) + ["timestamp"] if drop_timestamp else columns
+        results: List[Optional[Dict[str, Any]]] = [None] * len(probes)
+        for token_id, indexes in by_token.items():
+            last = max(utc_probes[index][1] for index in indexes)
+            rows = self.query_table(token_id, None, None, last, columns=read_columns, newest_first=False).to_pylist()
+            times = [row.pop("timestamp") if drop_timestamp else row["timestamp"] for row in rows]
+            for index in indexes:
+                timestamp = utc_probes[index][1]
+                position = bisect_right(times, timestamp) - 1
+                if position < 0:
+                    continue
+                if tolerance_seconds is not None and (timestamp - times[position]).total_seconds() > tolerance_seconds:
+                    continue
+                results[index] = rows[position]
+        return results
+
+    def market_summaries(
+        self,
+        duration: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-market snapshot counts and time range (what get_markets_with_orderbooks needs).
+
+        Returns:
+            List of {"market_id", "duration", "snapshot_count", "first_snapshot", "last_snapshot"},
+            ordered by first_snapshot
+        """
+        if not self._has_files():
+            return []
+        filters = self._filters(None, None, start_time, end_time, duration)
+
+        if self.engine == "duckdb":
+            where, params = self._duckdb_where(filters)
+            sql = (f"SELECT market_id, duration, COUNT(*) AS snapshot_count, "
+                   f"MIN(timestamp) AS first_snapshot, MAX(timestamp) AS last_snapshot "
+                   f"FROM read_parquet('{self._files_glob()}', hive_partitioning = true){where} "
+                   f"GROUP BY market_id, duration ORDER BY first_snapshot")
+            table = self._conn.execute(sql, params).fetch_arrow_table()
+        else:
+            table = self._dataset().to_table(
+                columns=["market_id", "duration", "timestamp"], filter=self._pyarrow_expression(filters)
+            )
+            table = table.group_by(["market_id", "duration"]).aggregate([
+                ("timestamp", "count"), ("timestamp", "min"), ("timestamp", "max"),
+            ]).rename_columns(["market_id", "duration", "snapshot_count", "first_snapshot", "last_snapshot"])
+            table = table.sort_by("first_snapshot")
+        return table.to_pylist()
+
+    def statistics(
+        self,
+        token_id: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Spread statistics for a token (same keys as OrderbookDatabase.get_market_statistics)."""
+        table = self.query_table(token_id, None, start_time, end_time, columns=["timestamp", "spread", "spread_bps"])
+        if table.num_rows == 0:
+            return {}
+        stats = {"count": table.num_rows}
+        for name in ("spread", "spread_bps"):
+            values = table.column(name).drop_null()
+            stats[f"min_{name}"] = pc.min(values).as_py() if len(values) else None
+            stats[f"max_{name}"] = pc.max(values).as_py() if len(values) else None
+            stats[f"avg_{name}"] = pc.mean(values).as_py() if len(values) else None
+        timestamps = table.column("timestamp")
+        stats["first_timestamp"] = pc.min(timestamps).as_py()
+        stats["last_timestamp"] = pc.max(timestamps).as_py()
+        return stats
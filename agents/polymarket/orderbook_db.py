@@ -2,19 +2,53 @@
 Database models and utilities for storing orderbook snapshots.
 """
 import os
+import queue
 import threading
-from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
-from sqlalchemy import create_engine, Column, String, Float, Integer, DateTime, JSON, Index, text, text
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import create_engine, event, Column, String, Float, Integer, DateTime, JSON, Index, text, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
+from agents.utils import metrics
+
 Base = declarative_base()
 
-# Lock for table creation to prevent race conditions
-_table_creation_locks = {}
-_table_creation_lock = threading.Lock()
+MARKET_TABLE_PREFIX = "orderbook_snapshots_market_"
+
+# Index profiles for btc_15_min_table / btc_1_hour_table:
+# - "ingest": only the (market_id, timestamp) and (token_id, timestamp) composites, so each
+#   insert updates two B-trees instead of a dozen
+# - "analytics": every declared index (build offline, e.g. before backtests)
+INDEX_PROFILES = ("ingest", "analytics")
+INGEST_INDEX_COLUMNS = {("market_id", "timestamp"), ("token_id", "timestamp")}
+
+# Derived columns of btc_15_min_table / btc_1_hour_table computed from the book at ingest
+MICROSTRUCTURE_COLUMNS = (
+    "microprice", "imbalance_1", "imbalance_5",
+    "bid_depth_1c", "ask_depth_1c", "bid_depth_2c", "ask_depth_2c", "bid_depth_5c", "ask_depth_5c",
+    "bid_levels", "ask_levels",
+)
+DEPTH_WINDOWS_CENTS = (1, 2, 5)
+
+# As-of lookup strategies (get_snapshots_asof):
+# - "seek": one index seek on (token_id, timestamp) per probe, batched into UNION ALL queries
+# - "merge": one range scan of (id, timestamp) per token, matched to the sorted probes in Python
+ASOF_METHODS = ("seek", "merge")
+
+# SQLite connection modes (ignored for PostgreSQL):
+# - "ingest": WAL + tuned pragmas, all snapshot writes go through one writer thread per file
+# - "read_only": separate read-only connections (queries/backtests against a live capture)
+SQLITE_MODES = ("ingest", "read_only")
+SQLITE_PRAGMAS = {
+    "busy_timeout": 10000,  # ms to wait for a lock instead of failing with "database is locked"
+    "cache_size": -65536,   # 64 MB page cache (negative = KiB)
+    "mmap_size": 268435456, # 256 MB memory-mapped reads
+    "temp_store": "MEMORY",
+}
 
 
 class OrderbookSnapshot(Base):
@@ -121,6 +155,19 @@ class BTC15MinOrderbookSnapshot(Base):
     spread = Column(Float, nullable=True)
     spread_bps = Column(Float, nullable=True)  # Spread in basis points
     
+    # Derived microstructure, computed once at ingest (see microstructure_features)
+    microprice = Column(Float, nullable=True, index=True)  # (bid * ask_size + ask * bid_size) / (bid_size + ask_size)
+    imbalance_1 = Column(Float, nullable=True, index=True)  # (bid size - ask size) / total at the touch, -1..1
+    imbalance_5 = Column(Float, nullable=True, index=True)  # Same over the top 5 levels per side
+    bid_depth_1c = Column(Float, nullable=True)  # Bid size priced within 1 cent of the best bid
+    ask_depth_1c = Column(Float, nullable=True)  # Ask size priced within 1 cent of the best ask
+    bid_depth_2c = Column(Float, nullable=True)
+    ask_depth_2c = Column(Float, nullable=True)
+    bid_depth_5c = Column(Float, nullable=True, index=True)
+    ask_depth_5c = Column(Float, nullable=True, index=True)
+    bid_levels = Column(Integer, nullable=True)  # Number of bid price levels in the book
+    ask_levels = Column(Integer, nullable=True)
+    
     # Full orderbook data (stored as JSON)
     bids = Column(JSON, nullable=True)  # List of [price, size] tuples
     asks = Column(JSON, nullable=True)  # List of [price, size] tuples
@@ -170,6 +217,19 @@ class BTC1HourOrderbookSnapshot(Base):
     spread = Column(Float, nullable=True)
     spread_bps = Column(Float, nullable=True)  # Spread in basis points
     
+    # Derived microstructure, computed once at ingest (see microstructure_features)
+    microprice = Column(Float, nullable=True, index=True)  # (bid * ask_size + ask * bid_size) / (bid_size + ask_size)
+    imbalance_1 = Column(Float, nullable=True, index=True)  # (bid size - ask size) / total at the touch, -1..1
+    imbalance_5 = Column(Float, nullable=True, index=True)  # Same over the top 5 levels per side
+    bid_depth_1c = Column(Float, nullable=True)  # Bid size priced within 1 cent of the best bid
+    ask_depth_1c = Column(Float, nullable=True)  # Ask size priced within 1 cent of the best ask
+    bid_depth_2c = Column(Float, nullable=True)
+    ask_depth_2c = Column(Float, nullable=True)
+    bid_depth_5c = Column(Float, nullable=True, index=True)
+    ask_depth_5c = Column(Float, nullable=True, index=True)
+    bid_levels = Column(Integer, nullable=True)  # Number of bid price levels in the book
+    ask_levels = Column(Integer, nullable=True)
+    
     # Full orderbook data (stored as JSON)
     bids = Column(JSON, nullable=True)  # List of [price, size] tuples
     asks = Column(JSON, nullable=True)  # List of [price, size] tuples
@@ -195,17 +255,657 @@ class BTC1HourOrderbookSnapshot(Base):
     )
 
 
+class OrderbookMarket(Base):
+    """
+    Market dimension table: per-market metadata that snapshot rows reference by market_id
+    instead of repeating the question/outcome text on every row.
+    """
+    __tablename__ = "orderbook_markets"
+    
+    market_id = Column(String, primary_key=True)
+    market_question = Column(String, nullable=True)
+    asset_type = Column(String, nullable=True)  # 'BTC' or 'ETH'
+    market_start_date = Column(DateTime, nullable=True)
+    market_end_date = Column(DateTime, nullable=True)
+    token_outcomes = Column(JSON, nullable=True)  # {token_id: outcome}
+    updated_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+
+class OrderbookRawSample(Base):
+    """Opt-in sampled raw websocket/API payloads (debugging side channel, not written by default)."""
+    __tablename__ = "orderbook_raw_samples"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    token_id = Column(String, nullable=False, index=True)
+    market_id = Column(String, nullable=True)
+    timestamp = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
+    source = Column(String, nullable=True)  # 'rtds', 'polling'
+    payload = Column(JSON, nullable=True)
+
+
+class LatestOrderbook(Base):
+    """
+    Current book per token: one row, upserted in the same transaction as each snapshot insert
+    (history stays in the snapshot tables). Reading "the book now" is a primary-key lookup.
+    """
+    __tablename__ = "latest_orderbook"
+    
+    token_id = Column(String, primary_key=True)
+    market_id = Column(String, nullable=True, index=True)
+    source_table = Column(String, nullable=True)  # Snapshot table holding this token's history
+    snapshot_id = Column(Integer, nullable=True)  # id of the snapshot row in source_table
+    timestamp = Column(DateTime, nullable=False)  # Snapshot time
+    updated_at = Column(DateTime, nullable=False)  # When the row was written (staleness check)
+    
+    best_bid_price = Column(Float, nullable=True)
+    best_bid_size = Column(Float, nullable=True)
+    best_ask_price = Column(Float, nullable=True)
+    best_ask_size = Column(Float, nullable=True)
+    spread = Column(Float, nullable=True)
+    spread_bps = Column(Float, nullable=True)
+    market_price = Column(Float, nullable=True)  # BTC tables only
+    microprice = Column(Float, nullable=True)  # BTC tables only
+    bids = Column(JSON, nullable=True)
+    asks = Column(JSON, nullable=True)
+
+
+LATEST_COLUMNS = [column.name for column in LatestOrderbook.__table__.columns]
+
+
+class OrderbookRoute(Base):
+    """
+    Routing catalog: which snapshot table(s) hold each token's history.
+    
+    Written once per (token, table) alongside the first snapshot insert; read by the unified
+    query layer (orderbook_routing) so a market/token query only touches the tables that hold it.
+    """
+    __tablename__ = "orderbook_routes"
+    
+    token_id = Column(String, primary_key=True)
+    source_table = Column(String, primary_key=True)  # Snapshot table (day partitions map to their parent)
+    market_id = Column(String, nullable=True, index=True)
+    first_seen = Column(DateTime, nullable=False)  # Timestamp of the first routed snapshot
+
+
+def _market_table_class(table_name: str, market_id: str):
+    """Build the mapped class for a per-market snapshot table (same columns as OrderbookSnapshot)."""
+    return type(
+        f"OrderbookSnapshot_{market_id}",
+        (Base,),
+        {
+            "__tablename__": table_name,
+            # Index names are database-wide, so they carry the table name
+            "__table_args__": (
+                Index(f'idx_{table_name}_token_timestamp', 'token_id', 'timestamp'),
+                Index(f'idx_{table_name}_market_timestamp', 'market_id', 'timestamp'),
+            ),
+            "id": Column(Integer, primary_key=True, autoincrement=True),
+            "token_id": Column(String, nullable=False, index=True),
+            "market_id": Column(String, nullable=True, index=True),
+            "timestamp": Column(DateTime, nullable=False, default=datetime.utcnow, index=True),
+            "best_bid_price": Column(Float, nullable=True),
+            "best_bid_size": Column(Float, nullable=True),
+            "best_ask_price": Column(Float, nullable=True),
+            "best_ask_size": Column(Float, nullable=True),
+            "spread": Column(Float, nullable=True),
+            "spread_bps": Column(Float, nullable=True),
+            "bids": Column(JSON, nullable=True),
+            "asks": Column(JSON, nullable=True),
+            "market_question": Column(String, nullable=True),
+            "outcome": Column(String, nullable=True),
+            "extra_metadata": Column(JSON, nullable=True),
+        }
+    )
+
+
+class MarketTableRegistry:
+    """
+    Process-wide market_id -> per-market table map.
+    
+    The tables already present in a database are listed once (the first time a database is
+    seen); after that a known table costs two dict lookups and no schema queries. A new
+    market's table is created once under a per-table lock, so concurrent first writes from
+    several threads/OrderbookDatabase instances race safely; CREATE TABLE races with other
+    processes are absorbed by checkfirst plus the "already exists" fallback.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._classes: Dict[str, Any] = {}  # table_name -> mapped class (one per process, like Base.metadata)
+        self._existing: Dict[str, set] = {}  # database URL -> per-market tables known to exist
+        self._table_locks: Dict[str, threading.Lock] = {}
+    
+    def load(self, engine) -> set:
+        """List existing per-market tables for a database (one catalog query per database per process)."""
+        from sqlalchemy import inspect
+        url = str(engine.url)
+        existing = self._existing.get(url)
+        if existing is not None:
+            return existing
+        with self._lock:
+            existing = self._existing.get(url)
+            if existing is None:
+                existing = {
+                    name for name in inspect(engine).get_table_names()
+                    if name.startswith(MARKET_TABLE_PREFIX)
+                }
+                self._existing[url] = existing
+        return existing
+    
+    def table_class(self, market_id: str):
+        """Mapped class for a market's table (built on first use, never touches the database)."""
+        table_name = f"{MARKET_TABLE_PREFIX}{market_id}"
+        table_class = self._classes.get(table_name)
+        if table_class is None:
+            with self._lock:
+                table_class = self._classes.get(table_name)
+                if table_class is None:
+                    table_class = self._classes[table_name] = _market_table_class(table_name, market_id)
+        return table_class
+    
+    def lookup(self, engine, market_id: str):
+        """
+        Table class for a market if its table exists, without ever creating it (read paths).
+        
+        Returns:
+            Mapped class for orderbook_snapshots_market_<market_id>, or None if there is no such table
+        """
+        table_class = self.table_class(market_id)
+        table_name = table_class.__tablename__
+        existing = self.load(engine)
+        if table_name not in existing:
+            # Possibly created by another process since the catalog was listed
+            from sqlalchemy import inspect
+            if not inspect(engine).has_table(table_name):
+                return None
+            existing.add(table_name)
+        return table_class
+    
+    def get_or_create(self, engine, market_id: str):
+        """
+        Table class for a market, creating the table in the database if it doesn't exist yet.
+        
+        Args:
+            engine: SQLAlchemy engine of the target database
+            market_id: Polymarket market ID
+            
+        Returns:
+            Mapped class for orderbook_snapshots_market_<market_id>
+        """
+        table_class = self.table_class(market_id)
+        table_name = table_class.__tablename__
+        existing = self.load(engine)
+        if table_name in existing:
+            return table_class
+        
+        with self._lock:
+            table_lock = self._table_locks.setdefault(table_name, threading.Lock())
+        with table_lock:
+            if table_name in existing:
+                return table_class  # Created by another thread while we waited
+            import logging
+            logger = logging.getLogger(__name__)
+            try:
+                table_class.__table__.create(bind=engine, checkfirst=True)
+                logger.info(f"✓ Created table {table_name}")
+            except Exception as e:
+                error_str = str(e).lower()
+                if "duplicate" in error_str or "already exists" in error_str:
+                    # Another process created it between the check and CREATE
+                    logger.debug(f"Table {table_name} already exists: {error_str[:100]}")
+                else:
+                    logger.error(f"Error creating table {table_name}: {e}")
+                    raise
+            existing.add(table_name)
+        return table_class
+    
+    def forget(self, engine, table_name: Optional[str] = None):
+        """Drop cached existence for a database (e.g. after tables were dropped externally)."""
+        with self._lock:
+            if table_name is None:
+                self._existing.pop(str(engine.url), None)
+            else:
+                self._existing.get(str(engine.url), set()).discard(table_name)
+
+
+market_tables = MarketTableRegistry()
+
+
+def snapshot_table_name(table_name: str) -> str:
+    """Snapshot table a physical table belongs to (day partitions map to their parent table)."""
+    if table_name.endswith("_legacy") or (table_name[-10:-8] == "_p" and table_name[-8:].isdigit()):
+        return table_name.rsplit("_", 1)[0]
+    return table_name
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Database datetimes are naive UTC."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def latest_values(rows: list) -> List[Dict[str, Any]]:
+    """latest_orderbook values for a batch of flushed snapshot rows (newest row per token)."""
+    newest: Dict[str, Any] = {}
+    for row in rows:
+        current = newest.get(row.token_id)
+        if current is None or _naive_utc(row.timestamp) >= _naive_utc(current.timestamp):
+            newest[row.token_id] = row
+    updated_at = _naive_utc(datetime.now(timezone.utc))
+    values = []
+    for row in newest.values():
+        value = {name: getattr(row, name, None) for name in LATEST_COLUMNS}
+        value.update(
+            source_table=snapshot_table_name(row.__table__.name),
+            snapshot_id=row.id,
+            timestamp=_naive_utc(row.timestamp),
+            updated_at=updated_at,
+        )
+        values.append(value)
+    return values
+
+
+def upsert_latest(session: Session, values: List[Dict[str, Any]]):
+    """
+    Upsert latest_orderbook rows inside the caller's transaction.
+    
+    A row is only replaced by a snapshot at least as new, so batches that commit out of
+    order never move a token's book backwards.
+    """
+    if not values:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for value in values:
+            session.merge(LatestOrderbook(**value))
+        return
+    table = LatestOrderbook.__table__
+    statement = insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.token_id],
+        set_={name: statement.excluded[name] for name in LATEST_COLUMNS if name != "token_id"},
+        where=table.c.timestamp <= statement.excluded.timestamp,
+    )
+    session.execute(statement, values)
+
+
+def insert_routes(session: Session, values: List[Dict[str, Any]]):
+    """Add orderbook_routes rows inside the caller's transaction (existing routes are kept)."""
+    if not values:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for value in values:
+            if session.get(OrderbookRoute, (value["token_id"], value["source_table"])) is None:
+                session.add(OrderbookRoute(**value))
+        return
+    session.execute(insert(OrderbookRoute.__table__).on_conflict_do_nothing(), values)
+
+
+class LatestBookMirror:
+    """
+    In-memory copy of latest_orderbook (token_id -> row dict) for monitoring loops.
+    
+    Writes made through the owning OrderbookDatabase are applied as they commit; refresh()
+    pulls rows written by other processes (a full primary-key scan the first time, then only
+    rows with a recent updated_at).
+    
+    updated_at is stamped before the writer's transaction commits, so a row can become visible
+    after a refresh has already seen newer ones; each refresh re-reads overlap_seconds behind
+    the newest updated_at it has seen (re-applied rows are no-ops).
+    """
+    
+    def __init__(self, overlap_seconds: float = 5.0):
+        """
+        Initialize mirror.
+        
+        Args:
+            overlap_seconds: How far behind the watermark each refresh re-reads, to pick up
+                rows whose commit landed after a later-stamped row was read (default: 5.0)
+        """
+        self._lock = threading.Lock()
+        self._books: Dict[str, Dict[str, Any]] = {}
+        self._watermark: Optional[datetime] = None  # Newest updated_at seen by refresh()
+        self.overlap = timedelta(seconds=overlap_seconds)
+    
+    def apply(self, values: List[Dict[str, Any]]):
+        """Merge committed latest_orderbook values (older snapshots never replace newer ones)."""
+        with self._lock:
+            for value in values:
+                current = self._books.get(value["token_id"])
+                if current is None or current["timestamp"] <= value["timestamp"]:
+                    self._books[value["token_id"]] = dict(value)
+    
+    def refresh(self, engine) -> int:
+        """
+        Load rows changed since the last refresh.
+        
+        Returns:
+            Number of rows read
+        """
+        from sqlalchemy import select
+        table = LatestOrderbook.__table__
+        query = select(table)
+        with self._lock:
+            watermark = self._watermark
+        if watermark is not None:
+            query = query.where(table.c.updated_at >= watermark - self.overlap)
+        with engine.connect() as conn:
+            values = [dict(row) for row in conn.execute(query).mappings()]
+        if values:
+            self.apply(values)
+            newest = max(value["updated_at"] for value in values)
+            with self._lock:
+                if self._watermark is None or newest > self._watermark:
+                    self._watermark = newest
+        return len(values)
+    
+    def get(self, token_id: str) -> Optional[Dict[str, Any]]:
+        """Current book of one token (a copy), or None if the mirror hasn't seen it."""
+        with self._lock:
+            book = self._books.get(token_id)
+            return dict(book) if book is not None else None
+    
+    def books(self, market_id: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Current books by token_id (optionally one market's tokens)."""
+        with self._lock:
+            return {
+                token_id: dict(book) for token_id, book in self._books.items()
+                if market_id is None or book["market_id"] == market_id
+            }
+    
+    def stale(self, max_age_seconds: float) -> Dict[str, Dict[str, Any]]:
+        """Books whose last write (updated_at) is older than max_age_seconds."""
+        cutoff = _naive_utc(datetime.now(timezone.utc)) - timedelta(seconds=max_age_seconds)
+        with self._lock:
+            return {token_id: dict(book) for token_id, book in self._books.items() if book["updated_at"] < cutoff}
+
+
+def _configure_sqlite(engine, read_only: bool = False):
+    """Apply SQLITE_PRAGMAS (plus WAL/synchronous for writers, query_only for readers) to every new connection."""
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+            else:
+                # WAL lets readers run alongside the writer; NORMAL is durable in WAL mode except
+                # for the last transactions before a power loss
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+        finally:
+            cursor.close()
+
+
+class _WriteJob:
+    __slots__ = ("db", "snapshots", "future")
+    
+    def __init__(self, db, snapshots: List[Dict[str, Any]]):
+        self.db = db
+        self.snapshots = snapshots
+        self.future: Future = Future()
+
+
+class SQLiteWriter:
+    """
+    Dedicated writer thread for one SQLite file (sqlite_mode="ingest").
+    
+    Every OrderbookDatabase on the file submits its save_snapshots() calls here. The thread
+    drains whatever is queued (up to max_group_rows) and commits it as one transaction, so
+    concurrent loggers/pollers share commits instead of contending for the write lock.
+    """
+    
+    def __init__(self, database_url: str, max_group_rows: int = 2000):
+        """
+        Initialize writer and start its thread.
+        
+        Args:
+            database_url: SQLite URL of the database file
+            max_group_rows: Max snapshot rows committed in one grouped transaction (default: 2000)
+        """
+        self.database_url = database_url
+        self.max_group_rows = max_group_rows
+        self.engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        _configure_sqlite(self.engine)
+        # Rows stay readable after commit (save_snapshot returns them)
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.stats = {"jobs": 0, "rows": 0, "transactions": 0, "max_group_jobs": 0, "errors": 0}
+        self._queue: "queue.Queue[Optional[_WriteJob]]" = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self.thread.start()
+    
+    def submit(self, db, snapshots: List[Dict[str, Any]]) -> Future:
+        """Queue save_snapshots() kwargs for db; the future resolves to the written row objects."""
+        job = _WriteJob(db, snapshots)
+        self._queue.put(job)
+        return job.future
+    
+    def close(self, timeout: Optional[float] = 10.0):
+        """Finish queued writes and stop the thread."""
+        self._queue.put(None)
+        self.thread.join(timeout)
+    
+    def _run(self):
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            jobs = [job]
+            rows = len(job.snapshots)
+            stop = False
+            while rows < self.max_group_rows:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                jobs.append(job)
+                rows += len(job.snapshots)
+            
+            try:
+                self._write_group(jobs)
+            except Exception as e:
+                # One bad job fails the whole group; retry jobs alone so only it fails
+                logger.warning(f"⚠️ Grouped write of {len(jobs)} jobs failed ({e}), retrying individually")
+                for job in jobs:
+                    try:
+                        self._write_group([job])
+                    except Exception as job_error:
+                        self.stats["errors"] += 1
+                        job.future.set_exception(job_error)
+            if stop:
+                return
+    
+    def _write_group(self, jobs: List[_WriteJob]):
+        started = time.perf_counter()
+        # Build all rows first: market dimension upserts commit on their own, before the group
+        prepared = [(job, job.db._build_rows(job.snapshots)) for job in jobs]
+        session = self.SessionLocal()
+        try:
+            for _, (rows, raw_samples) in prepared:
+                session.add_all(rows)
+                session.add_all(raw_samples)
+            session.flush()
+            after_commit = [job.db._write_side_tables(session, rows) for job, (rows, _) in prepared]
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        
+        for callback in after_commit:
+            callback()
+        self.stats["jobs"] += len(jobs)
+        self.stats["transactions"] += 1
+        self.stats["max_group_jobs"] = max(self.stats["max_group_jobs"], len(jobs))
+        for job, (rows, _) in prepared:
+            self.stats["rows"] += len(rows)
+            if rows:
+                OrderbookDatabase._record_write(type(rows[0]), len(rows), started)
+            job.future.set_result(rows)
+
+
+_sqlite_writers: Dict[str, SQLiteWriter] = {}
+_sqlite_writers_lock = threading.Lock()
+
+
+def get_sqlite_writer(database_url: str) -> SQLiteWriter:
+    """Process-wide writer for a SQLite URL (created on first use)."""
+    with _sqlite_writers_lock:
+        writer = _sqlite_writers.get(database_url)
+        if writer is None:
+            writer = _sqlite_writers[database_url] = SQLiteWriter(database_url)
+        return writer
+
+
+def sort_book(bids: List[List[float]], asks: List[List[float]]) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+    """
+    Order both sides best-first: bids descending, asks ascending.
+    
+    Args:
+        bids: [[price, size], ...] in any order (the CLOB API lists bids ascending)
+        asks: [[price, size], ...] in any order
+        
+    Returns:
+        Tuple of (bids, asks) as lists of (price, size) floats
+    """
+    bids = sorted(((float(price), float(size)) for price, size in bids or []), reverse=True)
+    asks = sorted((float(price), float(size)) for price, size in asks or [])
+    return bids, asks
+
+
+def top_of_book(bids: List[Tuple[float, float]], asks: List[Tuple[float, float]]) -> Dict[str, Any]:
+    """
+    Best bid/ask, spread and spread_bps columns of a snapshot.
+    
+    Args:
+        bids: Bids sorted best-first (see sort_book)
+        asks: Asks sorted best-first
+        
+    Returns:
+        Dictionary keyed by column name (None where a side is empty)
+    """
+    best_bid_price, best_bid_size = bids[0] if bids else (None, None)
+    best_ask_price, best_ask_size = asks[0] if asks else (None, None)
+    spread = None
+    spread_bps = None
+    if best_bid_price and best_ask_price:
+        spread = best_ask_price - best_bid_price
+        mid_price = (best_bid_price + best_ask_price) / 2
+        if mid_price > 0:
+            spread_bps = (spread / mid_price) * 10000
+    return {
+        "best_bid_price": best_bid_price,
+        "best_bid_size": best_bid_size,
+        "best_ask_price": best_ask_price,
+        "best_ask_size": best_ask_size,
+        "spread": spread,
+        "spread_bps": spread_bps,
+    }
+
+
+def microstructure_features(bids: List[List[float]], asks: List[List[float]], presorted: bool = False) -> Dict[str, Any]:
+    """
+    Derived book features stored alongside each BTC snapshot (MICROSTRUCTURE_COLUMNS).
+    
+    Args:
+        bids: [[price, size], ...] in any order (the CLOB API lists bids ascending)
+        asks: [[price, size], ...] in any order
+        presorted: Both sides are already best-first (output of sort_book)
+        
+    Returns:
+        Dictionary keyed by column name (None where a side is empty)
+    """
+    if not presorted:
+        bids, asks = sort_book(bids, asks)
+    features: Dict[str, Any] = {name: None for name in MICROSTRUCTURE_COLUMNS}
+    features["bid_levels"] = len(bids)
+    features["ask_levels"] = len(asks)
+    
+    for side, levels in (("bid", bids), ("ask", asks)):
+        if not levels:
+            continue
+        touch = levels[0][0]
+        for cents in DEPTH_WINDOWS_CENTS:
+            # Small epsilon: prices are floats on a 0.01 tick grid
+            limit = cents / 100 + 1e-9
+            features[f"{side}_depth_{cents}c"] = sum(size for price, size in levels if abs(price - touch) <= limit)
+    
+    if bids and asks:
+        (bid, bid_size), (ask, ask_size) = bids[0], asks[0]
+        if bid_size + ask_size > 0:
+            features["microprice"] = (bid * ask_size + ask * bid_size) / (bid_size + ask_size)
+        for depth in (1, 5):
+            bid_total = sum(size for _, size in bids[:depth])
+            ask_total = sum(size for _, size in asks[:depth])
+            if bid_total + ask_total > 0:
+                features[f"imbalance_{depth}"] = (bid_total - ask_total) / (bid_total + ask_total)
+    return features
+
+
+def secondary_indexes(table_class) -> List[Index]:
+    """Indexes of a snapshot table that the "ingest" profile drops."""
+    return [
+        index for index in table_class.__table__.indexes
+        if tuple(column.name for column in index.columns) not in INGEST_INDEX_COLUMNS
+    ]
+
+
 class OrderbookDatabase:
     """Database manager for orderbook snapshots."""
     
-    def __init__(self, database_url: Optional[str] = None, per_market_tables: bool = False, use_btc_eth_table: bool = False, use_btc_15_min_table: bool = False, use_btc_1_hour_table: bool = False):
+    def __init__(self, database_url: Optional[str] = None, per_market_tables: bool = False, use_btc_eth_table: bool = False, use_btc_15_min_table: bool = False, use_btc_1_hour_table: bool = False, store_market_text: bool = False, index_profile: Optional[str] = None, sqlite_mode: Optional[str] = None, partitioned: bool = False, latest_table: bool = True):
         """
         Initialize database connection.
         
         Args:
             database_url: SQLAlchemy database URL. If None, checks DATABASE_URL env var,
                         then ORDERBOOK_DB_PATH, then defaults to SQLite at ./orderbook.db
+            store_market_text: Also write market_question/outcome on every snapshot row
+                        (legacy layout). By default they live in the orderbook_markets
+                        dimension table and are filled back in by get_snapshots().
+            index_profile: Index profile applied to btc_15_min_table / btc_1_hour_table on startup:
+                        "ingest" drops the secondary indexes (write-optimized), "analytics" builds
+                        any that are missing. None (default) leaves existing indexes alone.
+            sqlite_mode: SQLite only. "ingest" enables WAL/tuned pragmas and routes snapshot
+                        writes through one shared writer thread with grouped transactions;
+                        "read_only" opens read-only connections and skips table creation
+                        (for queries/backtests against a live capture). None (default) keeps
+                        the single shared connection.
+            partitioned: Store btc_15_min_table / btc_1_hour_table in daily partitions (native
+                        on PostgreSQL, per-day tables behind a view on SQLite) so old days can be
+                        rolled up and dropped by apply_retention(). See orderbook_partitions.
+            latest_table: Upsert each token's newest snapshot into latest_orderbook in the same
+                        transaction as the insert (default: True), for get_latest_book() /
+                        get_latest_books() without scanning history.
         """
+        if index_profile is not None and index_profile not in INDEX_PROFILES:
+            raise ValueError(f"index_profile must be one of {INDEX_PROFILES}, got {index_profile!r}")
+        if sqlite_mode is not None and sqlite_mode not in SQLITE_MODES:
+            raise ValueError(f"sqlite_mode must be one of {SQLITE_MODES}, got {sqlite_mode!r}")
+        self.index_profile = index_profile
         if database_url is None:
             # Check for standard DATABASE_URL (Railway, Neon, etc.)
             database_url = os.getenv("DATABASE_URL")
@@ -228,8 +928,34 @@ class OrderbookDatabase:
                 logger = logging.getLogger(__name__)
                 logger.info(f"⚠ No DATABASE_URL found - using SQLite at {db_path}")
         
+        if not database_url.startswith("sqlite"):
+            sqlite_mode = None
+        elif sqlite_mode == "read_only":
+            db_file = database_url.split(":///", 1)[-1]
+            if not os.path.exists(db_file):
+                import logging
+                logging.getLogger(__name__).warning(f"⚠ {db_file} doesn't exist yet - opening it read-write")
+                sqlite_mode = None
+        self.sqlite_mode = sqlite_mode
+        self.read_only = sqlite_mode == "read_only"
+        self._writer: Optional[SQLiteWriter] = None
+        
         # Configure engine based on database type
-        if database_url.startswith("sqlite"):
+        if sqlite_mode == "read_only":
+            # Own read-only connections (one per thread), never blocking the writer
+            db_file = os.path.abspath(database_url.split(":///", 1)[-1])
+            self.engine = create_engine(
+                f"sqlite:///file:{db_file}?mode=ro&uri=true",
+                connect_args={"check_same_thread": False},
+            )
+            _configure_sqlite(self.engine, read_only=True)
+        elif sqlite_mode == "ingest":
+            # Snapshot writes go through the shared writer; this engine serves reads, DDL at
+            # startup and the occasional market dimension upsert (they wait on busy_timeout)
+            self._writer = get_sqlite_writer(database_url)
+            self.engine = create_engine(database_url, connect_args={"check_same_thread": False})
+            _configure_sqlite(self.engine)
+        elif database_url.startswith("sqlite"):
             # SQLite-specific configuration
             self.engine = create_engine(
                 database_url,
@@ -245,38 +971,86 @@ class OrderbookDatabase:
                 pool_pre_ping=True,  # Verify connections before using
             )
         
-        # Create base table
-        Base.metadata.create_all(self.engine)
+        # Create base table (a read-only capture already has its tables)
+        if not self.read_only:
+            Base.metadata.create_all(self.engine)
         SessionLocal = sessionmaker(bind=self.engine)
         self.SessionLocal = SessionLocal
         
-        # Track created per-market tables (cache table classes to avoid recreating)
-        self._created_tables = set()  # Track table names
-        self._table_class_cache = {}  # Cache table_name -> table_class mapping
+        self.latest_table = latest_table and not self.read_only
+        self.latest_books = LatestBookMirror()
+        self._has_latest_table: Optional[bool] = True if self.latest_table else None
+        # orderbook_markets is created by create_all; a read-only capture may predate it
+        self._has_market_table: Optional[bool] = None if self.read_only else True
+        self._known_routes: set = set()  # (token_id, source_table) already in orderbook_routes
+        
         self.per_market_tables = per_market_tables
+        if self.per_market_tables:
+            # List existing per-market tables once so inserts never query the catalog
+            market_tables.load(self.engine)
         self.use_btc_eth_table = use_btc_eth_table  # Use single btc_eth_table instead
         self.use_btc_15_min_table = use_btc_15_min_table  # Use btc_15_min_table for proactive logging
         self.use_btc_1_hour_table = use_btc_1_hour_table  # Use btc_1_hour_table for proactive logging
         
         # Create btc_eth_table if requested
-        if self.use_btc_eth_table:
+        if self.use_btc_eth_table and not self.read_only:
             BTCEthOrderbookSnapshot.__table__.create(self.engine, checkfirst=True)
             # Migrate existing table to add new columns if they don't exist
             self._migrate_btc_eth_table()
         
         # Create btc_15_min_table if requested
-        if self.use_btc_15_min_table:
+        if self.use_btc_15_min_table and not self.read_only:
             BTC15MinOrderbookSnapshot.__table__.create(self.engine, checkfirst=True)
             # Migrate existing table to add new columns if they don't exist
             self._migrate_btc_15_min_table()
         
         # Create btc_1_hour_table if requested
-        if self.use_btc_1_hour_table:
+        if self.use_btc_1_hour_table and not self.read_only:
             BTC1HourOrderbookSnapshot.__table__.create(self.engine, checkfirst=True)
             # Migrate existing table to add new columns if they don't exist
             self._migrate_btc_1_hour_table()
+        
+        # Read-only opens can't migrate: refuse a table older than the models up front
+        # instead of failing every query on a missing column
+        if self.read_only:
+            self._check_read_only_schema()
+        
+        # Day partitions (readers need nothing: they query the parent table / view)
+        self.partitioner = None
+        partitioned_class = BTC15MinOrderbookSnapshot if use_btc_15_min_table else (
+            BTC1HourOrderbookSnapshot if use_btc_1_hour_table else None)
+        if partitioned and partitioned_class is not None and not self.read_only:
+            from agents.polymarket.orderbook_partitions import SnapshotPartitioner
+            self.partitioner = SnapshotPartitioner(self.engine, partitioned_class, index_profile)
+            self.partitioner.setup()
         # Per-table locks for creation (prevents race conditions)
         self._table_locks = {}
+        
+        # Market dimension rows already written (market_id -> values), so each market is
+        # upserted once instead of on every snapshot
+        self.store_market_text = store_market_text
+        self._market_dimensions: Dict[str, Dict[str, Any]] = {}
+        self._market_dimension_lock = threading.Lock()
+    
+    def _check_read_only_schema(self):
+        """
+        Raise if the snapshot table this instance reads lacks columns its model selects.
+        
+        Columns are added by the migrations that run on read-write opens, so a capture last
+        written by older code has to be opened read-write once before read-only readers work.
+        """
+        from sqlalchemy import inspect
+        table = self._snapshot_model().__table__
+        inspector = inspect(self.engine)
+        if not inspector.has_table(table.name):
+            return
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        missing = [name for name in table.columns.keys() if name not in existing]
+        if missing:
+            raise RuntimeError(
+                f"{table.name} predates column(s) {', '.join(missing)}; "
+                f"open it once read-write (sqlite_mode=None) to migrate, then read-only opens work"
+            )
     
     def _migrate_btc_eth_table(self):
         """Add missing columns to btc_eth_table if they don't exist (migration)."""
@@ -388,6 +1162,11 @@ class OrderbookDatabase:
                 logger.info(f"✓ Migration complete for {table_name}")
             else:
                 logger.debug(f"Table {table_name} already has all realistic price columns")
+            
+            self._migrate_microstructure_columns(BTC15MinOrderbookSnapshot)
+            
+            if self.index_profile:
+                self._apply_index_profile(BTC15MinOrderbookSnapshot, self.index_profile)
         except Exception as e:
             logger.warning(f"Migration check failed (non-critical): {e}")
             # Don't raise - allow script to continue
@@ -441,10 +1220,221 @@ class OrderbookDatabase:
                 logger.info(f"✓ Migration complete for {table_name}")
             else:
                 logger.debug(f"Table {table_name} already has all realistic price columns")
+            
+            self._migrate_microstructure_columns(BTC1HourOrderbookSnapshot)
+            
+            if self.index_profile:
+                self._apply_index_profile(BTC1HourOrderbookSnapshot, self.index_profile)
         except Exception as e:
             logger.warning(f"Migration check failed (non-critical): {e}")
             # Don't raise - allow script to continue
     
+    def _migrate_microstructure_columns(self, table_class):
+        """Add the derived microstructure columns (and their indexes) to an existing BTC table."""
+        from sqlalchemy import inspect
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        table_name = table_class.__tablename__
+        existing_columns = {col['name'] for col in inspect(self.engine).get_columns(table_name)}
+        columns_to_add = [name for name in MICROSTRUCTURE_COLUMNS if name not in existing_columns]
+        if not columns_to_add:
+            return
+        
+        logger.info(f"Migrating {table_name}: Adding {len(columns_to_add)} microstructure column(s)...")
+        with self.engine.begin() as conn:
+            for col_name in columns_to_add:
+                col_type = table_class.__table__.c[col_name].type.compile(dialect=self.engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {col_name} {col_type}'))
+        # Older rows stay NULL until backfill_microstructure() runs
+        if self.index_profile != "ingest":
+            for index in table_class.__table__.indexes:
+                if any(column.name in columns_to_add for column in index.columns):
+                    index.create(self.engine, checkfirst=True)
+        logger.info(f"✓ Migration complete for {table_name} (run backfill_microstructure() for existing rows)")
+    
+    def _apply_index_profile(self, table_class, profile: str):
+        """Drop ("ingest") or build ("analytics") the secondary indexes of a snapshot table."""
+        from sqlalchemy import inspect
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        table_name = table_class.__tablename__
+        existing = {index['name'] for index in inspect(self.engine).get_indexes(table_name)}
+        started = time.perf_counter()
+        changed = []
+        for index in secondary_indexes(table_class):
+            if profile == "ingest" and index.name in existing:
+                index.drop(self.engine)
+                changed.append(index.name)
+            elif profile == "analytics" and index.name not in existing:
+                index.create(self.engine)
+                changed.append(index.name)
+        
+        if changed:
+            action = "Dropped" if profile == "ingest" else "Built"
+            logger.info(f"✓ {action} {len(changed)} secondary index(es) on {table_name} "
+                        f"({profile} profile, {time.perf_counter() - started:.1f}s)")
+        else:
+            logger.debug(f"Table {table_name} already matches the {profile} index profile")
+    
+    def build_analytics_indexes(self):
+        """
+        Build the secondary indexes dropped by the "ingest" profile (offline step).
+        
+        Run against a copy or between ingestion sessions: building indexes on a large table
+        blocks writers for the duration.
+        """
+        if self.use_btc_15_min_table:
+            self._apply_index_profile(BTC15MinOrderbookSnapshot, "analytics")
+        if self.use_btc_1_hour_table:
+            self._apply_index_profile(BTC1HourOrderbookSnapshot, "analytics")
+    
+    def backfill_microstructure(self, batch_size: int = 5000) -> int:
+        """
+        Compute the microstructure columns for rows logged before they existed.
+        
+        Args:
+            batch_size: Rows decoded and updated per transaction
+            
+        Returns:
+            Number of rows updated
+        """
+        from sqlalchemy import MetaData, bindparam, select, update
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        table_class = self._snapshot_model()
+        if table_class not in (BTC15MinOrderbookSnapshot, BTC1HourOrderbookSnapshot):
+            raise ValueError("backfill_microstructure() needs use_btc_15_min_table or use_btc_1_hour_table")
+        
+        table_names = [table_class.__tablename__]
+        if self.engine.dialect.name == "sqlite":
+            with self.engine.connect() as conn:
+                kind = conn.execute(text("SELECT type FROM sqlite_master WHERE name = :name"),
+                                    {"name": table_class.__tablename__}).scalar()
+                if kind == "view":
+                    # Partitioned: the view can't be updated, its day tables can
+                    table_names = [row[0] for row in conn.execute(
+                        text("SELECT partition_name FROM orderbook_partitions "
+                             "WHERE source_table = :table AND dropped_at IS NULL"),
+                        {"table": table_class.__tablename__},
+                    )]
+        
+        updated = 0
+        for table_name in table_names:
+            table = table_class.__table__.to_metadata(MetaData(), name=table_name)
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values({name: bindparam(name) for name in MICROSTRUCTURE_COLUMNS})
+            )
+            last_id = None
+            while True:
+                query = select(table.c.id, table.c.bids, table.c.asks).where(table.c.bid_levels.is_(None))
+                if last_id is not None:
+                    query = query.where(table.c.id > last_id)
+                with self.engine.begin() as conn:
+                    rows = conn.execute(query.order_by(table.c.id).limit(batch_size)).fetchall()
+                    if not rows:
+                        break
+                    conn.execute(statement, [
+                        {"row_id": row_id, **microstructure_features(bids, asks)} for row_id, bids, asks in rows
+                    ])
+                last_id = rows[-1][0]
+                updated += len(rows)
+        logger.info(f"✓ Backfilled microstructure columns for {updated} row(s) of {table_class.__tablename__}")
+        return updated
+    
+    def screen_snapshots(
+        self,
+        ranges: Dict[str, tuple],
+        market_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+        limit: int = 100000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find snapshots by derived/top-of-book column ranges without decoding book depth.
+        
+        Example: db.screen_snapshots({"imbalance_5": (0.5, None), "ask_depth_2c": (None, 100)})
+        
+        Args:
+            ranges: {column: (min, max)} inclusive, None for an open end
+            market_id: Filter by market ID
+            start_time: Start of time range
+            end_time: End of time range
+            columns: Columns to return (default: id, token_id, market_id, timestamp + the ranged columns)
+            limit: Maximum number of results
+            
+        Returns:
+            List of row dicts ordered by timestamp
+        """
+        from sqlalchemy import select
+        
+        model = self._snapshot_model(market_id)
+        if model is None:
+            return []
+        table = model.__table__
+        unknown = [name for name in list(ranges) + list(columns or []) if name not in table.c]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table.name}: {', '.join(unknown)}")
+        
+        columns = columns or ["id", "token_id", "market_id", "timestamp", *ranges]
+        query = select(*[table.c[name] for name in columns])
+        for name, (low, high) in ranges.items():
+            if low is not None:
+                query = query.where(table.c[name] >= low)
+            if high is not None:
+                query = query.where(table.c[name] <= high)
+        if market_id:
+            query = query.where(table.c.market_id == market_id)
+        if start_time:
+            query = query.where(table.c.timestamp >= start_time)
+        if end_time:
+            query = query.where(table.c.timestamp <= end_time)
+        
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(query.order_by(table.c.timestamp).limit(limit)).mappings()]
+    
+    def apply_retention(self, retention_days: int, dry_run: bool = False) -> List[str]:
+        """
+        Roll up and drop day partitions older than retention_days (requires partitioned=True).
+        
+        Args:
+            retention_days: Days of full-depth snapshots to keep
+            dry_run: Only list the partitions that would be dropped
+            
+        Returns:
+            Names of dropped (or droppable) partitions
+        """
+        if self.partitioner is None:
+            raise ValueError("apply_retention() needs OrderbookDatabase(partitioned=True) on a BTC table")
+        return self.partitioner.apply_retention(retention_days, dry_run=dry_run)
+    
+    @property
+    def table_label(self) -> str:
+        """Snapshot table name for metrics/log labels (per-market tables are grouped)."""
+        if self.use_btc_15_min_table:
+            return BTC15MinOrderbookSnapshot.__tablename__
+        if self.use_btc_1_hour_table:
+            return BTC1HourOrderbookSnapshot.__tablename__
+        if self.use_btc_eth_table:
+            return BTCEthOrderbookSnapshot.__tablename__
+        return "orderbook_snapshots_market" if self.per_market_tables else OrderbookSnapshot.__tablename__
+    
+    @staticmethod
+    def _record_write(table_class, rows: int, started: float):
+        """Report a committed snapshot write to the metrics endpoint (no-op when disabled)."""
+        if not metrics.ENABLED:
+            return
+        table = snapshot_table_name(table_class.__table__.name)  # Day partition -> its snapshot table
+        if table.startswith(MARKET_TABLE_PREFIX):
+            table = "orderbook_snapshots_market"  # Don't create a series per market
+        metrics.inc("orderbook_snapshots_persisted", {"table": table}, rows)
+        metrics.observe("orderbook_db_write_seconds", time.perf_counter() - started, {"table": table})
+    
     def get_session(self) -> Session:
         """Get a database session."""
         return self.SessionLocal()
@@ -453,116 +1443,271 @@ class OrderbookDatabase:
         """
         Get or create table for a specific market.
         If per_market_tables is False, returns base OrderbookSnapshot.
-        If per_market_tables is True, creates/returns market-specific table.
+        If per_market_tables is True, creates/returns market-specific table
+        (via the process-wide market_tables registry - no schema queries once known).
         """
         if not self.per_market_tables or not market_id:
             return OrderbookSnapshot
+        if self.read_only:
+            return market_tables.table_class(market_id)
+        return market_tables.get_or_create(self.engine, market_id)
+    
+    def _prepare_snapshot(
+        self,
+        token_id: str,
+        bids: List[List[float]],
+        asks: List[List[float]],
+        market_id: Optional[str] = None,
+        market_question: Optional[str] = None,
+        outcome: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        market_start_date: Optional[datetime] = None,
+        market_end_date: Optional[datetime] = None,
+        asset_type: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+    ):
+        """
+        Resolve the target table and build the row for a snapshot (no database write).
         
-        # Create market-specific table name (sanitize for SQL)
-        table_name = f"orderbook_snapshots_market_{market_id}"
+        Returns:
+            Tuple of (table class, column values dict)
+        """
+        # Determine asset type (for btc_eth_table)
+        asset_type = None
+        if market_question:
+            question_lower = market_question.lower()
+            if "bitcoin" in question_lower or "btc" in question_lower:
+                asset_type = "BTC"
+            elif "ethereum" in question_lower or "eth" in question_lower:
+                asset_type = "ETH"
         
-        # Check cache first (fastest)
-        if table_name in self._table_class_cache:
-            return self._table_class_cache[table_name]
+        # Use btc_15_min_table if enabled (for proactive BTC 15-min logging)
+        if self.use_btc_15_min_table:
+            SnapshotTable = BTC15MinOrderbookSnapshot
+        # Use btc_1_hour_table if enabled (for proactive BTC 1-hour logging)
+        elif self.use_btc_1_hour_table:
+            SnapshotTable = BTC1HourOrderbookSnapshot
+        # Use btc_eth_table if enabled (simpler, no dynamic table creation)
+        elif self.use_btc_eth_table:
+            SnapshotTable = BTCEthOrderbookSnapshot
+        else:
+            # Get appropriate table (base or market-specific)
+            # This ensures table exists before we try to insert
+            SnapshotTable = self._get_table_for_market(market_id)
         
-        # Check if table class already exists in Base registry (from previous run or concurrent access)
-        for mapper in Base.registry.mappers:
-            if hasattr(mapper.class_, '__tablename__') and mapper.class_.__tablename__ == table_name:
-                # Cache it for next time
-                self._table_class_cache[table_name] = mapper.class_
-                self._created_tables.add(table_name)
-                return mapper.class_
+        # Sort once; best bid/ask, spread and the microstructure features all come from this
+        # book (levels can arrive in any order - the CLOB API lists bids ascending)
+        sorted_bids, sorted_asks = sort_book(bids, asks)
         
-        # Create new table class for this market
-        # Use a unique class name to avoid conflicts
-        class_name = f"OrderbookSnapshot_{market_id}_{id(self)}"  # Add instance ID for uniqueness
+        # Snapshot time: when the update was received (default: now, timezone-aware UTC)
+        current_timestamp = timestamp or datetime.now(timezone.utc)
+        if self.partitioner is not None:
+            SnapshotTable = self.partitioner.table_for(current_timestamp)
         
-        # Check one more time if table was created by another thread/process
-        for mapper in Base.registry.mappers:
-            if hasattr(mapper.class_, '__tablename__') and mapper.class_.__tablename__ == table_name:
-                self._table_class_cache[table_name] = mapper.class_
-                self._created_tables.add(table_name)
-                return mapper.class_
+        # Calculate time remaining if end_date is provided
+        time_remaining_seconds = None
+        if market_end_date:
+            # Ensure both are timezone-aware for subtraction
+            if market_end_date.tzinfo is None:
+                # If naive, assume UTC
+                market_end_date = market_end_date.replace(tzinfo=timezone.utc)
+            if current_timestamp.tzinfo is None:
+                current_timestamp = current_timestamp.replace(tzinfo=timezone.utc)
+            
+            time_delta = market_end_date - current_timestamp
+            time_remaining_seconds = time_delta.total_seconds()
         
-        try:
-            market_table = type(
-                class_name,
-                (Base,),
-                {
-                    "__tablename__": table_name,
-                    "__table_args__": (
-                        Index('idx_token_timestamp', 'token_id', 'timestamp'),
-                        Index('idx_market_timestamp', 'market_id', 'timestamp'),
-                    ),
-                    "id": Column(Integer, primary_key=True, autoincrement=True),
-                    "token_id": Column(String, nullable=False, index=True),
-                    "market_id": Column(String, nullable=True, index=True),
-                    "timestamp": Column(DateTime, nullable=False, default=datetime.utcnow, index=True),
-                    "best_bid_price": Column(Float, nullable=True),
-                    "best_bid_size": Column(Float, nullable=True),
-                    "best_ask_price": Column(Float, nullable=True),
-                    "best_ask_size": Column(Float, nullable=True),
-                    "spread": Column(Float, nullable=True),
-                    "spread_bps": Column(Float, nullable=True),
-                    "bids": Column(JSON, nullable=True),
-                    "asks": Column(JSON, nullable=True),
-                    "market_question": Column(String, nullable=True),
-                    "outcome": Column(String, nullable=True),
-                    "extra_metadata": Column(JSON, nullable=True),
-                }
+        # Extract realistic prices from metadata (if available)
+        outcome_price = None
+        last_trade_price = None
+        market_price = None
+        if metadata:
+            outcome_price = metadata.get("outcome_price")
+            last_trade_price = metadata.get("last_trade_price")
+            market_price = metadata.get("market_price")
+        
+        table_columns = set(SnapshotTable.__table__.columns.keys())
+        
+        # Keep metadata small: drop empty values and anything already stored in a dedicated
+        # column (tables without price columns keep the prices in metadata)
+        if metadata:
+            metadata = {
+                key: value for key, value in metadata.items()
+                if value is not None and key not in table_columns
+            } or None
+        
+        # Question/outcome text lives in the market dimension table, referenced by market_id
+        if market_id and not self.store_market_text:
+            self._ensure_market_dimension(
+                market_id=market_id,
+                token_id=token_id,
+                market_question=market_question,
+                outcome=outcome,
+                asset_type=asset_type,
+                market_start_date=market_start_date,
+                market_end_date=market_end_date,
             )
+            market_question = None
+            outcome = None
+        
+        # Create snapshot with appropriate fields
+        snapshot_data = {
+            "token_id": token_id,
+            "market_id": market_id,
+            "timestamp": current_timestamp,
+            **top_of_book(sorted_bids, sorted_asks),
+            # Realistic prices (dedicated columns for easy querying)
+            "outcome_price": outcome_price,
+            "last_trade_price": last_trade_price,
+            "market_price": market_price,
+            "bids": bids,
+            "asks": asks,
+            "market_question": market_question,
+            "outcome": outcome,
+            "extra_metadata": metadata,
+        }
+        
+        # Add fields for btc_eth_table
+        if self.use_btc_eth_table:
+            snapshot_data["asset_type"] = asset_type
+            snapshot_data["market_start_date"] = market_start_date
+            snapshot_data["market_end_date"] = market_end_date
+            snapshot_data["time_remaining_seconds"] = time_remaining_seconds
+        
+        # Add fields for btc_15_min_table and btc_1_hour_table
+        if self.use_btc_15_min_table or self.use_btc_1_hour_table:
+            snapshot_data["market_start_date"] = market_start_date
+            snapshot_data["market_end_date"] = market_end_date
+            snapshot_data["time_remaining_seconds"] = time_remaining_seconds
+            # Calculate time since start
+            time_since_start_seconds = None
+            if market_start_date:
+                if market_start_date.tzinfo is None:
+                    market_start_date = market_start_date.replace(tzinfo=timezone.utc)
+                if current_timestamp.tzinfo is None:
+                    current_timestamp = current_timestamp.replace(tzinfo=timezone.utc)
+                time_delta = current_timestamp - market_start_date
+                time_since_start_seconds = time_delta.total_seconds()
+            snapshot_data["time_since_start_seconds"] = time_since_start_seconds
+            snapshot_data.update(microstructure_features(sorted_bids, sorted_asks, presorted=True))
+        
+        # Only pass columns this table actually has (the base and per-market tables
+        # have no price columns)
+        snapshot_data = {key: value for key, value in snapshot_data.items() if key in table_columns}
+        
+        return SnapshotTable, snapshot_data
+    
+    def _write_side_tables(self, session: Session, rows: list):
+        """
+        Write latest_orderbook and orderbook_routes for flushed snapshot rows in the same transaction.
+        
+        Returns:
+            Callback to run after the commit (updates the in-memory mirror and route cache)
+        """
+        latest = latest_values(rows) if self.latest_table else []
+        upsert_latest(session, latest)
+        
+        routes = {}
+        for row in rows:
+            key = (row.token_id, snapshot_table_name(row.__table__.name))
+            if key not in self._known_routes and key not in routes:
+                routes[key] = {
+                    "token_id": key[0],
+                    "source_table": key[1],
+                    "market_id": row.market_id,
+                    "first_seen": _naive_utc(row.timestamp),
+                }
+        insert_routes(session, list(routes.values()))
+        
+        def after_commit():
+            self.latest_books.apply(latest)
+            self._known_routes.update(routes)
+        return after_commit
+    
+    def _ensure_market_dimension(
+        self,
+        market_id: str,
+        token_id: str,
+        market_question: Optional[str] = None,
+        outcome: Optional[str] = None,
+        asset_type: Optional[str] = None,
+        market_start_date: Optional[datetime] = None,
+        market_end_date: Optional[datetime] = None,
+    ):
+        """Upsert the orderbook_markets row for a market, only when something new is known."""
+        with self._market_dimension_lock:
+            known = self._market_dimensions.get(market_id)
+            if known is None:
+                known = {"token_outcomes": {}}
+            updated = dict(known, token_outcomes=dict(known["token_outcomes"]))
+            for key, value in (
+                ("market_question", market_question),
+                ("asset_type", asset_type),
+                ("market_start_date", market_start_date),
+                ("market_end_date", market_end_date),
+            ):
+                if value is not None:
+                    updated[key] = value
+            if outcome is not None:
+                updated["token_outcomes"][token_id] = outcome
+            if market_id in self._market_dimensions and updated == known:
+                return
             
-            # Create table in database (checkfirst=True means it won't error if exists)
-            # Use bind=self.engine to ensure it's created synchronously
+            session = self.get_session()
             try:
-                # First check if table already exists
-                from sqlalchemy import inspect
-                inspector = inspect(self.engine)
-                if table_name in inspector.get_table_names():
-                    # Table exists, skip creation
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.debug(f"Table {table_name} already exists in database")
+                row = session.get(OrderbookMarket, market_id)
+                if row is None:
+                    row = OrderbookMarket(market_id=market_id)
+                    session.add(row)
                 else:
-                    # Create table - SQLAlchemy will handle indexes
-                    market_table.__table__.create(bind=self.engine, checkfirst=True)
+                    # Merge with what another process may already have recorded
+                    updated["token_outcomes"] = {**(row.token_outcomes or {}), **updated["token_outcomes"]}
+                for key, value in updated.items():
+                    if key == "token_outcomes" or value is not None:
+                        setattr(row, key, value)
+                row.updated_at = datetime.now(timezone.utc)
+                session.commit()
+                self._market_dimensions[market_id] = updated
             except Exception as e:
-                # Handle different types of errors
+                session.rollback()
                 import logging
-                logger = logging.getLogger(__name__)
-                error_str = str(e).lower()
-                
-                # If it's a duplicate index/table error, that's okay - table exists
-                if "duplicate" in error_str or "already exists" in error_str:
-                    # Table/index exists, that's fine
-                    logger.debug(f"Table {table_name} or indexes already exist: {error_str[:100]}")
-                else:
-                    # Check if table exists in DB before re-raising
-                    from sqlalchemy import inspect
-                    inspector = inspect(self.engine)
-                    if table_name in inspector.get_table_names():
-                        # Table exists in DB, just cache the class
-                        logger.debug(f"Table {table_name} exists in database despite error")
-                    else:
-                        # Re-raise if it's a different error
-                        logger.error(f"Error creating table {table_name}: {e}")
-                        raise
-            
-            # Cache the table class
-            self._table_class_cache[table_name] = market_table
-            self._created_tables.add(table_name)
-            
-            return market_table
-        except Exception as e:
-            # If table already exists in metadata, try to find it
-            if "already defined" in str(e) or "already exists" in str(e).lower():
-                # Look for existing table in registry
-                for mapper in Base.registry.mappers:
-                    if hasattr(mapper.class_, '__tablename__') and mapper.class_.__tablename__ == table_name:
-                        self._table_class_cache[table_name] = mapper.class_
-                        self._created_tables.add(table_name)
-                        return mapper.class_
-            raise
+                logging.getLogger(__name__).warning(f"Could not update market dimension for {market_id}: {e}")
+            finally:
+                session.close()
+    
+    def get_market_dimensions(self, market_ids: List[str]) -> Dict[str, OrderbookMarket]:
+        """Load orderbook_markets rows for the given market IDs."""
+        market_ids = [m for m in set(market_ids) if m]
+        if not market_ids or not self._market_table_available():
+            return {}
+        session = self.get_session()
+        try:
+            rows = session.query(OrderbookMarket).filter(OrderbookMarket.market_id.in_(market_ids)).all()
+            return {row.market_id: row for row in rows}
+        finally:
+            session.close()
+    
+    def _market_table_available(self) -> bool:
+        """Whether orderbook_markets exists (checked once for databases opened read-only)."""
+        if self._has_market_table is None:
+            from sqlalchemy import inspect
+            self._has_market_table = inspect(self.engine).has_table(OrderbookMarket.__tablename__)
+        return self._has_market_table
+    
+    def attach_market_fields(self, snapshots: List[Any]) -> List[Any]:
+        """Fill market_question/outcome on snapshots stored without them (normalized layout)."""
+        missing = [s for s in snapshots if s.market_id and s.market_question is None]
+        if not missing:
+            return snapshots
+        dimensions = self.get_market_dimensions([s.market_id for s in missing])
+        for snapshot in missing:
+            dimension = dimensions.get(snapshot.market_id)
+            if dimension is None:
+                continue
+            snapshot.market_question = dimension.market_question
+            if snapshot.outcome is None:
+                snapshot.outcome = (dimension.token_outcomes or {}).get(snapshot.token_id)
+        return snapshots
     
     def save_snapshot(
         self,
@@ -576,13 +1721,11 @@ class OrderbookDatabase:
         market_start_date: Optional[datetime] = None,
         market_end_date: Optional[datetime] = None,
         asset_type: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
     ) -> OrderbookSnapshot:
         """
         Save an orderbook snapshot to the database (synchronous).
-        For async version, use save_snapshot_async().
-        """
-        """
-        Save an orderbook snapshot to the database.
+        For async version, use save_snapshot_async(); for many rows, save_snapshots().
         
         Args:
             token_id: The CLOB token ID
@@ -592,190 +1735,49 @@ class OrderbookDatabase:
             market_question: Optional market question text
             outcome: Optional outcome name
             metadata: Optional additional metadata
+            timestamp: Optional snapshot time (default: now)
             
         Returns:
             The created OrderbookSnapshot object
         """
+        if self._writer is not None:
+            return self._writer.submit(self, [dict(
+                token_id=token_id,
+                bids=bids,
+                asks=asks,
+                market_id=market_id,
+                market_question=market_question,
+                outcome=outcome,
+                metadata=metadata,
+                market_start_date=market_start_date,
+                market_end_date=market_end_date,
+                asset_type=asset_type,
+                timestamp=timestamp,
+            )]).result()[0]
         session = self.get_session()
         try:
-            # Determine asset type (for btc_eth_table)
-            asset_type = None
-            if market_question:
-                question_lower = market_question.lower()
-                if "bitcoin" in question_lower or "btc" in question_lower:
-                    asset_type = "BTC"
-                elif "ethereum" in question_lower or "eth" in question_lower:
-                    asset_type = "ETH"
-            
-            # Use btc_15_min_table if enabled (for proactive BTC 15-min logging)
-            if self.use_btc_15_min_table:
-                SnapshotTable = BTC15MinOrderbookSnapshot
-            # Use btc_1_hour_table if enabled (for proactive BTC 1-hour logging)
-            elif self.use_btc_1_hour_table:
-                SnapshotTable = BTC1HourOrderbookSnapshot
-            # Use btc_eth_table if enabled (simpler, no dynamic table creation)
-            elif self.use_btc_eth_table:
-                SnapshotTable = BTCEthOrderbookSnapshot
-            else:
-                # Get appropriate table (base or market-specific)
-                # This ensures table exists before we try to insert
-                SnapshotTable = self._get_table_for_market(market_id)
-            
-            # CRITICAL: Ensure table exists in database before inserting
-            # This is especially important for per-market tables that might be created concurrently
-            if self.per_market_tables and market_id and not self.use_btc_eth_table:
-                table_name = f"orderbook_snapshots_market_{market_id}"
-                from sqlalchemy import inspect
-                import logging
-                logger = logging.getLogger(__name__)
-                
-                # Get or create a lock for this specific table (prevents concurrent creation)
-                with _table_creation_lock:
-                    if table_name not in _table_creation_locks:
-                        _table_creation_locks[table_name] = threading.Lock()
-                    table_lock = _table_creation_locks[table_name]
-                
-                # Use table-specific lock to prevent concurrent creation attempts
-                with table_lock:
-                    inspector = inspect(self.engine)
-                    
-                    # Always verify table exists before inserting (handles race conditions)
-                    if table_name not in inspector.get_table_names():
-                        # Table doesn't exist - create it now synchronously
-                        logger.warning(f"Table {table_name} does not exist, creating it now...")
-                        try:
-                            # Create table using engine.begin() for atomic transaction
-                            with self.engine.begin() as conn:
-                                SnapshotTable.__table__.create(bind=conn, checkfirst=True)
-                            
-                            # Verify it was created (refresh inspector)
-                            inspector = inspect(self.engine)
-                            if table_name not in inspector.get_table_names():
-                                # Double-check - maybe it was created by another process
-                                import time
-                                time.sleep(0.1)  # Brief wait for DB to sync
-                                inspector = inspect(self.engine)
-                                if table_name not in inspector.get_table_names():
-                                    raise Exception(f"Failed to create table {table_name} - table still does not exist after creation")
-                            logger.info(f"✓ Created table {table_name}")
-                        except Exception as e:
-                            error_str = str(e).lower()
-                            
-                            # Check if table exists now (might have been created by another process)
-                            inspector = inspect(self.engine)
-                            if table_name in inspector.get_table_names():
-                                # Table exists now, that's fine
-                                logger.debug(f"Table {table_name} exists (created by another process)")
-                            elif "duplicate" in error_str or "already exists" in error_str:
-                                # Table/index exists, that's fine
-                                logger.debug(f"Table {table_name} or indexes already exist")
-                            else:
-                                # Real error - re-raise
-                                logger.error(f"Failed to create table {table_name}: {e}")
-                                raise
-                    else:
-                        # Table exists, proceed
-                        logger.debug(f"Table {table_name} exists, proceeding with insert")
-            
-            # Calculate best bid/ask
-            best_bid_price = bids[0][0] if bids else None
-            best_bid_size = bids[0][1] if bids else None
-            best_ask_price = asks[0][0] if asks else None
-            best_ask_size = asks[0][1] if asks else None
-            
-            # Calculate spread
-            spread = None
-            spread_bps = None
-            if best_bid_price and best_ask_price:
-                spread = best_ask_price - best_bid_price
-                mid_price = (best_bid_price + best_ask_price) / 2
-                if mid_price > 0:
-                    spread_bps = (spread / mid_price) * 10000
-            
-            # Get current timestamp (timezone-aware UTC)
-            current_timestamp = datetime.now(timezone.utc)
-            
-            # Calculate time remaining if end_date is provided
-            time_remaining_seconds = None
-            if market_end_date:
-                # Ensure both are timezone-aware for subtraction
-                if market_end_date.tzinfo is None:
-                    # If naive, assume UTC
-                    market_end_date = market_end_date.replace(tzinfo=timezone.utc)
-                if current_timestamp.tzinfo is None:
-                    current_timestamp = current_timestamp.replace(tzinfo=timezone.utc)
-                
-                time_delta = market_end_date - current_timestamp
-                time_remaining_seconds = time_delta.total_seconds()
-            
-            # Extract realistic prices from metadata (if available)
-            outcome_price = None
-            last_trade_price = None
-            market_price = None
-            if metadata:
-                outcome_price = metadata.get("outcome_price")
-                last_trade_price = metadata.get("last_trade_price")
-                market_price = metadata.get("market_price")
-            
-            # Ensure realistic prices are in metadata for JSON storage
-            if metadata is None:
-                metadata = {}
-            if outcome_price is not None:
-                metadata["outcome_price"] = outcome_price
-            if last_trade_price is not None:
-                metadata["last_trade_price"] = last_trade_price
-            if market_price is not None:
-                metadata["market_price"] = market_price
-            
-            # Create snapshot with appropriate fields
-            snapshot_data = {
-                "token_id": token_id,
-                "market_id": market_id,
-                "timestamp": current_timestamp,
-                "best_bid_price": best_bid_price,
-                "best_bid_size": best_bid_size,
-                "best_ask_price": best_ask_price,
-                "best_ask_size": best_ask_size,
-                # Realistic prices (dedicated columns for easy querying)
-                "outcome_price": outcome_price,
-                "last_trade_price": last_trade_price,
-                "market_price": market_price,
-                "spread": spread,
-                "spread_bps": spread_bps,
-                "bids": bids,
-                "asks": asks,
-                "market_question": market_question,
-                "outcome": outcome,
-                "extra_metadata": metadata,
-            }
-            
-            # Add fields for btc_eth_table
-            if self.use_btc_eth_table:
-                snapshot_data["asset_type"] = asset_type
-                snapshot_data["market_start_date"] = market_start_date
-                snapshot_data["market_end_date"] = market_end_date
-                snapshot_data["time_remaining_seconds"] = time_remaining_seconds
-            
-            # Add fields for btc_15_min_table and btc_1_hour_table
-            if self.use_btc_15_min_table or self.use_btc_1_hour_table:
-                snapshot_data["market_start_date"] = market_start_date
-                snapshot_data["market_end_date"] = market_end_date
-                snapshot_data["time_remaining_seconds"] = time_remaining_seconds
-                # Calculate time since start
-                time_since_start_seconds = None
-                if market_start_date:
-                    if market_start_date.tzinfo is None:
-                        market_start_date = market_start_date.replace(tzinfo=timezone.utc)
-                    if current_timestamp.tzinfo is None:
-                        current_timestamp = current_timestamp.replace(tzinfo=timezone.utc)
-                    time_delta = current_timestamp - market_start_date
-                    time_since_start_seconds = time_delta.total_seconds()
-                snapshot_data["time_since_start_seconds"] = time_since_start_seconds
-            
+            started = time.perf_counter()
+            SnapshotTable, snapshot_data = self._prepare_snapshot(
+                token_id=token_id,
+                bids=bids,
+                asks=asks,
+                market_id=market_id,
+                market_question=market_question,
+                outcome=outcome,
+                metadata=metadata,
+                market_start_date=market_start_date,
+                market_end_date=market_end_date,
+                asset_type=asset_type,
+                timestamp=timestamp,
+            )
             snapshot = SnapshotTable(**snapshot_data)
             
             session.add(snapshot)
+            session.flush()
+            after_commit = self._write_side_tables(session, [snapshot])
             session.commit()
+            after_commit()
+            self._record_write(SnapshotTable, 1, started)
             session.refresh(snapshot)
             return snapshot
         except Exception as e:
@@ -784,6 +1786,66 @@ class OrderbookDatabase:
         finally:
             session.close()
     
+    def save_snapshots(self, snapshots: List[Dict[str, Any]]) -> List[int]:
+        """
+        Save many orderbook snapshots in a single transaction.
+        
+        Args:
+            snapshots: List of dicts with save_snapshot() keyword arguments. A dict may also
+                       carry "raw_payload" (sampled raw message), which is written to
+                       orderbook_raw_samples in the same transaction.
+            
+        Returns:
+            Database IDs of the created rows, in input order
+        """
+        if not snapshots:
+            return []
+        if self._writer is not None:
+            # Grouped with other pending writes on the shared writer thread
+            return [row.id for row in self._writer.submit(self, snapshots).result()]
+        session = self.get_session()
+        try:
+            started = time.perf_counter()
+            rows, raw_samples = self._build_rows(snapshots)
+            session.add_all(rows)
+            session.add_all(raw_samples)
+            session.flush()
+            ids = [row.id for row in rows]
+            after_commit = self._write_side_tables(session, rows)
+            session.commit()
+            after_commit()
+            self._record_write(type(rows[0]), len(rows), started)
+            return ids
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def _build_rows(self, snapshots: List[Dict[str, Any]]):
+        """
+        Build snapshot rows (and sampled raw payload rows) from save_snapshot() kwargs.
+        
+        Returns:
+            Tuple of (snapshot rows, OrderbookRawSample rows)
+        """
+        rows = []
+        raw_samples = []
+        for kwargs in snapshots:
+            kwargs = dict(kwargs)
+            raw_payload = kwargs.pop("raw_payload", None)
+            SnapshotTable, snapshot_data = self._prepare_snapshot(**kwargs)
+            rows.append(SnapshotTable(**snapshot_data))
+            if raw_payload is not None:
+                raw_samples.append(OrderbookRawSample(
+                    token_id=kwargs["token_id"],
+                    market_id=kwargs.get("market_id"),
+                    timestamp=snapshot_data["timestamp"],
+                    source=(kwargs.get("metadata") or {}).get("source"),
+                    payload=raw_payload,
+                ))
+        return rows, raw_samples
+    
     async def save_snapshot_async(
         self,
         token_id: str,
@@ -853,9 +1915,11 @@ class OrderbookDatabase:
             # If using btc_eth_table, use that model
             elif self.use_btc_eth_table:
                 model_class = BTCEthOrderbookSnapshot
-            # If per-market tables enabled, use market-specific table
+            # If per-market tables enabled, use market-specific table (if it exists yet)
             elif self.per_market_tables and market_id:
-                model_class = self._get_table_for_market(market_id)
+                model_class = market_tables.lookup(self.engine, market_id)
+                if model_class is None:
+                    return []
             else:
                 model_class = OrderbookSnapshot
             
@@ -873,9 +1937,10 @@ class OrderbookDatabase:
             query = query.order_by(model_class.timestamp.desc())
             query = query.limit(limit)
             
-            return query.all()
+            snapshots = query.all()
         finally:
             session.close()
+        return self.attach_market_fields(snapshots)
     
     def get_latest_snapshot(
         self,
@@ -886,40 +1951,317 @@ class OrderbookDatabase:
         snapshots = self.get_snapshots(token_id=token_id, market_id=market_id, limit=1)
         return snapshots[0] if snapshots else None
     
+    def get_latest_book(
+        self,
+        token_id: Optional[str] = None,
+        market_id: Optional[str] = None,
+    ):
+        """
+        Current book for a token or market without scanning history.
+        
+        Served from latest_orderbook when the database has it (a LatestOrderbook row with the
+        same top-of-book/bids/asks attributes as a snapshot); falls back to
+        get_latest_snapshot() otherwise.
+        
+        Returns:
+            LatestOrderbook row, history snapshot row, or None
+        """
+        if (token_id or market_id) and self._latest_table_available():
+            session = self.get_session()
+            try:
+                if token_id:
+                    latest = session.get(LatestOrderbook, token_id)
+                    if latest is not None and market_id and latest.market_id != market_id:
+                        latest = None
+                else:
+                    latest = (
+                        session.query(LatestOrderbook)
+                        .filter(LatestOrderbook.market_id == market_id)
+                        .order_by(LatestOrderbook.timestamp.desc())
+                        .first()
+                    )
+            finally:
+                session.close()
+            if latest is not None:
+                return latest
+        return self.get_latest_snapshot(token_id=token_id, market_id=market_id)
+    
+    def _latest_table_available(self) -> bool:
+        """Whether latest_orderbook exists (checked once for databases opened read-only)."""
+        if self._has_latest_table is None:
+            from sqlalchemy import inspect
+            self._has_latest_table = inspect(self.engine).has_table(LatestOrderbook.__tablename__)
+        return self._has_latest_table
+    
+    def get_latest_books(
+        self,
+        market_id: Optional[str] = None,
+        max_age_seconds: Optional[float] = None,
+        refresh: bool = True,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Current books for all tokens from the in-memory latest_orderbook mirror.
+        
+        Args:
+            market_id: Only this market's tokens
+            max_age_seconds: Only books written within this many seconds (drop stale tokens)
+            refresh: Pull rows written by other processes first (incremental after the first call)
+            
+        Returns:
+            Dictionary of token_id -> latest_orderbook row dict
+        """
+        if refresh and self._latest_table_available():
+            self.latest_books.refresh(self.engine)
+        books = self.latest_books.books(market_id)
+        if max_age_seconds is not None:
+            stale = self.latest_books.stale(max_age_seconds)
+            books = {token_id: book for token_id, book in books.items() if token_id not in stale}
+        return books
+    
+    def get_snapshots_asof(
+        self,
+        probes: List[tuple],
+        tolerance_seconds: Optional[float] = None,
+        columns: Optional[List[str]] = None,
+        market_id: Optional[str] = None,
+        method: str = "seek",
+        chunk_size: int = 250,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Last snapshot at or before each (token_id, timestamp) probe, in one pass.
+        
+        Args:
+            probes: List of (token_id, timestamp) tuples (naive timestamps are UTC)
+            tolerance_seconds: Ignore snapshots older than this before the probe time
+            columns: Columns to return (default: every column of the snapshot table)
+            market_id: Market whose per-market table to read (per_market_tables only)
+            method: "seek" (default; index seek per probe, best for sparse probes) or "merge"
+                    (range scan per token, best for many probes per token)
+            chunk_size: Probes per UNION ALL query for "seek" (SQLite allows 500 compound selects)
+            
+        Returns:
+            One row dict (or None if no snapshot matched) per probe, in probe order
+        """
+        from sqlalchemy import select
+        
+        if method not in ASOF_METHODS:
+            raise ValueError(f"method must be one of {ASOF_METHODS}, got {method!r}")
+        model = self._snapshot_model(market_id)
+        if model is None:
+            return [None] * len(probes)
+        table = model.__table__
+        columns = columns or list(table.columns.keys())
+        unknown = [name for name in columns if name not in table.c]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table.name}: {', '.join(unknown)}")
+        probes = [(token_id, _naive_utc(timestamp)) for token_id, timestamp in probes]
+        tolerance = timedelta(seconds=tolerance_seconds) if tolerance_seconds is not None else None
+        
+        with self.engine.connect() as conn:
+            if method == "seek":
+                snapshot_ids = self._asof_seek(conn, table, probes, tolerance, chunk_size)
+            else:
+                snapshot_ids = self._asof_merge(conn, table, probes, tolerance)
+            
+            rows: Dict[int, Dict[str, Any]] = {}
+            wanted = sorted({snapshot_id for snapshot_id in snapshot_ids if snapshot_id is not None})
+            for start in range(0, len(wanted), 500):
+                query = select(table.c.id.label("_asof_id"), *[table.c[name] for name in columns]).where(
+                    table.c.id.in_(wanted[start:start + 500])
+                )
+                for row in conn.execute(query).mappings():
+                    row = dict(row)
+                    rows[row.pop("_asof_id")] = row
+        return [rows.get(snapshot_id) if snapshot_id is not None else None for snapshot_id in snapshot_ids]
+    
+    @staticmethod
+    def _asof_seek(conn, table, probes: List[tuple], tolerance: Optional[timedelta], chunk_size: int) -> List[Optional[int]]:
+        """Snapshot id per probe via a correlated ORDER BY timestamp DESC LIMIT 1 seek each."""
+        from sqlalchemy import bindparam, literal_column, select, union_all
+        
+        statements: Dict[int, Any] = {}
+        
+        def statement(size: int):
+            # Same statement (and compiled SQL) for every full chunk; only the parameters change
+            if size not in statements:
+                selects = []
+                for position in range(size):
+                    seek = select(table.c.id).where(
+                        table.c.token_id == bindparam(f"token_{position}"),
+                        table.c.timestamp <= bindparam(f"at_{position}"),
+                    )
+                    if tolerance is not None:
+                        seek = seek.where(table.c.timestamp >= bindparam(f"from_{position}"))
+                    seek = seek.order_by(table.c.timestamp.desc()).limit(1).scalar_subquery()
+                    selects.append(select(literal_column(str(position)).label("probe"), seek.label("snapshot_id")))
+                statements[size] = union_all(*selects) if size > 1 else selects[0]
+            return statements[size]
+        
+        snapshot_ids: List[Optional[int]] = [None] * len(probes)
+        for start in range(0, len(probes), chunk_size):
+            chunk = probes[start:start + chunk_size]
+            params: Dict[str, Any] = {}
+            for position, (token_id, timestamp) in enumerate(chunk):
+                params[f"token_{position}"] = token_id
+                params[f"at_{position}"] = timestamp
+                if tolerance is not None:
+                    params[f"from_{position}"] = timestamp - tolerance
+            for position, snapshot_id in conn.execute(statement(len(chunk)), params):
+                snapshot_ids[start + position] = snapshot_id
+        return snapshot_ids
+    
+    @staticmethod
+    def _asof_merge(conn, table, probes: List[tuple], tolerance: Optional[timedelta]) -> List[Optional[int]]:
+        """Snapshot id per probe from one (id, timestamp) range scan per token."""
+        from bisect import bisect_right
+        from sqlalchemy import select
+        
+        by_token: Dict[str, List[int]] = {}
+        for index, (token_id, _) in enumerate(probes):
+            by_token.setdefault(token_id, []).append(index)
+        
+        snapshot_ids: List[Optional[int]] = [None] * len(probes)
+        for token_id, indexes in by_token.items():
+            first = min(probes[index][1] for index in indexes)
+            last = max(probes[index][1] for index in indexes)
+            # Start the scan at the snapshot the earliest probe resolves to, not at the token's first row
+            start = conn.execute(
+                select(table.c.timestamp)
+                .where(table.c.token_id == token_id, table.c.timestamp <= first)
+                .order_by(table.c.timestamp.desc())
+                .limit(1)
+            ).scalar()
+            query = select(table.c.id, table.c.timestamp).where(table.c.token_id == token_id, table.c.timestamp <= last)
+            if start is not None:
+                query = query.where(table.c.timestamp >= start)
+            rows = conn.execute(query.order_by(table.c.timestamp)).fetchall()
+            times = [row.timestamp for row in rows]
+            for index in indexes:
+                timestamp = probes[index][1]
+                position = bisect_right(times, timestamp) - 1
+                if position >= 0 and (tolerance is None or times[position] >= timestamp - tolerance):
+                    snapshot_ids[index] = rows[position].id
+        return snapshot_ids
+    
+    def _snapshot_model(self, market_id: Optional[str] = None):
+        """
+        Model class that get_snapshots() would read for these flags.
+        
+        Read path only: a per-market table is looked up, never created, so this returns
+        None for a market that has no table yet.
+        """
+        if self.use_btc_15_min_table:
+            return BTC15MinOrderbookSnapshot
+        if self.use_btc_1_hour_table:
+            return BTC1HourOrderbookSnapshot
+        if self.use_btc_eth_table:
+            return BTCEthOrderbookSnapshot
+        if self.per_market_tables and market_id:
+            return market_tables.lookup(self.engine, market_id)
+        return OrderbookSnapshot
+    
+    def _statistics_columns(self, model) -> list:
+        """Aggregate select list shared by the overall, per-outcome and per-bucket statistics."""
+        from sqlalchemy import func
+        columns = [
+            func.count().label("count"),
+            func.min(model.spread).label("min_spread"),
+            func.max(model.spread).label("max_spread"),
+            func.avg(model.spread).label("avg_spread"),
+            func.min(model.spread_bps).label("min_spread_bps"),
+            func.max(model.spread_bps).label("max_spread_bps"),
+            func.avg(model.spread_bps).label("avg_spread_bps"),
+            func.avg((model.best_bid_price + model.best_ask_price) / 2).label("avg_mid_price"),
+            func.min(model.timestamp).label("first_timestamp"),
+            func.max(model.timestamp).label("last_timestamp"),
+        ]
+        if self.engine.dialect.name == "postgresql":
+            # Exact ordered-set percentiles (SQLite has no built-in equivalent)
+            for pct in (50, 90, 99):
+                columns.append(func.percentile_cont(pct / 100).within_group(model.spread).label(f"p{pct}_spread"))
+        return columns
+    
     def get_market_statistics(
         self,
-        token_id: str,
+        token_id: Optional[str] = None,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
+        market_id: Optional[str] = None,
+        by_outcome: bool = False,
+        bucket_seconds: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
-        Calculate statistics for a market over a time period.
+        Calculate statistics for a token or market over a time period.
         
+        Aggregated in the database (exact, no row cap): count, min/max/avg spread and
+        spread_bps, avg mid price, first/last timestamp, plus p50/p90/p99 spread on PostgreSQL.
+        
+        Args:
+            token_id: Token to summarize
+            start_time: Start of time range
+            end_time: End of time range
+            market_id: Market to summarize (all of its tokens) instead of / in addition to token_id
+            by_outcome: Add "by_outcome": {outcome: statistics} (one entry per token)
+            bucket_seconds: Add "buckets": per-time-bucket statistics, oldest first
+            
         Returns:
-            Dictionary with statistics like min/max spread, avg spread, etc.
+            Dictionary with statistics like min/max spread, avg spread, etc. (empty if no rows)
         """
-        snapshots = self.get_snapshots(
-            token_id=token_id,
-            start_time=start_time,
-            end_time=end_time,
-            limit=100000,  # Large limit for statistics
-        )
+        from sqlalchemy import BigInteger, cast, func, select
         
-        if not snapshots:
+        model = self._snapshot_model(market_id)
+        if model is None:
             return {}
+        conditions = []
+        if token_id:
+            conditions.append(model.token_id == token_id)
+        if market_id and not model.__tablename__.startswith(MARKET_TABLE_PREFIX):
+            conditions.append(model.market_id == market_id)
+        if start_time:
+            conditions.append(model.timestamp >= start_time)
+        if end_time:
+            conditions.append(model.timestamp <= end_time)
+        columns = self._statistics_columns(model)
         
-        spreads = [s.spread for s in snapshots if s.spread is not None]
-        spread_bps = [s.spread_bps for s in snapshots if s.spread_bps is not None]
-        
-        return {
-            "count": len(snapshots),
-            "min_spread": min(spreads) if spreads else None,
-            "max_spread": max(spreads) if spreads else None,
-            "avg_spread": sum(spreads) / len(spreads) if spreads else None,
-            "min_spread_bps": min(spread_bps) if spread_bps else None,
-            "max_spread_bps": max(spread_bps) if spread_bps else None,
-            "avg_spread_bps": sum(spread_bps) / len(spread_bps) if spread_bps else None,
-            "first_timestamp": snapshots[-1].timestamp,
-            "last_timestamp": snapshots[0].timestamp,
-        }
+        with self.engine.connect() as conn:
+            stats = dict(conn.execute(select(*columns).where(*conditions)).mappings().one())
+            if not stats["count"]:
+                return {}
+            
+            if by_outcome:
+                rows = conn.execute(
+                    select(model.token_id, func.max(model.market_id).label("market_id"),
+                           func.max(model.outcome).label("outcome"), *columns)
+                    .where(*conditions)
+                    .group_by(model.token_id)
+                ).mappings().all()
+                # Outcome text is usually in the market dimension table rather than on the rows
+                dimensions = self.get_market_dimensions(list({row["market_id"] for row in rows if row["market_id"]}))
+                stats["by_outcome"] = {}
+                for row in rows:
+                    row = dict(row)
+                    dimension = dimensions.get(row["market_id"])
+                    outcome = row.pop("outcome") or (
+                        (dimension.token_outcomes or {}).get(row["token_id"]) if dimension is not None else None
+                    )
+                    row.pop("market_id")
+                    stats["by_outcome"][outcome or row["token_id"]] = row
+            
+            if bucket_seconds:
+                # Integer epoch seconds, then integer division (SQLite has no floor() unless
+                # built with math functions)
+                if self.engine.dialect.name == "postgresql":
+                    epoch = cast(func.floor(func.extract("epoch", model.timestamp)), BigInteger)
+                else:
+                    epoch = cast(func.strftime("%s", model.timestamp), Integer)
+                bucket = (epoch // int(bucket_seconds) * int(bucket_seconds)).label("bucket_epoch")
+                rows = conn.execute(
+                    select(bucket, *columns).where(*conditions).group_by(bucket).order_by(bucket)
+                ).mappings().all()
+                stats["buckets"] = [
+                    {"bucket_start": datetime.fromtimestamp(int(row["bucket_epoch"]), tz=timezone.utc),
+                     **{key: value for key, value in row.items() if key != "bucket_epoch"}}
+                    for row in rows
+                ]
+        return stats
 
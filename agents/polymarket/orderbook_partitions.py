@@ -0,0 +1,520 @@
+"""
+Time-partitioned snapshot storage, rollups and retention for btc_15_min_table / btc_1_hour_table.
+
+Partitioning (OrderbookDatabase(partitioned=True)), one partition per UTC day:
+- PostgreSQL: the snapshot table is a native PARTITION BY RANGE (timestamp) table; inserts go
+  to the parent and the database routes them.
+- SQLite: rows go to per-day tables (<table>_pYYYYMMDD) and <table> becomes a UNION ALL view
+  over them, so existing readers keep querying <table> unchanged. A pre-existing table is kept
+  as <table>_legacy inside the view.
+
+Retention (OrderbookDatabase.apply_retention / scripts/python/apply_snapshot_retention.py):
+day partitions older than N days are first rolled up into orderbook_rollups at 1s/10s/1m
+resolution (mid, spread, top-of-book sizes, depth bands), then dropped with DROP TABLE -
+O(1) instead of a DELETE over millions of rows.
+
+All writers on a partitioned database must use partitioned=True (on SQLite, <table> is a view).
+"""
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, Float, Index, Integer, MetaData, String, Table, inspect, insert, text
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.schema import CreateTable
+
+from agents.polymarket.orderbook_db import Base, INGEST_INDEX_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Rollup resolution name -> bucket width in seconds
+ROLLUP_RESOLUTIONS = {"1s": 1, "10s": 10, "1m": 60}
+# Depth bands: total size within this price distance of mid (prices are 0-1, so 0.01 = 1 cent)
+DEPTH_BANDS = {"1c": 0.01, "5c": 0.05, "10c": 0.10}
+
+# Spaces SQLite partition row ids apart so ids stay unique across the UNION ALL view
+_SQLITE_IDS_PER_DAY = 10 ** 10
+
+
+class OrderbookRollup(Base):
+    """Downsampled top-of-book and depth summary per token and time bucket (survives retention)."""
+    __tablename__ = "orderbook_rollups"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source_table = Column(String, nullable=False)  # e.g. btc_15_min_table
+    token_id = Column(String, nullable=False)
+    market_id = Column(String, nullable=True)
+    resolution = Column(String, nullable=False)  # '1s', '10s', '1m'
+    bucket_start = Column(DateTime, nullable=False)
+    snapshot_count = Column(Integer, nullable=False)
+
+    # Mid price: last value in the bucket plus the range it covered
+    mid = Column(Float, nullable=True)
+    mid_high = Column(Float, nullable=True)
+    mid_low = Column(Float, nullable=True)
+    spread = Column(Float, nullable=True)  # Mean spread over the bucket
+
+    # Top of book at the end of the bucket
+    best_bid_price = Column(Float, nullable=True)
+    best_bid_size = Column(Float, nullable=True)
+    best_ask_price = Column(Float, nullable=True)
+    best_ask_size = Column(Float, nullable=True)
+
+    # Depth bands at the end of the bucket (size within 1/5/10 cents of mid)
+    bid_depth_1c = Column(Float, nullable=True)
+    ask_depth_1c = Column(Float, nullable=True)
+    bid_depth_5c = Column(Float, nullable=True)
+    ask_depth_5c = Column(Float, nullable=True)
+    bid_depth_10c = Column(Float, nullable=True)
+    ask_depth_10c = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index('idx_rollups_source_token_bucket', 'source_table', 'token_id', 'resolution', 'bucket_start'),
+    )
+
+
+class OrderbookPartition(Base):
+    """Catalog of snapshot partitions and their rollup/retention state."""
+    __tablename__ = "orderbook_partitions"
+
+    partition_name = Column(String, primary_key=True)
+    source_table = Column(String, nullable=False, index=True)
+    day = Column(DateTime, nullable=True)  # UTC day start; NULL for a SQLite <table>_legacy
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    rolled_up_at = Column(DateTime, nullable=True)
+    dropped_at = Column(DateTime, nullable=True)
+
+
+def utc_day(timestamp: datetime) -> date:
+    """UTC calendar day of a (naive = UTC, or timezone-aware) timestamp."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.date()
+
+
+def depth_within(levels: Optional[List[List[float]]], reference: float, band: float, bids: bool) -> float:
+    """Total size of levels within `band` of reference (at or above it for bids, at or below for asks)."""
+    if not levels:
+        return 0.0
+    if bids:
+        return sum(level[1] for level in levels if level[0] >= reference - band)
+    return sum(level[1] for level in levels if level[0] <= reference + band)
+
+
+# SQLite day partitions live in their own metadata, so Base.metadata.create_all() never
+# recreates a dropped partition
+_PartitionBase = declarative_base(metadata=MetaData())
+
+# Mapped classes for SQLite day partitions, shared process-wide
+_partition_classes: Dict[str, Any] = {}
+_partition_classes_lock = threading.Lock()
+
+
+def _partition_class(base_class, partition_name: str, include_secondary: bool):
+    """Mapped class for a SQLite day partition (same columns as base_class, own index names)."""
+    with _partition_classes_lock:
+        partition_class = _partition_classes.get(partition_name)
+        if partition_class is not None:
+            return partition_class
+        base_table = base_class.__table__
+        columns = []
+        for column in base_table.columns:
+            column = column._copy()
+            column.index = None  # Indexes are declared explicitly below with partition-specific names
+            columns.append(column)
+        # One index per column set (the base tables declare some twice: index=True plus Index())
+        index_column_sets = {tuple(column.name for column in index.columns) for index in base_table.indexes}
+        indexes = [
+            Index(f"idx_{partition_name}_{'_'.join(index_columns)}", *index_columns)
+            for index_columns in sorted(index_column_sets)
+            if include_secondary or index_columns in INGEST_INDEX_COLUMNS
+        ]
+        table = Table(partition_name, _PartitionBase.metadata, *columns, *indexes, sqlite_autoincrement=True)
+        partition_class = type(f"{base_class.__name__}_{partition_name}", (_PartitionBase,), {"__table__": table})
+        _partition_classes[partition_name] = partition_class
+        return partition_class
+
+
+class SnapshotPartitioner:
+    """Day partitions, rollups and retention for one snapshot table."""
+
+    def __init__(self, engine, base_class, index_profile: Optional[str] = None):
+        """
+        Initialize partitioner.
+
+        Args:
+            engine: SQLAlchemy engine (PostgreSQL or SQLite)
+            base_class: Snapshot model (BTC15MinOrderbookSnapshot or BTC1HourOrderbookSnapshot)
+            index_profile: "ingest" creates only the composite indexes on new partitions
+        """
+        self.engine = engine
+        self.base_class = base_class
+        self.table_name = base_class.__tablename__
+        self.index_profile = index_profile
+        self.dialect = engine.dialect.name
+        # False until setup() succeeds (or if an existing PostgreSQL table couldn't be converted)
+        self.enabled = False
+        self._days: Dict[date, Any] = {}  # day -> class to insert into
+        self._lock = threading.Lock()
+        self._legacy_name = f"{self.table_name}_legacy"
+
+    def partition_name(self, day: date) -> str:
+        return f"{self.table_name}_p{day:%Y%m%d}"
+
+    # ========== Setup ==========
+
+    def setup(self):
+        """Create catalog tables, convert the snapshot table if needed and load known partitions."""
+        OrderbookRollup.__table__.create(self.engine, checkfirst=True)
+        OrderbookPartition.__table__.create(self.engine, checkfirst=True)
+        if self.dialect == "postgresql":
+            self._setup_postgres()
+        elif self.dialect == "sqlite":
+            self._setup_sqlite()
+        else:
+            logger.warning(f"⚠️ Partitioning not supported on {self.dialect}; {self.table_name} stays unpartitioned")
+            return
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT partition_name, day FROM orderbook_partitions "
+                     "WHERE source_table = :table AND dropped_at IS NULL AND day IS NOT NULL"),
+                {"table": self.table_name},
+            ).fetchall()
+        for partition_name, day in rows:
+            if isinstance(day, str):
+                day = datetime.fromisoformat(day)
+            self._days[day.date()] = self._insert_class(partition_name)
+        if self.dialect == "sqlite" and self._add_missing_columns():
+            self._refresh_view()
+        self.table_for(datetime.now(timezone.utc))
+
+    def _setup_postgres(self):
+        with self.engine.connect() as conn:
+            relkind = conn.execute(
+                text("SELECT relkind FROM pg_class WHERE relname = :name AND pg_table_is_visible(oid)"),
+                {"name": self.table_name},
+            ).scalar()
+            has_rows = relkind == "r" and conn.execute(
+                text(f"SELECT EXISTS (SELECT 1 FROM {self.table_name})")
+            ).scalar()
+
+        if relkind == "p":
+            self.enabled = True
+            return
+        if has_rows:
+            logger.warning(f"⚠️ {self.table_name} is an unpartitioned table with data - leaving it as is "
+                           f"(migrate it to a partitioned table manually to enable partitioning)")
+            return
+
+        # Empty or missing (OrderbookDatabase's create_all made a plain table): recreate partitioned.
+        # The partition key has to be part of the primary key.
+        ddl = str(CreateTable(self.base_class.__table__).compile(dialect=self.engine.dialect)).strip()
+        ddl = ddl.replace("PRIMARY KEY (id)", "PRIMARY KEY (id, timestamp)")
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {self.table_name}"))
+            conn.execute(text(f"{ddl} PARTITION BY RANGE (timestamp)"))
+        for index in self._indexes():
+            index.create(self.engine)
+        self.enabled = True
+        logger.info(f"✓ Created {self.table_name} as a daily range-partitioned table")
+
+    def _setup_sqlite(self):
+        with self.engine.connect() as conn:
+            kind = conn.execute(
+                text("SELECT type FROM sqlite_master WHERE name = :name"), {"name": self.table_name}
+            ).scalar()
+            has_rows = kind == "table" and conn.execute(
+                text(f"SELECT EXISTS (SELECT 1 FROM {self.table_name})")
+            ).scalar()
+
+        if kind == "table":
+            with self.engine.begin() as conn:
+                if has_rows:
+                    # Keep existing rows readable through the view
+                    conn.execute(text(f"ALTER TABLE {self.table_name} RENAME TO {self._legacy_name}"))
+                    self._register(conn, self._legacy_name, None)
+                    logger.info(f"✓ Moved existing {self.table_name} rows to {self._legacy_name}")
+                else:
+                    conn.execute(text(f"DROP TABLE {self.table_name}"))
+        self.enabled = True
+
+    def _add_missing_columns(self) -> int:
+        """Bring SQLite day tables created by an older schema up to the base table's columns."""
+        added = 0
+        inspector = inspect(self.engine)
+        for partition in self.partitions():
+            if not inspector.has_table(partition.partition_name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(partition.partition_name)}
+            missing = [column for column in self.base_class.__table__.columns if column.name not in existing]
+            with self.engine.begin() as conn:
+                for column in missing:
+                    conn.execute(text(
+                        f"ALTER TABLE {partition.partition_name} ADD COLUMN {column.name} "
+                        f"{column.type.compile(dialect=self.engine.dialect)}"
+                    ))
+            added += len(missing)
+        if added:
+            logger.info(f"✓ Added {added} column(s) to existing {self.table_name} partitions")
+        return added
+
+    def _indexes(self) -> List[Index]:
+        """Indexes of the base table honouring the index profile."""
+        return [
+            index for index in self.base_class.__table__.indexes
+            if self.index_profile != "ingest"
+            or tuple(column.name for column in index.columns) in INGEST_INDEX_COLUMNS
+        ]
+
+    def _insert_class(self, partition_name: str):
+        if self.dialect == "sqlite":
+            return _partition_class(self.base_class, partition_name, self.index_profile != "ingest")
+        return self.base_class
+
+    def _register(self, conn, partition_name: str, day: Optional[date]):
+        day_start = datetime(day.year, day.month, day.day) if day else None
+        updated = conn.execute(
+            text("UPDATE orderbook_partitions SET dropped_at = NULL, rolled_up_at = NULL, day = :day "
+                 "WHERE partition_name = :name"),
+            {"name": partition_name, "day": day_start},
+        ).rowcount
+        if not updated:
+            conn.execute(insert(OrderbookPartition.__table__).values(
+                partition_name=partition_name,
+                source_table=self.table_name,
+                day=day_start,
+                created_at=datetime.now(timezone.utc),
+            ))
+
+    # ========== Write path ==========
+
+    def table_for(self, timestamp: datetime):
+        """
+        Model class to insert a snapshot taken at `timestamp` into (creates the day partition once).
+
+        Returns:
+            base_class on PostgreSQL (the database routes rows), the day table's class on SQLite
+        """
+        if not self.enabled:
+            return self.base_class
+        day = utc_day(timestamp)
+        table_class = self._days.get(day)
+        if table_class is not None:
+            return table_class
+        with self._lock:
+            table_class = self._days.get(day)
+            if table_class is None:
+                table_class = self._create_partition(day)
+                self._days[day] = table_class
+        return table_class
+
+    def _create_partition(self, day: date):
+        partition_name = self.partition_name(day)
+        started = time.perf_counter()
+        if self.dialect == "postgresql":
+            next_day = day + timedelta(days=1)
+            with self.engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name} PARTITION OF {self.table_name} "
+                    f"FOR VALUES FROM ('{day.isoformat()}') TO ('{next_day.isoformat()}')"
+                ))
+                self._register(conn, partition_name, day)
+        else:
+            table_class = self._insert_class(partition_name)
+            with self.engine.begin() as conn:
+                existed = inspect(conn).has_table(partition_name)
+                table_class.__table__.create(bind=conn, checkfirst=True)
+                if not existed:
+                    # Start this day's ids in their own range so the view never repeats an id
+                    conn.execute(
+                        text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+                        {"name": partition_name, "seq": day.toordinal() * _SQLITE_IDS_PER_DAY},
+                    )
+                self._register(conn, partition_name, day)
+            self._refresh_view()
+        logger.info(f"✓ Created partition {partition_name} ({time.perf_counter() - started:.2f}s)")
+        return self._insert_class(partition_name)
+
+    def _refresh_view(self):
+        """Recreate the SQLite <table> view as UNION ALL over the live partitions."""
+        with self.engine.connect() as conn:
+            names = [row[0] for row in conn.execute(
+                text("SELECT partition_name FROM orderbook_partitions "
+                     "WHERE source_table = :table AND dropped_at IS NULL ORDER BY day"),
+                {"table": self.table_name},
+            )]
+        columns = ", ".join(self.base_class.__table__.columns.keys())
+        select = " UNION ALL ".join(f"SELECT {columns} FROM {name}" for name in names)
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DROP VIEW IF EXISTS {self.table_name}"))
+            if select:
+                conn.execute(text(f"CREATE VIEW {self.table_name} AS {select}"))
+
+    # ========== Rollups and retention ==========
+
+    def partitions(self) -> List[OrderbookPartition]:
+        """Live (not dropped) partitions, oldest first."""
+        from sqlalchemy.orm import Session
+        with Session(self.engine) as session:
+            return session.query(OrderbookPartition).filter(
+                OrderbookPartition.source_table == self.table_name,
+                OrderbookPartition.dropped_at.is_(None),
+            ).order_by(OrderbookPartition.day).all()
+
+    def rollup(self, partition: OrderbookPartition, batch_size: int = 5000) -> int:
+        """
+        Summarize a day partition into orderbook_rollups at every ROLLUP_RESOLUTIONS width.
+
+        Args:
+            partition: Day partition (from partitions())
+            batch_size: Rows fetched / rollups inserted per round trip
+
+        Returns:
+            Number of rollup rows written
+        """
+        day_start = partition.day
+        day_end = day_start + timedelta(days=1)
+        source = self._insert_class(partition.partition_name)
+        started = time.perf_counter()
+
+        with self.engine.begin() as conn:
+            # Re-running a rollup replaces it
+            conn.execute(
+                text("DELETE FROM orderbook_rollups WHERE source_table = :table "
+                     "AND bucket_start >= :start AND bucket_start < :end"),
+                {"table": self.table_name, "start": day_start, "end": day_end},
+            )
+
+        from sqlalchemy.orm import Session
+        written = 0
+        pending: List[Dict[str, Any]] = []
+        # (token_id, resolution) -> open bucket accumulator
+        buckets: Dict[tuple, Dict[str, Any]] = {}
+
+        def flush(force: bool = False):
+            nonlocal written, pending
+            if pending and (force or len(pending) >= batch_size):
+                with self.engine.begin() as conn:
+                    conn.execute(insert(OrderbookRollup.__table__), pending)
+                written += len(pending)
+                pending = []
+
+        with Session(self.engine) as session:
+            rows = session.query(
+                source.token_id, source.market_id, source.timestamp,
+                source.best_bid_price, source.best_bid_size, source.best_ask_price, source.best_ask_size,
+                source.spread, source.bids, source.asks,
+            ).filter(
+                source.timestamp >= day_start, source.timestamp < day_end
+            ).order_by(source.token_id, source.timestamp).yield_per(batch_size)
+
+            for row in rows:
+                epoch = row.timestamp.replace(tzinfo=timezone.utc).timestamp()
+                mid = None
+                if row.best_bid_price is not None and row.best_ask_price is not None:
+                    mid = (row.best_bid_price + row.best_ask_price) / 2
+                for resolution, width in ROLLUP_RESOLUTIONS.items():
+                    bucket_epoch = epoch - epoch % width
+                    key = (row.token_id, resolution)
+                    acc = buckets.get(key)
+                    if acc is not None and acc["epoch"] != bucket_epoch:
+                        pending.append(self._finish_bucket(acc))
+                        acc = None
+                    if acc is None:
+                        acc = buckets[key] = {
+                            "epoch": bucket_epoch, "resolution": resolution, "row": row,
+                            "count": 0, "mid_high": None, "mid_low": None, "spread_sum": 0.0, "spread_n": 0,
+                        }
+                    acc["count"] += 1
+                    acc["row"] = row
+                    if mid is not None:
+                        acc["mid_high"] = mid if acc["mid_high"] is None else max(acc["mid_high"], mid)
+                        acc["mid_low"] = mid if acc["mid_low"] is None else min(acc["mid_low"], mid)
+                    if row.spread is not None:
+                        acc["spread_sum"] += row.spread
+                        acc["spread_n"] += 1
+                flush()
+
+        pending.extend(self._finish_bucket(acc) for acc in buckets.values())
+        flush(force=True)
+
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("UPDATE orderbook_partitions SET rolled_up_at = :now WHERE partition_name = :name"),
+                {"now": datetime.now(timezone.utc), "name": partition.partition_name},
+            )
+        logger.info(f"📊 Rolled up {partition.partition_name}: {written} rollup rows "
+                    f"({time.perf_counter() - started:.1f}s)")
+        return written
+
+    def _finish_bucket(self, acc: Dict[str, Any]) -> Dict[str, Any]:
+        row = acc["row"]  # Last snapshot in the bucket
+        mid = None
+        if row.best_bid_price is not None and row.best_ask_price is not None:
+            mid = (row.best_bid_price + row.best_ask_price) / 2
+        summary = {
+            "source_table": self.table_name,
+            "token_id": row.token_id,
+            "market_id": row.market_id,
+            "resolution": acc["resolution"],
+            "bucket_start": datetime.fromtimestamp(acc["epoch"], tz=timezone.utc).replace(tzinfo=None),
+            "snapshot_count": acc["count"],
+            "mid": mid,
+            "mid_high": acc["mid_high"],
+            "mid_low": acc["mid_low"],
+            "spread": acc["spread_sum"] / acc["spread_n"] if acc["spread_n"] else None,
+            "best_bid_price": row.best_bid_price,
+            "best_bid_size": row.best_bid_size,
+            "best_ask_price": row.best_ask_price,
+            "best_ask_size": row.best_ask_size,
+        }
+        for band_name, band in DEPTH_BANDS.items():
+            summary[f"bid_depth_{band_name}"] = depth_within(row.bids, mid, band, bids=True) if mid is not None else None
+            summary[f"ask_depth_{band_name}"] = depth_within(row.asks, mid, band, bids=False) if mid is not None else None
+        return summary
+
+    def drop_partition(self, partition: OrderbookPartition):
+        """Drop a day partition (DROP TABLE, no row-by-row delete)."""
+        name = partition.partition_name
+        with self.engine.begin() as conn:
+            conn.execute(
+                text("UPDATE orderbook_partitions SET dropped_at = :now WHERE partition_name = :name"),
+                {"now": datetime.now(timezone.utc), "name": name},
+            )
+        if self.dialect == "sqlite":
+            self._refresh_view()  # Take it out of the view before dropping the table
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        with self._lock:
+            if partition.day is not None:
+                self._days.pop(partition.day.date(), None)
+        logger.info(f"➖ Dropped partition {name}")
+
+    def apply_retention(self, retention_days: int, dry_run: bool = False) -> List[str]:
+        """
+        Roll up and drop day partitions older than retention_days (today's partition counts as day 0).
+
+        Args:
+            retention_days: Full-depth days to keep
+            dry_run: Only report which partitions would be dropped
+
+        Returns:
+            Names of dropped (or, with dry_run, droppable) partitions
+        """
+        if not self.enabled:
+            logger.warning(f"⚠️ {self.table_name} is not partitioned - retention skipped")
+            return []
+        cutoff = datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+        expired = [p for p in self.partitions() if p.day is not None and p.day.date() < cutoff]
+        if dry_run:
+            return [p.partition_name for p in expired]
+        dropped = []
+        for partition in expired:
+            if partition.rolled_up_at is None:
+                self.rollup(partition)
+            self.drop_partition(partition)
+            dropped.append(partition.partition_name)
+        return dropped
@@ -1,13 +1,27 @@
 """
 Polling-based orderbook logger as an alternative to WebSocket streaming.
 Useful when WebSocket connections are unreliable or you need more control over polling frequency.
+
+The token set is dynamic: add_tokens()/remove_tokens() change it while poll_loop() runs,
+each token has its own poll schedule, and tokens expire automatically at their
+market_end_date - so rolling 15-minute markets never need a poller restart.
+
+With adaptive=True, a deadline scheduler sets each token's next poll from time to
+resolution (dense in the final minutes, sparse far from close) and recent book change
+rate, and request_budget caps total requests/second across all tokens.
 """
 import asyncio
+import heapq
+import itertools
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+import threading
+import time
+from typing import List, Optional, Dict, Any, Iterable, Set, Tuple
+from datetime import datetime, timedelta, timezone
 import httpx
 from agents.polymarket.orderbook_db import OrderbookDatabase
+from agents.polymarket.orderbook_utils import side_fingerprint
+from agents.utils import json_codec
 
 # Try to import Polymarket, but make it optional
 try:
@@ -33,6 +47,15 @@ class OrderbookPoller:
         poll_interval: float = 1.0,
         market_info: Optional[Dict[str, Dict]] = None,
         track_top_n: int = 20,  # Track top N competitive levels for HFT
+        expiry_grace: float = 30.0,
+        adaptive: bool = False,
+        min_poll_interval: float = 0.25,
+        max_poll_interval: float = 10.0,
+        urgent_window: float = 60.0,
+        ramp_window: float = 1800.0,
+        request_budget: Optional[float] = None,
+        level_change_stats: bool = False,
+        max_concurrent_fetches: int = 16,
     ):
         """
         Initialize the orderbook poller.
@@ -43,35 +66,282 @@ class OrderbookPoller:
             poll_interval: Seconds between polls (default: 1.0)
             market_info: Optional dict mapping token_id to market metadata
             track_top_n: Number of top bid/ask levels to track for change detection (default: 20)
+            expiry_grace: Seconds to keep polling a token after its market_end_date (default: 30.0)
+            adaptive: Set each token's interval from time to resolution and book change rate
+                instead of a fixed poll_interval (default: False)
+            min_poll_interval: Adaptive: fastest interval, used in the final urgent_window (default: 0.25)
+            max_poll_interval: Adaptive: slowest interval, ramp_window+ before close (default: 10.0)
+            urgent_window: Adaptive: seconds before market end polled at min_poll_interval (default: 60.0)
+            ramp_window: Adaptive: seconds over which the interval ramps from min to max (default: 1800.0)
+            request_budget: Max total requests/second across all tokens; intervals are stretched
+                proportionally when the schedule would exceed it (default: unlimited)
+            level_change_stats: Keep the previous top-N levels per token and count which levels
+                changed (see level_change_counts); change detection itself only uses
+                fingerprints (default: False)
+            max_concurrent_fetches: Max orderbook fetches in flight at once; each due token is
+                fetched as its own task, so one slow request doesn't hold back the rest (default: 16)
         """
         self.db = db
-        self.token_ids = token_ids.copy() if isinstance(token_ids, list) else list(token_ids)  # Make mutable copy
+        self.token_ids: List[str] = []
         self.poll_interval = poll_interval
+        self.expiry_grace = expiry_grace
+        self.adaptive = adaptive
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.urgent_window = urgent_window
+        self.ramp_window = ramp_window
+        self.request_budget = request_budget
         self.market_info = market_info or {}
         self.track_top_n = track_top_n  # Track top N levels (0 = save all, no change detection)
         # Only initialize Polymarket if available (requires wallet key)
         self.polymarket = Polymarket() if POLYMARKET_AVAILABLE else None
         self.running = False
-        # Track last orderbooks for change detection (only used if track_top_n > 0)
-        self._last_orderbooks = {} if track_top_n > 0 else {}
+        # Last (bid, ask) side fingerprints per token for change detection (track_top_n > 0)
+        # and the adaptive change rate - 16 bytes of state per token instead of book copies
+        self._last_fingerprints: Dict[str, Tuple[int, int]] = {}
+        # Optional per-level diff statistics (keeps the previous top-N levels)
+        self.level_change_stats = level_change_stats
+        self._last_top_levels: Dict[str, Tuple[list, list]] = {}
+        self.level_change_counts = {"compared": 0, "bid_levels_changed": 0, "ask_levels_changed": 0}
         # Track consecutive failures for ended markets
         self._failed_tokens = {}  # {token_id: failure_count}
         self._max_failures = 3  # Remove token after 3 consecutive 404 failures
+        
+        # Per-token schedules: next poll time (time.monotonic()), interval, market end.
+        # _schedule is a deadline heap; entries whose time no longer matches
+        # _next_poll_at (rescheduled or removed tokens) are skipped lazily.
+        self._next_poll_at: Dict[str, float] = {}
+        self._schedule: List[Tuple[float, int, str]] = []
+        self._schedule_seq = itertools.count()
+        self._token_intervals: Dict[str, float] = {}
+        self._market_end: Dict[str, datetime] = {}
+        
+        # Adaptive scheduling state
+        self._current_interval: Dict[str, float] = {}  # Interval actually scheduled (after budget)
+        self._desired_rate: Dict[str, float] = {}  # 1/desired interval, summed into _demand
+        self._demand = 0.0  # Requests/second the schedule asks for before budget scaling
+        self._change_rate: Dict[str, float] = {}  # EWMA of "book changed since last poll"
+        # Achieved sample rate tracking
+        self._last_polled_at: Dict[str, float] = {}
+        self._poll_gap: Dict[str, float] = {}  # EWMA of seconds between polls
+        self._poll_counts: Dict[str, int] = {}
+        # Set when tokens are added so the loop polls them without waiting out its sleep
+        self._tokens_changed = asyncio.Event()
+        # Reused HTTP client (keep-alive) instead of a new connection per request;
+        # created lazily from fetch worker threads, so creation is locked
+        self._http: Optional[httpx.Client] = None
+        self._http_lock = threading.Lock()
+        # In-flight fetch tasks, bounded by max_concurrent_fetches
+        self.max_concurrent_fetches = max_concurrent_fetches
+        self._poll_tasks: Set[asyncio.Task] = set()
+        
+        self.add_tokens(token_ids)
+    
+    # ========== Dynamic token set ==========
+    
+    @staticmethod
+    def _parse_end_date(value: Any) -> Optional[datetime]:
+        if not value:
+            return None
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                return None
+        if not isinstance(value, datetime):
+            return None
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    
+    def add_tokens(
+        self,
+        token_ids: Iterable[str],
+        market_info: Optional[Dict[str, Dict]] = None,
+        poll_interval: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Start polling tokens on the running loop (no restart needed).
+        
+        Args:
+            token_ids: Token IDs to add (already-polled tokens are ignored)
+            market_info: Optional dict mapping token_id to market metadata; a market_end_date
+                entry makes the token expire automatically
+            poll_interval: Seconds between polls for these tokens (default: poller poll_interval)
+        
+        Returns:
+            Token IDs that were newly added
+        """
+        if market_info:
+            self.market_info.update(market_info)
+        
+        now = time.monotonic()
+        added = []
+        for token_id in token_ids:
+            if token_id in self._next_poll_at:
+                continue
+            self.token_ids.append(token_id)
+            self._token_intervals[token_id] = poll_interval or self.poll_interval
+            end_date = self._parse_end_date(self.market_info.get(token_id, {}).get("market_end_date"))
+            if end_date:
+                self._market_end[token_id] = end_date
+            self._schedule_poll(token_id, now)  # Poll immediately - no gap for new markets
+            added.append(token_id)
+        
+        if added:
+            if self.running:
+                logger.info(f"➕ Added {len(added)} token(s) to poller ({len(self.token_ids)} total)")
+            self._tokens_changed.set()
+        return added
+    
+    def remove_tokens(self, token_ids: Iterable[str]) -> List[str]:
+        """
+        Stop polling tokens.
+        
+        Returns:
+            Token IDs that were removed
+        """
+        removed = [token_id for token_id in token_ids if self._drop_token(token_id)]
+        if removed:
+            logger.info(f"➖ Removed {len(removed)} token(s) from poller ({len(self.token_ids)} remaining)")
+        return removed
+    
+    def _drop_token(self, token_id: str) -> bool:
+        """Remove a token and all its tracking state."""
+        if token_id not in self._next_poll_at:
+            return False
+        self.token_ids.remove(token_id)
+        self._next_poll_at.pop(token_id, None)
+        self._token_intervals.pop(token_id, None)
+        self._market_end.pop(token_id, None)
+        self._demand -= self._desired_rate.pop(token_id, 0.0)
+        for state in (self._current_interval, self._change_rate, self._last_top_levels,
+                      self._last_polled_at, self._poll_gap, self._poll_counts):
+            state.pop(token_id, None)
+        self._failed_tokens.pop(token_id, None)
+        self._last_fingerprints.pop(token_id, None)
+        if hasattr(self, '_save_count'):
+            self._save_count.pop(token_id, None)
+        if hasattr(self, '_first_fetch'):
+            self._first_fetch.discard(token_id)
+        return True
+    
+    def _expire_tokens(self):
+        """Drop tokens whose market ended more than expiry_grace seconds ago."""
+        if not self._market_end:
+            return
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.expiry_grace)
+        expired = [token_id for token_id, end_date in self._market_end.items() if end_date <= cutoff]
+        for token_id in expired:
+            self._drop_token(token_id)
+        if expired:
+            logger.info(f"⏱️ Market ended: stopped polling {len(expired)} expired token(s) ({len(self.token_ids)} remaining)")
+    
+    # ========== Scheduling ==========
+    
+    def _schedule_poll(self, token_id: str, when: float):
+        self._next_poll_at[token_id] = when
+        heapq.heappush(self._schedule, (when, next(self._schedule_seq), token_id))
+    
+    def _pop_due(self, now: float) -> List[str]:
+        """Pop all tokens whose next poll time has passed."""
+        due = []
+        while self._schedule and self._schedule[0][0] <= now:
+            when, _, token_id = heapq.heappop(self._schedule)
+            if self._next_poll_at.get(token_id) == when:
+                due.append(token_id)
+        return due
+    
+    def _next_deadline(self) -> Optional[float]:
+        while self._schedule:
+            when, _, token_id = self._schedule[0]
+            if self._next_poll_at.get(token_id) == when:
+                return when
+            heapq.heappop(self._schedule)  # Stale entry
+        return None
+    
+    def _desired_interval(self, token_id: str) -> float:
+        """Interval from time to resolution and recent change rate (adaptive mode)."""
+        interval = self._token_intervals[token_id]
+        end_date = self._market_end.get(token_id)
+        if end_date:
+            remaining = (end_date - datetime.now(timezone.utc)).total_seconds()
+            if remaining <= self.urgent_window:
+                interval = self.min_poll_interval
+            else:
+                ramp = min(1.0, (remaining - self.urgent_window) / self.ramp_window)
+                interval = self.min_poll_interval + (self.max_poll_interval - self.min_poll_interval) * ramp
+        # Busy books are sampled more densely, quiet ones less (2x at no change, ~0.67x at every poll)
+        change_rate = self._change_rate.get(token_id, 1.0)
+        interval *= 2.0 / (1.0 + 2.0 * change_rate)
+        return min(self.max_poll_interval, max(self.min_poll_interval, interval))
+    
+    def _next_interval(self, token_id: str) -> float:
+        """Interval until the token's next poll, stretched to fit request_budget."""
+        desired = self._desired_interval(token_id) if self.adaptive else self._token_intervals[token_id]
+        rate = 1.0 / desired
+        self._demand += rate - self._desired_rate.get(token_id, 0.0)
+        self._desired_rate[token_id] = rate
+        if self.request_budget and self._demand > self.request_budget:
+            desired *= self._demand / self.request_budget
+        self._current_interval[token_id] = desired
+        return desired
+    
+    def _record_poll(self, token_id: str, started: float):
+        """Track achieved sample rate (EWMA of the gap between polls)."""
+        self._poll_counts[token_id] = self._poll_counts.get(token_id, 0) + 1
+        last = self._last_polled_at.get(token_id)
+        if last is not None:
+            gap = started - last
+            previous = self._poll_gap.get(token_id)
+            self._poll_gap[token_id] = gap if previous is None else 0.8 * previous + 0.2 * gap
+        self._last_polled_at[token_id] = started
+    
+    def _record_change(self, token_id: str, changed: bool):
+        """Update the token's change rate (EWMA) after comparing a fresh book to the last one."""
+        previous = self._change_rate.get(token_id, 1.0)
+        self._change_rate[token_id] = 0.8 * previous + 0.2 * (1.0 if changed else 0.0)
+    
+    def get_schedule_stats(self) -> Dict[str, Any]:
+        """
+        Per-token schedule and achieved sample rate.
+        
+        Returns:
+            Dict with demand_hz (requested before budget), budget_hz, achieved_hz (total) and
+            tokens: {token_id: {interval, achieved_hz, polls, change_rate, seconds_to_end}}
+        """
+        now = datetime.now(timezone.utc)
+        tokens = {}
+        for token_id in self.token_ids:
+            gap = self._poll_gap.get(token_id)
+            end_date = self._market_end.get(token_id)
+            tokens[token_id] = {
+                "interval": self._current_interval.get(token_id, self._token_intervals[token_id]),
+                "achieved_hz": 1.0 / gap if gap else None,
+                "polls": self._poll_counts.get(token_id, 0),
+                "change_rate": self._change_rate.get(token_id),
+                "seconds_to_end": (end_date - now).total_seconds() if end_date else None,
+            }
+        return {
+            "demand_hz": self._demand,
+            "budget_hz": self.request_budget,
+            "achieved_hz": sum(t["achieved_hz"] or 0.0 for t in tokens.values()),
+            "tokens": tokens,
+        }
     
     def _fetch_orderbook_direct(self, token_id: str):
         """Fetch orderbook directly from CLOB API (no auth needed)."""
         try:
             url = "https://clob.polymarket.com/book"
-            response = httpx.get(url, params={"token_id": token_id}, timeout=10.0)
+            client = self._http
+            if client is None:
+                with self._http_lock:
+                    if self._http is None:
+                        self._http = httpx.Client(timeout=10.0)
+                    client = self._http
+            response = client.get(url, params={"token_id": token_id})
             
             if response.status_code == 200:
-                data = response.json()
-                bids = [[float(b["price"]), float(b["size"])] for b in data.get("bids", [])]
-                asks = [[float(a["price"]), float(a["size"])] for a in data.get("asks", [])]
-                # Extract last_trade_price if available (this is the actual market price)
-                last_trade_price = data.get("last_trade_price")
-                if last_trade_price is not None:
-                    last_trade_price = float(last_trade_price)
+                # last_trade_price is the actual market price (if available)
+                bids, asks, last_trade_price = json_codec.decode_rest_book(response.content)
                 return bids, asks, None, last_trade_price  # Return last_trade_price as 4th element
             else:
                 # Return status code so caller can detect 404
@@ -80,62 +350,20 @@ class OrderbookPoller:
             logger.error(f"Error fetching orderbook directly: {e}")
             return [], [], None, None
     
-    def _orderbook_changed(self, bids: list, asks: list, last_bids: list, last_asks: list) -> bool:
+    def _count_changed_levels(self, levels: list, last_levels: list) -> int:
         """
-        Check if orderbook has changed in top N competitive levels.
-        For HFT backtesting, we capture ANY change, no matter how small.
+        Count top-N levels that differ from the previous book (statistics only).
         
-        Saves if:
-        - First time (no last orderbook)
-        - ANY price change in top N levels
-        - ANY size change in top N levels (even 0.01% - captures all liquidity shifts)
-        - Levels added/removed in top N
+        Change detection uses side fingerprints; this per-level diff only feeds
+        level_change_counts when level_change_stats is enabled.
         """
-        # Always save first time
-        if not last_bids and not last_asks:
-            return True
-        
-        # Check top N bid levels for ANY changes
-        top_n_bids = min(self.track_top_n, len(bids), len(last_bids))
-        
-        # Check if number of levels changed
-        if len(bids) != len(last_bids):
-            return True
-        
-        # Check each level in top N for ANY price or size change
-        for i in range(top_n_bids):
-            if i >= len(bids) or i >= len(last_bids):
-                return True  # Level added/removed
-            
-            # ANY price change (even 0.0001)
-            if bids[i][0] != last_bids[i][0]:
-                return True
-            
-            # ANY size change (even tiny amounts matter for HFT)
-            if bids[i][1] != last_bids[i][1]:
-                return True
-        
-        # Check top N ask levels for ANY changes
-        top_n_asks = min(self.track_top_n, len(asks), len(last_asks))
-        
-        # Check if number of levels changed
-        if len(asks) != len(last_asks):
-            return True
-        
-        # Check each level in top N for ANY price or size change
-        for i in range(top_n_asks):
-            if i >= len(asks) or i >= len(last_asks):
-                return True  # Level added/removed
-            
-            # ANY price change
-            if asks[i][0] != last_asks[i][0]:
-                return True
-            
-            # ANY size change
-            if asks[i][1] != last_asks[i][1]:
-                return True
-        
-        return False  # No changes in top N levels
+        depth = self.track_top_n or 20
+        changed = abs(min(len(levels), depth) - min(len(last_levels), depth))  # Levels added/removed
+        for level, last_level in zip(levels[:depth], last_levels[:depth]):
+            # ANY price or size change (even tiny amounts matter for HFT)
+            if level[0] != last_level[0] or level[1] != last_level[1]:
+                changed += 1
+        return changed
     
     async def _fetch_and_save_orderbook(self, token_id: str):
         """Fetch orderbook for a token and save to database."""
@@ -148,7 +376,7 @@ class OrderbookPoller:
             if self.polymarket and self.polymarket.private_key:
                 try:
                     logger.debug(f"Fetching orderbook via Polymarket client for {token_id[:20]}...")
-                    orderbook = self.polymarket.get_orderbook(token_id)
+                    orderbook = await asyncio.to_thread(self.polymarket.get_orderbook, token_id)
                     bids = [[float(bid.price), float(bid.size)] for bid in orderbook.bids]
                     asks = [[float(ask.price), float(ask.size)] for ask in orderbook.asks]
                     # Try to get last_trade_price from orderbook object if available
@@ -169,16 +397,7 @@ class OrderbookPoller:
                         
                         if failure_count >= self._max_failures:
                             logger.info(f"⚠ Market ended: Token {token_id[:20]}... returned 404 {failure_count} times - removing from monitoring")
-                            # Remove from token_ids list
-                            if token_id in self.token_ids:
-                                self.token_ids.remove(token_id)
-                                # Clean up tracking data
-                                self._failed_tokens.pop(token_id, None)
-                                self._last_orderbooks.pop(token_id, None)
-                                if hasattr(self, '_save_count'):
-                                    self._save_count.pop(token_id, None)
-                                if hasattr(self, '_first_fetch'):
-                                    self._first_fetch.discard(token_id)
+                            self._drop_token(token_id)
                             return
                         else:
                             logger.debug(f"Token {token_id[:20]}... returned 404 ({failure_count}/{self._max_failures}) - market may be ending")
@@ -186,11 +405,11 @@ class OrderbookPoller:
                     
                     logger.warning(f"Polymarket client failed for {token_id[:20]}...: {e}, trying direct HTTP")
                     # Fallback to direct HTTP
-                    bids, asks, http_status, last_trade_price = self._fetch_orderbook_direct(token_id)
+                    bids, asks, http_status, last_trade_price = await asyncio.to_thread(self._fetch_orderbook_direct, token_id)
             else:
                 # No wallet key - use direct HTTP
                 logger.debug(f"Fetching orderbook via direct HTTP for {token_id[:20]}...")
-                bids, asks, http_status, last_trade_price = self._fetch_orderbook_direct(token_id)
+                bids, asks, http_status, last_trade_price = await asyncio.to_thread(self._fetch_orderbook_direct, token_id)
             
             # Check for 404 errors (market ended) from direct HTTP
             if http_status == 404:
@@ -199,16 +418,7 @@ class OrderbookPoller:
                 
                 if failure_count >= self._max_failures:
                     logger.info(f"⚠ Market ended: Token {token_id[:20]}... returned 404 {failure_count} times - removing from monitoring")
-                    # Remove from token_ids list
-                    if token_id in self.token_ids:
-                        self.token_ids.remove(token_id)
-                        # Clean up tracking data
-                        self._failed_tokens.pop(token_id, None)
-                        self._last_orderbooks.pop(token_id, None)
-                        if hasattr(self, '_save_count'):
-                            self._save_count.pop(token_id, None)
-                        if hasattr(self, '_first_fetch'):
-                            self._first_fetch.discard(token_id)
+                    self._drop_token(token_id)
                     return
                 else:
                     logger.debug(f"Token {token_id[:20]}... returned 404 ({failure_count}/{self._max_failures}) - market may be ending")
@@ -222,6 +432,7 @@ class OrderbookPoller:
             if token_id in self._failed_tokens:
                 self._failed_tokens.pop(token_id)
             
+            
             # Log first retrieval to confirm we're getting data
             if not hasattr(self, '_first_fetch'):
                 self._first_fetch = set()
@@ -229,17 +440,28 @@ class OrderbookPoller:
                 logger.info(f"✓ Retrieved orderbook for {token_id[:20]}...: {len(bids)} bids, {len(asks)} asks")
                 self._first_fetch.add(token_id)
             
-            # Check if orderbook has changed (if change detection enabled)
-            if self.track_top_n > 0:
-                last_bids, last_asks = self._last_orderbooks.get(token_id, ([], []))
-                has_changed = self._orderbook_changed(bids, asks, last_bids, last_asks)
+            # Check if orderbook has changed in its top N levels (if change detection enabled)
+            if self.track_top_n > 0 or self.adaptive:
+                depth = self.track_top_n or 20
+                fingerprint = (side_fingerprint(bids, depth), side_fingerprint(asks, depth))
+                last_fingerprint = self._last_fingerprints.get(token_id)
+                self._last_fingerprints[token_id] = fingerprint
+                has_changed = fingerprint != last_fingerprint  # Always save first time
+                
+                if self.adaptive and last_fingerprint is not None:
+                    self._record_change(token_id, has_changed)
                 
-                if not has_changed:
+                if has_changed and self.level_change_stats:
+                    last_bids, last_asks = self._last_top_levels.get(token_id, ([], []))
+                    if last_bids or last_asks:
+                        self.level_change_counts["compared"] += 1
+                        self.level_change_counts["bid_levels_changed"] += self._count_changed_levels(bids, last_bids)
+                        self.level_change_counts["ask_levels_changed"] += self._count_changed_levels(asks, last_asks)
+                    self._last_top_levels[token_id] = (bids[:depth], asks[:depth])
+                
+                if self.track_top_n > 0 and not has_changed:
                     logger.debug(f"No change in top {self.track_top_n} levels for token {token_id[:20]}..., skipping save")
                     return
-                
-                # Update last orderbook
-                self._last_orderbooks[token_id] = (bids.copy(), asks.copy())
             
             # Get market info if available
             market_meta = self.market_info.get(token_id, {})
@@ -273,7 +495,7 @@ class OrderbookPoller:
             # This allows polling to continue without waiting for DB write
             metadata = {
                 "source": "polling",
-                "poll_interval": self.poll_interval,
+                "poll_interval": self._current_interval.get(token_id, self._token_intervals.get(token_id, self.poll_interval)),
                 "last_trade_price": last_trade_price,
                 "outcome_price": outcome_price,  # From Gamma API (what website shows)
                 "market_price": market_price,  # Actual trading price (outcome_price > last_trade_price > mid price)
@@ -347,6 +569,20 @@ class OrderbookPoller:
         except Exception as e:
             logger.error(f"❌ Error fetching/saving orderbook for {token_id[:20]}...: {e}", exc_info=True)
     
+    async def _poll_token(self, token_id: str, started: float, fetch_slots: asyncio.Semaphore):
+        """Fetch one due token and schedule its next poll when the fetch completes."""
+        try:
+            async with fetch_slots:
+                await self._fetch_and_save_orderbook(token_id)
+        except Exception as e:
+            logger.error(f"Error in task for token {token_id[:20]}...: {e}")
+        finally:
+            # Reschedule tokens still being polled (tokens removed, or removed and re-added,
+            # during the fetch already have their own schedule)
+            if self.running and self._next_poll_at.get(token_id, float("inf")) <= started:
+                self._schedule_poll(token_id, started + self._next_interval(token_id))
+                self._tokens_changed.set()  # Wake the loop in case this deadline is the earliest
+    
     async def poll_loop(self):
         """Main polling loop."""
         self.running = True
@@ -355,45 +591,73 @@ class OrderbookPoller:
         logger.info(f"  Using {'Polymarket client (wallet key found)' if has_wallet else 'direct HTTP (no wallet key)'} for fetching")
         
         poll_count = 0
-        while self.running:
-            try:
-                poll_count += 1
-                # Log every 10th poll cycle to show activity
-                if poll_count == 1 or poll_count % 10 == 0:
-                    logger.info(f"Poll cycle #{poll_count} - fetching orderbooks for {len(self.token_ids)} tokens")
-                
-                # Fetch orderbooks for all tokens concurrently
-                tasks = [
-                    self._fetch_and_save_orderbook(token_id)
-                    for token_id in self.token_ids
-                ]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Check for exceptions
-                for i, result in enumerate(results):
-                    if isinstance(result, Exception):
-                        logger.error(f"Error in task for token {self.token_ids[i][:20]}...: {result}")
-                
-                if poll_count == 1 or poll_count % 10 == 0:
-                    logger.info(f"Completed poll cycle #{poll_count}, sleeping {self.poll_interval}s")
-                await asyncio.sleep(self.poll_interval)
-                
-            except asyncio.CancelledError:
-                logger.info("Polling cancelled")
-                raise  # Re-raise to properly propagate cancellation
-            except SystemExit:
-                logger.info("Polling received SystemExit")
-                break
-            except KeyboardInterrupt:
-                logger.info("Polling received KeyboardInterrupt")
-                break
-            except Exception as e:
-                logger.error(f"❌ Error in polling loop: {e}", exc_info=True)
-                await asyncio.sleep(self.poll_interval)
+        fetch_slots = asyncio.Semaphore(self.max_concurrent_fetches)
+        try:
+            while self.running:
+                try:
+                    self._tokens_changed.clear()
+                    self._expire_tokens()
+                    
+                    # Poll the tokens whose schedule is due
+                    now = time.monotonic()
+                    due = self._pop_due(now)
+                    if due:
+                        poll_count += 1
+                        # Log every 10th poll cycle to show activity
+                        if poll_count == 1 or poll_count % 10 == 0:
+                            logger.info(f"Poll cycle #{poll_count} - fetching orderbooks for {len(due)}/{len(self.token_ids)} tokens")
+                            if self.adaptive or self.request_budget:
+                                stats = self.get_schedule_stats()
+                                budget = f"{stats['budget_hz']:.1f}" if stats["budget_hz"] else "unlimited"
+                                logger.info(f"  📊 Schedule: demand {stats['demand_hz']:.1f} req/s, achieved {stats['achieved_hz']:.1f} req/s, budget {budget}")
+                        
+                        # Fetch each due token as an independent task; a token isn't back in
+                        # the schedule until its own fetch finishes, so it is never fetched twice
+                        for token_id in due:
+                            self._record_poll(token_id, now)
+                            task = asyncio.create_task(self._poll_token(token_id, now, fetch_slots))
+                            self._poll_tasks.add(task)
+                            task.add_done_callback(self._poll_tasks.discard)
+                    
+                    # Sleep until the next token is due, or until tokens are added
+                    next_deadline = self._next_deadline()
+                    if next_deadline is not None:
+                        sleep_for = max(0.0, next_deadline - time.monotonic())
+                    else:
+                        sleep_for = self.poll_interval
+                    try:
+                        await asyncio.wait_for(self._tokens_changed.wait(), timeout=sleep_for)
+                    except asyncio.TimeoutError:
+                        pass
+                    
+                except asyncio.CancelledError:
+                    logger.info("Polling cancelled")
+                    raise  # Re-raise to properly propagate cancellation
+                except SystemExit:
+                    logger.info("Polling received SystemExit")
+                    break
+                except KeyboardInterrupt:
+                    logger.info("Polling received KeyboardInterrupt")
+                    break
+                except Exception as e:
+                    logger.error(f"❌ Error in polling loop: {e}", exc_info=True)
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            self.running = False
+            tasks = list(self._poll_tasks)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            with self._http_lock:
+                if self._http is not None:
+                    self._http.close()
+                    self._http = None
     
     def stop(self):
         """Stop polling."""
         self.running = False
+        self._tokens_changed.set()  # Wake the loop so it exits promptly
         logger.info("Stopping orderbook poller")
 
 
@@ -1,6 +1,7 @@
 """
 Utilities for querying historical orderbook data from the database.
 """
+import os
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 
@@ -17,17 +18,39 @@ from agents.polymarket.orderbook_db import OrderbookDatabase, OrderbookSnapshot
 class OrderbookQuery:
     """Query utilities for historical orderbook data."""
     
-    def __init__(self, db: Optional[OrderbookDatabase] = None, db_path: Optional[str] = None):
+    def __init__(
+        self,
+        db: Optional[OrderbookDatabase] = None,
+        db_path: Optional[str] = None,
+        backend: str = "database",
+        archive_path: Optional[str] = None,
+    ):
         """
         Initialize query utilities.
         
         Args:
             db: Optional OrderbookDatabase instance
             db_path: Optional path to SQLite database (if db not provided)
+            backend: "database" (default) or "parquet" to read closed markets from the
+                     Parquet archive (DuckDB/pyarrow) without opening the database
+            archive_path: Archive root for the parquet backend
+                     (default: ORDERBOOK_ARCHIVE_PATH env var, or ./orderbook_archive)
         """
-        if db is None:
+        self.backend = backend
+        self.archive = None
+        if backend == "parquet":
+            from agents.polymarket.orderbook_archive import ParquetSnapshotStore
+            self.archive = ParquetSnapshotStore(
+                archive_path or os.getenv("ORDERBOOK_ARCHIVE_PATH", "./orderbook_archive")
+            )
+            self.db = db
+        elif backend != "database":
+            raise ValueError(f"backend must be 'database' or 'parquet', got {backend!r}")
+        elif db is None:
+            # Read-only connections: safe to run against a database that is being logged to
             self.db = OrderbookDatabase(
-                database_url=None if db_path is None else f"sqlite:///{db_path}"
+                database_url=None if db_path is None else f"sqlite:///{db_path}",
+                sqlite_mode="read_only",
             )
         else:
             self.db = db
@@ -41,6 +64,14 @@ class OrderbookQuery:
         limit: int = 1000,
     ) -> List[OrderbookSnapshot]:
         """Get orderbook snapshots with filters."""
+        if self.archive is not None:
+            return self.archive.get_snapshots(
+                token_id=token_id,
+                market_id=market_id,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit,
+            )
         return self.db.get_snapshots(
             token_id=token_id,
             market_id=market_id,
@@ -67,6 +98,22 @@ class OrderbookQuery:
         if not PANDAS_AVAILABLE:
             raise ImportError("pandas is required for get_snapshots_dataframe")
         
+        if self.archive is not None:
+            # Columnar read straight into a DataFrame (no per-row objects); newest `limit`
+            # rows like the database path, returned oldest first
+            df = self.archive.query(
+                token_id=token_id,
+                market_id=market_id,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit,
+                columns=[
+                    "timestamp", "token_id", "market_id", "best_bid_price", "best_bid_size",
+                    "best_ask_price", "best_ask_size", "spread", "spread_bps", "outcome",
+                ],
+            )
+            return df.sort_values("timestamp").reset_index(drop=True) if not df.empty else df
+        
         snapshots = self.get_snapshots(
             token_id=token_id,
             market_id=market_id,
@@ -134,6 +181,8 @@ class OrderbookQuery:
         """
         Get the orderbook snapshot closest to a specific time.
         
+        For many lookups use get_orderbooks_asof() / asof_join(), which resolve all of them in one pass.
+        
         Args:
             token_id: Token ID
             target_time: Target timestamp
@@ -166,17 +215,102 @@ class OrderbookQuery:
         
         return closest
     
+    def get_latest_orderbook(
+        self,
+        token_id: Optional[str] = None,
+        market_id: Optional[str] = None,
+    ):
+        """Current book for a token or market (a latest_orderbook primary-key lookup when available)."""
+        if self.archive is not None:
+            snapshots = self.archive.get_snapshots(token_id=token_id, market_id=market_id, limit=1)
+            return snapshots[0] if snapshots else None
+        return self.db.get_latest_book(token_id=token_id, market_id=market_id)
+    
+    def get_latest_books(
+        self,
+        market_id: Optional[str] = None,
+        max_age_seconds: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Current books of all tokens, token_id -> row dict (see OrderbookDatabase.get_latest_books)."""
+        if self.archive is not None:
+            raise ValueError("The parquet backend only holds closed markets; use the database backend")
+        return self.db.get_latest_books(market_id=market_id, max_age_seconds=max_age_seconds)
+    
+    def get_orderbooks_asof(
+        self,
+        probes: List[tuple],
+        tolerance_seconds: Optional[float] = None,
+        columns: Optional[List[str]] = None,
+        method: str = "seek",
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Last snapshot at or before each (token_id, timestamp) probe, as row dicts in probe order.
+        
+        See OrderbookDatabase.get_snapshots_asof (method only applies to the database backend).
+        """
+        if self.archive is not None:
+            return self.archive.asof(probes, tolerance_seconds=tolerance_seconds, columns=columns)
+        return self.db.get_snapshots_asof(probes, tolerance_seconds=tolerance_seconds, columns=columns, method=method)
+    
+    def asof_join(
+        self,
+        df,
+        token_column: str = "token_id",
+        time_column: str = "timestamp",
+        columns: Optional[List[str]] = None,
+        tolerance_seconds: Optional[float] = None,
+        method: str = "seek",
+    ):
+        """
+        Attach the book as of each row of a DataFrame (e.g. BTC price events) in one call.
+        
+        Args:
+            df: DataFrame with a token ID column and a timestamp column
+            token_column: Column holding the CLOB token ID
+            time_column: Column holding the event time
+            columns: Snapshot columns to attach (default: top of book, spread and snapshot time)
+            tolerance_seconds: Leave the book empty if the last snapshot is older than this
+            method: "seek" or "merge" (database backend)
+            
+        Returns:
+            Copy of df with the snapshot columns added (snapshot time as "snapshot_timestamp")
+        """
+        if not PANDAS_AVAILABLE:
+            raise ImportError("pandas is required for asof_join")
+        
+        columns = columns or [
+            "timestamp", "best_bid_price", "best_bid_size", "best_ask_price", "best_ask_size", "spread",
+        ]
+        probes = [
+            (token_id, pd.Timestamp(timestamp).to_pydatetime())
+            for token_id, timestamp in zip(df[token_column], df[time_column])
+        ]
+        rows = self.get_orderbooks_asof(probes, tolerance_seconds=tolerance_seconds, columns=columns, method=method)
+        books = pd.DataFrame([row or {} for row in rows], columns=columns, index=df.index)
+        books = books.rename(columns={"timestamp": "snapshot_timestamp"})
+        return pd.concat([df, books.drop(columns=[c for c in books.columns if c in df.columns])], axis=1)
+    
     def get_statistics(
         self,
-        token_id: str,
+        token_id: Optional[str] = None,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
+        market_id: Optional[str] = None,
+        by_outcome: bool = False,
+        bucket_seconds: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """Get statistics for a token over a time period."""
+        """Get statistics for a token or market over a time period (see OrderbookDatabase.get_market_statistics)."""
+        if self.archive is not None:
+            if market_id or by_outcome or bucket_seconds:
+                raise ValueError("The parquet backend only supports per-token statistics")
+            return self.archive.statistics(token_id=token_id, start_time=start_time, end_time=end_time)
         return self.db.get_market_statistics(
             token_id=token_id,
             start_time=start_time,
             end_time=end_time,
+            market_id=market_id,
+            by_outcome=by_outcome,
+            bucket_seconds=bucket_seconds,
         )
     
     def export_to_csv(
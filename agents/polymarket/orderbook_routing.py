@@ -0,0 +1,366 @@
+"""
+Unified query layer over every snapshot table (btc_15_min_table, btc_1_hour_table, btc_eth_table,
+orderbook_snapshots and the per-market orderbook_snapshots_market_<id> tables).
+
+Callers ask for a market or token; UnifiedSnapshotQuery looks up which tables hold it in the
+orderbook_routes catalog (written by OrderbookDatabase alongside each table's first snapshot of a
+token), scans only those tables once each, and returns one result ordered by timestamp with a
+source_table column - either as a single UNION ALL query or as parallel per-table queries merged
+in order.
+
+Usage:
+    unified = UnifiedSnapshotQuery()
+    df = unified.frame(market_id="123456")            # typed DataFrame, all tables
+    for row in unified.iter_rows(token_id=token_id):  # streamed dicts, oldest first
+        ...
+
+Databases logged before the catalog existed can be indexed once with rebuild_routes()
+(scripts/python/query_btc_market_orderbooks.py --rebuild-routes).
+"""
+import heapq
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import DateTime, Float, Integer, String, cast, func, inspect, literal, null, select, union_all
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from agents.polymarket.orderbook_db import (
+    BTC15MinOrderbookSnapshot,
+    BTC1HourOrderbookSnapshot,
+    BTCEthOrderbookSnapshot,
+    MARKET_TABLE_PREFIX,
+    OrderbookDatabase,
+    OrderbookRoute,
+    OrderbookSnapshot,
+    insert_routes,
+    market_tables,
+)
+
+logger = logging.getLogger(__name__)
+
+# Fixed snapshot tables, in the order they are listed when several hold a market
+SNAPSHOT_MODELS = {
+    model.__tablename__: model
+    for model in (BTC15MinOrderbookSnapshot, BTC1HourOrderbookSnapshot, BTCEthOrderbookSnapshot, OrderbookSnapshot)
+}
+FAN_OUT_MODES = ("union", "parallel")
+# Not returned unless asked for: free-form and large
+_DEFAULT_EXCLUDED_COLUMNS = {"extra_metadata"}
+
+
+def _frame_dtype(column_type) -> Optional[str]:
+    """pandas dtype for a snapshot column type (None: leave as object / convert separately)."""
+    if isinstance(column_type, Float):
+        return "float64"
+    if isinstance(column_type, Integer):
+        return "Int64"
+    if isinstance(column_type, String):
+        return "string"
+    return None
+
+
+class UnifiedSnapshotQuery:
+    """Route market/token queries to the snapshot tables that hold them and fan out."""
+
+    def __init__(
+        self,
+        db: Optional[OrderbookDatabase] = None,
+        database_url: Optional[str] = None,
+        fan_out: str = "union",
+        max_workers: int = 4,
+    ):
+        """
+        Initialize query layer.
+
+        Args:
+            db: OrderbookDatabase to read from (default: a read-only one for database_url)
+            database_url: Database URL (default: DATABASE_URL / ORDERBOOK_DB_PATH like OrderbookDatabase)
+            fan_out: "union" (one UNION ALL query, default) or "parallel" (one query per table on
+                     its own connection, merged by timestamp - useful on PostgreSQL)
+            max_workers: Threads for parallel fan-out
+        """
+        if fan_out not in FAN_OUT_MODES:
+            raise ValueError(f"fan_out must be one of {FAN_OUT_MODES}, got {fan_out!r}")
+        self.db = db or OrderbookDatabase(database_url=database_url, sqlite_mode="read_only")
+        self.engine = self.db.engine
+        self.fan_out = fan_out
+        self.max_workers = max_workers
+        self._existing: Optional[set] = None
+
+    # ========== Routing ==========
+
+    def existing_tables(self, refresh: bool = False) -> set:
+        """Snapshot tables present in the database (views included: partitioned SQLite tables are views)."""
+        if self._existing is None or refresh:
+            inspector = inspect(self.engine)
+            names = set(inspector.get_table_names()) | set(inspector.get_view_names())
+            self._existing = {
+                name for name in names
+                if name in SNAPSHOT_MODELS or name.startswith(MARKET_TABLE_PREFIX) or name == OrderbookRoute.__tablename__
+            }
+        return self._existing
+
+    def table(self, name: str):
+        """SQLAlchemy Table for a snapshot table name."""
+        if name in SNAPSHOT_MODELS:
+            return SNAPSHOT_MODELS[name].__table__
+        if name.startswith(MARKET_TABLE_PREFIX):
+            return market_tables.table_class(name[len(MARKET_TABLE_PREFIX):]).__table__
+        raise ValueError(f"Not a snapshot table: {name}")
+
+    def _ordered(self, names) -> List[str]:
+        order = list(SNAPSHOT_MODELS)
+        return sorted(set(names), key=lambda name: (order.index(name) if name in order else len(order), name))
+
+    def tables_for(self, token_id: Optional[str] = None, market_id: Optional[str] = None) -> List[str]:
+        """
+        Snapshot tables holding a token or market.
+
+        Uses orderbook_routes; if the catalog has nothing for the key (older databases), probes each
+        fixed table (plus the market's own per-market table) with an indexed EXISTS.
+
+        Returns:
+            Table names (all snapshot tables when neither token_id nor market_id is given)
+        """
+        existing = self.existing_tables()
+        if not token_id and not market_id:
+            return self._ordered(name for name in existing if name != OrderbookRoute.__tablename__)
+
+        if OrderbookRoute.__tablename__ in existing:
+            query = select(OrderbookRoute.source_table).distinct()
+            if token_id:
+                query = query.where(OrderbookRoute.token_id == token_id)
+            if market_id:
+                query = query.where(OrderbookRoute.market_id == str(market_id))
+            with self.engine.connect() as conn:
+                routed = [name for (name,) in conn.execute(query) if name in existing]
+            if routed:
+                return self._ordered(routed)
+
+        candidates = [name for name in SNAPSHOT_MODELS if name in existing]
+        if market_id and f"{MARKET_TABLE_PREFIX}{market_id}" in existing:
+            candidates.append(f"{MARKET_TABLE_PREFIX}{market_id}")
+        found = []
+        with self.engine.connect() as conn:
+            for name in candidates:
+                table = self.table(name)
+                probe = select(table.c.id)
+                if token_id:
+                    probe = probe.where(table.c.token_id == token_id)
+                if market_id:
+                    probe = probe.where(table.c.market_id == str(market_id))
+                if conn.execute(probe.limit(1)).first() is not None:
+                    found.append(name)
+        return self._ordered(found)
+
+    def token_ids(self, market_id: str) -> List[str]:
+        """Tokens logged for a market (from the routing catalog, else the snapshot tables)."""
+        existing = self.existing_tables()
+        with self.engine.connect() as conn:
+            if OrderbookRoute.__tablename__ in existing:
+                tokens = [token for (token,) in conn.execute(
+                    select(OrderbookRoute.token_id).distinct().where(OrderbookRoute.market_id == str(market_id))
+                )]
+                if tokens:
+                    return sorted(tokens)
+            tokens = set()
+            for name in self.tables_for(market_id=market_id):
+                table = self.table(name)
+                tokens.update(token for (token,) in conn.execute(
+                    select(table.c.token_id).distinct().where(table.c.market_id == str(market_id))
+                ))
+        return sorted(tokens)
+
+    def rebuild_routes(self) -> int:
+        """
+        Index existing history into orderbook_routes (one GROUP BY scan per snapshot table).
+
+        Needs a writable database (pass db=OrderbookDatabase(...) without sqlite_mode="read_only").
+
+        Returns:
+            Number of (token, table) routes found
+        """
+        OrderbookRoute.__table__.create(self.engine, checkfirst=True)
+        routes = []
+        with self.engine.connect() as conn:
+            for name in self.tables_for():
+                table = self.table(name)
+                query = select(
+                    table.c.token_id, func.max(table.c.market_id).label("market_id"),
+                    func.min(table.c.timestamp).label("first_seen"),
+                ).group_by(table.c.token_id)
+                routes.extend(
+                    {"token_id": token_id, "source_table": name, "market_id": market_id, "first_seen": first_seen}
+                    for token_id, market_id, first_seen in conn.execute(query)
+                )
+        session = self.db.get_session()
+        try:
+            for start in range(0, len(routes), 1000):
+                insert_routes(session, routes[start:start + 1000])
+            session.commit()
+        finally:
+            session.close()
+        self.existing_tables(refresh=True)
+        logger.info(f"✓ Indexed {len(routes)} token route(s) into {OrderbookRoute.__tablename__}")
+        return len(routes)
+
+    # ========== Queries ==========
+
+    def _columns(self, tables: List[str], columns: Optional[List[str]]) -> Dict[str, Any]:
+        """Output column -> SQL type (union of the tables' columns unless columns is given)."""
+        types: Dict[str, Any] = {}
+        for name in tables:
+            for column in self.table(name).columns:
+                types.setdefault(column.name, column.type)
+        if columns is None:
+            return {name: column_type for name, column_type in types.items() if name not in _DEFAULT_EXCLUDED_COLUMNS}
+        unknown = [name for name in columns if name not in types]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {', '.join(tables)}: {', '.join(unknown)}")
+        return {name: types[name] for name in columns}
+
+    def _select(self, name: str, columns: Dict[str, Any], token_id, market_id, start_time, end_time):
+        table = self.table(name)
+        select_list = [
+            table.c[column] if column in table.c else cast(null(), column_type).label(column)
+            for column, column_type in columns.items()
+        ]
+        query = select(*select_list, literal(name).label("source_table"))
+        if token_id:
+            query = query.where(table.c.token_id == token_id)
+        if market_id:
+            query = query.where(table.c.market_id == str(market_id))
+        if start_time:
+            query = query.where(table.c.timestamp >= start_time)
+        if end_time:
+            query = query.where(table.c.timestamp <= end_time)
+        return query
+
+    def iter_rows(
+        self,
+        token_id: Optional[str] = None,
+        market_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+        batch_size: int = 5000,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream snapshots from every table holding the token/market, ordered by timestamp.
+
+        Args:
+            token_id: Filter by token ID
+            market_id: Filter by market ID
+            start_time: Start of time range
+            end_time: End of time range
+            columns: Columns to return (default: all snapshot columns except extra_metadata;
+                     columns a table lacks come back as None). source_table is always added.
+            limit: Maximum number of rows overall
+            newest_first: Order by timestamp descending
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            Row dicts
+        """
+        tables = self.tables_for(token_id, market_id)
+        if not tables:
+            return
+        column_types = self._columns(tables, columns)
+        selects = [self._select(name, column_types, token_id, market_id, start_time, end_time) for name in tables]
+
+        if self.fan_out == "parallel" and len(selects) > 1:
+            yield from self._iter_parallel(selects, limit, newest_first)
+            return
+
+        query = union_all(*selects) if len(selects) > 1 else selects[0]
+        timestamp = query.selected_columns.timestamp
+        query = query.order_by(timestamp.desc() if newest_first else timestamp)
+        if limit:
+            query = query.limit(limit)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+            for row in result.mappings():
+                yield dict(row)
+
+    def _iter_parallel(self, selects: list, limit: Optional[int], newest_first: bool) -> Iterator[Dict[str, Any]]:
+        """One query per table on its own connection, k-way merged by timestamp."""
+        def run(query):
+            timestamp = query.selected_columns.timestamp
+            query = query.order_by(timestamp.desc() if newest_first else timestamp)
+            if limit:
+                query = query.limit(limit)
+            with self.engine.connect() as conn:
+                return [dict(row) for row in conn.execute(query).mappings()]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(selects))) as pool:
+            results = list(pool.map(run, selects))
+        merged = heapq.merge(*results, key=lambda row: row["timestamp"], reverse=newest_first)
+        yield from itertools.islice(merged, limit) if limit else merged
+
+    def iter_frames(self, chunk_size: int = 50000, **kwargs):
+        """
+        Stream snapshots as typed pandas DataFrames of up to chunk_size rows (same arguments as iter_rows).
+
+        Column dtypes follow the table schema: float64, nullable Int64, string, UTC datetimes
+        and object for JSON (bids/asks).
+        """
+        if pd is None:
+            raise ImportError("pandas is required for iter_frames / frame")
+        tables = self.tables_for(kwargs.get("token_id"), kwargs.get("market_id"))
+        if not tables:
+            return
+        column_types = self._columns(tables, kwargs.get("columns"))
+        rows = self.iter_rows(batch_size=min(chunk_size, 5000), **kwargs)
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield self._typed_frame(chunk, column_types)
+
+    def frame(self, **kwargs):
+        """All matching snapshots as one typed DataFrame (same arguments as iter_rows)."""
+        if pd is None:
+            raise ImportError("pandas is required for iter_frames / frame")
+        frames = list(self.iter_frames(**kwargs))
+        if frames:
+            return pd.concat(frames, ignore_index=True)
+        tables = self.tables_for(kwargs.get("token_id"), kwargs.get("market_id"))
+        return self._typed_frame([], self._columns(tables, kwargs.get("columns")) if tables else {})
+
+    @staticmethod
+    def _typed_frame(rows: List[Dict[str, Any]], column_types: Dict[str, Any]):
+        columns = list(column_types) + ["source_table"]
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        for name, column_type in column_types.items():
+            if isinstance(column_type, DateTime):
+                df[name] = pd.to_datetime(df[name], utc=True)
+            elif _frame_dtype(column_type):
+                df[name] = df[name].astype(_frame_dtype(column_type))
+        df["source_table"] = df["source_table"].astype("string")
+        return df
+
+    def get_snapshots(
+        self,
+        token_id: Optional[str] = None,
+        market_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 1000,
+    ) -> List[SimpleNamespace]:
+        """
+        Snapshots across tables shaped like OrderbookDatabase.get_snapshots() rows (newest first).
+
+        Market question/outcome are filled in from the market dimension table where the rows lack them.
+        """
+        rows = self.iter_rows(token_id, market_id, start_time, end_time, limit=limit, newest_first=True)
+        return self.db.attach_market_fields([SimpleNamespace(**row) for row in rows])
@@ -1,13 +1,25 @@
 """
 WebSocket client for real-time Polymarket orderbook streaming.
 Uses Polymarket's Real-Time Data Socket (RTDS) for live orderbook updates.
+
+Updates flow through a staged pipeline connected by bounded asyncio queues:
+    receive (socket reader) -> parse (JSON + dispatch) -> normalize (bids/asks, prices)
+    -> persist (batched inserts in a worker thread)
+so a slow database commit never stalls the websocket reader. Each stage keeps
+counters (see OrderbookLogger.get_pipeline_stats) showing where backpressure builds.
 """
 import json
 import asyncio
 import logging
-from typing import List, Optional, Callable, Dict, Any
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Callable, Dict, Any, Tuple
 import websockets
-from datetime import datetime
+from datetime import datetime, timezone
+
+from agents.utils import json_codec, metrics
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +35,15 @@ class OrderbookStream:
     RTDS_URL = "wss://ws-live-data.polymarket.com"
     CLOB_WS_URL = "wss://clob.polymarket.com/ws"  # Alternative endpoint
     
-    def __init__(self, on_orderbook_update: Optional[Callable] = None, api_credentials: Optional[Dict[str, str]] = None):
+    # Max asset IDs per subscribe/unsubscribe message
+    SUBSCRIBE_CHUNK_SIZE = 100
+    
+    def __init__(
+        self,
+        on_orderbook_update: Optional[Callable] = None,
+        api_credentials: Optional[Dict[str, str]] = None,
+        receive_queue_size: int = 1000,
+    ):
         """
         Initialize the orderbook stream.
         
@@ -31,12 +51,27 @@ class OrderbookStream:
             on_orderbook_update: Callback function called when orderbook updates are received.
                                  Should accept (token_id, orderbook_data) as arguments.
             api_credentials: Optional dict with 'api_key', 'api_secret', 'api_passphrase' for authentication.
+            receive_queue_size: Max raw frames buffered between the socket reader and the parser
+                                (default: 1000). When full, the reader waits (backpressure).
         """
         self.on_orderbook_update = on_orderbook_update
         self.api_credentials = api_credentials
         self.websocket = None
         self.running = False
         self.subscribed_tokens: set = set()
+        self.receive_queue_size = receive_queue_size
+        self._receive_queue: Optional[asyncio.Queue] = None
+        # Receive/parse stage counters
+        self.stats = {
+            "received": 0,
+            "parsed": 0,
+            "receive_queue_full": 0,  # Times the reader had to wait for the parser
+            "receive_queue_max": 0,   # High-water mark of the receive queue
+        }
+        # Time-to-first-book: when each token's subscribe was sent, and how long until
+        # its first orderbook message arrived
+        self._subscribe_sent_at: Dict[str, float] = {}
+        self.time_to_first_book: Dict[str, float] = {}
     
     async def connect(self):
         """Connect to the RTDS WebSocket."""
@@ -47,6 +82,16 @@ class OrderbookStream:
             logger.error(f"Failed to connect to RTDS: {e}")
             raise
     
+    def _auth_payload(self) -> Optional[Dict[str, Any]]:
+        """Auth block for subscription messages (RTDS might require auth)."""
+        if not self.api_credentials:
+            return None
+        return {
+            "key": self.api_credentials.get("api_key"),
+            "secret": self.api_credentials.get("api_secret"),
+            "passphrase": self.api_credentials.get("api_passphrase"),
+        }
+    
     async def subscribe_to_orderbook(self, token_id: str):
         """
         Subscribe to orderbook updates for a specific token.
@@ -54,60 +99,72 @@ class OrderbookStream:
         Args:
             token_id: The CLOB token ID to subscribe to
         """
+        await self.subscribe_to_orderbooks([token_id])
+    
+    async def subscribe_to_orderbooks(self, token_ids: List[str], chunk_size: int = SUBSCRIBE_CHUNK_SIZE):
+        """
+        Subscribe to orderbook updates for many tokens, sending asset ID lists in chunks.
+        
+        Args:
+            token_ids: CLOB token IDs to subscribe to (already subscribed ones are skipped)
+            chunk_size: Max asset IDs per subscribe message (default: 100)
+        """
         if not self.websocket:
             await self.connect()
         
-        # Build subscription message with authentication if available
-        subscribe_message = {
-            "type": "subscribe",
-            "channel": "orderbook",
-            "id": token_id,
-        }
-        
-        # Add API credentials if available (RTDS might require auth)
-        if self.api_credentials:
-            subscribe_message["auth"] = {
-                "key": self.api_credentials.get("api_key"),
-                "secret": self.api_credentials.get("api_secret"),
-                "passphrase": self.api_credentials.get("api_passphrase"),
-            }
-            logger.debug(f"Adding API credentials to subscription")
+        new_tokens = [t for t in dict.fromkeys(token_ids) if t not in self.subscribed_tokens]
+        if not new_tokens:
+            return
         
+        auth = self._auth_payload()
         try:
-            logger.info(f"Sending subscription for token: {token_id[:20]}...")
-            logger.debug(f"Subscription message (without secrets): {json.dumps({k: v for k, v in subscribe_message.items() if k != 'auth'})}")
-            
-            await self.websocket.send(json.dumps(subscribe_message))
-            self.subscribed_tokens.add(token_id)
-            logger.info(f"✓ Subscription sent for token: {token_id[:20]}...")
-            
-            # Wait briefly to see if we get a response
-            import asyncio
-            await asyncio.sleep(0.1)
-            
+            for start in range(0, len(new_tokens), chunk_size):
+                chunk = new_tokens[start:start + chunk_size]
+                if len(chunk) == 1:
+                    subscribe_message = {"type": "subscribe", "channel": "orderbook", "id": chunk[0]}
+                else:
+                    subscribe_message = {"type": "subscribe", "channel": "orderbook", "assets_ids": chunk}
+                logger.debug(f"Subscription message (without secrets): {json.dumps(subscribe_message)[:200]}")
+                if auth:
+                    subscribe_message["auth"] = auth
+                
+                await self.websocket.send(json.dumps(subscribe_message))
+                sent_at = time.monotonic()
+                for token_id in chunk:
+                    self.subscribed_tokens.add(token_id)
+                    self._subscribe_sent_at[token_id] = sent_at
+            logger.info(f"✓ Subscription sent for {len(new_tokens)} token(s)")
         except Exception as e:
-            logger.error(f"Error subscribing to {token_id}: {e}", exc_info=True)
+            logger.error(f"Error subscribing to {len(new_tokens)} token(s): {e}", exc_info=True)
             raise
     
     async def unsubscribe_from_orderbook(self, token_id: str):
         """Unsubscribe from orderbook updates for a token."""
+        await self.unsubscribe_from_orderbooks([token_id])
+    
+    async def unsubscribe_from_orderbooks(self, token_ids: List[str], chunk_size: int = SUBSCRIBE_CHUNK_SIZE):
+        """Unsubscribe from orderbook updates for many tokens, in chunks."""
         if not self.websocket:
             return
         
-        unsubscribe_message = {
-            "type": "unsubscribe",
-            "channel": "orderbook",
-            "id": token_id,
-        }
-        
-        await self.websocket.send(json.dumps(unsubscribe_message))
-        self.subscribed_tokens.discard(token_id)
-        logger.info(f"Unsubscribed from orderbook for token: {token_id}")
+        tokens = [t for t in dict.fromkeys(token_ids) if t in self.subscribed_tokens]
+        for start in range(0, len(tokens), chunk_size):
+            chunk = tokens[start:start + chunk_size]
+            if len(chunk) == 1:
+                unsubscribe_message = {"type": "unsubscribe", "channel": "orderbook", "id": chunk[0]}
+            else:
+                unsubscribe_message = {"type": "unsubscribe", "channel": "orderbook", "assets_ids": chunk}
+            await self.websocket.send(json.dumps(unsubscribe_message))
+            for token_id in chunk:
+                self.subscribed_tokens.discard(token_id)
+                self._subscribe_sent_at.pop(token_id, None)
+        if tokens:
+            logger.info(f"Unsubscribed from orderbook for {len(tokens)} token(s)")
     
     async def _handle_message(self, message: str):
         """Handle incoming WebSocket messages."""
         try:
-            data = json.loads(message)
+            data = json_codec.loads(message)
             msg_type = data.get("type", "unknown")
             
             # Log first few messages to understand format
@@ -124,6 +181,11 @@ class OrderbookStream:
                 token_id = data.get("id") or data.get("asset_id")
                 orderbook_data = data.get("data", {})
                 
+                sent_at = self._subscribe_sent_at.pop(token_id, None) if token_id else None
+                if sent_at is not None:
+                    self.time_to_first_book[token_id] = time.monotonic() - sent_at
+                    logger.info(f"⏱️ First book for token {token_id[:20]}... {self.time_to_first_book[token_id]:.2f}s after subscribe")
+                
                 if token_id and self.on_orderbook_update:
                     await self.on_orderbook_update(token_id, orderbook_data)
                 else:
@@ -159,6 +221,18 @@ class OrderbookStream:
         except Exception as e:
             logger.error(f"Error handling message: {e}", exc_info=True)
     
+    async def _parse_loop(self):
+        """Parse stage: decode frames from the receive queue and dispatch them."""
+        while True:
+            message = await self._receive_queue.get()
+            try:
+                if message is None:
+                    return
+                await self._handle_message(message)
+                self.stats["parsed"] += 1
+            finally:
+                self._receive_queue.task_done()
+    
     async def listen(self):
         """Listen for incoming messages."""
         if not self.websocket:
@@ -167,18 +241,41 @@ class OrderbookStream:
         self.running = True
         logger.info("Starting to listen for orderbook updates...")
         
+        # Receive stage only reads frames; parsing runs in its own task
+        self._receive_queue = asyncio.Queue(maxsize=self.receive_queue_size)
+        parse_task = asyncio.create_task(self._parse_loop())
+        cancelled = False
+        
         try:
             async for message in self.websocket:
                 if not self.running:
                     break
-                await self._handle_message(message)
+                self.stats["received"] += 1
+                if metrics.ENABLED:
+                    metrics.inc("ws_messages", {"connection": "stream"})
+                if self._receive_queue.full():
+                    self.stats["receive_queue_full"] += 1
+                await self._receive_queue.put(message)
+                depth = self._receive_queue.qsize()
+                if depth > self.stats["receive_queue_max"]:
+                    self.stats["receive_queue_max"] = depth
         except websockets.exceptions.ConnectionClosed as e:
             logger.warning(f"WebSocket connection closed: {e}")
             logger.warning("Will attempt to reconnect on next check")
             self.running = False
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
         except Exception as e:
             logger.error(f"Error in listen loop: {e}", exc_info=True)
             self.running = False
+        finally:
+            if cancelled:
+                parse_task.cancel()
+            else:
+                # Let the parser finish frames already received, then stop it
+                await self._receive_queue.put(None)
+                await parse_task
     
     async def disconnect(self):
         """Disconnect from the WebSocket."""
@@ -200,9 +297,22 @@ class OrderbookStream:
 class OrderbookLogger:
     """
     Service that combines WebSocket streaming with database logging.
+    
+    The stream's parse stage hands updates to a bounded normalize queue; normalized
+    rows go through a bounded persist queue to a single worker thread that inserts
+    them in batches, so database latency never blocks the event loop.
     """
     
-    def __init__(self, db, token_ids: List[str], market_info: Optional[Dict[str, Dict]] = None):
+    def __init__(
+        self,
+        db,
+        token_ids: List[str],
+        market_info: Optional[Dict[str, Dict]] = None,
+        queue_size: int = 1000,
+        batch_size: int = 100,
+        stats_interval: float = 60.0,
+        raw_sample_rate: Optional[float] = None,
+    ):
         """
         Initialize the orderbook logger.
         
@@ -211,171 +321,349 @@ class OrderbookLogger:
             token_ids: List of token IDs to monitor
             market_info: Optional dict mapping token_id to market metadata
                         {token_id: {"market_id": "...", "market_question": "...", "outcome": "..."}}
+            queue_size: Max items in each pipeline queue (default: 1000)
+            batch_size: Max snapshots per database transaction (default: 100)
+            stats_interval: Seconds between pipeline stats log lines, 0 to disable (default: 60)
+            raw_sample_rate: Fraction of raw RTDS payloads to keep in orderbook_raw_samples
+                        (default: ORDERBOOK_RAW_SAMPLE_RATE env var, or 0 = off)
         """
         self.db = db
         self.token_ids = token_ids
         self.market_info = market_info or {}
         self._update_count = {}  # Track update counts per token
         self.stream = None
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.stats_interval = stats_interval
+        if raw_sample_rate is None:
+            raw_sample_rate = float(os.getenv("ORDERBOOK_RAW_SAMPLE_RATE", "0"))
+        self.raw_sample_rate = raw_sample_rate
+        
+        self._normalize_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._persist_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._pipeline_tasks: List[asyncio.Task] = []
+        self._persist_executor: Optional[ThreadPoolExecutor] = None
+        self._metrics_handle: Optional[int] = None
+        # Normalize/persist stage counters
+        self.stats = {
+            "enqueued": 0,
+            "normalize_queue_full": 0,  # Times the parser had to wait for the normalizer
+            "normalized": 0,
+            "normalize_errors": 0,
+            "persist_queue_full": 0,    # Times the normalizer had to wait for the database
+            "persisted": 0,
+            "persist_errors": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "persist_seconds": 0.0,     # Total time spent in database writes
+        }
     
     async def _on_orderbook_update(self, token_id: str, orderbook_data: Dict[str, Any]):
         """
-        Callback for orderbook updates - saves to database.
+        Callback for orderbook updates - hands the update to the normalize stage.
         
         Args:
             token_id: The token ID
             orderbook_data: Orderbook data from RTDS
         """
-        try:
-            # Log first update to confirm we're receiving data
-            if token_id not in self._update_count:
-                logger.info(f"📥 Received first orderbook update for token {token_id[:20]}...")
-                logger.debug(f"Orderbook data keys: {list(orderbook_data.keys()) if isinstance(orderbook_data, dict) else 'N/A'}")
-            
-            # Parse orderbook data
-            # RTDS format may vary, but typically includes bids/asks
-            bids = orderbook_data.get("bids", [])
-            asks = orderbook_data.get("asks", [])
-            
-            # Handle different RTDS message formats
-            # Sometimes data is nested under 'data' key
-            if not bids and not asks:
-                if isinstance(orderbook_data, dict) and "data" in orderbook_data:
-                    nested_data = orderbook_data["data"]
-                    bids = nested_data.get("bids", [])
-                    asks = nested_data.get("asks", [])
-            
-            # Convert to list of [price, size] tuples if needed
-            if bids and isinstance(bids[0], dict):
-                bids = [[float(b["price"]), float(b["size"])] for b in bids]
-            elif bids and isinstance(bids[0], list):
-                # Already in [price, size] format
-                bids = [[float(b[0]), float(b[1])] for b in bids if len(b) >= 2]
-            
-            if asks and isinstance(asks[0], dict):
-                asks = [[float(a["price"]), float(a["size"])] for a in asks]
-            elif asks and isinstance(asks[0], list):
-                # Already in [price, size] format
-                asks = [[float(a[0]), float(a[1])] for a in asks if len(a) >= 2]
-            
-            # Get market info if available
-            market_meta = self.market_info.get(token_id, {})
+        if self._normalize_queue.full():
+            self.stats["normalize_queue_full"] += 1
+        await self._normalize_queue.put((token_id, orderbook_data, datetime.now(timezone.utc)))
+        self.stats["enqueued"] += 1
+    
+    def _normalize(
+        self, token_id: str, orderbook_data: Dict[str, Any], received_at: datetime
+    ) -> Tuple[Dict[str, Any], Optional[Tuple[int, str]]]:
+        """
+        Turn a raw RTDS update into save_snapshot() keyword arguments.
+        
+        Returns:
+            Tuple of (snapshot kwargs, (update number, price summary) if this update should be logged)
+        """
+        # Log first update to confirm we're receiving data
+        if token_id not in self._update_count:
+            logger.info(f"📥 Received first orderbook update for token {token_id[:20]}...")
+            logger.debug(f"Orderbook data keys: {list(orderbook_data.keys()) if isinstance(orderbook_data, dict) else 'N/A'}")
+        
+        # Parse orderbook data
+        # RTDS format may vary, but typically includes bids/asks
+        bids = orderbook_data.get("bids", [])
+        asks = orderbook_data.get("asks", [])
+        
+        # Handle different RTDS message formats
+        # Sometimes data is nested under 'data' key
+        if not bids and not asks:
+            if isinstance(orderbook_data, dict) and "data" in orderbook_data:
+                nested_data = orderbook_data["data"]
+                bids = nested_data.get("bids", [])
+                asks = nested_data.get("asks", [])
+        
+        # Convert to list of [price, size] floats
+        bids = json_codec.parse_levels(bids)
+        asks = json_codec.parse_levels(asks)
+        
+        # Get market info if available
+        market_meta = self.market_info.get(token_id, {})
+        
+        # Determine asset type from market question
+        asset_type = None
+        market_question = market_meta.get("market_question", "")
+        if market_question:
+            question_lower = market_question.lower()
+            if "bitcoin" in question_lower or "btc" in question_lower:
+                asset_type = "BTC"
+            elif "ethereum" in question_lower or "eth" in question_lower:
+                asset_type = "ETH"
+        
+        # Get market info for outcome_price
+        outcome_price = market_meta.get("outcome_price")
+        
+        # Extract last_trade_price from orderbook_data if available
+        last_trade_price = orderbook_data.get("last_trade_price")
+        if last_trade_price:
+            try:
+                last_trade_price = float(last_trade_price)
+            except:
+                last_trade_price = None
+        
+        # Calculate market price
+        market_price = None
+        if outcome_price is not None:
+            market_price = outcome_price
+        elif last_trade_price is not None:
+            market_price = last_trade_price
+        elif bids and asks:
+            best_bid = bids[0][0] if bids else None
+            best_ask = asks[0][0] if asks else None
+            if best_bid and best_ask:
+                market_price = (best_bid + best_ask) / 2
+        
+        # Prepare metadata with realistic prices
+        metadata = {
+            "source": "rtds",
+            "outcome_price": outcome_price,  # From Gamma API (what website shows)
+            "last_trade_price": last_trade_price,  # From CLOB API (most recent trade)
+            "market_price": market_price,  # Calculated: outcome_price > last_trade_price > mid_price
+        }
+        
+        snapshot = {
+            "token_id": token_id,
+            "bids": bids,
+            "asks": asks,
+            "market_id": market_meta.get("market_id"),
+            "market_question": market_meta.get("market_question"),
+            "outcome": market_meta.get("outcome"),
+            "metadata": metadata,
+            "market_start_date": market_meta.get("market_start_date"),
+            "market_end_date": market_meta.get("market_end_date"),
+            "asset_type": asset_type,
+            "timestamp": received_at,
+        }
+        # Raw payloads duplicate bids/asks; keep only an opt-in sample for debugging
+        if self.raw_sample_rate > 0 and random.random() < self.raw_sample_rate:
+            snapshot["raw_payload"] = orderbook_data
+        
+        # Log periodically (every 10th update) to avoid log spam
+        self._update_count[token_id] = self._update_count.get(token_id, 0) + 1
+        log_info = None
+        if self._update_count[token_id] % 10 == 1:
+            # Get best bid/ask from top of orderbook (may be stale)
+            best_bid_raw = bids[0][0] if bids else None
+            best_ask_raw = asks[0][0] if asks else None
             
-            # Determine asset type from market question
-            asset_type = None
-            market_question = market_meta.get("market_question", "")
-            if market_question:
-                question_lower = market_question.lower()
-                if "bitcoin" in question_lower or "btc" in question_lower:
-                    asset_type = "BTC"
-                elif "ethereum" in question_lower or "eth" in question_lower:
-                    asset_type = "ETH"
+            # Find best bid/ask near actual market price (like UI does)
+            from agents.polymarket.orderbook_utils import get_best_bid_ask_near_price
             
-            # Get market info for outcome_price
-            market_meta = self.market_info.get(token_id, {})
-            outcome_price = market_meta.get("outcome_price")
+            reference_price = outcome_price or last_trade_price or market_price
+            best_bid_near, best_ask_near = None, None
+            if reference_price and bids and asks:
+                # Convert to dict format if needed
+                bids_dict = bids if isinstance(bids[0], dict) else [{"price": str(b[0]), "size": str(b[1])} for b in bids]
+                asks_dict = asks if isinstance(asks[0], dict) else [{"price": str(a[0]), "size": str(a[1])} for a in asks]
+                best_bid_near, best_ask_near = get_best_bid_ask_near_price(
+                    bids_dict, asks_dict, reference_price, max_spread_pct=0.15
+                )
             
-            # Extract last_trade_price from orderbook_data if available
-            last_trade_price = orderbook_data.get("last_trade_price")
-            if last_trade_price:
-                try:
-                    last_trade_price = float(last_trade_price)
-                except:
-                    last_trade_price = None
+            # Show meaningful prices: outcome_price > market_price > last_trade_price > bid/ask
+            price_parts = []
             
-            # Calculate market price
-            market_price = None
             if outcome_price is not None:
-                market_price = outcome_price
-            elif last_trade_price is not None:
-                market_price = last_trade_price
-            elif bids and asks:
-                best_bid = bids[0][0] if bids else None
-                best_ask = asks[0][0] if asks else None
-                if best_bid and best_ask:
-                    market_price = (best_bid + best_ask) / 2
+                price_parts.append(f"Outcome: {outcome_price:.4f} (website)")
+            if market_price is not None:
+                price_parts.append(f"Market: {market_price:.4f}")
+            if last_trade_price is not None:
+                price_parts.append(f"LastTrade: {last_trade_price:.4f}")
             
-            # Prepare metadata with realistic prices
-            metadata = {
-                "source": "rtds",
-                "raw_data": orderbook_data,
-                "outcome_price": outcome_price,  # From Gamma API (what website shows)
-                "last_trade_price": last_trade_price,  # From CLOB API (most recent trade)
-                "market_price": market_price,  # Calculated: outcome_price > last_trade_price > mid_price
-            }
+            # Show best bid/ask near market price (like UI shows)
+            if best_bid_near and best_ask_near:
+                spread = best_ask_near - best_bid_near
+                price_parts.append(f"Bid/Ask: {best_bid_near:.4f}/{best_ask_near:.4f} (near market)")
+                if best_bid_raw and best_ask_raw and (abs(best_bid_raw - best_bid_near) > 0.1 or abs(best_ask_raw - best_ask_near) > 0.1):
+                    price_parts.append(f"[raw: {best_bid_raw:.2f}/{best_ask_raw:.2f}]")
+            elif best_bid_raw and best_ask_raw:
+                spread = best_ask_raw - best_bid_raw
+                if spread > 0.1:
+                    price_parts.append(f"Bid/Ask: {best_bid_raw:.2f}/{best_ask_raw:.2f} (wide spread!)")
+                else:
+                    price_parts.append(f"Bid/Ask: {best_bid_raw:.4f}/{best_ask_raw:.4f}")
             
-            # Save to database
-            snapshot = self.db.save_snapshot(
-                token_id=token_id,
-                bids=bids,
-                asks=asks,
-                market_id=market_meta.get("market_id"),
-                market_question=market_meta.get("market_question"),
-                outcome=market_meta.get("outcome"),
-                metadata=metadata,
-                market_start_date=market_meta.get("market_start_date"),
-                market_end_date=market_meta.get("market_end_date"),
-                asset_type=asset_type,
-            )
+            price_info = " | ".join(price_parts) if price_parts else "No price data"
+            log_info = (self._update_count[token_id], price_info)
+        
+        return snapshot, log_info
+    
+    async def _normalize_loop(self):
+        """Normalize stage: parse bids/asks and prices, then queue rows for persistence."""
+        while True:
+            token_id, orderbook_data, received_at = await self._normalize_queue.get()
+            try:
+                item = self._normalize(token_id, orderbook_data, received_at)
+                self.stats["normalized"] += 1
+                if self._persist_queue.full():
+                    self.stats["persist_queue_full"] += 1
+                await self._persist_queue.put(item)
+            except Exception as e:
+                self.stats["normalize_errors"] += 1
+                logger.error(f"❌ Error normalizing orderbook update for {token_id}: {e}", exc_info=True)
+                # Log the orderbook data structure for debugging
+                logger.error(f"Orderbook data structure: {type(orderbook_data)}, keys: {list(orderbook_data.keys()) if isinstance(orderbook_data, dict) else 'N/A'}")
+                logger.error(f"Full orderbook data: {orderbook_data}")
+            finally:
+                self._normalize_queue.task_done()
+    
+    def _persist_batch(self, snapshots: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """Insert a batch in one transaction; on failure retry rows one by one. Runs in the worker thread."""
+        try:
+            return self.db.save_snapshots(snapshots)
+        except Exception as e:
+            if len(snapshots) == 1:
+                logger.error(f"❌ Error saving orderbook update for {snapshots[0]['token_id']}: {e}", exc_info=True)
+                return [None]
+            logger.warning(f"⚠️ Batch insert of {len(snapshots)} snapshots failed ({e}), retrying individually")
+        
+        ids = []
+        for snapshot in snapshots:
+            try:
+                ids.extend(self.db.save_snapshots([snapshot]))
+            except Exception as e:
+                logger.error(f"❌ Error saving orderbook update for {snapshot['token_id']}: {e}", exc_info=True)
+                ids.append(None)
+        return ids
+    
+    async def _persist_loop(self):
+        """Persist stage: drain whatever is queued (up to batch_size) and insert it off-loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._persist_queue.get()]
+            while len(batch) < self.batch_size and not self._persist_queue.empty():
+                batch.append(self._persist_queue.get_nowait())
             
-            # Log periodically (every 10th update) to avoid log spam
-            self._update_count[token_id] = self._update_count.get(token_id, 0) + 1
-            if self._update_count[token_id] % 10 == 1:
-                # Get best bid/ask from top of orderbook (may be stale)
-                best_bid_raw = bids[0][0] if bids else None
-                best_ask_raw = asks[0][0] if asks else None
-                
-                # Find best bid/ask near actual market price (like UI does)
-                from agents.polymarket.orderbook_utils import get_best_bid_ask_near_price
-                
-                reference_price = outcome_price or last_trade_price or market_price
-                best_bid_near, best_ask_near = None, None
-                if reference_price and bids and asks:
-                    # Convert to dict format if needed
-                    bids_dict = bids if isinstance(bids[0], dict) else [{"price": str(b[0]), "size": str(b[1])} for b in bids]
-                    asks_dict = asks if isinstance(asks[0], dict) else [{"price": str(a[0]), "size": str(a[1])} for a in asks]
-                    best_bid_near, best_ask_near = get_best_bid_ask_near_price(
-                        bids_dict, asks_dict, reference_price, max_spread_pct=0.15
-                    )
-                
-                # Show meaningful prices: outcome_price > market_price > last_trade_price > bid/ask
-                price_parts = []
-                
-                if outcome_price is not None:
-                    price_parts.append(f"Outcome: {outcome_price:.4f} (website)")
-                if market_price is not None:
-                    price_parts.append(f"Market: {market_price:.4f}")
-                if last_trade_price is not None:
-                    price_parts.append(f"LastTrade: {last_trade_price:.4f}")
-                
-                # Show best bid/ask near market price (like UI shows)
-                if best_bid_near and best_ask_near:
-                    spread = best_ask_near - best_bid_near
-                    price_parts.append(f"Bid/Ask: {best_bid_near:.4f}/{best_ask_near:.4f} (near market)")
-                    if best_bid_raw and best_ask_raw and (abs(best_bid_raw - best_bid_near) > 0.1 or abs(best_ask_raw - best_ask_near) > 0.1):
-                        price_parts.append(f"[raw: {best_bid_raw:.2f}/{best_ask_raw:.2f}]")
-                elif best_bid_raw and best_ask_raw:
-                    spread = best_ask_raw - best_bid_raw
-                    if spread > 0.1:
-                        price_parts.append(f"Bid/Ask: {best_bid_raw:.2f}/{best_ask_raw:.2f} (wide spread!)")
-                    else:
-                        price_parts.append(f"Bid/Ask: {best_bid_raw:.4f}/{best_ask_raw:.4f}")
-                
-                price_info = " | ".join(price_parts) if price_parts else "No price data"
+            try:
+                start = time.monotonic()
+                ids = await loop.run_in_executor(
+                    self._persist_executor, self._persist_batch, [snapshot for snapshot, _ in batch]
+                )
+                self.stats["persist_seconds"] += time.monotonic() - start
+                self.stats["batches"] += 1
+                self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
                 
-                logger.info(f"✓ Saved orderbook snapshot #{self._update_count[token_id]} (DB ID: {snapshot.id}) for token {token_id[:20]}... | {price_info}")
-            
-        except Exception as e:
-            logger.error(f"❌ Error saving orderbook update for {token_id}: {e}", exc_info=True)
-            # Log the orderbook data structure for debugging
-            logger.error(f"Orderbook data structure: {type(orderbook_data)}, keys: {list(orderbook_data.keys()) if isinstance(orderbook_data, dict) else 'N/A'}")
-            logger.error(f"Full orderbook data: {orderbook_data}")
+                for (snapshot, log_info), snapshot_id in zip(batch, ids):
+                    if snapshot_id is None:
+                        self.stats["persist_errors"] += 1
+                        continue
+                    self.stats["persisted"] += 1
+                    if log_info:
+                        update_number, price_info = log_info
+                        logger.info(f"✓ Saved orderbook snapshot #{update_number} (DB ID: {snapshot_id}) for token {snapshot['token_id'][:20]}... | {price_info}")
+            finally:
+                for _ in batch:
+                    self._persist_queue.task_done()
+    
+    async def _stats_loop(self):
+        """Periodically log pipeline counters."""
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            stats = self.get_pipeline_stats()
+            logger.info(
+                f"📊 Orderbook pipeline: received={stats['received']} parsed={stats['parsed']} "
+                f"normalized={stats['normalized']} persisted={stats['persisted']} "
+                f"(errors: normalize={stats['normalize_errors']}, persist={stats['persist_errors']}) | "
+                f"queues receive={stats['receive_queue']} normalize={stats['normalize_queue']} "
+                f"persist={stats['persist_queue']} | waits receive={stats['receive_queue_full']} "
+                f"normalize={stats['normalize_queue_full']} persist={stats['persist_queue_full']} | "
+                f"batches={stats['batches']} max_batch={stats['max_batch']} "
+                f"db_time={stats['persist_seconds']:.1f}s"
+            )
+    
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """
+        Per-stage counters and current queue depths.
+        
+        A growing queue or "*_queue_full" counter marks the stage that can't keep up:
+        receive_queue_full -> parsing is slow, normalize_queue_full -> normalization is slow,
+        persist_queue_full -> the database is slow.
+        """
+        stream_stats = self.stream.stats if self.stream else {}
+        receive_queue = self.stream._receive_queue if self.stream else None
+        return {
+            "received": stream_stats.get("received", 0),
+            "parsed": stream_stats.get("parsed", 0),
+            "receive_queue_full": stream_stats.get("receive_queue_full", 0),
+            "receive_queue_max": stream_stats.get("receive_queue_max", 0),
+            "receive_queue": receive_queue.qsize() if receive_queue else 0,
+            "normalize_queue": self._normalize_queue.qsize(),
+            "persist_queue": self._persist_queue.qsize(),
+            **self.stats,
+        }
+    
+    def _start_pipeline(self):
+        """Start the normalize/persist (and stats) tasks if not already running."""
+        if self._pipeline_tasks:
+            return
+        self._persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="orderbook-persist")
+        self._pipeline_tasks = [
+            asyncio.create_task(self._normalize_loop()),
+            asyncio.create_task(self._persist_loop()),
+        ]
+        if self.stats_interval > 0:
+            self._pipeline_tasks.append(asyncio.create_task(self._stats_loop()))
+        self._metrics_handle = metrics.register_callback("orderbook_pipeline_queue_depth", self._queue_depths)
+    
+    def _queue_depths(self) -> List:
+        """(labels, depth) per pipeline stage, for the metrics endpoint."""
+        stats = self.get_pipeline_stats()
+        pipeline = self.db.table_label
+        return [
+            ({"pipeline": pipeline, "stage": stage}, stats[f"{stage}_queue"])
+            for stage in ("receive", "normalize", "persist")
+        ]
+    
+    async def _stop_pipeline(self, timeout: float = 10.0):
+        """Flush queued updates to the database, then stop the pipeline tasks."""
+        if not self._pipeline_tasks:
+            return
+        tasks, self._pipeline_tasks = self._pipeline_tasks, []
+        metrics.unregister_callback(self._metrics_handle)
+        self._metrics_handle = None
+        try:
+            await asyncio.wait_for(self._normalize_queue.join(), timeout)
+            await asyncio.wait_for(self._persist_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"⚠️ Timed out flushing orderbook pipeline "
+                f"({self._normalize_queue.qsize() + self._persist_queue.qsize()} updates dropped)"
+            )
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._persist_executor:
+            self._persist_executor.shutdown(wait=False)
+            self._persist_executor = None
     
     async def start(self):
         """Start logging orderbook updates."""
         # Get API credentials from Polymarket if monitoring script wallet key is available
         api_credentials = None
-        import os
         # Use separate wallet key for monitoring script (not trading script)
         monitoring_wallet_key = os.getenv("POLYGON_WALLET_MONITORING_SCRIPT_PRIVATE_KEY")
         if monitoring_wallet_key:
@@ -405,22 +693,27 @@ class OrderbookLogger:
         
         self.stream = OrderbookStream(
             on_orderbook_update=self._on_orderbook_update,
-            api_credentials=api_credentials
+            api_credentials=api_credentials,
+            receive_queue_size=self.queue_size,
         )
         
-        await self.stream.connect()
-        
-        # Subscribe to all tokens
-        for token_id in self.token_ids:
-            await self.stream.subscribe_to_orderbook(token_id)
-        
-        # Start listening
-        await self.stream.listen()
+        self._start_pipeline()
+        try:
+            await self.stream.connect()
+            
+            # Subscribe to all tokens
+            await self.stream.subscribe_to_orderbooks(self.token_ids)
+            
+            # Start listening
+            await self.stream.listen()
+        finally:
+            await self._stop_pipeline()
     
     async def stop(self):
-        """Stop logging."""
+        """Stop logging (flushes updates still queued in the pipeline)."""
         if self.stream:
             await self.stream.disconnect()
+        await self._stop_pipeline()
 
 
 async def run_orderbook_logger(token_ids: List[str], db_path: Optional[str] = None):
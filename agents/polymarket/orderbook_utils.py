@@ -3,6 +3,7 @@ Utilities for getting meaningful prices from orderbook data.
 The raw CLOB best_bid/best_ask can be misleading due to sparse liquidity.
 """
 import httpx
+import itertools
 import logging
 from typing import Optional, Tuple, Dict, Any
 
@@ -247,3 +248,23 @@ def find_best_price_in_range(
         logger.error(f"Error finding best price in range: {e}")
         return None, None
 
+
+def side_fingerprint(levels: list, depth: int = 0) -> int:
+    """
+    64-bit fingerprint of one orderbook side.
+    
+    Hashes the level count plus the top `depth` [price, size] levels, so "did this side
+    change in its top N levels (or gain/lose levels)?" becomes an integer compare and
+    the previous book doesn't need to be kept. Levels parsed from the CLOB's decimal
+    strings are already exact, so the floats are hashed as-is (deterministic across
+    processes - float/int hashes aren't randomized).
+    
+    Args:
+        levels: Parsed levels [[price, size], ...], best first
+        depth: Number of top levels to include (0 = all)
+        
+    Returns:
+        Unsigned 64-bit fingerprint
+    """
+    top = levels[:depth] if depth else levels
+    return hash((len(levels), *itertools.chain.from_iterable(top))) & 0xFFFFFFFFFFFFFFFF
@@ -4,6 +4,7 @@
 import os
 import pdb
 import time
+import threading
 import ast
 import requests
 import logging
@@ -42,6 +43,8 @@ class PostOrdersArgs:
     orderType: OrderType
 
 from agents.utils.objects import SimpleMarket, SimpleEvent
+from agents.polymarket.multicall import MulticallReader
+from agents.polymarket.transaction_manager import TransactionManager
 
 load_dotenv()
 
@@ -112,6 +115,11 @@ class Polymarket:
         self.ctf = self.web3.eth.contract(
             address=self.ctf_address, abi=self.ctf_abi
         )
+        # Batched view calls (many balances/allowances in one eth_call)
+        self.multicall = MulticallReader(self.web3)
+        # Every signed transaction goes through one TransactionManager (shared nonce sequence)
+        self.tx_manager: Optional[TransactionManager] = None
+        self._tx_manager_lock = threading.Lock()
 
         self._init_api_keys()
         self._init_approvals(False)
@@ -166,110 +174,50 @@ class Polymarket:
         if not run:
             return
 
-        priv_key = self.private_key
-        pub_key = self.get_address_for_private_key()
-        chain_id = self.chain_id
-        web3 = self.web3
-        nonce = web3.eth.get_transaction_count(pub_key)
         usdc = self.usdc
         ctf = self.ctf
 
-        # CTF Exchange
-        raw_usdc_approve_txn = usdc.functions.approve(
-            "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E", int(MAX_INT, 0)
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_usdc_approve_tx = web3.eth.account.sign_transaction(
-            raw_usdc_approve_txn, private_key=priv_key
-        )
-        send_usdc_approve_tx = web3.eth.send_raw_transaction(
-            signed_usdc_approve_tx.raw_transaction
-        )
-        usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_usdc_approve_tx, 600
-        )
-        print(usdc_approve_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        raw_ctf_approval_txn = ctf.functions.setApprovalForAll(
-            "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E", True
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_ctf_approval_tx = web3.eth.account.sign_transaction(
-            raw_ctf_approval_txn, private_key=priv_key
-        )
-        send_ctf_approval_tx = web3.eth.send_raw_transaction(
-            signed_ctf_approval_tx.raw_transaction
-        )
-        ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_ctf_approval_tx, 600
-        )
-        print(ctf_approval_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
-
-        # Neg Risk CTF Exchange
-        raw_usdc_approve_txn = usdc.functions.approve(
-            "0xC5d563A36AE78145C45a50134d48A1215220f80a", int(MAX_INT, 0)
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_usdc_approve_tx = web3.eth.account.sign_transaction(
-            raw_usdc_approve_txn, private_key=priv_key
-        )
-        send_usdc_approve_tx = web3.eth.send_raw_transaction(
-            signed_usdc_approve_tx.raw_transaction
-        )
-        usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_usdc_approve_tx, 600
-        )
-        print(usdc_approve_tx_receipt)
-
-        nonce = web3.eth.get_transaction_count(pub_key)
+        # CTF Exchange, Neg Risk CTF Exchange, Neg Risk Adapter
+        for spender in (
+            "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E",
+            "0xC5d563A36AE78145C45a50134d48A1215220f80a",
+            "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296",
+        ):
+            usdc_approve_tx_receipt = self._send_transaction(
+                usdc.functions.approve(spender, int(MAX_INT, 0)), description="usdc_approve"
+            )
+            print(usdc_approve_tx_receipt)
 
-        raw_ctf_approval_txn = ctf.functions.setApprovalForAll(
-            "0xC5d563A36AE78145C45a50134d48A1215220f80a", True
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_ctf_approval_tx = web3.eth.account.sign_transaction(
-            raw_ctf_approval_txn, private_key=priv_key
-        )
-        send_ctf_approval_tx = web3.eth.send_raw_transaction(
-            signed_ctf_approval_tx.raw_transaction
-        )
-        ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_ctf_approval_tx, 600
-        )
-        print(ctf_approval_tx_receipt)
+            ctf_approval_tx_receipt = self._send_transaction(
+                ctf.functions.setApprovalForAll(spender, True), description="ctf_set_approval_for_all"
+            )
+            print(ctf_approval_tx_receipt)
 
-        nonce = web3.eth.get_transaction_count(pub_key)
+    def get_transaction_manager(self, **kwargs) -> TransactionManager:
+        """
+        Get the wallet's TransactionManager, creating it on first use.
 
-        # Neg Risk Adapter
-        raw_usdc_approve_txn = usdc.functions.approve(
-            "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296", int(MAX_INT, 0)
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_usdc_approve_tx = web3.eth.account.sign_transaction(
-            raw_usdc_approve_txn, private_key=priv_key
-        )
-        send_usdc_approve_tx = web3.eth.send_raw_transaction(
-            signed_usdc_approve_tx.raw_transaction
-        )
-        usdc_approve_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_usdc_approve_tx, 600
-        )
-        print(usdc_approve_tx_receipt)
+        Args:
+            **kwargs: Passed to TransactionManager when it is created (gas_price_ttl, receipt_timeout, ...)
 
-        nonce = web3.eth.get_transaction_count(pub_key)
+        Returns:
+            The shared TransactionManager instance
+        """
+        with self._tx_manager_lock:
+            if self.tx_manager is None:
+                if not self.private_key:
+                    raise ValueError("Cannot send transactions: no private key available")
+                self.tx_manager = TransactionManager(self.web3, self.private_key, self.chain_id, **kwargs)
+            return self.tx_manager
+
+    def _send_transaction(self, call, gas: Optional[int] = None, description: str = ""):
+        """
+        Sign and send a contract call through the TransactionManager and block for its receipt.
 
-        raw_ctf_approval_txn = ctf.functions.setApprovalForAll(
-            "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296", True
-        ).build_transaction({"chainId": chain_id, "from": pub_key, "nonce": nonce})
-        signed_ctf_approval_tx = web3.eth.account.sign_transaction(
-            raw_ctf_approval_txn, private_key=priv_key
-        )
-        send_ctf_approval_tx = web3.eth.send_raw_transaction(
-            signed_ctf_approval_tx.raw_transaction
-        )
-        ctf_approval_tx_receipt = web3.eth.wait_for_transaction_receipt(
-            send_ctf_approval_tx, 600
-        )
-        print(ctf_approval_tx_receipt)
+        Raises:
+            TimeoutError: No receipt within the manager's receipt_timeout
+        """
+        return self.get_transaction_manager().send_and_wait_sync(call, gas=gas, description=description)
 
     def get_all_markets(self) -> "list[SimpleMarket]":
         markets = []
@@ -1021,8 +969,6 @@ class Polymarket:
             Transaction receipt dict, or None if error
         """
         try:
-            wallet_address = self.get_address_for_private_key()
-            
             if amount_usdc is None:
                 # Approve max amount (2^256 - 1)
                 from decimal import Decimal
@@ -1033,30 +979,13 @@ class Polymarket:
                 amount_raw = int(amount_usdc * 1e6)
                 logger.info(f"Approving ${amount_usdc:.2f} USDC for CTF contract...")
             
-            # Build approval transaction
-            nonce = self.web3.eth.get_transaction_count(wallet_address)
-            
-            approve_txn = self.usdc.functions.approve(
-                self.ctf_address,
-                amount_raw
-            ).build_transaction({
-                "chainId": self.chain_id,
-                "from": wallet_address,
-                "nonce": nonce,
-                "gas": 100000,  # Standard gas limit for approve
-                "gasPrice": self.web3.eth.gas_price
-            })
-            
-            # Sign and send transaction
-            signed_txn = self.web3.eth.account.sign_transaction(
-                approve_txn, private_key=self.private_key
+            # Send approval (standard gas limit for approve) and wait for the receipt
+            receipt = self._send_transaction(
+                self.usdc.functions.approve(self.ctf_address, amount_raw),
+                gas=100000,
+                description="approve_usdc_for_ctf",
             )
-            
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
-            logger.info(f"⏳ Approval transaction sent: {tx_hash.hex()}")
-            
-            # Wait for transaction receipt
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=300)
+            tx_hash = receipt.transactionHash
             
             if receipt.status == 1:
                 logger.info(f"✅ USDC approval successful! Transaction: {tx_hash.hex()}")
@@ -1199,6 +1128,141 @@ class Polymarket:
             )
             return None
     
+    def _multicall_with_retry(self, read_fn, description: str, retry_on_rate_limit: bool = True):
+        """
+        Run a batched multicall read, backing off on RPC rate limits.
+        
+        Args:
+            read_fn: Zero-argument callable performing the MulticallReader read
+            description: Label used in logs
+            retry_on_rate_limit: If True, retry with backoff on rate limit errors (default: True)
+        
+        Returns:
+            Result of read_fn, or None if the batch could not be read
+        """
+        max_retries = 3 if retry_on_rate_limit else 1
+        retry_delays = [10.0, 20.0, 30.0]  # Wait times for rate limit retries
+        
+        for attempt in range(max_retries):
+            try:
+                return read_fn()
+            except Exception as e:
+                error_str = str(e)
+                if ('rate limit' in error_str.lower() or '-32090' in error_str) and attempt < max_retries - 1:
+                    delay = retry_delays[min(attempt, len(retry_delays) - 1)]
+                    logger.warning(
+                        f"  ⚠️ Rate limit error reading {description} (attempt {attempt + 1}/{max_retries}). "
+                        f"Waiting {delay}s before retry..."
+                    )
+                    time.sleep(delay)
+                    continue
+                logger.error(f"❌ Error reading {description} via multicall: {e}")
+                return None
+        return None
+    
+    def get_conditional_token_balances(
+        self,
+        token_ids: List[str],
+        wallet_address: Optional[str] = None,
+        retry_on_rate_limit: bool = True
+    ) -> Dict[str, Optional[float]]:
+        """
+        Get balances of many conditional tokens (ERC1155) in a single RPC round-trip.
+        
+        Batched version of get_conditional_token_balance() using Multicall3.
+        
+        Args:
+            token_ids: CLOB token IDs (uint256 strings)
+            wallet_address: Optional wallet address. If not provided, uses proxy wallet or direct wallet.
+            retry_on_rate_limit: If True, retry with backoff on rate limit errors (default: True)
+        
+        Returns:
+            Dict mapping token_id -> balance as float (number of shares), or None if unavailable
+        """
+        token_ids = list(dict.fromkeys(token_ids))  # dedupe, keep order
+        if not token_ids:
+            return {}
+        
+        if wallet_address:
+            address_to_check = wallet_address
+        elif self.proxy_wallet_address:
+            address_to_check = self.proxy_wallet_address
+        else:
+            address_to_check = self.get_address_for_private_key()
+        
+        raw_balances = self._multicall_with_retry(
+            lambda: self.multicall.erc1155_balances(self.ctf, address_to_check, token_ids),
+            f"{len(token_ids)} conditional token balances",
+            retry_on_rate_limit=retry_on_rate_limit,
+        )
+        if raw_balances is None:
+            return {token_id: None for token_id in token_ids}
+        
+        # ERC1155 conditional tokens on Polymarket use 1e6 (6 decimals)
+        balances = {
+            token_id: (float(raw) / 1e6 if raw is not None else None)
+            for token_id, raw in zip(token_ids, raw_balances)
+        }
+        logger.debug(
+            f"🔍 Read {len(balances)} conditional token balances in one call "
+            f"(wallet={address_to_check[:10]}...{address_to_check[-8:]})"
+        )
+        return balances
+    
+    def check_conditional_token_allowances(
+        self,
+        exchange_addresses: List[str],
+        wallet_address: Optional[str] = None
+    ) -> Dict[str, Optional[bool]]:
+        """
+        Check conditional token (ERC1155) approvals for several exchange contracts in one RPC call.
+        
+        Batched version of check_conditional_token_allowance() using Multicall3.
+        
+        Args:
+            exchange_addresses: Exchange contract addresses to check approval for
+            wallet_address: Optional wallet address. If not provided, uses proxy wallet or direct wallet.
+        
+        Returns:
+            Dict mapping exchange_address -> True/False, or None if the check failed
+        """
+        if wallet_address:
+            address_to_check = wallet_address
+        elif self.proxy_wallet_address:
+            address_to_check = self.proxy_wallet_address
+        else:
+            address_to_check = self.get_address_for_private_key()
+        
+        approvals = self._multicall_with_retry(
+            lambda: self.multicall.erc1155_approvals(self.ctf, address_to_check, exchange_addresses),
+            "conditional token allowances",
+        )
+        if approvals is None:
+            return {exchange_address: None for exchange_address in exchange_addresses}
+        return dict(zip(exchange_addresses, approvals))
+    
+    def get_usdc_balances(self, wallet_addresses: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Get USDC.e balances for several wallets (e.g. direct + proxy) in one RPC call.
+        
+        Args:
+            wallet_addresses: Wallet addresses to check
+        
+        Returns:
+            Dict mapping wallet_address -> USDC balance as float, or None if unavailable
+        """
+        raw_balances = self._multicall_with_retry(
+            lambda: self.multicall.erc20_balances(self.usdc, wallet_addresses),
+            "USDC balances",
+        )
+        if raw_balances is None:
+            return {address: None for address in wallet_addresses}
+        # USDC has 6 decimals
+        return {
+            address: (float(raw) / 1e6 if raw is not None else None)
+            for address, raw in zip(wallet_addresses, raw_balances)
+        }
+    
     def ensure_conditional_token_allowances(self, wallet_address: Optional[str] = None) -> bool:
         """
         Ensure conditional token allowances are set for all required exchange contracts.
@@ -1242,8 +1306,12 @@ class Polymarket:
             all_approved = True
             approval_results = []
             
+            # One multicall for all exchanges instead of an eth_call per exchange
+            approvals = self.check_conditional_token_allowances(
+                [exchange_addr for exchange_addr, _ in exchange_addresses], address_to_check
+            )
             for exchange_addr, exchange_name in exchange_addresses:
-                is_approved = self.check_conditional_token_allowance(exchange_addr, address_to_check)
+                is_approved = approvals.get(exchange_addr)
                 if is_approved is None:
                     logger.warning(f"  ⚠️ Could not check allowance for {exchange_name} ({exchange_addr[:10]}...)")
                     approval_results.append((exchange_name, exchange_addr, None))
@@ -1311,8 +1379,11 @@ class Polymarket:
                             
                             logger.info("🔄 Re-checking conditional token allowances after setting them...")
                             all_approved = True
+                            approvals = self.check_conditional_token_allowances(
+                                [exchange_addr for exchange_addr, _ in exchange_addresses], address_to_check
+                            )
                             for exchange_addr, exchange_name in exchange_addresses:
-                                is_approved = self.check_conditional_token_allowance(exchange_addr, address_to_check)
+                                is_approved = approvals.get(exchange_addr)
                                 if is_approved is False:
                                     all_approved = False
                                     logger.warning(f"  ⚠️ Approval still not set for {exchange_name} - transaction may still be pending")
@@ -1376,50 +1447,19 @@ class Polymarket:
                 f"for wallet {wallet_address[:10]}...{wallet_address[-8:]}"
             )
             
-            # Build transaction
-            # Get nonce with 'pending' to include pending transactions
-            nonce = self.web3.eth.get_transaction_count(wallet_address, 'pending')
-            logger.debug(f"   Using nonce: {nonce} for approval transaction")
-            
-            approval_txn = self.ctf.functions.setApprovalForAll(
-                exchange_address, True
-            ).build_transaction({
-                "chainId": self.chain_id,
-                "from": wallet_address,
-                "nonce": nonce,
-                "gas": 100000,  # Reasonable gas limit for setApprovalForAll
-                "gasPrice": self.web3.eth.gas_price
-            })
-            
-            # Sign transaction
-            signed_txn = self.web3.eth.account.sign_transaction(
-                approval_txn, private_key=self.private_key
-            )
-            
-            # Send transaction
-            raw_tx = getattr(signed_txn, 'raw_transaction', None) or getattr(signed_txn, 'rawTransaction', None)
-            if not raw_tx:
-                raise ValueError("Could not extract raw transaction from signed transaction")
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            logger.info(f"Transaction sent: {tx_hash.hex()}")
-            logger.info(f"Polygonscan: https://polygonscan.com/tx/{tx_hash.hex()}")
-            
-            # Wait for receipt
-            logger.info(f"⏳ Waiting for transaction receipt (timeout: 300s)...")
+            # Send (reasonable gas limit for setApprovalForAll) and wait for the receipt
+            logger.info(f"⏳ Waiting for transaction receipt...")
             try:
-                receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=300)
-                logger.info(f"✅ Transaction receipt received! Status: {receipt.status}")
-            except Exception as e:
-                logger.warning(f"⚠️ Timeout waiting for receipt, trying direct fetch: {e}")
-                try:
-                    receipt = self.web3.eth.get_transaction_receipt(tx_hash)
-                    logger.info(f"✅ Retrieved receipt directly! Status: {receipt.status}")
-                except Exception as get_error:
-                    logger.error(
-                        f"❌ Could not retrieve transaction receipt: {get_error}. "
-                        f"Transaction may still be pending. Check Polygonscan: https://polygonscan.com/tx/{tx_hash.hex()}"
-                    )
-                    return False
+                receipt = self._send_transaction(
+                    self.ctf.functions.setApprovalForAll(exchange_address, True),
+                    gas=100000,
+                    description=f"set_approval_for_all ({exchange_name})",
+                )
+            except TimeoutError as e:
+                logger.error(f"❌ Could not retrieve transaction receipt: {e}. Transaction may still be pending.")
+                return False
+            tx_hash = receipt.transactionHash
+            logger.info(f"✅ Transaction receipt received! Status: {receipt.status}")
             
             if receipt.status == 1:
                 logger.info(
@@ -1438,16 +1478,82 @@ class Polymarket:
                 return False
                 
         except Exception as e:
-            logger.error(
-                f"❌ Error setting conditional token approval for {exchange_name}: {e}",
-                exc_info=True
-            )
             logger.error(
                 f"❌ Error setting conditional token approval for {exchange_name}: {e}",
                 exc_info=True
             )
             return False
     
+    @staticmethod
+    def _condition_id_to_bytes32(condition_id) -> bytes:
+        """
+        Convert a condition ID to bytes32.
+        
+        Condition ID from API can be:
+        - Hex string (with or without 0x prefix)
+        - Integer string
+        - Integer
+        """
+        if isinstance(condition_id, str):
+            condition_id_str = condition_id.strip()
+            if condition_id_str.startswith('0x'):
+                # Hex string with 0x prefix, padded to 64 hex chars (32 bytes)
+                condition_id_bytes32 = bytes.fromhex(condition_id_str[2:].zfill(64))
+            elif all(c in '0123456789abcdefABCDEF' for c in condition_id_str):
+                # Hex string without 0x prefix
+                condition_id_bytes32 = bytes.fromhex(condition_id_str.zfill(64))
+            else:
+                # Integer string - convert to bytes32
+                condition_id_bytes32 = int(condition_id_str).to_bytes(32, byteorder='big')
+        else:
+            # Assume it's already an integer
+            condition_id_bytes32 = int(condition_id).to_bytes(32, byteorder='big')
+        
+        # Ensure it's exactly 32 bytes
+        if len(condition_id_bytes32) < 32:
+            condition_id_bytes32 = condition_id_bytes32.rjust(32, b'\x00')
+        elif len(condition_id_bytes32) > 32:
+            condition_id_bytes32 = condition_id_bytes32[-32:]
+        return condition_id_bytes32
+    
+    def build_split_call(self, condition_id: str, amount_usdc: float):
+        """
+        Build (but don't send) a CTF splitPosition call for a binary market.
+        
+        Args:
+            condition_id: Condition ID (bytes32) from market data
+            amount_usdc: Amount of USDC to split
+            
+        Returns:
+            Contract function call (use .build_transaction or TransactionManager.submit)
+        """
+        return self.ctf.functions.splitPosition(
+            self.usdc_address,
+            b'\x00' * 32,  # parentCollectionId: bytes32(0) for Polymarket
+            self._condition_id_to_bytes32(condition_id),
+            [1, 2],  # Binary market: YES (1) and NO (2)
+            int(amount_usdc * 1e6),
+        )
+    
+    def build_merge_call(self, condition_id: str, amount_usdc: float):
+        """
+        Build (but don't send) a CTF mergePositions call for a binary market.
+        
+        Args:
+            condition_id: Condition ID (bytes32) from market data
+            amount_usdc: Amount of shares to merge (X YES + X NO → $X USDC)
+            
+        Returns:
+            Contract function call (use .build_transaction or TransactionManager.submit)
+        """
+        return self.ctf.functions.mergePositions(
+            self.usdc_address,
+            b'\x00' * 32,  # parentCollectionId: bytes32(0) for Polymarket
+            self._condition_id_to_bytes32(condition_id),
+            [1, 2],  # Binary market: YES (1) and NO (2)
+            int(amount_usdc * 1e6),
+        )
+    
     def split_position(
         self,
         condition_id: str,
@@ -1474,38 +1580,6 @@ class Polymarket:
                 f"amount=${amount_usdc:.2f}, condition_id={condition_id[:20]}..."
             )
             
-            # Convert condition_id to bytes32
-            # Condition ID from API can be:
-            # - Hex string (with or without 0x prefix)
-            # - Integer string
-            # - Integer
-            if isinstance(condition_id, str):
-                condition_id_str = condition_id.strip()
-                if condition_id_str.startswith('0x'):
-                    # Hex string with 0x prefix
-                    hex_str = condition_id_str[2:]
-                    # Pad to 64 hex chars (32 bytes) if needed
-                    hex_str = hex_str.zfill(64)
-                    condition_id_bytes32 = bytes.fromhex(hex_str)
-                elif all(c in '0123456789abcdefABCDEF' for c in condition_id_str):
-                    # Hex string without 0x prefix
-                    hex_str = condition_id_str.zfill(64)
-                    condition_id_bytes32 = bytes.fromhex(hex_str)
-                else:
-                    # Integer string - convert to bytes32
-                    condition_id_int = int(condition_id_str)
-                    condition_id_bytes32 = condition_id_int.to_bytes(32, byteorder='big')
-            else:
-                # Assume it's already an integer
-                condition_id_int = int(condition_id)
-                condition_id_bytes32 = condition_id_int.to_bytes(32, byteorder='big')
-            
-            # Ensure it's exactly 32 bytes
-            if len(condition_id_bytes32) < 32:
-                condition_id_bytes32 = condition_id_bytes32.rjust(32, b'\x00')
-            elif len(condition_id_bytes32) > 32:
-                condition_id_bytes32 = condition_id_bytes32[-32:]
-            
             # Convert amount to 6 decimals (USDC uses 6 decimals)
             amount_raw = int(amount_usdc * 1e6)
             
@@ -1559,177 +1633,23 @@ class Polymarket:
                         )
                         return None
             
-            # Build splitPosition transaction
-            # Parameters:
-            # - collateralToken: USDC address
-            # - parentCollectionId: bytes32(0) for Polymarket
-            # - conditionId: bytes32 condition ID
-            # - partition: [1, 2] for binary YES/NO markets
-            # - amount: amount in USDC (6 decimals)
-            
-            parent_collection_id = b'\x00' * 32  # bytes32(0) for Polymarket
-            partition = [1, 2]  # Binary market: YES (1) and NO (2)
-            
             logger.info(
                 f"Splitting ${amount_usdc:.2f} USDC into YES + NO shares "
                 f"(condition_id: {condition_id[:20]}...)"
             )
             
-            # Build transaction
-            # Use 'pending' nonce to include pending transactions and avoid nonce conflicts
-            nonce = self.web3.eth.get_transaction_count(wallet_address, 'pending')
-            logger.debug(f"Using nonce: {nonce} (includes pending transactions)")
-            
-            # Use current gas price (Polygon is usually fast enough)
-            # Note: Polygon blocks are ~2 seconds, so transactions confirm quickly
-            gas_price = self.web3.eth.gas_price
-            logger.debug(f"Gas price: {gas_price / 1e9:.2f} gwei")
-            
-            split_txn = self.ctf.functions.splitPosition(
-                self.usdc_address,
-                parent_collection_id,
-                condition_id_bytes32,
-                partition,
-                amount_raw
-            ).build_transaction({
-                "chainId": self.chain_id,
-                "from": wallet_address,
-                "nonce": nonce,
-                "gas": 500000,  # Reasonable gas limit for splitPosition
-                "gasPrice": gas_price
-            })
-            
-            # Sign transaction
-            signed_txn = self.web3.eth.account.sign_transaction(
-                split_txn, private_key=self.private_key
-            )
-            
-            # Send transaction
-            logger.info("Sending splitPosition transaction...")
-            # Handle both old (rawTransaction) and new (raw_transaction) web3.py versions
-            raw_tx = getattr(signed_txn, 'raw_transaction', None) or getattr(signed_txn, 'rawTransaction', None)
-            if not raw_tx:
-                raise ValueError("Could not extract raw transaction from signed transaction")
-            
+            # Send through the TransactionManager (local nonce, shared receipt polling)
+            logger.info("Sending splitPosition transaction and waiting for receipt...")
             try:
-                tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-                logger.info(f"Transaction sent: {tx_hash.hex()}")
-            except Exception as send_error:
-                logger.error(f"❌ Error sending transaction: {send_error}")
-                logger.error(f"   This usually means the transaction was rejected before being broadcast")
-                logger.error(f"   Common causes: nonce too high, gas price too low, or network issue")
-                # Check current nonce
-                try:
-                    current_nonce = self.web3.eth.get_transaction_count(wallet_address, 'pending')
-                    logger.info(f"   Current pending nonce: {current_nonce}, used nonce: {nonce}")
-                    if nonce > current_nonce:
-                        logger.warning(f"   ⚠️ Nonce {nonce} is higher than pending nonce {current_nonce} - transaction may be rejected")
-                except Exception:
-                    pass
-                raise
-            
-            # Verify transaction was actually broadcast (check mempool)
-            logger.info(f"Verifying transaction was broadcast to network...")
-            try:
-                # Wait a moment for transaction to propagate
-                time.sleep(2)
-                tx_check = self.web3.eth.get_transaction(tx_hash)
-                if tx_check:
-                    logger.info(f"✅ Transaction confirmed in mempool/blockchain")
-                    logger.info(f"   From: {tx_check.get('from', 'unknown')}")
-                    logger.info(f"   To: {tx_check.get('to', 'unknown')}")
-                    logger.info(f"   Nonce: {tx_check.get('nonce', 'unknown')}")
-                    logger.info(f"   Gas price: {tx_check.get('gasPrice', 'unknown')}")
-                    block_num = tx_check.get('blockNumber')
-                    if block_num:
-                        logger.info(f"   Block: {block_num} (already mined!)")
-                    else:
-                        logger.info(f"   Status: Pending in mempool")
-                else:
-                    logger.warning(f"⚠️ Transaction hash returned but transaction not found in mempool")
-                    logger.warning(f"   This may indicate a network connectivity issue")
-            except Exception as verify_error:
-                logger.warning(f"⚠️ Could not verify transaction broadcast: {verify_error}")
-                logger.warning(f"   Transaction hash: {tx_hash.hex()}")
-                logger.warning(f"   Will proceed to wait for receipt anyway...")
-            
-            # Wait for receipt
-            logger.info(f"Waiting for transaction receipt (timeout: 300s)...")
-            logger.info(f"Transaction hash: {tx_hash.hex()}")
-            logger.info(f"Polygonscan: https://polygonscan.com/tx/{tx_hash.hex()}")
-            
-            receipt = None
-            max_wait_time = 300  # seconds
-            # Use faster polling: 1s for first 30s, then 2s after that
-            start_time = time.time()
-            
-            try:
-                logger.info(f"⏳ Polling for transaction receipt (checking every 1-2s, max {max_wait_time}s)...")
-                # Poll manually with periodic status updates
-                while (time.time() - start_time) < max_wait_time:
-                    elapsed = time.time() - start_time
-                    
-                    # Use faster polling interval initially (1s), then slower (2s) after 30s
-                    poll_interval = 1.0 if elapsed < 30 else 2.0
-                    
-                    try:
-                        receipt = self.web3.eth.get_transaction_receipt(tx_hash)
-                        if receipt is not None:
-                            logger.info(f"✅ Transaction receipt received! Status: {receipt.status} (after {elapsed:.1f}s)")
-                            break
-                    except Exception:
-                        # Receipt not available yet, continue polling
-                        pass
-                    
-                    # Log progress more frequently initially
-                    if elapsed < 30:
-                        if int(elapsed) % 5 == 0:  # Every 5 seconds for first 30s
-                            logger.info(f"⏳ Still waiting for receipt... ({int(elapsed)}s elapsed)")
-                    elif int(elapsed) % 15 == 0:  # Every 15 seconds after 30s
-                        logger.info(f"⏳ Still waiting for receipt... ({int(elapsed)}s elapsed)")
-                    
-                    time.sleep(poll_interval)
-                
-                # If we still don't have a receipt, try wait_for_transaction_receipt as fallback
-                if receipt is None:
-                    logger.warning(f"⚠️ Manual polling didn't find receipt, trying wait_for_transaction_receipt...")
-                    try:
-                        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
-                        logger.info(f"✅ Transaction receipt received via wait_for_transaction_receipt! Status: {receipt.status}")
-                    except Exception as wait_error:
-                        logger.warning(f"⚠️ wait_for_transaction_receipt also failed: {wait_error}")
-                        
-            except Exception as receipt_error:
-                logger.warning(f"⚠️ Error waiting for transaction receipt: {receipt_error}")
-                logger.info(f"⚠️ Attempting to check transaction status directly...")
-            
-            # Final attempt to get receipt directly
-            if receipt is None:
-                try:
-                    receipt = self.web3.eth.get_transaction_receipt(tx_hash)
-                    logger.info(f"✅ Retrieved receipt directly! Status: {receipt.status}")
-                except Exception as get_error:
-                    logger.error(f"❌ Could not retrieve receipt: {get_error}")
-                    # Check if transaction is pending
-                    try:
-                        tx = self.web3.eth.get_transaction(tx_hash)
-                        if tx is None:
-                            logger.error(f"❌ Transaction not found in mempool or blockchain")
-                        else:
-                            block_num = tx.get('blockNumber')
-                            if block_num:
-                                logger.warning(f"⚠️ Transaction found in block {block_num} but receipt not available yet")
-                            else:
-                                logger.warning(f"⚠️ Transaction found but still pending in mempool")
-                    except Exception as tx_error:
-                        logger.error(f"❌ Could not check transaction status: {tx_error}")
-                    logger.error(f"❌ Split transaction may have failed or is still pending")
-                    logger.info(f"💡 Check transaction status manually: https://polygonscan.com/tx/{tx_hash.hex()}")
-                    return None
-            
-            if receipt is None:
-                logger.error(f"❌ No receipt available for transaction {tx_hash.hex()}")
+                receipt = self._send_transaction(
+                    self.build_split_call(condition_id, amount_usdc),
+                    gas=500000,  # Reasonable gas limit for splitPosition
+                    description="split_position",
+                )
+            except TimeoutError as e:
+                logger.error(f"❌ Split transaction may have failed or is still pending: {e}")
                 return None
+            tx_hash = receipt.transactionHash
             
             if receipt.status == 1:
                 logger.info(f"✅✅✅ Split position successful! ✅✅✅")
@@ -1781,88 +1701,19 @@ class Polymarket:
                 f"condition_id={condition_id[:20]}..."
             )
             
-            # Convert condition_id to bytes32 (same logic as split_position)
-            if isinstance(condition_id, str):
-                condition_id_str = condition_id.strip()
-                if condition_id_str.startswith('0x'):
-                    hex_str = condition_id_str[2:]
-                    hex_str = hex_str.zfill(64)
-                    condition_id_bytes32 = bytes.fromhex(hex_str)
-                elif all(c in '0123456789abcdefABCDEF' for c in condition_id_str):
-                    hex_str = condition_id_str.zfill(64)
-                    condition_id_bytes32 = bytes.fromhex(hex_str)
-                else:
-                    condition_id_int = int(condition_id_str)
-                    condition_id_bytes32 = condition_id_int.to_bytes(32, byteorder='big')
-            else:
-                condition_id_int = int(condition_id)
-                condition_id_bytes32 = condition_id_int.to_bytes(32, byteorder='big')
-            
-            # Ensure it's exactly 32 bytes
-            if len(condition_id_bytes32) < 32:
-                condition_id_bytes32 = condition_id_bytes32.rjust(32, b'\x00')
-            elif len(condition_id_bytes32) > 32:
-                condition_id_bytes32 = condition_id_bytes32[-32:]
-            
-            # Convert amount to 6 decimals (USDC uses 6 decimals)
-            amount_raw = int(amount_usdc * 1e6)
-            
-            # Build mergePositions transaction
-            # Parameters same as splitPosition:
-            # - collateralToken: USDC address
-            # - parentCollectionId: bytes32(0) for Polymarket
-            # - conditionId: bytes32 condition ID
-            # - partition: [1, 2] for binary YES/NO markets
-            # - amount: amount in USDC (6 decimals)
-            
-            parent_collection_id = b'\x00' * 32  # bytes32(0) for Polymarket
-            partition = [1, 2]  # Binary market: YES (1) and NO (2)
-            
             logger.info(
                 f"Merging {amount_usdc:.2f} YES + {amount_usdc:.2f} NO shares back to ${amount_usdc:.2f} USDC "
                 f"(condition_id: {condition_id[:20]}...)"
             )
             
-            # Build transaction
-            nonce = self.web3.eth.get_transaction_count(wallet_address)
-            
-            merge_txn = self.ctf.functions.mergePositions(
-                self.usdc_address,
-                parent_collection_id,
-                condition_id_bytes32,
-                partition,
-                amount_raw
-            ).build_transaction({
-                "chainId": self.chain_id,
-                "from": wallet_address,
-                "nonce": nonce,
-                "gas": 500000,  # Reasonable gas limit for mergePositions
-                "gasPrice": self.web3.eth.gas_price
-            })
-            
-            # Sign transaction
-            signed_txn = self.web3.eth.account.sign_transaction(
-                merge_txn, private_key=self.private_key
+            # Send through the TransactionManager so it never reuses the nonce of an in-flight split/approval
+            logger.info("Sending mergePositions transaction and waiting for receipt...")
+            receipt = self._send_transaction(
+                self.build_merge_call(condition_id, amount_usdc),
+                gas=500000,  # Reasonable gas limit for mergePositions
+                description="merge_positions",
             )
-            
-            # Send transaction
-            logger.info("Sending mergePositions transaction...")
-            raw_tx = getattr(signed_txn, 'raw_transaction', None) or getattr(signed_txn, 'rawTransaction', None)
-            if not raw_tx:
-                raise ValueError("Could not extract raw transaction from signed transaction")
-            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-            logger.info(f"Transaction sent: {tx_hash.hex()}")
-            
-            # Wait for receipt
-            logger.info(f"Waiting for transaction receipt (timeout: 300s)...")
-            logger.info(f"Transaction hash: {tx_hash.hex()}")
-            logger.info(f"Polygonscan: https://polygonscan.com/tx/{tx_hash.hex()}")
-            
-            try:
-                receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=300)
-            except Exception as e:
-                logger.warning(f"Timeout waiting for receipt, trying direct fetch: {e}")
-                receipt = self.web3.eth.get_transaction_receipt(tx_hash)
+            tx_hash = receipt.transactionHash
             
             if receipt.status == 1:
                 logger.info(f"✅✅✅ Merge positions successful! ✅✅✅")
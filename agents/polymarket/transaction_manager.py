@@ -0,0 +1,369 @@
+"""
+Non-blocking on-chain transaction manager.
+
+Lets several split/merge/redeem/approval transactions be in flight at once from a
+single wallet:
+- Local nonce tracking (fetched once from the chain, then incremented locally) so
+  concurrent sends never reuse a nonce; resyncs from the chain's pending count on nonce
+  errors, failed sends and transactions that time out (dropped or stuck)
+- Gas price caching with a short TTL instead of an eth_gasPrice call per send
+- One shared receipt-polling task that resolves an asyncio future per pending
+  transaction hash, instead of each caller blocking in wait_for_transaction_receipt
+
+All blocking Web3 calls go through a pluggable `run_rpc` coroutine (default: a small
+private thread pool) so they never run on the event loop.
+
+The manager lives on one event loop: the first loop that awaits it, or a private
+background loop started for synchronous callers. Synchronous code (Polymarket's
+approval/split/merge methods, possibly running on worker threads) uses
+send_and_wait_sync(), so every signed transaction from the wallet shares one nonce
+sequence whether it is sent from async or sync code.
+"""
+import asyncio
+import dataclasses
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Error substrings returned by nodes when the local nonce is out of sync with the chain
+NONCE_ERROR_MARKERS = (
+    "nonce too low",
+    "already known",
+    "replacement transaction underpriced",
+    "known transaction",
+)
+
+
+@dataclasses.dataclass
+class PendingTransaction:
+    """A sent transaction awaiting its receipt."""
+    tx_hash: str
+    nonce: int
+    description: str
+    future: asyncio.Future
+    sent_at: float = dataclasses.field(default_factory=time.monotonic)
+    deadline: float = 0.0
+
+
+class TransactionManager:
+    """
+    Sends signed transactions for one wallet and tracks their receipts.
+
+    Usage:
+        tx_manager = TransactionManager(web3, private_key, chain_id=137)
+        pending = await tx_manager.submit(ctf.functions.mergePositions(...), gas=500000)
+        receipt = await pending.future
+
+        # From synchronous code / worker threads
+        receipt = tx_manager.send_and_wait_sync(usdc.functions.approve(...), gas=100000)
+    """
+
+    def __init__(
+        self,
+        web3,
+        private_key: str,
+        chain_id: int,
+        run_rpc: Optional[Callable[..., Awaitable[Any]]] = None,
+        gas_price_ttl: float = 15.0,
+        gas_price_multiplier: float = 1.0,
+        receipt_poll_interval: float = 1.0,
+        receipt_timeout: float = 300.0,
+    ):
+        """
+        Initialize transaction manager.
+
+        Args:
+            web3: Web3 instance connected to the chain
+            private_key: Private key used to sign transactions
+            chain_id: Chain ID (137 for Polygon)
+            run_rpc: Coroutine function(func, *args) that runs a blocking Web3 call off the
+                     event loop (default: a private single-purpose thread pool)
+            gas_price_ttl: Seconds to reuse a fetched gas price (default: 15.0)
+            gas_price_multiplier: Multiplier applied to the node's gas price (default: 1.0)
+            receipt_poll_interval: Seconds between receipt polling rounds (default: 1.0)
+            receipt_timeout: Seconds before a pending transaction's future fails (default: 300.0)
+        """
+        self.web3 = web3
+        self.private_key = private_key
+        self.chain_id = chain_id
+        self.address = web3.eth.account.from_key(private_key).address
+        self.gas_price_ttl = gas_price_ttl
+        self.gas_price_multiplier = gas_price_multiplier
+        self.receipt_poll_interval = receipt_poll_interval
+        self.receipt_timeout = receipt_timeout
+
+        self._own_executor: Optional[ThreadPoolExecutor] = None
+        if run_rpc is None:
+            self._own_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tx-manager")
+            run_rpc = self._run_on_own_executor
+        self._run_rpc = run_rpc
+
+        # Event loop the manager runs on (bound on first use)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+        # Nonce tracking (_nonce_stale: resync from the chain before the next send). The lock
+        # is created on the bound loop (_bind_loop): on Python 3.9 an asyncio.Lock attaches to
+        # the loop current at construction, and the manager is often built before asyncio.run
+        # or on a worker thread with no loop at all
+        self._nonce_lock: Optional[asyncio.Lock] = None
+        self._next_nonce: Optional[int] = None
+        self._nonce_stale = False
+
+        # Gas price cache: (price_wei, fetched_at)
+        self._gas_price: Optional[int] = None
+        self._gas_price_fetched_at = 0.0
+
+        # Pending transactions: tx_hash -> PendingTransaction
+        self._pending: Dict[str, PendingTransaction] = {}
+        self._poll_task: Optional[asyncio.Task] = None
+
+    async def _run_on_own_executor(self, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._own_executor, functools.partial(func, *args, **kwargs))
+
+    async def _sync_nonce(self):
+        """Reload the next nonce from the chain (includes pending transactions)."""
+        self._next_nonce = await self._run_rpc(self.web3.eth.get_transaction_count, self.address, "pending")
+        self._nonce_stale = False
+        logger.debug(f"Nonce synced from chain: {self._next_nonce}")
+
+    def _bind_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Bind to the running loop on first use; return the manager's loop if it is another one."""
+        loop = asyncio.get_running_loop()
+        with self._loop_lock:
+            if not self._loop_alive():
+                self._rebind(loop)
+            if self._loop is not loop:
+                return self._loop
+            if self._nonce_lock is None:
+                self._nonce_lock = asyncio.Lock()
+            return None
+
+    @staticmethod
+    async def _await_receipt(pending: PendingTransaction):
+        return await pending.future
+
+    def _loop_alive(self) -> bool:
+        # The private loop counts as alive from the moment its thread starts
+        if self._loop is None:
+            return False
+        if self._loop_thread is not None:
+            return self._loop_thread.is_alive()
+        return self._loop.is_running()
+
+    def _rebind(self, loop: asyncio.AbstractEventLoop):
+        # Called with _loop_lock held. Anything pending on a previous (stopped) loop is lost,
+        # so start from fresh loop-bound state and re-read the nonce from the chain.
+        if self._loop is not None:
+            self._pending.clear()
+            self._poll_task = None
+            self._nonce_stale = True
+        # Recreated by _bind_loop on the new loop (this may run on a thread without a loop)
+        self._nonce_lock = None
+        self._loop = loop
+        if self._loop_thread is not None and not self._loop_thread.is_alive():
+            self._loop_thread = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Loop for synchronous callers: the bound loop if running, else a private background loop."""
+        with self._loop_lock:
+            if not self._loop_alive():
+                loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=loop.run_forever, name="tx-manager-loop", daemon=True)
+                self._loop_thread.start()
+                self._rebind(loop)
+            return self._loop
+
+    async def get_gas_price(self) -> int:
+        """Get the gas price in wei, reusing a cached value for gas_price_ttl seconds."""
+        now = time.monotonic()
+        if self._gas_price is None or (now - self._gas_price_fetched_at) > self.gas_price_ttl:
+            gas_price = await self._run_rpc(lambda: self.web3.eth.gas_price)
+            self._gas_price = int(gas_price * self.gas_price_multiplier)
+            self._gas_price_fetched_at = now
+        return self._gas_price
+
+    def _build_tx(self, tx: Any, nonce: int, gas: Optional[int], gas_price: int) -> Dict:
+        params = {
+            "chainId": self.chain_id,
+            "from": self.address,
+            "nonce": nonce,
+            "gasPrice": gas_price,
+        }
+        if gas is not None:
+            params["gas"] = gas
+        if hasattr(tx, "build_transaction"):
+            # Contract function call (e.g. ctf.functions.mergePositions(...))
+            return tx.build_transaction(params)
+        built = dict(tx)
+        for key, value in params.items():
+            built.setdefault(key, value)
+        built["nonce"] = nonce
+        return built
+
+    def _sign_and_send(self, tx_dict: Dict):
+        signed = self.web3.eth.account.sign_transaction(tx_dict, private_key=self.private_key)
+        raw_tx = getattr(signed, "raw_transaction", None) or getattr(signed, "rawTransaction", None)
+        if not raw_tx:
+            raise ValueError("Could not extract raw transaction from signed transaction")
+        return self.web3.eth.send_raw_transaction(raw_tx)
+
+    async def submit(self, tx: Any, gas: Optional[int] = None, description: str = "") -> PendingTransaction:
+        """
+        Sign and send a transaction without waiting for its receipt.
+
+        Args:
+            tx: Contract function call (anything with build_transaction) or a transaction dict
+            gas: Gas limit (estimated by the node if None)
+            description: Label used in logs
+
+        Returns:
+            PendingTransaction whose future resolves to the receipt (or raises TimeoutError)
+        """
+        home = self._bind_loop()
+        if home is not None:
+            # Bound to another loop (e.g. the private loop started for sync callers): send there
+            # and mirror the receipt future onto the caller's loop
+            pending = await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self.submit(tx, gas=gas, description=description), home)
+            )
+            receipt = asyncio.run_coroutine_threadsafe(self._await_receipt(pending), home)
+            return dataclasses.replace(pending, future=asyncio.wrap_future(receipt))
+
+        gas_price = await self.get_gas_price()
+
+        async with self._nonce_lock:
+            if self._next_nonce is None or self._nonce_stale:
+                await self._sync_nonce()
+
+            for attempt in range(2):
+                nonce = self._next_nonce
+                tx_dict = await self._run_rpc(self._build_tx, tx, nonce, gas, gas_price)
+                try:
+                    tx_hash = await self._run_rpc(self._sign_and_send, tx_dict)
+                    break
+                except Exception as e:
+                    error_str = str(e).lower()
+                    if attempt == 0 and any(marker in error_str for marker in NONCE_ERROR_MARKERS):
+                        logger.warning(f"⚠️ Nonce {nonce} rejected ({e}) - resyncing nonce from chain and retrying")
+                        await self._sync_nonce()
+                        continue
+                    # The node may or may not have accepted it - don't guess the next nonce
+                    self._nonce_stale = True
+                    raise
+            self._next_nonce = nonce + 1
+
+        tx_hash_hex = tx_hash.hex() if hasattr(tx_hash, "hex") else str(tx_hash)
+        loop = asyncio.get_running_loop()
+        pending = PendingTransaction(
+            tx_hash=tx_hash_hex,
+            nonce=nonce,
+            description=description,
+            future=loop.create_future(),
+        )
+        pending.deadline = pending.sent_at + self.receipt_timeout
+        self._pending[tx_hash_hex] = pending
+        logger.info(f"Transaction sent ({description or 'tx'}): {tx_hash_hex} (nonce {nonce})")
+
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._receipt_poll_loop())
+        return pending
+
+    async def send_and_wait(self, tx: Any, gas: Optional[int] = None, description: str = ""):
+        """Submit a transaction and await its receipt."""
+        pending = await self.submit(tx, gas=gas, description=description)
+        return await pending.future
+
+    def send_and_wait_sync(self, tx: Any, gas: Optional[int] = None, description: str = ""):
+        """
+        Submit a transaction and block until its receipt (for synchronous callers).
+
+        Must not be called from the manager's own event loop thread.
+
+        Raises:
+            TimeoutError: No receipt within receipt_timeout (the nonce is resynced before the next send)
+        """
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError("send_and_wait_sync() called from the transaction manager's event loop - await send_and_wait()")
+        future = asyncio.run_coroutine_threadsafe(self.send_and_wait(tx, gas=gas, description=description), loop)
+        return future.result()
+
+    async def _fetch_receipt(self, tx_hash: str):
+        try:
+            return await self._run_rpc(self.web3.eth.get_transaction_receipt, tx_hash)
+        except Exception:
+            # Not mined yet (TransactionNotFound) or transient RPC error - retry next round
+            return None
+
+    async def _receipt_poll_loop(self):
+        """Poll receipts for all pending transactions until none remain."""
+        while self._pending:
+            pending_items = list(self._pending.values())
+            receipts = await asyncio.gather(*(self._fetch_receipt(p.tx_hash) for p in pending_items))
+
+            now = time.monotonic()
+            for pending, receipt in zip(pending_items, receipts):
+                if pending.future.done():
+                    self._pending.pop(pending.tx_hash, None)
+                elif receipt is not None:
+                    elapsed = now - pending.sent_at
+                    logger.info(
+                        f"✅ Receipt for {pending.description or 'tx'} {pending.tx_hash[:16]}... "
+                        f"(status {receipt.get('status')}, after {elapsed:.1f}s)"
+                    )
+                    pending.future.set_result(receipt)
+                    self._pending.pop(pending.tx_hash, None)
+                elif now > pending.deadline:
+                    # Dropped or stuck: the local counter may now be ahead of the chain
+                    logger.warning(
+                        f"⚠️ No receipt for {pending.description or 'tx'} {pending.tx_hash[:16]}... "
+                        f"(nonce {pending.nonce}) - resyncing nonce before the next send"
+                    )
+                    self._nonce_stale = True
+                    pending.future.set_exception(
+                        TimeoutError(f"No receipt for {pending.tx_hash} after {self.receipt_timeout:.0f}s")
+                    )
+                    self._pending.pop(pending.tx_hash, None)
+
+            if self._pending:
+                await asyncio.sleep(self.receipt_poll_interval)
+
+    def pending_count(self) -> int:
+        """Number of transactions still awaiting a receipt."""
+        return len(self._pending)
+
+    async def close(self):
+        """Stop polling, fail any outstanding futures and stop the private loop/executor."""
+        loop = self._loop
+        if self._loop_thread is not None and loop is not None and loop is not asyncio.get_running_loop():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._close_on_loop(), loop))
+            loop.call_soon_threadsafe(loop.stop)
+            self._loop_thread = None
+        else:
+            await self._close_on_loop()
+        if self._own_executor:
+            self._own_executor.shutdown(wait=False)
+
+    async def _close_on_loop(self):
+        if self._poll_task and not self._poll_task.done():
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+        for pending in self._pending.values():
+            if not pending.future.done():
+                pending.future.cancel()
+        self._pending.clear()
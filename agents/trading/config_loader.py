@@ -152,6 +152,11 @@ class TradingConfig:
         except (ValueError, TypeError):
             raise ValueError(f"websocket_health_check_timeout must be a number > 0, got {websocket_health_check_timeout}")
         
+        # Validate websocket_connections (optional, defaults to 1)
+        websocket_connections = self.config.get('websocket_connections', 1)
+        if not isinstance(websocket_connections, int) or websocket_connections < 1:
+            raise ValueError(f"websocket_connections must be an integer >= 1, got {websocket_connections}")
+        
         # Validate order_status_check_interval (optional, defaults to 10.0)
         order_status_check_interval = self.config.get('order_status_check_interval', 10.0)
         try:
@@ -267,6 +272,11 @@ class TradingConfig:
         """Seconds of silence before considering WebSocket connection dead."""
         return float(self.config.get('websocket_health_check_timeout', 14.0))
     
+    @property
+    def websocket_connections(self) -> int:
+        """Number of WebSocket connections to shard orderbook subscriptions across (1 = single connection)."""
+        return int(self.config.get('websocket_connections', 1))
+    
     @property
     def order_status_check_interval(self) -> float:
         """Seconds between order status checks. How frequently to check if orders are filled."""
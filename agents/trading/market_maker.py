@@ -29,6 +29,7 @@ from agents.trading.utils.order_status_helpers import (
     is_order_partial_fill,
 )
 from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.async_polymarket import AsyncPolymarket
 from agents.polymarket.btc_market_detector import (
     get_latest_btc_1h_market_proactive,
     is_market_active,
@@ -95,6 +96,10 @@ class MarketMaker:
         self.config = MarketMakerConfig(config_path)
         self.db = TradeDatabase()
         self.pm = Polymarket()
+        # Blocking CLOB/RPC calls go through dedicated thread pools; split/merge
+        # transactions go through a transaction manager so several can be in flight
+        self.async_pm = AsyncPolymarket(self.pm)
+        self.async_pm.enable_transaction_manager()
         
         # Generate deployment ID
         self.deployment_id = str(uuid.uuid4())
@@ -114,8 +119,9 @@ class MarketMaker:
         self.websocket_service = None
         if self.config.use_websocket_orderbook:
             try:
-                from agents.trading.websocket_orderbook_service import WebSocketOrderbookService
-                self.websocket_service = WebSocketOrderbookService(
+                from agents.trading.websocket_orderbook_service import create_websocket_orderbook_service
+                self.websocket_service = create_websocket_orderbook_service(
+                    num_connections=self.config.websocket_connections,
                     proxy_url=proxy_url,
                     health_check_timeout=self.config.websocket_health_check_timeout,
                     reconnect_delay=self.config.websocket_reconnect_delay,
@@ -193,123 +199,21 @@ class MarketMaker:
                     logger.info("Checking each position for redeemable shares...")
                 logger.info("")
                 
-                redeemable_count = 0
-                skipped_no_shares = 0
-                skipped_not_resolved = 0
-                skipped_no_winning_side = 0
+                # Read every YES/NO balance in one multicall instead of 2 RPCs per position
+                balances = await self.async_pm.get_conditional_token_balances(
+                    [token_id for db_pos in all_positions for token_id in (db_pos.yes_token_id, db_pos.no_token_id)],
+                    wallet_address=direct_wallet
+                )
                 
-                for db_pos in all_positions:
-                    try:
-                        # Check wallet balances
-                        yes_balance = self.pm.get_conditional_token_balance(
-                            db_pos.yes_token_id,
-                            wallet_address=direct_wallet
-                        )
-                        no_balance = self.pm.get_conditional_token_balance(
-                            db_pos.no_token_id,
-                            wallet_address=direct_wallet
-                        )
-                        
-                        if yes_balance is None or no_balance is None:
-                            logger.warning(f"Could not check balances for {db_pos.market_slug}")
-                            continue
-                        
-                        logger.info(f"📊 {db_pos.market_slug}:")
-                        logger.info(f"   YES shares: {yes_balance:.2f}, NO shares: {no_balance:.2f}")
-                        logger.info(f"   Status: {db_pos.position_status}, Winning side: {db_pos.winning_side}")
-                        
-                        if yes_balance == 0 and no_balance == 0:
-                            logger.info(f"   ✓ No shares remaining (already redeemed)")
-                            skipped_no_shares += 1
-                            logger.info("")
-                            continue
-                        
-                        # Create position object for redemption/merging
-                        position = MarketMakerPosition(
-                            market_slug=db_pos.market_slug,
-                            market={},  # Not needed for redemption
-                            condition_id=db_pos.condition_id,
-                            yes_token_id=db_pos.yes_token_id,
-                            no_token_id=db_pos.no_token_id,
-                            split_amount=db_pos.split_amount,
-                            yes_shares=yes_balance,
-                            no_shares=no_balance,
-                            yes_filled=(yes_balance == 0),
-                            no_filled=(no_balance == 0),
-                        )
-                        
-                        # Process all positions - merge/redeem based on status
-                        # IMPORTANT: Only merge/resolve if position is marked as resolved
-                        # We don't merge active positions because the purpose is to sell each side separately
-                        if db_pos.position_status == "resolved":
-                            # Case 1: Both YES and NO shares exist - merge equal amounts back to USDC
-                            if yes_balance > 0 and no_balance > 0:
-                                merge_amount = min(yes_balance, no_balance)
-                                if abs(yes_balance - no_balance) < 0.01:  # Essentially equal
-                                    logger.info(
-                                        f"   💰 Both sides exist in equal amounts ({merge_amount:.2f}). "
-                                        f"Merging back to ${merge_amount:.2f} USDC..."
-                                    )
-                                    loop = asyncio.get_event_loop()
-                                    merge_result = await loop.run_in_executor(
-                                        None,
-                                        self.pm.merge_positions,
-                                        db_pos.condition_id,
-                                        merge_amount
-                                    )
-                                    if merge_result:
-                                        logger.info(f"   ✅ Successfully merged {merge_amount:.2f} YES + NO → ${merge_amount:.2f} USDC")
-                                        redeemable_count += 1
-                                        # Update remaining balances
-                                        yes_balance -= merge_amount
-                                        no_balance -= merge_amount
-                                    else:
-                                        logger.error(f"   ❌ Failed to merge positions")
-                                else:
-                                    logger.info(
-                                        f"   💰 Unequal amounts (YES: {yes_balance:.2f}, NO: {no_balance:.2f}). "
-                                        f"Merging {merge_amount:.2f} equal amounts..."
-                                    )
-                                    loop = asyncio.get_event_loop()
-                                    merge_result = await loop.run_in_executor(
-                                        None,
-                                        self.pm.merge_positions,
-                                        db_pos.condition_id,
-                                        merge_amount
-                                    )
-                                    if merge_result:
-                                        logger.info(f"   ✅ Successfully merged {merge_amount:.2f} YES + NO → ${merge_amount:.2f} USDC")
-                                        redeemable_count += 1
-                                        yes_balance -= merge_amount
-                                        no_balance -= merge_amount
-                            
-                            # Case 2: Position is resolved and we know winning side - redeem winning shares
-                            if db_pos.winning_side:
-                                # Update position with remaining balances after merge
-                                position.yes_shares = yes_balance
-                                position.no_shares = no_balance
-                                position.yes_filled = (yes_balance == 0)
-                                position.no_filled = (no_balance == 0)
-                                
-                                logger.info(f"   Market is RESOLVED - redeeming winning shares...")
-                                await self._redeem_winning_shares(position, db_pos.winning_side)
-                                redeemable_count += 1
-                            else:
-                                logger.info(f"   Market resolved but winning_side not recorded - skipping redemption")
-                                skipped_no_winning_side += 1
-                        else:
-                            # Position not resolved - do NOT merge (market making is still active)
-                            # The purpose of splitting is to sell each side separately
-                            logger.info(f"   Market status: '{db_pos.position_status}' - position is still active")
-                            logger.info(f"   (YES: {yes_balance:.2f}, NO: {no_balance:.2f}) - NOT merging (market making in progress)")
-                            logger.info(f"   These shares are being used for market making - will be redeemed after market resolves")
-                            skipped_not_resolved += 1
-                        
-                        logger.info("")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing {db_pos.market_slug}: {e}", exc_info=True)
-                        continue
+                # Positions are independent - check and merge/redeem them concurrently
+                # (merges are sent through the transaction manager, so nonces never collide)
+                results = await asyncio.gather(
+                    *(self._scan_and_redeem_position(db_pos, direct_wallet, balances) for db_pos in all_positions)
+                )
+                redeemable_count = sum(r["redeemed"] for r in results)
+                skipped_no_shares = sum(r["no_shares"] for r in results)
+                skipped_not_resolved = sum(r["not_resolved"] for r in results)
+                skipped_no_winning_side = sum(r["no_winning_side"] for r in results)
                 
             finally:
                 session.close()
@@ -326,6 +230,132 @@ class MarketMaker:
         except Exception as e:
             logger.error(f"Error scanning wallet: {e}", exc_info=True)
     
+    async def _scan_and_redeem_position(
+        self,
+        db_pos: RealMarketMakerPosition,
+        direct_wallet: str,
+        balances: Optional[Dict[str, Optional[float]]] = None
+    ) -> Dict[str, int]:
+        """
+        Check wallet balances for one database position and merge/redeem its shares.
+        
+        Args:
+            db_pos: Position record from the database
+            direct_wallet: Direct wallet address holding the shares
+            balances: Optional prefetched token_id -> balance map (from get_conditional_token_balances)
+        
+        Returns:
+            Dict of counter increments: redeemed, no_shares, not_resolved, no_winning_side
+        """
+        counts = {"redeemed": 0, "no_shares": 0, "not_resolved": 0, "no_winning_side": 0}
+        try:
+            # Check wallet balances
+            if balances is None:
+                balances = await self.async_pm.get_conditional_token_balances(
+                    [db_pos.yes_token_id, db_pos.no_token_id],
+                    wallet_address=direct_wallet
+                )
+            yes_balance = balances.get(db_pos.yes_token_id)
+            no_balance = balances.get(db_pos.no_token_id)
+            
+            if yes_balance is None or no_balance is None:
+                logger.warning(f"Could not check balances for {db_pos.market_slug}")
+                return counts
+            
+            logger.info(f"📊 {db_pos.market_slug}:")
+            logger.info(f"   YES shares: {yes_balance:.2f}, NO shares: {no_balance:.2f}")
+            logger.info(f"   Status: {db_pos.position_status}, Winning side: {db_pos.winning_side}")
+            
+            if yes_balance == 0 and no_balance == 0:
+                logger.info(f"   ✓ No shares remaining (already redeemed)")
+                counts["no_shares"] += 1
+                logger.info("")
+                return counts
+            
+            # Create position object for redemption/merging
+            position = MarketMakerPosition(
+                market_slug=db_pos.market_slug,
+                market={},  # Not needed for redemption
+                condition_id=db_pos.condition_id,
+                yes_token_id=db_pos.yes_token_id,
+                no_token_id=db_pos.no_token_id,
+                split_amount=db_pos.split_amount,
+                yes_shares=yes_balance,
+                no_shares=no_balance,
+                yes_filled=(yes_balance == 0),
+                no_filled=(no_balance == 0),
+            )
+            
+            # Process all positions - merge/redeem based on status
+            # IMPORTANT: Only merge/resolve if position is marked as resolved
+            # We don't merge active positions because the purpose is to sell each side separately
+            if db_pos.position_status == "resolved":
+                # Case 1: Both YES and NO shares exist - merge equal amounts back to USDC
+                if yes_balance > 0 and no_balance > 0:
+                    merge_amount = min(yes_balance, no_balance)
+                    if abs(yes_balance - no_balance) < 0.01:  # Essentially equal
+                        logger.info(
+                            f"   💰 Both sides exist in equal amounts ({merge_amount:.2f}). "
+                            f"Merging back to ${merge_amount:.2f} USDC..."
+                        )
+                        merge_result = await self.async_pm.merge_positions(
+                            db_pos.condition_id,
+                            merge_amount
+                        )
+                        if merge_result:
+                            logger.info(f"   ✅ Successfully merged {merge_amount:.2f} YES + NO → ${merge_amount:.2f} USDC")
+                            counts["redeemed"] += 1
+                            # Update remaining balances
+                            yes_balance -= merge_amount
+                            no_balance -= merge_amount
+                        else:
+                            logger.error(f"   ❌ Failed to merge positions")
+                    else:
+                        logger.info(
+                            f"   💰 Unequal amounts (YES: {yes_balance:.2f}, NO: {no_balance:.2f}). "
+                            f"Merging {merge_amount:.2f} equal amounts..."
+                        )
+                        merge_result = await self.async_pm.merge_positions(
+                            db_pos.condition_id,
+                            merge_amount
+                        )
+                        if merge_result:
+                            logger.info(f"   ✅ Successfully merged {merge_amount:.2f} YES + NO → ${merge_amount:.2f} USDC")
+                            counts["redeemed"] += 1
+                            yes_balance -= merge_amount
+                            no_balance -= merge_amount
+                
+                # Case 2: Position is resolved and we know winning side - redeem winning shares
+                if db_pos.winning_side:
+                    # Update position with remaining balances after merge
+                    position.yes_shares = yes_balance
+                    position.no_shares = no_balance
+                    position.yes_filled = (yes_balance == 0)
+                    position.no_filled = (no_balance == 0)
+                    
+                    logger.info(f"   Market is RESOLVED - redeeming winning shares...")
+                    await self._redeem_winning_shares(
+                        position,
+                        db_pos.winning_side,
+                        balances={db_pos.yes_token_id: yes_balance, db_pos.no_token_id: no_balance},
+                    )
+                    counts["redeemed"] += 1
+                else:
+                    logger.info(f"   Market resolved but winning_side not recorded - skipping redemption")
+                    counts["no_winning_side"] += 1
+            else:
+                # Position not resolved - do NOT merge (market making is still active)
+                # The purpose of splitting is to sell each side separately
+                logger.info(f"   Market status: '{db_pos.position_status}' - position is still active")
+                logger.info(f"   (YES: {yes_balance:.2f}, NO: {no_balance:.2f}) - NOT merging (market making in progress)")
+                logger.info(f"   These shares are being used for market making - will be redeemed after market resolves")
+                counts["not_resolved"] += 1
+            
+            logger.info("")
+        except Exception as e:
+            logger.error(f"Error processing {db_pos.market_slug}: {e}", exc_info=True)
+        return counts
+    
     async def _merge_resolved_positions_for_capital(self, limit: int = 20):
         """
         Merge positions with equal YES/NO shares to free up USDC capital.
@@ -354,18 +384,18 @@ class MarketMaker:
                 
                 merged_count = 0
                 total_usdc_freed = 0.0
+                merges_to_send = []  # (market_slug, condition_id, merge_amount)
+                
+                # Read every YES/NO balance in one multicall
+                balances = await self.async_pm.get_conditional_token_balances(
+                    [token_id for db_pos in all_positions for token_id in (db_pos.yes_token_id, db_pos.no_token_id)],
+                    wallet_address=direct_wallet
+                )
                 
                 for db_pos in all_positions:
                     try:
-                        # Check wallet balances
-                        yes_balance = self.pm.get_conditional_token_balance(
-                            db_pos.yes_token_id,
-                            wallet_address=direct_wallet
-                        )
-                        no_balance = self.pm.get_conditional_token_balance(
-                            db_pos.no_token_id,
-                            wallet_address=direct_wallet
-                        )
+                        yes_balance = balances.get(db_pos.yes_token_id)
+                        no_balance = balances.get(db_pos.no_token_id)
                         
                         if yes_balance is None or no_balance is None:
                             continue
@@ -381,21 +411,7 @@ class MarketMaker:
                                 f"(status: {db_pos.position_status}): "
                                 f"{merge_amount:.2f} YES + {merge_amount:.2f} NO → ${merge_amount:.2f} USDC"
                             )
-                            
-                            loop = asyncio.get_event_loop()
-                            merge_result = await loop.run_in_executor(
-                                None,
-                                self.pm.merge_positions,
-                                db_pos.condition_id,
-                                merge_amount
-                            )
-                            
-                            if merge_result:
-                                logger.info(f"   ✅ Successfully merged → ${merge_amount:.2f} USDC freed")
-                                merged_count += 1
-                                total_usdc_freed += merge_amount
-                            else:
-                                logger.warning(f"   ❌ Failed to merge")
+                            merges_to_send.append((db_pos.market_slug, db_pos.condition_id, merge_amount))
                         else:
                             logger.info(
                                 f"   ⏭️ Skipping {db_pos.market_slug}: "
@@ -407,6 +423,23 @@ class MarketMaker:
                         logger.error(f"Error merging {db_pos.market_slug}: {e}", exc_info=True)
                         continue
                 
+                # Send all merges at once - the transaction manager assigns nonces locally
+                # and resolves every receipt from one polling task
+                merge_results = await asyncio.gather(
+                    *(self.async_pm.merge_positions(condition_id, merge_amount)
+                      for _, condition_id, merge_amount in merges_to_send),
+                    return_exceptions=True,
+                )
+                for (market_slug, _, merge_amount), merge_result in zip(merges_to_send, merge_results):
+                    if isinstance(merge_result, Exception):
+                        logger.error(f"Error merging {market_slug}: {merge_result}")
+                    elif merge_result:
+                        logger.info(f"   ✅ Successfully merged {market_slug} → ${merge_amount:.2f} USDC freed")
+                        merged_count += 1
+                        total_usdc_freed += merge_amount
+                    else:
+                        logger.warning(f"   ❌ Failed to merge {market_slug}")
+                
                 logger.info("=" * 80)
                 logger.info(f"MERGE COMPLETE: Merged {merged_count} positions, freed ${total_usdc_freed:.2f} USDC")
                 logger.info("=" * 80)
@@ -547,11 +580,11 @@ class MarketMaker:
                     no_token_id = str(int.from_bytes(no_token_id_raw, 'big'))
                     
                     # Check wallet balances
-                    yes_balance = self.pm.get_conditional_token_balance(
+                    yes_balance = await self.async_pm.get_conditional_token_balance(
                         yes_token_id,
                         wallet_address=direct_wallet
                     )
-                    no_balance = self.pm.get_conditional_token_balance(
+                    no_balance = await self.async_pm.get_conditional_token_balance(
                         no_token_id,
                         wallet_address=direct_wallet
                     )
@@ -568,10 +601,7 @@ class MarketMaker:
                             f"merging {merge_amount:.2f} shares"
                         )
                         
-                        loop = asyncio.get_event_loop()
-                        merge_result = await loop.run_in_executor(
-                            None,
-                            self.pm.merge_positions,
+                        merge_result = await self.async_pm.merge_positions(
                             condition_id,
                             merge_amount
                         )
@@ -633,12 +663,7 @@ class MarketMaker:
             for tx_hash in normalized_hashes:
                 try:
                     # Fetch transaction details from blockchain RPC
-                    loop = asyncio.get_event_loop()
-                    tx_data = await loop.run_in_executor(
-                        None,
-                        w3.eth.get_transaction,
-                        tx_hash
-                    )
+                    tx_data = await self.async_pm.run_rpc(w3.eth.get_transaction, tx_hash)
                     
                     if not tx_data:
                         logger.warning(f"  ⚠️ Transaction {tx_hash[:16]}... not found on blockchain")
@@ -702,11 +727,11 @@ class MarketMaker:
                     no_token_id = str(int.from_bytes(no_token_id_raw, 'big'))
                     
                     # Check wallet balances
-                    yes_balance = self.pm.get_conditional_token_balance(
+                    yes_balance = await self.async_pm.get_conditional_token_balance(
                         yes_token_id,
                         wallet_address=direct_wallet
                     )
-                    no_balance = self.pm.get_conditional_token_balance(
+                    no_balance = await self.async_pm.get_conditional_token_balance(
                         no_token_id,
                         wallet_address=direct_wallet
                     )
@@ -723,10 +748,7 @@ class MarketMaker:
                             f"merging {merge_amount:.2f} shares"
                         )
                         
-                        loop = asyncio.get_event_loop()
-                        merge_result = await loop.run_in_executor(
-                            None,
-                            self.pm.merge_positions,
+                        merge_result = await self.async_pm.merge_positions(
                             condition_id,
                             merge_amount
                         )
@@ -779,18 +801,17 @@ class MarketMaker:
                 resolved_positions = query.all()
                 logger.info(f"Found {len(resolved_positions)} resolved positions in database")
                 
+                # Check if shares still exist in wallet - one multicall for all positions
+                direct_wallet = self.pm.get_address_for_private_key()
+                balances = await self.async_pm.get_conditional_token_balances(
+                    [token_id for db_pos in resolved_positions for token_id in (db_pos.yes_token_id, db_pos.no_token_id)],
+                    wallet_address=direct_wallet
+                )
+                
                 for db_pos in resolved_positions:
                     try:
-                        # Check if shares still exist in wallet
-                        direct_wallet = self.pm.get_address_for_private_key()
-                        yes_balance = self.pm.get_conditional_token_balance(
-                            db_pos.yes_token_id, 
-                            wallet_address=direct_wallet
-                        )
-                        no_balance = self.pm.get_conditional_token_balance(
-                            db_pos.no_token_id,
-                            wallet_address=direct_wallet
-                        )
+                        yes_balance = balances.get(db_pos.yes_token_id)
+                        no_balance = balances.get(db_pos.no_token_id)
                         
                         if yes_balance is None or no_balance is None:
                             logger.warning(f"Could not check balances for {db_pos.market_slug}")
@@ -819,9 +840,9 @@ class MarketMaker:
                             no_filled=(no_balance == 0),
                         )
                         
-                        # Redeem shares
+                        # Redeem shares (balances already fetched in the batch above)
                         if db_pos.winning_side:
-                            await self._redeem_winning_shares(position, db_pos.winning_side)
+                            await self._redeem_winning_shares(position, db_pos.winning_side, balances=balances)
                         else:
                             logger.warning(
                                 f"⚠️ {db_pos.market_slug}: No winning_side recorded. "
@@ -862,8 +883,14 @@ class MarketMaker:
             logger.info(f"Wallet address: {wallet_address}")
             logger.info(f"  (Make sure USDC is sent to this address on Polygon network)")
             
-            # Check direct Polygon wallet balance (used for splitting)
-            direct_balance = self.pm.get_usdc_balance()
+            # Direct wallet (used for splitting) and proxy wallet balances in one multicall
+            proxy_address = self.pm.proxy_wallet_address
+            usdc_balances = await self.async_pm.get_usdc_balances(
+                [wallet_address] + ([proxy_address] if proxy_address else [])
+            )
+            direct_balance = usdc_balances.get(wallet_address)
+            if direct_balance is None:
+                direct_balance = await self.async_pm.get_usdc_balance()
             logger.info(f"Direct Polygon wallet USDC balance: ${direct_balance:.2f}")
             
             if direct_balance < self.config.split_amount:
@@ -879,7 +906,9 @@ class MarketMaker:
                 logger.info(f"✓ Direct wallet balance sufficient for split (${self.config.split_amount:.2f})")
             
             # Also check proxy wallet balance (for reference)
-            proxy_balance = self.pm.get_polymarket_balance()
+            proxy_balance = usdc_balances.get(proxy_address) if proxy_address else None
+            if proxy_balance is None:
+                proxy_balance = await self.async_pm.get_polymarket_balance()
             if proxy_balance is not None:
                 logger.info(f"Polymarket proxy wallet balance: ${proxy_balance:.2f} (for trading, not splitting)")
         except Exception as e:
@@ -1019,6 +1048,10 @@ class MarketMaker:
                     logger.info("✓ WebSocket order status service stopped")
                 except Exception as e:
                     logger.error(f"Error stopping WebSocket order status service: {e}")
+            
+            logger.info("Polymarket call latency:")
+            self.async_pm.log_latency_stats()
+            await self.async_pm.close()
     
     async def _handle_websocket_order_update(self, order_data: Dict):
         """
@@ -1181,6 +1214,10 @@ class MarketMaker:
         except Exception as e:
             logger.error(f"Error handling WebSocket trade update: {e}", exc_info=True)
     
+    def _lookup_position_market(self, db_pos: RealMarketMakerPosition) -> Optional[Dict]:
+        """Look up the Gamma market for a persisted position."""
+        return get_market_by_slug(db_pos.market_slug)
+    
     async def _resume_positions(self):
         """Resume monitoring existing positions from database."""
         # Query for active positions from this deployment
@@ -1195,7 +1232,7 @@ class MarketMaker:
             
             for db_pos in positions:
                 market_slug = db_pos.market_slug
-                market = get_market_by_slug(market_slug)
+                market = self._lookup_position_market(db_pos)
                 
                 if not market:
                     logger.warning(f"Could not find market for slug: {market_slug}")
@@ -1487,7 +1524,7 @@ class MarketMaker:
         
         # Pre-check balance before attempting split
         try:
-            current_balance = self.pm.get_usdc_balance()
+            current_balance = await self.async_pm.get_usdc_balance()
             if current_balance < self.config.split_amount:
                 logger.error(
                     f"❌ Insufficient USDC balance for split: "
@@ -1503,12 +1540,8 @@ class MarketMaker:
             logger.warning(f"Could not check balance before split: {e}. Proceeding anyway...")
         
         try:
-            # Call split_position synchronously (it's a blocking web3 call)
-            # Run in executor to avoid blocking the event loop
-            loop = asyncio.get_event_loop()
-            split_result = await loop.run_in_executor(
-                None,
-                self.pm.split_position,
+            # split_position is a blocking web3 call - runs on the RPC pool
+            split_result = await self.async_pm.split_position(
                 condition_id,
                 self.config.split_amount
             )
@@ -1589,8 +1622,8 @@ class MarketMaker:
                 f"🔍 Verifying YES and NO shares are available on-chain "
                 f"(checking direct wallet: {direct_wallet_address[:10]}...{direct_wallet_address[-8:]})..."
             )
-            yes_balance = self.pm.get_conditional_token_balance(position.yes_token_id, wallet_address=direct_wallet_address)
-            no_balance = self.pm.get_conditional_token_balance(position.no_token_id, wallet_address=direct_wallet_address)
+            yes_balance = await self.async_pm.get_conditional_token_balance(position.yes_token_id, wallet_address=direct_wallet_address)
+            no_balance = await self.async_pm.get_conditional_token_balance(position.no_token_id, wallet_address=direct_wallet_address)
             
             if yes_balance is None or no_balance is None:
                 logger.error("❌ Could not check conditional token balances - aborting order placement")
@@ -1608,8 +1641,8 @@ class MarketMaker:
                 )
                 await asyncio.sleep(5.0)
                 # Re-check after wait (still checking direct wallet)
-                yes_balance = self.pm.get_conditional_token_balance(position.yes_token_id, wallet_address=direct_wallet_address)
-                no_balance = self.pm.get_conditional_token_balance(position.no_token_id, wallet_address=direct_wallet_address)
+                yes_balance = await self.async_pm.get_conditional_token_balance(position.yes_token_id, wallet_address=direct_wallet_address)
+                no_balance = await self.async_pm.get_conditional_token_balance(position.no_token_id, wallet_address=direct_wallet_address)
                 if yes_balance is None or no_balance is None:
                     logger.error("❌ Could not re-check conditional token balances - aborting order placement")
                     return
@@ -1628,7 +1661,7 @@ class MarketMaker:
             logger.info("🔍 Checking conditional token allowances for exchange contracts...")
             logger.info(f"   Checking allowances for DIRECT wallet: {direct_wallet_address[:10]}...{direct_wallet_address[-8:]}")
             logger.info(f"   (Shares are in direct wallet, so allowances must be set for direct wallet)")
-            allowances_ok = self.pm.ensure_conditional_token_allowances(wallet_address=direct_wallet_address)
+            allowances_ok = await self.async_pm.ensure_conditional_token_allowances(wallet_address=direct_wallet_address)
             if not allowances_ok:
                 logger.error(
                     "❌ Conditional token allowances NOT set. Cannot place sell orders. "
@@ -1807,7 +1840,6 @@ class MarketMaker:
             logger.info("=" * 80)
             
             # Place YES and NO sell orders in batch to reduce latency
-            loop = asyncio.get_event_loop()
             
             orders_to_place = [
                 {
@@ -1825,9 +1857,7 @@ class MarketMaker:
             ]
             
             # Execute batch order placement
-            batch_result = await loop.run_in_executor(
-                None,
-                self.pm.place_orders_batch,
+            batch_result = await self.async_pm.place_orders_batch(
                 orders_to_place
             )
             
@@ -1847,7 +1877,7 @@ class MarketMaker:
                             
                             # Verify order status immediately
                             await asyncio.sleep(1.0)  # Brief wait for order to propagate
-                            yes_status = self.pm.get_order_status(yes_order_id)
+                            yes_status = await self.async_pm.get_order_status(yes_order_id)
                             if yes_status:
                                 logger.info(f"   📋 YES order status: {yes_status.get('status', 'unknown')}")
                             else:
@@ -1862,7 +1892,7 @@ class MarketMaker:
                             
                             # Verify order status immediately
                             await asyncio.sleep(1.0)  # Brief wait for order to propagate
-                            no_status = self.pm.get_order_status(no_order_id)
+                            no_status = await self.async_pm.get_order_status(no_order_id)
                             if no_status:
                                 logger.info(f"   📋 NO order status: {no_status.get('status', 'unknown')}")
                             else:
@@ -2191,10 +2221,10 @@ class MarketMaker:
             # Always do HTTP check as backup (even if WebSocket is working)
             # WebSocket callbacks handle real-time updates, but HTTP ensures we don't miss anything
             if position.yes_order_id and not position.yes_filled:
-                yes_status = self.pm.get_order_status(position.yes_order_id)
+                yes_status = await self.async_pm.get_order_status(position.yes_order_id)
             
             if position.no_order_id and not position.no_filled:
-                no_status = self.pm.get_order_status(position.no_order_id)
+                no_status = await self.async_pm.get_order_status(position.no_order_id)
             
             # Parse order statuses and detect fills
             if yes_status:
@@ -2345,7 +2375,7 @@ class MarketMaker:
                 other_order_id = position.no_order_id if unfilled_side == "NO" else position.yes_order_id
                 
                 if other_order_id:
-                    other_status = self.pm.get_order_status(other_order_id)
+                    other_status = await self.async_pm.get_order_status(other_order_id)
                     if other_status:
                         other_status_str, other_filled_amount, other_total_amount = parse_order_status(other_status)
                         if is_order_filled(other_status_str, other_filled_amount, other_total_amount):
@@ -2642,10 +2672,7 @@ class MarketMaker:
             )
             
             # Batch cancel both orders
-            loop = asyncio.get_event_loop()
-            cancel_result = await loop.run_in_executor(
-                None,
-                self.pm.cancel_orders_batch,
+            cancel_result = await self.async_pm.cancel_orders_batch(
                 [position.yes_order_id, position.no_order_id]
             )
             
@@ -2666,7 +2693,7 @@ class MarketMaker:
             while verify_attempt < max_verify_attempts and (not yes_cancelled or not no_cancelled):
                 # Check YES order if not already confirmed
                 if not yes_cancelled and position.yes_order_id:
-                    yes_status = self.pm.get_order_status(position.yes_order_id)
+                    yes_status = await self.async_pm.get_order_status(position.yes_order_id)
                     if yes_status:
                         yes_status_str, yes_filled_amount, yes_total_amount = parse_order_status(yes_status)
                         if is_order_cancelled(yes_status_str):
@@ -2684,7 +2711,7 @@ class MarketMaker:
                 
                 # Check NO order if not already confirmed
                 if not no_cancelled and position.no_order_id:
-                    no_status = self.pm.get_order_status(position.no_order_id)
+                    no_status = await self.async_pm.get_order_status(position.no_order_id)
                     if no_status:
                         no_status_str, no_filled_amount, no_total_amount = parse_order_status(no_status)
                         if is_order_cancelled(no_status_str):
@@ -2750,9 +2777,7 @@ class MarketMaker:
                 }
             ]
             
-            place_result = await loop.run_in_executor(
-                None,
-                self.pm.place_orders_batch,
+            place_result = await self.async_pm.place_orders_batch(
                 orders_to_place
             )
             
@@ -2826,10 +2851,7 @@ class MarketMaker:
             logger.info(f"Merging positions for {position.market_slug} (cancelling orders first, then merging shares)")
             
             # Step 1: Cancel both orders (required before merging shares)
-            loop = asyncio.get_event_loop()
-            cancel_result = await loop.run_in_executor(
-                None,
-                self.pm.cancel_orders_batch,
+            cancel_result = await self.async_pm.cancel_orders_batch(
                 [position.yes_order_id, position.no_order_id]
             )
             
@@ -2845,8 +2867,8 @@ class MarketMaker:
             await asyncio.sleep(3.0)
             
             # Step 3: Verify orders are cancelled before merging
-            yes_status = self.pm.get_order_status(position.yes_order_id) if position.yes_order_id else None
-            no_status = self.pm.get_order_status(position.no_order_id) if position.no_order_id else None
+            yes_status = await self.async_pm.get_order_status(position.yes_order_id) if position.yes_order_id else None
+            no_status = await self.async_pm.get_order_status(position.no_order_id) if position.no_order_id else None
             
             yes_cancelled = False
             no_cancelled = False
@@ -2878,9 +2900,7 @@ class MarketMaker:
                     f"🔄 Merging {merge_amount:.2f} YES + {merge_amount:.2f} NO shares back to ${merge_amount:.2f} USDC..."
                 )
                 
-                merge_result = await loop.run_in_executor(
-                    None,
-                    self.pm.merge_positions,
+                merge_result = await self.async_pm.merge_positions(
                     position.condition_id,
                     merge_amount
                 )
@@ -2950,7 +2970,7 @@ class MarketMaker:
                 return
             
             # Check order status before cancelling
-            current_status = self.pm.get_order_status(order_id)
+            current_status = await self.async_pm.get_order_status(order_id)
             if current_status:
                 status_str, filled_amount, total_amount = parse_order_status(current_status)
                 
@@ -2978,7 +2998,7 @@ class MarketMaker:
             # Cancel existing order
             logger.info(f"Cancelling {side} order {order_id}")
             try:
-                cancel_result = self.pm.cancel_order(order_id)
+                cancel_result = await self.async_pm.cancel_order(order_id)
                 
                 if cancel_result:
                     logger.info(f"✅ Cancel request sent for {side} order {order_id}")
@@ -3005,7 +3025,7 @@ class MarketMaker:
             order_confirmed_cancelled_or_filled = False
             
             while verify_attempt < max_verify_attempts and not order_confirmed_cancelled_or_filled:
-                verify_status = self.pm.get_order_status(order_id)
+                verify_status = await self.async_pm.get_order_status(order_id)
                 if verify_status:
                     status_str, filled_amount, total_amount = parse_order_status(verify_status)
                     if is_order_cancelled(status_str):
@@ -3090,7 +3110,7 @@ class MarketMaker:
             # Use direct wallet address (where shares are)
             direct_wallet_address = self.pm.get_address_for_private_key()
             logger.info(f"🔍 Verifying {side} shares are still available before placing new order...")
-            actual_balance = self.pm.get_conditional_token_balance(
+            actual_balance = await self.async_pm.get_conditional_token_balance(
                 token_id,
                 wallet_address=direct_wallet_address
             )
@@ -3124,7 +3144,7 @@ class MarketMaker:
             
             # Verify allowances are still set
             logger.info(f"🔍 Verifying conditional token allowances before placing new order...")
-            allowances_ok = self.pm.ensure_conditional_token_allowances(wallet_address=direct_wallet_address)
+            allowances_ok = await self.async_pm.ensure_conditional_token_allowances(wallet_address=direct_wallet_address)
             if not allowances_ok:
                 logger.error(
                     f"❌ Conditional token allowances NOT set for direct wallet. "
@@ -3148,7 +3168,7 @@ class MarketMaker:
                 logger.info(f"  📊 New {side} order price: ${new_price:.4f}, Best BID: None")
             
             # Place new order
-            order_response = self.pm.execute_order(
+            order_response = await self.async_pm.execute_order(
                 price=new_price,
                 size=shares,
                 side="SELL",
@@ -3415,7 +3435,12 @@ class MarketMaker:
         except Exception as e:
             logger.error(f"Error calculating resolution payout: {e}", exc_info=True)
     
-    async def _redeem_winning_shares(self, position: MarketMakerPosition, winning_side: str):
+    async def _redeem_winning_shares(
+        self,
+        position: MarketMakerPosition,
+        winning_side: str,
+        balances: Optional[Dict[str, Optional[float]]] = None
+    ):
         """
         Automatically redeem winning shares after market resolution.
         
@@ -3426,18 +3451,23 @@ class MarketMaker:
         
         Note: This is ONLY called after market resolution. We don't merge during active market making
         because the purpose of splitting is to sell each side separately.
+        
+        Args:
+            position: Position to redeem
+            winning_side: "YES" or "NO"
+            balances: Optional prefetched token_id -> balance map (from get_conditional_token_balances);
+                      if not given, both sides are read in one multicall
         """
         try:
             # Check ACTUAL wallet balances (more reliable than position object)
-            direct_wallet = self.pm.get_address_for_private_key()
-            yes_balance = self.pm.get_conditional_token_balance(
-                position.yes_token_id,
-                wallet_address=direct_wallet
-            )
-            no_balance = self.pm.get_conditional_token_balance(
-                position.no_token_id,
-                wallet_address=direct_wallet
-            )
+            if balances is None:
+                direct_wallet = self.pm.get_address_for_private_key()
+                balances = await self.async_pm.get_conditional_token_balances(
+                    [position.yes_token_id, position.no_token_id],
+                    wallet_address=direct_wallet
+                )
+            yes_balance = balances.get(position.yes_token_id)
+            no_balance = balances.get(position.no_token_id)
             
             if yes_balance is None or no_balance is None:
                 logger.warning(f"Could not check wallet balances for {position.market_slug}, using position object values")
@@ -3463,10 +3493,7 @@ class MarketMaker:
                         f"💰 Both sides remain unsold in equal amounts ({merge_amount:.2f}). "
                         f"Merging back to ${merge_amount:.2f} USDC..."
                     )
-                    loop = asyncio.get_event_loop()
-                    merge_result = await loop.run_in_executor(
-                        None,
-                        self.pm.merge_positions,
+                    merge_result = await self.async_pm.merge_positions(
                         position.condition_id,
                         merge_amount
                     )
@@ -3482,10 +3509,7 @@ class MarketMaker:
                         f"⚠️ Unequal amounts (YES: {yes_remaining:.2f}, NO: {no_remaining:.2f}). "
                         f"Will merge {merge_amount:.2f} and handle remainder separately."
                     )
-                    loop = asyncio.get_event_loop()
-                    merge_result = await loop.run_in_executor(
-                        None,
-                        self.pm.merge_positions,
+                    merge_result = await self.async_pm.merge_positions(
                         position.condition_id,
                         merge_amount
                     )
@@ -3502,16 +3526,11 @@ class MarketMaker:
                 )
                 try:
                     # Place sell order at $0.99 (just below $1.00 to ensure fill)
-                    loop = asyncio.get_event_loop()
-                    # Use lambda to wrap keyword arguments (run_in_executor doesn't accept kwargs)
-                    order_result = await loop.run_in_executor(
-                        None,
-                        lambda: self.pm.execute_order(
-                            price=0.99,
-                            size=yes_remaining,
-                            side="SELL",
-                            token_id=position.yes_token_id
-                        )
+                    order_result = await self.async_pm.execute_order(
+                        price=0.99,
+                        size=yes_remaining,
+                        side="SELL",
+                        token_id=position.yes_token_id
                     )
                     if order_result and order_result.get("order_id"):
                         logger.info(f"✅ Placed sell order for {yes_remaining:.2f} YES shares: {order_result.get('order_id')}")
@@ -3527,16 +3546,11 @@ class MarketMaker:
                 )
                 try:
                     # Place sell order at $0.99 (just below $1.00 to ensure fill)
-                    loop = asyncio.get_event_loop()
-                    # Use lambda to wrap keyword arguments (run_in_executor doesn't accept kwargs)
-                    order_result = await loop.run_in_executor(
-                        None,
-                        lambda: self.pm.execute_order(
-                            price=0.99,
-                            size=no_remaining,
-                            side="SELL",
-                            token_id=position.no_token_id
-                        )
+                    order_result = await self.async_pm.execute_order(
+                        price=0.99,
+                        size=no_remaining,
+                        side="SELL",
+                        token_id=position.no_token_id
                     )
                     if order_result and order_result.get("order_id"):
                         logger.info(f"✅ Placed sell order for {no_remaining:.2f} NO shares: {order_result.get('order_id')}")
@@ -3566,14 +3580,14 @@ class MarketMaker:
             if not position.yes_filled and position.yes_order_id:
                 try:
                     logger.info(f"Cancelling remaining YES order {position.yes_order_id}")
-                    self.pm.cancel_order(position.yes_order_id)
+                    await self.async_pm.cancel_order(position.yes_order_id)
                 except Exception as e:
                     logger.warning(f"Error cancelling YES order: {e}")
             
             if not position.no_filled and position.no_order_id:
                 try:
                     logger.info(f"Cancelling remaining NO order {position.no_order_id}")
-                    self.pm.cancel_order(position.no_order_id)
+                    await self.async_pm.cancel_order(position.no_order_id)
                 except Exception as e:
                     logger.warning(f"Error cancelling NO order: {e}")
             
@@ -122,6 +122,10 @@ class MarketMakerConfig:
         if not isinstance(websocket_health_check_timeout, (int, float)) or websocket_health_check_timeout <= 0.0:
             raise ValueError(f"websocket_health_check_timeout must be a positive float, got {websocket_health_check_timeout}")
         
+        websocket_connections = self.config.get('websocket_connections', 1)
+        if not isinstance(websocket_connections, int) or websocket_connections < 1:
+            raise ValueError(f"websocket_connections must be a positive integer, got {websocket_connections}")
+        
         # Validate WebSocket order status config (optional, defaults to True)
         use_websocket_order_status = self.config.get('use_websocket_order_status', True)
         if not isinstance(use_websocket_order_status, bool):
@@ -208,6 +212,11 @@ class MarketMakerConfig:
         """WebSocket reconnect delay in seconds."""
         return float(self.config.get('websocket_reconnect_delay', 5.0))
     
+    @property
+    def websocket_connections(self) -> int:
+        """Number of WebSocket connections to shard orderbook subscriptions across."""
+        return int(self.config.get('websocket_connections', 1))
+    
     @property
     def use_websocket_order_status(self) -> bool:
         """Whether to use WebSocket for order status updates."""
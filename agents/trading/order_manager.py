@@ -22,6 +22,7 @@ from agents.trading.utils.order_status_helpers import (
 )
 from agents.trading.utils.market_time_helpers import get_minutes_until_resolution
 from agents.polymarket.btc_market_detector import is_market_active, get_market_by_slug
+from agents.polymarket.async_polymarket import AsyncPolymarket
 from agents.backtesting.backtesting_utils import calculate_polymarket_fee
 
 logger = logging.getLogger(__name__)
@@ -47,6 +48,7 @@ class OrderManager:
         is_running: Callable[[], bool],
         place_sell_order_callback: Callable[[RealTradeThreshold], Awaitable[None]],
         websocket_order_status_service=None,
+        async_pm=None,
     ):
         """
         Initialize order manager.
@@ -62,12 +64,16 @@ class OrderManager:
             is_running: Callable that returns current running status
             place_sell_order_callback: Async function(trade) -> None (called when buy order fills)
             websocket_order_status_service: Optional WebSocketOrderStatusService instance for real-time order updates
+            async_pm: Optional shared AsyncPolymarket facade (created from pm if not provided)
         """
         self.config = config
         self.open_trades = open_trades
         self.open_sell_orders = open_sell_orders
         self.db = db
         self.pm = pm
+        # Only shut down the facade's thread pools if we created it
+        self._owns_async_pm = async_pm is None
+        self.async_pm = async_pm or AsyncPolymarket(pm)
         self.get_principal = get_principal
         self.deployment_id = deployment_id
         self.is_running = is_running
@@ -88,6 +94,11 @@ class OrderManager:
         self._using_websocket = False
         self._websocket_fallback_logged = False
     
+    async def close(self):
+        """Shut down the AsyncPolymarket thread pools if this manager created them."""
+        if self._owns_async_pm:
+            await self.async_pm.close()
+    
     async def _handle_websocket_order_update(self, order_data: Dict):
         """
         Handle order status update from WebSocket.
@@ -424,7 +435,7 @@ class OrderManager:
                     f"Placing BUY order at ${order_price:.4f} for {order_size} shares "
                     f"(market={market_slug}, side={side}, token_id={token_id[:20]}...)"
                 )
-                order_response = self.pm.execute_order(
+                order_response = await self.async_pm.execute_order(
                     price=order_price,
                     size=order_size,
                     side="BUY",
@@ -457,7 +468,7 @@ class OrderManager:
                 # Check for balance/allowance errors
                 if "not enough balance" in error_msg.lower() or "allowance" in error_msg.lower():
                     try:
-                        current_balance = self.pm.get_polymarket_balance()
+                        current_balance = await self.async_pm.get_polymarket_balance()
                         if current_balance is not None:
                             logger.error(
                                 f"Insufficient balance/allowance: wallet has ${current_balance:.2f}, "
@@ -640,7 +651,7 @@ class OrderManager:
             # So we get maker fills and also get all trades to check for taker fills
             fills = []
             try:
-                maker_fills = self.pm.get_trades(maker_address=wallet_address) or []
+                maker_fills = await self.async_pm.get_trades(maker_address=wallet_address) or []
                 logger.debug(f"Found {len(maker_fills)} maker fills for wallet {wallet_address[:10] if wallet_address else 'N/A'}...")
             except Exception as e:
                 logger.error(f"Error getting maker fills: {e}", exc_info=True)
@@ -648,7 +659,7 @@ class OrderManager:
             
             # Get all trades (no filter) to find trades where we're the taker
             try:
-                all_trades = self.pm.get_trades() or []
+                all_trades = await self.async_pm.get_trades() or []
                 logger.debug(f"Retrieved {len(all_trades)} total trades to check for taker fills")
             except Exception as e:
                 logger.error(f"Error getting all trades: {e}", exc_info=True)
@@ -781,7 +792,7 @@ class OrderManager:
     async def _check_buy_orders_via_open_orders(self, all_trades_to_check: Dict[str, int]):
         """Check if buy orders are still in open orders list."""
         try:
-            open_orders = self.pm.get_open_orders()
+            open_orders = await self.async_pm.get_open_orders()
             open_order_ids = set()
             if open_orders:
                 for o in open_orders:
@@ -799,7 +810,7 @@ class OrderManager:
                     if trade and not trade.filled_shares and trade.order_status == "open":
                         # Check order status via API to verify it's actually filled
                         try:
-                            order_status = self.pm.get_order_status(order_id)
+                            order_status = await self.async_pm.get_order_status(order_id)
                             if order_status:
                                 # Parse order status to check if it's filled
                                 status, filled_amount, total_amount = parse_order_status(order_status)
@@ -947,7 +958,7 @@ class OrderManager:
                     continue
                 
                 logger.debug(f"Checking order status for {order_id[:20]}... (trade_id={trade_id}, market={trade.market_slug})")
-                order_status = self.pm.get_order_status(order_id)
+                order_status = await self.async_pm.get_order_status(order_id)
                 if not order_status:
                     # If order not found, check retry count
                     retry_count = self.orders_not_found.get(order_id, 0)
@@ -1031,7 +1042,7 @@ class OrderManager:
                     
                     # Try to cancel remaining portion
                     try:
-                        self.pm.cancel_order(order_id)
+                        await self.async_pm.cancel_order(order_id)
                         logger.info(f"Cancelled remaining portion of order {order_id}")
                     except Exception as e:
                         logger.warning(f"Could not cancel order {order_id}: {e}")
@@ -1047,7 +1058,7 @@ class OrderManager:
                             f"has resolved. Cancelling order and marking as cancelled."
                         )
                         try:
-                            cancel_result = self.pm.cancel_order(order_id)
+                            cancel_result = await self.async_pm.cancel_order(order_id)
                             if cancel_result:
                                 logger.info(f"✅ Successfully cancelled buy order {order_id} via API")
                             else:
@@ -1083,7 +1094,7 @@ class OrderManager:
                             f"Cancelling order immediately."
                         )
                         try:
-                            cancel_result = self.pm.cancel_order(order_id)
+                            cancel_result = await self.async_pm.cancel_order(order_id)
                             if cancel_result:
                                 logger.info(f"✅ Successfully cancelled buy order {order_id} via API")
                             else:
@@ -1168,7 +1179,7 @@ class OrderManager:
                 wallet_address = self.pm.get_address_for_private_key()
             
             # First try with maker_address filter
-            fills = self.pm.get_trades(maker_address=wallet_address)
+            fills = await self.async_pm.get_trades(maker_address=wallet_address)
             
             # Also get trades without filter to catch cases where we're the taker
             if fills:
@@ -1191,12 +1202,12 @@ class OrderManager:
                         break
                 
                 if not found_any_match:
-                    fills_unfiltered = self.pm.get_trades()
+                    fills_unfiltered = await self.async_pm.get_trades()
                     if fills_unfiltered:
                         existing_order_ids = {f.get("taker_order_id") for f in fills if f.get("taker_order_id")}
                         fills.extend([f for f in fills_unfiltered if f.get("taker_order_id") not in existing_order_ids])
             else:
-                fills = self.pm.get_trades()
+                fills = await self.async_pm.get_trades()
             
             if fills:
                 logger.info(f"📊 Checking {len(fills)} trade records for sell order fills...")
@@ -1242,18 +1253,14 @@ class OrderManager:
                                 logger.warning(
                                     f"⚠️ Sell order {fill_order_id} (trade {trade_id}) trade record shows FAILED status"
                                 )
-                                session = self.db.SessionLocal()
                                 try:
-                                    trade_obj = session.query(RealTradeThreshold).filter_by(id=trade_id).first()
-                                    if trade_obj:
-                                        trade_obj.sell_order_status = "failed"
-                                        trade_obj.error_message = f"Sell order trade failed: status={trade_status}"
-                                        session.commit()
+                                    self.db.update_trade_fields(
+                                        trade_id,
+                                        sell_order_status="failed",
+                                        error_message=f"Sell order trade failed: status={trade_status}",
+                                    )
                                 except Exception as e:
-                                    session.rollback()
                                     logger.error(f"Error marking sell order as failed: {e}")
-                                finally:
-                                    session.close()
                                 continue
                             
                             if is_successful_trade:
@@ -1313,7 +1320,7 @@ class OrderManager:
         """Check individual sell order statuses."""
         for sell_order_id, trade_id in list(all_sell_orders_to_check.items()):
             try:
-                order_status = self.pm.get_order_status(sell_order_id)
+                order_status = await self.async_pm.get_order_status(sell_order_id)
                 if not order_status:
                     # If sell order not found, check retry count
                     retry_count = self.sell_orders_not_found.get(sell_order_id, 0)
@@ -1334,24 +1341,13 @@ class OrderManager:
                     
                     # Clear sell_order_id from database
                     try:
-                        session = self.db.SessionLocal()
-                        try:
-                            trade_obj = session.query(RealTradeThreshold).filter_by(id=trade_id).first()
-                            if trade_obj:
-                                trade_obj.sell_order_id = None
-                                trade_obj.sell_order_status = None
-                                session.commit()
-                                logger.info(
-                                    f"✅ Cleared sell_order_id for trade {trade_id}. "
-                                    f"retry_missing_sell_orders will retry placing the sell order."
-                                )
-                        except Exception as e:
-                            session.rollback()
-                            logger.error(f"Error clearing sell_order_id from database: {e}", exc_info=True)
-                        finally:
-                            session.close()
+                        self.db.update_trade_fields(trade_id, sell_order_id=None, sell_order_status=None)
+                        logger.info(
+                            f"✅ Cleared sell_order_id for trade {trade_id}. "
+                            f"retry_missing_sell_orders will retry placing the sell order."
+                        )
                     except Exception as e:
-                        logger.error(f"Error accessing database to clear sell_order_id: {e}", exc_info=True)
+                        logger.error(f"Error clearing sell_order_id from database: {e}", exc_info=True)
                     
                     # Remove from tracking
                     self.open_sell_orders.pop(sell_order_id, None)
@@ -1400,24 +1396,18 @@ class OrderManager:
                                 
                                 # Cancel the current order
                                 try:
-                                    cancel_result = self.pm.cancel_order(sell_order_id)
+                                    cancel_result = await self.async_pm.cancel_order(sell_order_id)
                                     if cancel_result:
                                         logger.info(f"✅ Successfully cancelled threshold sell order {sell_order_id} for re-pricing")
                                         self.open_sell_orders.pop(sell_order_id, None)
                                         
                                         # Update database
-                                        session = self.db.SessionLocal()
                                         try:
-                                            trade_obj = session.query(RealTradeThreshold).filter_by(id=trade_id).first()
-                                            if trade_obj:
-                                                trade_obj.sell_order_status = "cancelled"
-                                                trade_obj.sell_order_id = None
-                                                session.commit()
+                                            self.db.update_trade_fields(
+                                                trade_id, sell_order_status="cancelled", sell_order_id=None
+                                            )
                                         except Exception as e:
-                                            session.rollback()
                                             logger.error(f"Error updating database after cancellation: {e}")
-                                        finally:
-                                            session.close()
                                         
                                         # Reload trade and place new order at lower price
                                         trade = self.db.get_trade_by_id(trade_id)
@@ -1508,30 +1498,19 @@ class OrderManager:
     async def retry_missing_sell_orders(self):
         """Retry placing sell orders for trades with filled buy orders but no sell orders."""
         try:
-            session = self.db.SessionLocal()
-            try:
-                trades_needing_sell = session.query(RealTradeThreshold).filter(
-                    RealTradeThreshold.deployment_id == self.deployment_id,
-                    RealTradeThreshold.order_status == "filled",
-                    RealTradeThreshold.filled_shares.isnot(None),
-                    RealTradeThreshold.filled_shares > 0,
-                    RealTradeThreshold.sell_order_id.is_(None),
-                    RealTradeThreshold.market_resolved_at.is_(None),
-                ).all()
+            trades_needing_sell = self.db.get_filled_trades_without_sell(deployment_id=self.deployment_id)
+            
+            for trade in trades_needing_sell:
+                # Only retry if buy order filled more than 30 seconds ago
+                if trade.order_filled_at:
+                    time_since_fill = datetime.now(timezone.utc) - trade.order_filled_at
+                    if time_since_fill.total_seconds() < 30:
+                        continue
                 
-                for trade in trades_needing_sell:
-                    # Only retry if buy order filled more than 30 seconds ago
-                    if trade.order_filled_at:
-                        time_since_fill = datetime.now(timezone.utc) - trade.order_filled_at
-                        if time_since_fill.total_seconds() < 30:
-                            continue
-                    
-                    logger.info(
-                        f"Found trade {trade.id} with filled buy order but no sell order. "
-                        f"Retrying sell order placement..."
-                    )
-                    await self.place_sell_order_callback(trade)
-            finally:
-                session.close()
+                logger.info(
+                    f"Found trade {trade.id} with filled buy order but no sell order. "
+                    f"Retrying sell order placement..."
+                )
+                await self.place_sell_order_callback(trade)
         except Exception as e:
             logger.debug(f"Error checking for missing sell orders: {e}")
@@ -7,6 +7,7 @@ Supports both WebSocket (real-time) and HTTP (fallback) orderbook fetching.
 import logging
 import httpx
 from typing import Optional, Tuple, Dict
+from agents.utils import json_codec, metrics
 from agents.utils.proxy_config import get_proxy_dict
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,7 @@ def fetch_orderbook(token_id: str) -> Optional[Dict]:
             if _fallback_logged:
                 logger.info("✓ WebSocket orderbook service is working again - switching back to WebSocket")
                 _fallback_logged = False
+            metrics.inc("orderbook_fetch", {"source": "websocket"})
             return orderbook
         # Cache miss or stale - fall through to HTTP
     
@@ -56,15 +58,16 @@ def fetch_orderbook(token_id: str) -> Optional[Dict]:
         response = httpx.get(url, params={"token_id": token_id}, proxies=proxies, timeout=10.0)
         
         if response.status_code == 200:
-            data = response.json()
-            bids = [[float(b["price"]), float(b["size"])] for b in data.get("bids", [])]
-            asks = [[float(a["price"]), float(a["size"])] for a in data.get("asks", [])]
+            bids, asks, _ = json_codec.decode_rest_book(response.content)
+            metrics.inc("orderbook_fetch", {"source": "http"})
             return {"bids": bids, "asks": asks}
         else:
             logger.warning(f"Failed to fetch orderbook for {token_id}: HTTP {response.status_code}")
+            metrics.inc("orderbook_fetch", {"source": "http_error"})
             return None
     except Exception as e:
         logger.error(f"Error fetching orderbook for {token_id}: {e}")
+        metrics.inc("orderbook_fetch", {"source": "http_error"})
         return None
 
 
@@ -13,6 +13,7 @@ from agents.trading.orderbook_helper import (
     get_lowest_ask,
 )
 from agents.polymarket.btc_market_detector import is_market_active, get_market_by_slug
+from agents.polymarket.async_polymarket import AsyncPolymarket
 from agents.trading.trade_db import RealTradeThreshold
 
 logger = logging.getLogger(__name__)
@@ -40,6 +41,7 @@ class OrderbookMonitor:
         place_early_sell_callback: Callable[[RealTradeThreshold, float], Awaitable[None]],
         get_minutes_until_resolution: Callable[[Dict], Optional[float]],
         websocket_service=None,
+        async_pm=None,
     ):
         """
         Initialize orderbook monitor.
@@ -59,6 +61,7 @@ class OrderbookMonitor:
             place_early_sell_callback: Async function(trade, sell_price) -> None
             get_minutes_until_resolution: Callable that takes market dict and returns minutes until resolution
             websocket_service: Optional WebSocketOrderbookService instance for real-time orderbook updates
+            async_pm: Optional shared AsyncPolymarket facade (created from pm if not provided)
         """
         self.config = config
         self.monitored_markets = monitored_markets
@@ -67,6 +70,9 @@ class OrderbookMonitor:
         self.open_sell_orders = open_sell_orders
         self.db = db
         self.pm = pm
+        # Only shut down the facade's thread pools if we created it
+        self._owns_async_pm = async_pm is None
+        self.async_pm = async_pm or AsyncPolymarket(pm)
         self.get_principal = get_principal
         self.deployment_id = deployment_id
         self.is_running = is_running
@@ -89,6 +95,11 @@ class OrderbookMonitor:
         # Format: {trade_id: {"started_at": datetime}}
         self.threshold_sell_confirmations: Dict[int, Dict] = {}
     
+    async def close(self):
+        """Shut down the AsyncPolymarket thread pools if this monitor created them."""
+        if self._owns_async_pm:
+            await self.async_pm.close()
+    
     async def monitoring_loop(self):
         """Poll orderbooks and check for threshold triggers."""
         import asyncio
@@ -244,7 +255,7 @@ class OrderbookMonitor:
         
         # Check wallet balance before placing orders
         try:
-            wallet_balance = self.pm.get_polymarket_balance()
+            wallet_balance = await self.async_pm.get_polymarket_balance()
             if wallet_balance is None:
                 logger.warning("Could not check wallet balance - skipping order placement")
                 return
@@ -459,304 +470,283 @@ class OrderbookMonitor:
         if not monitored_market_slugs:
             return
         
-        session = self.db.SessionLocal()
-        try:
-            # Check trades without sell orders first - only for monitored markets
-            trades_without_sell = session.query(RealTradeThreshold).filter(
-                RealTradeThreshold.deployment_id == self.deployment_id,
-                RealTradeThreshold.order_status == "filled",
-                RealTradeThreshold.filled_shares.isnot(None),
-                RealTradeThreshold.filled_shares > 0,
-                RealTradeThreshold.sell_order_id.is_(None),  # No sell order yet
-                RealTradeThreshold.market_resolved_at.is_(None),  # Market not resolved yet
-                RealTradeThreshold.market_slug.in_(monitored_market_slugs),  # Only current markets
-            ).order_by(RealTradeThreshold.order_placed_at.desc()).all()
-            
-            logger.info(
-                f"🔍 Checking {len(trades_without_sell)} trades without sell orders for threshold sell "
-                f"(monitored markets: {len(monitored_market_slugs)})"
-            )
-            
-            for trade in trades_without_sell:
-                try:
+        # Check trades without sell orders first - only for monitored markets
+        trades_without_sell = self.db.get_filled_trades_without_sell(
+            deployment_id=self.deployment_id,
+            market_slugs=monitored_market_slugs,
+        )
+        
+        logger.info(
+            f"🔍 Checking {len(trades_without_sell)} trades without sell orders for threshold sell "
+            f"(monitored markets: {len(monitored_market_slugs)})"
+        )
+        
+        for trade in trades_without_sell:
+            try:
+                logger.info(
+                    f"🔍 Checking threshold sell for trade {trade.id} (market: {trade.market_slug}, "
+                    f"token_id: {trade.token_id[:20] if trade.token_id else 'N/A'}...)"
+                )
+                
+                # Fetch orderbook for the token we bought
+                orderbook = fetch_orderbook(trade.token_id)
+                if not orderbook:
                     logger.info(
-                        f"🔍 Checking threshold sell for trade {trade.id} (market: {trade.market_slug}, "
-                        f"token_id: {trade.token_id[:20] if trade.token_id else 'N/A'}...)"
+                        f"⚠️ Could not fetch orderbook for trade {trade.id} (token_id: {trade.token_id[:20] if trade.token_id else 'N/A'}...)"
                     )
-                    
-                    # Fetch orderbook for the token we bought
-                    orderbook = fetch_orderbook(trade.token_id)
-                    if not orderbook:
-                        logger.info(
-                            f"⚠️ Could not fetch orderbook for trade {trade.id} (token_id: {trade.token_id[:20] if trade.token_id else 'N/A'}...)"
-                        )
-                        continue
-                    
-                    # Get highest bid
-                    highest_bid = get_highest_bid(orderbook)
-                    if highest_bid is None:
-                        logger.info(
-                            f"⚠️ No highest_bid found in orderbook for trade {trade.id} "
-                            f"(market: {trade.market_slug})"
-                        )
-                        continue
-                    
+                    continue
+                
+                # Get highest bid
+                highest_bid = get_highest_bid(orderbook)
+                if highest_bid is None:
                     logger.info(
-                        f"📊 Trade {trade.id}: highest_bid={highest_bid:.4f}, "
-                        f"threshold_sell={self.config.threshold_sell:.4f}, "
-                        f"condition: {highest_bid:.4f} < {self.config.threshold_sell:.4f} = {highest_bid < self.config.threshold_sell}"
+                        f"⚠️ No highest_bid found in orderbook for trade {trade.id} "
+                        f"(market: {trade.market_slug})"
                     )
+                    continue
+                
+                logger.info(
+                    f"📊 Trade {trade.id}: highest_bid={highest_bid:.4f}, "
+                    f"threshold_sell={self.config.threshold_sell:.4f}, "
+                    f"condition: {highest_bid:.4f} < {self.config.threshold_sell:.4f} = {highest_bid < self.config.threshold_sell}"
+                )
+                
+                # Check if trade is in threshold sell confirmation (skip if confirmation is disabled)
+                if self.config.threshold_sell_confirmation_seconds > 0.0 and trade.id in self.threshold_sell_confirmations:
+                    confirmation_info = self.threshold_sell_confirmations[trade.id]
+                    confirmation_started_at = confirmation_info["started_at"]
                     
-                    # Check if trade is in threshold sell confirmation (skip if confirmation is disabled)
-                    if self.config.threshold_sell_confirmation_seconds > 0.0 and trade.id in self.threshold_sell_confirmations:
-                        confirmation_info = self.threshold_sell_confirmations[trade.id]
-                        confirmation_started_at = confirmation_info["started_at"]
-                        
-                        from datetime import datetime, timezone
-                        time_elapsed = (datetime.now(timezone.utc) - confirmation_started_at).total_seconds()
-                        
-                        # Check if still below threshold
-                        if highest_bid < self.config.threshold_sell:
-                            # Check if confirmation period has elapsed
-                            if time_elapsed >= self.config.threshold_sell_confirmation_seconds:
-                                # Confirmation complete - proceed with sell order placement
-                                logger.info(
-                                    f"✅ Threshold sell confirmation complete for trade {trade.id}: "
-                                    f"highest_bid={highest_bid:.4f} still below threshold_sell={self.config.threshold_sell:.4f} "
-                                    f"after {time_elapsed:.1f} seconds. Proceeding with sell order placement."
-                                )
-                                # Remove from confirmation
-                                self.threshold_sell_confirmations.pop(trade.id, None)
-                                
-                                # Place early sell order
-                                sell_price = self.config.threshold_sell - self.config.margin_sell
-                                if sell_price < 0.01:
-                                    sell_price = 0.01  # Minimum price
-                                
-                                logger.info(
-                                    f"Early sell confirmed for trade {trade.id} (market: {trade.market_slug}, no sell order yet): "
-                                    f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
-                                    f"placing sell order at {sell_price:.4f}"
-                                )
-                                
-                                await self.place_early_sell_callback(trade, sell_price)
-                            else:
-                                # Still in confirmation period
-                                logger.debug(
-                                    f"⏳ Threshold sell confirmation in progress for trade {trade.id}: "
-                                    f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
-                                    f"{time_elapsed:.1f}/{self.config.threshold_sell_confirmation_seconds:.1f} seconds elapsed"
-                                )
-                        else:
-                            # Price recovered above threshold - cancel confirmation
+                    from datetime import datetime, timezone
+                    time_elapsed = (datetime.now(timezone.utc) - confirmation_started_at).total_seconds()
+                    
+                    # Check if still below threshold
+                    if highest_bid < self.config.threshold_sell:
+                        # Check if confirmation period has elapsed
+                        if time_elapsed >= self.config.threshold_sell_confirmation_seconds:
+                            # Confirmation complete - proceed with sell order placement
                             logger.info(
-                                f"🔄 Threshold sell confirmation cancelled for trade {trade.id}: "
-                                f"highest_bid={highest_bid:.4f} recovered above threshold_sell={self.config.threshold_sell:.4f} "
-                                f"after {time_elapsed:.1f} seconds"
+                                f"✅ Threshold sell confirmation complete for trade {trade.id}: "
+                                f"highest_bid={highest_bid:.4f} still below threshold_sell={self.config.threshold_sell:.4f} "
+                                f"after {time_elapsed:.1f} seconds. Proceeding with sell order placement."
                             )
+                            # Remove from confirmation
                             self.threshold_sell_confirmations.pop(trade.id, None)
-                        continue
-                    
-                    # Check if highest_bid < threshold_sell
-                    if highest_bid < self.config.threshold_sell:
-                        # Handle threshold sell confirmation
-                        if self.config.threshold_sell_confirmation_seconds > 0.0:
-                            # Start confirmation period - will check again in next loop iteration
-                            from datetime import datetime, timezone
-                            self.threshold_sell_confirmations[trade.id] = {
-                                "started_at": datetime.now(timezone.utc),
-                            }
+                            
+                            # Place early sell order
+                            sell_price = self.config.threshold_sell - self.config.margin_sell
+                            if sell_price < 0.01:
+                                sell_price = 0.01  # Minimum price
+                            
                             logger.info(
-                                f"⏳ Threshold sell confirmation started for trade {trade.id}: "
+                                f"Early sell confirmed for trade {trade.id} (market: {trade.market_slug}, no sell order yet): "
                                 f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
-                                f"waiting {self.config.threshold_sell_confirmation_seconds:.1f} seconds before placing sell order"
+                                f"placing sell order at {sell_price:.4f}"
                             )
-                            continue  # Wait for confirmation period to complete
-                        
-                        # No confirmation required (threshold_sell_confirmation_seconds == 0) - place sell order immediately
-                        # This happens in the SAME loop iteration where threshold is detected - no extra loop needed
-                        sell_price = self.config.threshold_sell - self.config.margin_sell
-                        if sell_price < 0.01:
-                            sell_price = 0.01  # Minimum price
-                        
+                            
+                            await self.place_early_sell_callback(trade, sell_price)
+                        else:
+                            # Still in confirmation period
+                            logger.debug(
+                                f"⏳ Threshold sell confirmation in progress for trade {trade.id}: "
+                                f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
+                                f"{time_elapsed:.1f}/{self.config.threshold_sell_confirmation_seconds:.1f} seconds elapsed"
+                            )
+                    else:
+                        # Price recovered above threshold - cancel confirmation
                         logger.info(
-                            f"Early sell triggered for trade {trade.id} (market: {trade.market_slug}, no sell order yet): "
+                            f"🔄 Threshold sell confirmation cancelled for trade {trade.id}: "
+                            f"highest_bid={highest_bid:.4f} recovered above threshold_sell={self.config.threshold_sell:.4f} "
+                            f"after {time_elapsed:.1f} seconds"
+                        )
+                        self.threshold_sell_confirmations.pop(trade.id, None)
+                    continue
+                
+                # Check if highest_bid < threshold_sell
+                if highest_bid < self.config.threshold_sell:
+                    # Handle threshold sell confirmation
+                    if self.config.threshold_sell_confirmation_seconds > 0.0:
+                        # Start confirmation period - will check again in next loop iteration
+                        from datetime import datetime, timezone
+                        self.threshold_sell_confirmations[trade.id] = {
+                            "started_at": datetime.now(timezone.utc),
+                        }
+                        logger.info(
+                            f"⏳ Threshold sell confirmation started for trade {trade.id}: "
                             f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
-                            f"placing sell order at {sell_price:.4f}"
+                            f"waiting {self.config.threshold_sell_confirmation_seconds:.1f} seconds before placing sell order"
                         )
-                        
-                        await self.place_early_sell_callback(trade, sell_price)
-                except Exception as e:
-                    logger.error(f"Error checking early sell condition for trade {trade.id}: {e}", exc_info=True)
-            
-            # Also check trades with open $0.99 sell orders - if price drops below threshold,
-            # cancel the $0.99 order and place an early sell order
-            trades_with_099_sell = session.query(RealTradeThreshold).filter(
-                RealTradeThreshold.deployment_id == self.deployment_id,
-                RealTradeThreshold.order_status == "filled",
-                RealTradeThreshold.filled_shares.isnot(None),
-                RealTradeThreshold.filled_shares > 0,
-                RealTradeThreshold.sell_order_id.isnot(None),
-                RealTradeThreshold.sell_order_status == "open",
-                RealTradeThreshold.sell_order_price == 0.99,
-                RealTradeThreshold.market_resolved_at.is_(None),  # Market not resolved yet
-                RealTradeThreshold.market_slug.in_(monitored_market_slugs),  # Only current markets
-            ).order_by(RealTradeThreshold.order_placed_at.desc()).all()
-            
-            logger.info(
-                f"🔍 Checking {len(trades_with_099_sell)} trades with open $0.99 sell orders for threshold sell"
-            )
-            
-            # Also check trades that were incorrectly marked as "filled" but might not actually be filled
-            # This handles cases where API delays caused false positives
-            # Only check if order was marked filled very recently (within last 2 minutes) and market hasn't resolved
-            from datetime import datetime, timezone, timedelta
-            recent_time = datetime.now(timezone.utc) - timedelta(minutes=2)
-            trades_incorrectly_filled = session.query(RealTradeThreshold).filter(
-                RealTradeThreshold.deployment_id == self.deployment_id,
-                RealTradeThreshold.order_status == "filled",
-                RealTradeThreshold.filled_shares.isnot(None),
-                RealTradeThreshold.filled_shares > 0,
-                RealTradeThreshold.sell_order_id.isnot(None),
-                RealTradeThreshold.sell_order_status == "filled",  # Marked as filled
-                RealTradeThreshold.market_resolved_at.is_(None),  # Market not resolved yet
-                RealTradeThreshold.market_slug.in_(monitored_market_slugs),  # Only current markets
-                RealTradeThreshold.sell_order_placed_at.isnot(None),
-                RealTradeThreshold.sell_order_placed_at >= recent_time,  # Recently marked as filled
-            ).order_by(RealTradeThreshold.order_placed_at.desc()).all()
-            
-            # Verify these trades are actually still open by checking the API
-            for trade in trades_incorrectly_filled:
-                try:
-                    # Check if order is actually still open in the API
-                    order_status = self.pm.get_order_status(trade.sell_order_id)
-                    if order_status:
-                        status = order_status.get("status", "unknown")
-                        if status in ["live", "LIVE", "open", "OPEN"]:
-                            # Order is still open - it was incorrectly marked as filled
-                            logger.warning(
-                                f"⚠️ Trade {trade.id} sell order {trade.sell_order_id} was incorrectly marked as 'filled' "
-                                f"but is still OPEN in API (status={status}). Resetting to 'open' and checking early sell."
-                            )
-                            # Reset sell_order_status to "open" so it can be checked for early sell
-                            trade.sell_order_status = "open"
-                            session.commit()
-                            # Add to trades_with_099_sell list so it gets checked
-                            trades_with_099_sell.append(trade)
-                except Exception as e:
-                    logger.debug(f"Could not verify order status for trade {trade.id}: {e}")
-            
-            for trade in trades_with_099_sell:
-                try:
+                        continue  # Wait for confirmation period to complete
+                    
+                    # No confirmation required (threshold_sell_confirmation_seconds == 0) - place sell order immediately
+                    # This happens in the SAME loop iteration where threshold is detected - no extra loop needed
+                    sell_price = self.config.threshold_sell - self.config.margin_sell
+                    if sell_price < 0.01:
+                        sell_price = 0.01  # Minimum price
+                    
                     logger.info(
-                        f"🔍 Checking threshold sell for trade {trade.id} with $0.99 sell order "
-                        f"(market: {trade.market_slug}, token_id: {trade.token_id[:20] if trade.token_id else 'N/A'}...)"
+                        f"Early sell triggered for trade {trade.id} (market: {trade.market_slug}, no sell order yet): "
+                        f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
+                        f"placing sell order at {sell_price:.4f}"
                     )
                     
-                    # Fetch orderbook for the token we bought
-                    orderbook = fetch_orderbook(trade.token_id)
-                    if not orderbook:
-                        logger.info(
-                            f"⚠️ Could not fetch orderbook for trade {trade.id} with $0.99 sell order "
-                            f"(token_id: {trade.token_id[:20] if trade.token_id else 'N/A'}...)"
-                        )
-                        continue
-                    
-                    # Get highest bid
-                    highest_bid = get_highest_bid(orderbook)
-                    if highest_bid is None:
-                        logger.info(
-                            f"⚠️ No highest_bid found in orderbook for trade {trade.id} with $0.99 sell order "
-                            f"(market: {trade.market_slug})"
+                    await self.place_early_sell_callback(trade, sell_price)
+            except Exception as e:
+                logger.error(f"Error checking early sell condition for trade {trade.id}: {e}", exc_info=True)
+        
+        # Also check trades with open $0.99 sell orders - if price drops below threshold,
+        # cancel the $0.99 order and place an early sell order
+        trades_with_099_sell = self.db.get_filled_trades_with_sell_order(
+            deployment_id=self.deployment_id,
+            market_slugs=monitored_market_slugs,
+            sell_order_status="open",
+            sell_order_price=0.99,
+        )
+        
+        logger.info(
+            f"🔍 Checking {len(trades_with_099_sell)} trades with open $0.99 sell orders for threshold sell"
+        )
+        
+        # Also check trades that were incorrectly marked as "filled" but might not actually be filled
+        # This handles cases where API delays caused false positives
+        # Only check if order was marked filled very recently (within last 2 minutes) and market hasn't resolved
+        from datetime import datetime, timezone, timedelta
+        recent_time = datetime.now(timezone.utc) - timedelta(minutes=2)
+        trades_incorrectly_filled = self.db.get_filled_trades_with_sell_order(
+            deployment_id=self.deployment_id,
+            market_slugs=monitored_market_slugs,
+            sell_order_status="filled",  # Marked as filled
+            sell_order_placed_after=recent_time,  # Recently marked as filled
+        )
+        
+        # Verify these trades are actually still open by checking the API
+        for trade in trades_incorrectly_filled:
+            try:
+                # Check if order is actually still open in the API
+                order_status = await self.async_pm.get_order_status(trade.sell_order_id)
+                if order_status:
+                    status = order_status.get("status", "unknown")
+                    if status in ["live", "LIVE", "open", "OPEN"]:
+                        # Order is still open - it was incorrectly marked as filled
+                        logger.warning(
+                            f"⚠️ Trade {trade.id} sell order {trade.sell_order_id} was incorrectly marked as 'filled' "
+                            f"but is still OPEN in API (status={status}). Resetting to 'open' and checking early sell."
                         )
-                        continue
-                    
+                        # Reset sell_order_status to "open" so it can be checked for early sell
+                        self.db.update_trade_fields(trade.id, sell_order_status="open")
+                        # Add to trades_with_099_sell list so it gets checked
+                        trades_with_099_sell.append(self.db.get_trade_by_id(trade.id))
+            except Exception as e:
+                logger.debug(f"Could not verify order status for trade {trade.id}: {e}")
+        
+        for trade in trades_with_099_sell:
+            try:
+                logger.info(
+                    f"🔍 Checking threshold sell for trade {trade.id} with $0.99 sell order "
+                    f"(market: {trade.market_slug}, token_id: {trade.token_id[:20] if trade.token_id else 'N/A'}...)"
+                )
+                
+                # Fetch orderbook for the token we bought
+                orderbook = fetch_orderbook(trade.token_id)
+                if not orderbook:
                     logger.info(
-                        f"📊 Trade {trade.id} ($0.99 sell): highest_bid={highest_bid:.4f}, "
-                        f"threshold_sell={self.config.threshold_sell:.4f}, "
-                        f"condition: {highest_bid:.4f} < {self.config.threshold_sell:.4f} = {highest_bid < self.config.threshold_sell}"
+                        f"⚠️ Could not fetch orderbook for trade {trade.id} with $0.99 sell order "
+                        f"(token_id: {trade.token_id[:20] if trade.token_id else 'N/A'}...)"
                     )
+                    continue
+                
+                # Get highest bid
+                highest_bid = get_highest_bid(orderbook)
+                if highest_bid is None:
+                    logger.info(
+                        f"⚠️ No highest_bid found in orderbook for trade {trade.id} with $0.99 sell order "
+                        f"(market: {trade.market_slug})"
+                    )
+                    continue
+                
+                logger.info(
+                    f"📊 Trade {trade.id} ($0.99 sell): highest_bid={highest_bid:.4f}, "
+                    f"threshold_sell={self.config.threshold_sell:.4f}, "
+                    f"condition: {highest_bid:.4f} < {self.config.threshold_sell:.4f} = {highest_bid < self.config.threshold_sell}"
+                )
+                
+                # Check if trade is in threshold sell confirmation (skip if confirmation is disabled)
+                if self.config.threshold_sell_confirmation_seconds > 0.0 and trade.id in self.threshold_sell_confirmations:
+                    confirmation_info = self.threshold_sell_confirmations[trade.id]
+                    confirmation_started_at = confirmation_info["started_at"]
                     
-                    # Check if trade is in threshold sell confirmation (skip if confirmation is disabled)
-                    if self.config.threshold_sell_confirmation_seconds > 0.0 and trade.id in self.threshold_sell_confirmations:
-                        confirmation_info = self.threshold_sell_confirmations[trade.id]
-                        confirmation_started_at = confirmation_info["started_at"]
-                        
-                        from datetime import datetime, timezone
-                        time_elapsed = (datetime.now(timezone.utc) - confirmation_started_at).total_seconds()
-                        
-                        # Check if still below threshold
-                        if highest_bid < self.config.threshold_sell:
-                            # Check if confirmation period has elapsed
-                            if time_elapsed >= self.config.threshold_sell_confirmation_seconds:
-                                # Confirmation complete - proceed with sell order placement
-                                logger.info(
-                                    f"✅ Threshold sell confirmation complete for trade {trade.id} ($0.99 sell): "
-                                    f"highest_bid={highest_bid:.4f} still below threshold_sell={self.config.threshold_sell:.4f} "
-                                    f"after {time_elapsed:.1f} seconds. Proceeding with sell order placement."
-                                )
-                                # Remove from confirmation
-                                self.threshold_sell_confirmations.pop(trade.id, None)
-                                
-                                # Place early sell order (this will cancel the $0.99 order first)
-                                sell_price = self.config.threshold_sell - self.config.margin_sell
-                                if sell_price < 0.01:
-                                    sell_price = 0.01  # Minimum price
-                                
-                                logger.info(
-                                    f"Early sell confirmed for trade {trade.id} (market: {trade.market_slug}, has $0.99 sell order): "
-                                    f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
-                                    f"canceling $0.99 order and placing early sell at {sell_price:.4f}"
-                                )
-                                
-                                await self.place_early_sell_callback(trade, sell_price)
-                            else:
-                                # Still in confirmation period
-                                logger.debug(
-                                    f"⏳ Threshold sell confirmation in progress for trade {trade.id} ($0.99 sell): "
-                                    f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
-                                    f"{time_elapsed:.1f}/{self.config.threshold_sell_confirmation_seconds:.1f} seconds elapsed"
-                                )
-                        else:
-                            # Price recovered above threshold - cancel confirmation
+                    from datetime import datetime, timezone
+                    time_elapsed = (datetime.now(timezone.utc) - confirmation_started_at).total_seconds()
+                    
+                    # Check if still below threshold
+                    if highest_bid < self.config.threshold_sell:
+                        # Check if confirmation period has elapsed
+                        if time_elapsed >= self.config.threshold_sell_confirmation_seconds:
+                            # Confirmation complete - proceed with sell order placement
                             logger.info(
-                                f"🔄 Threshold sell confirmation cancelled for trade {trade.id} ($0.99 sell): "
-                                f"highest_bid={highest_bid:.4f} recovered above threshold_sell={self.config.threshold_sell:.4f} "
-                                f"after {time_elapsed:.1f} seconds"
+                                f"✅ Threshold sell confirmation complete for trade {trade.id} ($0.99 sell): "
+                                f"highest_bid={highest_bid:.4f} still below threshold_sell={self.config.threshold_sell:.4f} "
+                                f"after {time_elapsed:.1f} seconds. Proceeding with sell order placement."
                             )
+                            # Remove from confirmation
                             self.threshold_sell_confirmations.pop(trade.id, None)
-                        continue
-                    
-                    # Check if highest_bid < threshold_sell
-                    if highest_bid < self.config.threshold_sell:
-                        # Handle threshold sell confirmation
-                        if self.config.threshold_sell_confirmation_seconds > 0.0:
-                            # Start confirmation period - will check again in next loop iteration
-                            from datetime import datetime, timezone
-                            self.threshold_sell_confirmations[trade.id] = {
-                                "started_at": datetime.now(timezone.utc),
-                            }
+                            
+                            # Place early sell order (this will cancel the $0.99 order first)
+                            sell_price = self.config.threshold_sell - self.config.margin_sell
+                            if sell_price < 0.01:
+                                sell_price = 0.01  # Minimum price
+                            
                             logger.info(
-                                f"⏳ Threshold sell confirmation started for trade {trade.id} ($0.99 sell): "
+                                f"Early sell confirmed for trade {trade.id} (market: {trade.market_slug}, has $0.99 sell order): "
                                 f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
-                                f"waiting {self.config.threshold_sell_confirmation_seconds:.1f} seconds before placing sell order"
+                                f"canceling $0.99 order and placing early sell at {sell_price:.4f}"
                             )
-                            continue  # Wait for confirmation period to complete
-                        
-                        # No confirmation required (threshold_sell_confirmation_seconds == 0) - place sell order immediately
-                        # This happens in the SAME loop iteration where threshold is detected - no extra loop needed
-                        sell_price = self.config.threshold_sell - self.config.margin_sell
-                        if sell_price < 0.01:
-                            sell_price = 0.01  # Minimum price
-                        
+                            
+                            await self.place_early_sell_callback(trade, sell_price)
+                        else:
+                            # Still in confirmation period
+                            logger.debug(
+                                f"⏳ Threshold sell confirmation in progress for trade {trade.id} ($0.99 sell): "
+                                f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
+                                f"{time_elapsed:.1f}/{self.config.threshold_sell_confirmation_seconds:.1f} seconds elapsed"
+                            )
+                    else:
+                        # Price recovered above threshold - cancel confirmation
+                        logger.info(
+                            f"🔄 Threshold sell confirmation cancelled for trade {trade.id} ($0.99 sell): "
+                            f"highest_bid={highest_bid:.4f} recovered above threshold_sell={self.config.threshold_sell:.4f} "
+                            f"after {time_elapsed:.1f} seconds"
+                        )
+                        self.threshold_sell_confirmations.pop(trade.id, None)
+                    continue
+                
+                # Check if highest_bid < threshold_sell
+                if highest_bid < self.config.threshold_sell:
+                    # Handle threshold sell confirmation
+                    if self.config.threshold_sell_confirmation_seconds > 0.0:
+                        # Start confirmation period - will check again in next loop iteration
+                        from datetime import datetime, timezone
+                        self.threshold_sell_confirmations[trade.id] = {
+                            "started_at": datetime.now(timezone.utc),
+                        }
                         logger.info(
-                            f"Early sell triggered for trade {trade.id} (market: {trade.market_slug}, has $0.99 sell order): "
+                            f"⏳ Threshold sell confirmation started for trade {trade.id} ($0.99 sell): "
                             f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
-                            f"canceling $0.99 order and placing early sell at {sell_price:.4f}"
+                            f"waiting {self.config.threshold_sell_confirmation_seconds:.1f} seconds before placing sell order"
                         )
-                        
-                        await self.place_early_sell_callback(trade, sell_price)
-                except Exception as e:
-                    logger.error(f"Error checking early sell condition for trade {trade.id}: {e}", exc_info=True)
-        finally:
-            session.close()
+                        continue  # Wait for confirmation period to complete
+                    
+                    # No confirmation required (threshold_sell_confirmation_seconds == 0) - place sell order immediately
+                    # This happens in the SAME loop iteration where threshold is detected - no extra loop needed
+                    sell_price = self.config.threshold_sell - self.config.margin_sell
+                    if sell_price < 0.01:
+                        sell_price = 0.01  # Minimum price
+                    
+                    logger.info(
+                        f"Early sell triggered for trade {trade.id} (market: {trade.market_slug}, has $0.99 sell order): "
+                        f"highest_bid={highest_bid:.4f} < threshold_sell={self.config.threshold_sell:.4f}, "
+                        f"canceling $0.99 order and placing early sell at {sell_price:.4f}"
+                    )
+                    
+                    await self.place_early_sell_callback(trade, sell_price)
+            except Exception as e:
+                logger.error(f"Error checking early sell condition for trade {trade.id}: {e}", exc_info=True)
@@ -12,6 +12,7 @@ from agents.polymarket.gamma import GammaMarketClient
 from agents.polymarket.market_finder import get_token_ids_from_market
 from agents.utils.proxy_config import get_proxy_dict
 from agents.polymarket.btc_market_detector import _parse_datetime_safe
+from agents.polymarket.market_cache import get_market_cache
 
 logger = logging.getLogger(__name__)
 
@@ -169,6 +170,8 @@ class SportsMarketDetector:
                 return
             
             logger.info(f"Found {len(markets)} active markets for topic '{topic}'")
+            # Share the metadata with other components looking these markets up by id/condition_id
+            get_market_cache().put_markets(markets)
             
             for market in markets:
                 market_id = str(market.get("id"))
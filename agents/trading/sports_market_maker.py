@@ -16,10 +16,11 @@ from typing import Dict, Optional, Set
 from agents.trading.market_maker_config import MarketMakerConfig
 from agents.trading.market_maker import MarketMaker, MarketMakerPosition
 from agents.trading.sports_market_detector import SportsMarketDetector
-from agents.trading.trade_db import TradeDatabase
+from agents.trading.trade_db import TradeDatabase, RealMarketMakerPosition
 from agents.polymarket.polymarket import Polymarket
 from agents.polymarket.market_finder import get_token_ids_from_market
 from agents.polymarket.btc_market_detector import _parse_datetime_safe
+from agents.polymarket.market_cache import get_market_cache
 from agents.trading.utils.market_time_helpers import get_minutes_until_resolution
 
 logger = logging.getLogger(__name__)
@@ -145,7 +146,7 @@ class SportsMarketMaker(MarketMaker):
             wallet_address = self.pm.get_address_for_private_key()
             logger.info(f"Wallet address: {wallet_address}")
             
-            direct_balance = self.pm.get_usdc_balance()
+            direct_balance = await self.async_pm.get_usdc_balance()
             logger.info(f"Direct Polygon wallet USDC balance: ${direct_balance:.2f}")
             
             if direct_balance < self.config.split_amount:
@@ -355,6 +356,24 @@ class SportsMarketMaker(MarketMaker):
         except Exception as e:
             logger.error(f"Error handling both filled: {e}", exc_info=True)
     
+    def _lookup_position_market(self, db_pos: RealMarketMakerPosition) -> Optional[Dict]:
+        """
+        Look up the market for a persisted sports position.
+        
+        Sports positions are stored under a synthetic "sports-{market_id}" slug,
+        so resolve them by market id (seeded by the detector) and fall back to
+        the condition id instead of a slug lookup that can never match.
+        """
+        market_slug = db_pos.market_slug
+        if not market_slug.startswith("sports-"):
+            return super()._lookup_position_market(db_pos)
+        
+        cache = get_market_cache()
+        market = cache.get_market_by_id(market_slug.replace("sports-", ""))
+        if not market and db_pos.condition_id:
+            market = cache.get_market_by_condition_id(db_pos.condition_id)
+        return market
+    
     async def _close_position(self, position: MarketMakerPosition, reason: str = "unknown"):
         """
         Close a position and clean up tracking.
@@ -383,4 +402,7 @@ class SportsMarketMaker(MarketMaker):
         if self.websocket_order_status_service:
             await self.websocket_order_status_service.stop()
         
+        self.async_pm.log_latency_stats()
+        await self.async_pm.close()
+        
         logger.info("Sports Market Maker stopped")
@@ -699,6 +699,28 @@ class TradeDatabase:
         finally:
             session.close()
     
+    def update_trade_fields(self, trade_id: int, **fields):
+        """
+        Set arbitrary columns on a trade record.
+        
+        Args:
+            trade_id: Trade ID
+            **fields: Column name -> new value (e.g. sell_order_status="cancelled", sell_order_id=None)
+        """
+        session = self.SessionLocal()
+        try:
+            trade = session.query(RealTradeThreshold).filter_by(id=trade_id).first()
+            if trade:
+                for name, value in fields.items():
+                    setattr(trade, name, value)
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error updating trade fields: {e}")
+            raise
+        finally:
+            session.close()
+    
     def get_trade_by_id(self, trade_id: int) -> Optional[RealTradeThreshold]:
         """Get trade by ID."""
         session = self.SessionLocal()
@@ -829,6 +851,37 @@ class TradeDatabase:
         finally:
             session.close()
     
+    def get_latest_resolved_trade(
+        self,
+        deployment_id: Optional[str] = None,
+        positive_principal: bool = False,
+    ) -> Optional[RealTradeThreshold]:
+        """
+        Get the most recently resolved trade that recorded a principal.
+        
+        Same filters as get_latest_principal (principal_after set, order placed, market
+        resolved, not failed), without requiring a positive principal unless asked.
+        
+        Args:
+            deployment_id: Optional deployment ID to filter by
+            positive_principal: Only consider trades with principal_after > 0
+        """
+        session = self.SessionLocal()
+        try:
+            query = session.query(RealTradeThreshold).filter(
+                RealTradeThreshold.principal_after.isnot(None),
+                RealTradeThreshold.order_id.isnot(None),
+                RealTradeThreshold.market_resolved_at.isnot(None),
+                RealTradeThreshold.order_status != "failed",
+            )
+            if positive_principal:
+                query = query.filter(RealTradeThreshold.principal_after > 0)
+            if deployment_id is not None:
+                query = query.filter(RealTradeThreshold.deployment_id == deployment_id)
+            return query.order_by(RealTradeThreshold.market_resolved_at.desc()).first()
+        finally:
+            session.close()
+    
     def has_bet_on_market(self, market_slug: str) -> bool:
         """
         Check if ANY deployment (current or previous) has already bet on this market.
@@ -897,6 +950,79 @@ class TradeDatabase:
         finally:
             session.close()
     
+    def get_filled_trades_without_sell(
+        self,
+        deployment_id: Optional[str] = None,
+        market_slugs: Optional[List[str]] = None,
+    ) -> List[RealTradeThreshold]:
+        """
+        Get unresolved filled trades that don't have a sell order yet, most recent first.
+        
+        Args:
+            deployment_id: Optional deployment ID to filter by
+            market_slugs: Optional list of market slugs to restrict to
+        """
+        session = self.SessionLocal()
+        try:
+            query = session.query(RealTradeThreshold).filter(
+                RealTradeThreshold.order_status == "filled",
+                RealTradeThreshold.filled_shares.isnot(None),
+                RealTradeThreshold.filled_shares > 0,
+                RealTradeThreshold.sell_order_id.is_(None),
+                RealTradeThreshold.market_resolved_at.is_(None),
+            )
+            if deployment_id is not None:
+                query = query.filter(RealTradeThreshold.deployment_id == deployment_id)
+            if market_slugs is not None:
+                query = query.filter(RealTradeThreshold.market_slug.in_(market_slugs))
+            return query.order_by(RealTradeThreshold.order_placed_at.desc()).all()
+        finally:
+            session.close()
+    
+    def get_filled_trades_with_sell_order(
+        self,
+        deployment_id: Optional[str] = None,
+        market_slugs: Optional[List[str]] = None,
+        sell_order_status: Optional[str] = None,
+        sell_order_price: Optional[float] = None,
+        sell_order_placed_after: Optional[datetime] = None,
+    ) -> List[RealTradeThreshold]:
+        """
+        Get unresolved filled trades that have a sell order, most recent first.
+        
+        Args:
+            deployment_id: Optional deployment ID to filter by
+            market_slugs: Optional list of market slugs to restrict to
+            sell_order_status: Optional sell order status to match (e.g. 'open')
+            sell_order_price: Optional sell order price to match (e.g. 0.99)
+            sell_order_placed_after: Optional lower bound on sell_order_placed_at
+        """
+        session = self.SessionLocal()
+        try:
+            query = session.query(RealTradeThreshold).filter(
+                RealTradeThreshold.order_status == "filled",
+                RealTradeThreshold.filled_shares.isnot(None),
+                RealTradeThreshold.filled_shares > 0,
+                RealTradeThreshold.sell_order_id.isnot(None),
+                RealTradeThreshold.market_resolved_at.is_(None),
+            )
+            if deployment_id is not None:
+                query = query.filter(RealTradeThreshold.deployment_id == deployment_id)
+            if market_slugs is not None:
+                query = query.filter(RealTradeThreshold.market_slug.in_(market_slugs))
+            if sell_order_status is not None:
+                query = query.filter(RealTradeThreshold.sell_order_status == sell_order_status)
+            if sell_order_price is not None:
+                query = query.filter(RealTradeThreshold.sell_order_price == sell_order_price)
+            if sell_order_placed_after is not None:
+                query = query.filter(
+                    RealTradeThreshold.sell_order_placed_at.isnot(None),
+                    RealTradeThreshold.sell_order_placed_at >= sell_order_placed_after,
+                )
+            return query.order_by(RealTradeThreshold.order_placed_at.desc()).all()
+        finally:
+            session.close()
+    
     def get_trades_by_deployment(self, deployment_id: str) -> List[RealTradeThreshold]:
         """Get all trades from a specific deployment."""
         session = self.SessionLocal()
@@ -0,0 +1,614 @@
+"""
+In-memory trade state store with write-behind persistence to TradeDatabase.
+
+TradeStore is a drop-in replacement for TradeDatabase in the threshold strategy
+(OrderManager, OrderbookMonitor, ThresholdTrader):
+- Reads of active trades (get_trade_by_id, get_open_trades, get_open_sell_orders, ...)
+  are served from memory instead of opening a DB session per call; reads that can reach
+  resolved history (get_trades_by_market_slug, get_latest_principal, ...) combine the
+  database with the in-memory view, which wins for any trade it holds
+- Mutations (update_*) are applied in memory immediately and queued for a background
+  writer thread, which appends them to a journal file (JSON lines, one fsync per batch)
+  and writes them to the database in batches - no file or database I/O on the caller's
+  thread (the event loop)
+- create_trade is written through synchronously (the database assigns the trade ID)
+
+Journals are per process: <journal_dir>/<strategy>.<pid>.jsonl, held under an exclusive
+file lock for the life of the store, so two strategy processes never rewrite each
+other's journal. Crash recovery: on startup, every journal of the same strategy whose
+lock is free (its process is gone) is replayed into the database and removed, then the
+active trades (unresolved ones, plus any the journals touched) are loaded into memory.
+
+Methods not overridden here (limit buy trades, SessionLocal, engine, ...) are forwarded
+to the wrapped TradeDatabase.
+"""
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no journal locking
+    fcntl = None
+
+from sqlalchemy import or_
+
+from agents.trading.trade_db import TradeDatabase, RealTradeThreshold
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ("open", "partial")
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def _sort_time(value: Optional[datetime]) -> datetime:
+    """Comparable timestamp (DB rows may be naive, in-memory updates are UTC-aware)."""
+    if value is None:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _try_lock(f) -> bool:
+    """Take an exclusive, non-blocking lock on an open file (always succeeds without fcntl)."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _read_journal_file(path: str) -> List[Dict]:
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A torn final line from a crash mid-write - everything before it is intact
+                logger.warning(f"⚠️ Skipping unreadable trade journal line {line_number} in {path}")
+    return entries
+
+
+class TradeStore:
+    """
+    Authoritative in-memory view of threshold strategy trades.
+
+    Usage:
+        db = TradeStore(TradeDatabase())
+        trade = db.get_trade_by_id(trade_id)   # served from memory
+        db.update_order_status(trade_id, "filled")  # memory now, journal + database within flush_interval
+        db.close()  # final flush
+    """
+
+    def __init__(
+        self,
+        db: Optional[TradeDatabase] = None,
+        journal_path: Optional[str] = None,
+        flush_interval: float = 1.0,
+        strategy: str = "threshold",
+        journal_dir: Optional[str] = None,
+    ):
+        """
+        Initialize trade store and recover state.
+
+        Args:
+            db: TradeDatabase to persist to (created from env if None)
+            journal_path: Exact journal file to use (default: TRADE_JOURNAL_PATH env, else a
+                          per-process file in journal_dir). Raises RuntimeError if another
+                          process holds it.
+            flush_interval: Seconds between batched database flushes (default: 1.0)
+            strategy: Journal name prefix; stores of the same strategy recover each other's
+                      journals after a crash (default: "threshold")
+            journal_dir: Directory for per-process journals (default: TRADE_JOURNAL_DIR env or ./trade_journals)
+        """
+        self.db = db or TradeDatabase()
+        self.flush_interval = flush_interval
+        self.strategy = strategy
+        journal_path = journal_path or os.getenv("TRADE_JOURNAL_PATH")
+        self._shared_journals = journal_path is None
+        if journal_path is None:
+            self.journal_dir = journal_dir or os.getenv("TRADE_JOURNAL_DIR", "./trade_journals")
+            os.makedirs(self.journal_dir, exist_ok=True)
+            journal_path = os.path.join(self.journal_dir, f"{strategy}.{os.getpid()}.jsonl")
+        else:
+            self.journal_dir = os.path.dirname(journal_path) or "."
+        self.journal_path = journal_path
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._file_lock = threading.Lock()  # Journal appends vs compaction
+        self._trades: Dict[int, RealTradeThreshold] = {}
+        self._pending: List[Dict] = []  # Entries not yet flushed to the database
+        self._unjournaled: List[Dict] = []  # Entries not yet written to the journal file
+        self._seq = 0
+        self._journaled_seq = 0
+        self._flushed_seq = 0
+
+        # Hold our own journal open (and locked) for the life of the store
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if not _try_lock(self._journal):
+            self._journal.close()
+            raise RuntimeError(f"Trade journal {self.journal_path} is in use by another process")
+
+        self._recover()
+
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(target=self._writer_loop, name="trade-store-writer", daemon=True)
+        self._flush_thread.start()
+
+    def __getattr__(self, name: str):
+        # Forward everything not handled by the store (limit buy methods, SessionLocal, ...)
+        if name == "db":
+            raise AttributeError(name)
+        return getattr(self.db, name)
+
+    # ========== Recovery ==========
+
+    def _orphaned_journals(self) -> List[str]:
+        """Other journals of this strategy (recovered if their owner's lock is free)."""
+        if not self._shared_journals:
+            return []
+        paths = []
+        for path in sorted(glob.glob(os.path.join(self.journal_dir, f"{self.strategy}.*.jsonl"))):
+            if os.path.abspath(path) != os.path.abspath(self.journal_path):
+                paths.append(path)
+        return paths
+
+    def _replay(self, path: str, entries: List[Dict]) -> set:
+        if not entries:
+            return set()
+        logger.info(f"🔄 Replaying {len(entries)} unflushed trade updates from {path}")
+        self._write_to_db(entries)
+        return {entry["trade_id"] for entry in entries}
+
+    def _recover(self):
+        """Replay unflushed journal entries into the database, then load the active trades."""
+        touched = set()
+
+        # Our own file: left over from a previous process with the same PID, or an explicit path
+        touched |= self._replay(self.journal_path, _read_journal_file(self.journal_path))
+        # Journal is now fully reflected in the database
+        self._journal.truncate(0)
+
+        for path in self._orphaned_journals():
+            with open(path, "a+", encoding="utf-8") as f:
+                if not _try_lock(f):
+                    continue  # A live process owns it
+                touched |= self._replay(path, _read_journal_file(path))
+                os.remove(path)
+
+        # Only trades that can still change live in memory; resolved history is read from the database
+        session = self.db.SessionLocal()
+        try:
+            condition = RealTradeThreshold.market_resolved_at.is_(None)
+            if touched:
+                condition = or_(condition, RealTradeThreshold.id.in_(touched))
+            trades = session.query(RealTradeThreshold).filter(condition).all()
+        finally:
+            session.close()
+        with self._lock:
+            self._trades = {trade.id: trade for trade in trades}
+        logger.info(f"✓ Trade store loaded {len(self._trades)} active trades into memory")
+
+    # ========== Write-behind ==========
+
+    def _write_to_db(self, entries: List[Dict]):
+        """Apply journal entries to the database in one transaction (coalesced per trade)."""
+        merged: Dict[int, Dict[str, Any]] = {}
+        for entry in sorted(entries, key=lambda e: e.get("seq", 0)):
+            fields = merged.setdefault(entry["trade_id"], {})
+            for name, value in entry["fields"].items():
+                fields[name] = _decode_value(value)
+
+        session = self.db.SessionLocal()
+        try:
+            for trade_id, fields in merged.items():
+                session.query(RealTradeThreshold).filter_by(id=trade_id).update(
+                    fields, synchronize_session=False
+                )
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _mutate(self, trade_id: int, fields: Dict[str, Any]):
+        """Apply fields in memory and queue them for the journal writer (no I/O here)."""
+        with self._lock:
+            trade = self._trades.get(trade_id)
+            if trade is None:
+                # Unknown to this process (e.g. created by another deployment) - load it once
+                trade = self.db.get_trade_by_id(trade_id)
+                if trade is None:
+                    return
+                self._trades[trade_id] = trade
+            for name, value in fields.items():
+                setattr(trade, name, value)
+
+            self._seq += 1
+            entry = {
+                "seq": self._seq,
+                "trade_id": trade_id,
+                "fields": {name: _encode_value(value) for name, value in fields.items()},
+            }
+            self._pending.append(entry)
+            self._unjournaled.append(entry)
+        self._wake.set()
+
+    def _write_journal(self):
+        """Append queued entries to the journal with a single fsync (writer thread / flush)."""
+        with self._file_lock:
+            with self._lock:
+                batch, self._unjournaled = self._unjournaled, []
+            if not batch:
+                return
+            self._journal.write("".join(json.dumps(entry) + "\n" for entry in batch))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            with self._lock:
+                self._journaled_seq = batch[-1]["seq"]
+
+    def flush(self):
+        """Journal and write all pending entries to the database now."""
+        with self._flush_lock:
+            self._write_journal()
+            with self._lock:
+                batch = list(self._pending)
+            if not batch:
+                return
+            try:
+                self._write_to_db(batch)
+            except Exception as e:
+                logger.error(f"❌ Error flushing {len(batch)} trade updates to database (will retry): {e}")
+                return
+            with self._file_lock:
+                with self._lock:
+                    self._flushed_seq = batch[-1]["seq"]
+                    self._pending = [entry for entry in self._pending if entry["seq"] > self._flushed_seq]
+                    # Compact the journal down to what is journaled but still unflushed
+                    # (queued entries are appended by the next _write_journal)
+                    keep = [entry for entry in self._pending if entry["seq"] <= self._journaled_seq]
+                self._journal.truncate(0)
+                self._journal.write("".join(json.dumps(entry) + "\n" for entry in keep))
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+            logger.debug(f"Flushed {len(batch)} trade updates to database")
+
+    def _writer_loop(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while not self._stop_event.is_set():
+            self._wake.wait(max(0.0, next_flush - time.monotonic()))
+            self._wake.clear()
+            try:
+                self._write_journal()
+                if time.monotonic() >= next_flush:
+                    self.flush()
+                    next_flush = time.monotonic() + self.flush_interval
+            except Exception as e:
+                logger.error(f"❌ Trade journal writer error (will retry): {e}", exc_info=True)
+
+    def pending_count(self) -> int:
+        """Number of updates not yet written to the database."""
+        with self._lock:
+            return len(self._pending)
+
+    def close(self):
+        """Stop the writer thread, write remaining updates to the database and release the journal."""
+        self._stop_event.set()
+        self._wake.set()
+        self._flush_thread.join(timeout=self.flush_interval + 5.0)
+        self.flush()
+        with self._file_lock:
+            self._journal.close()
+        if self._shared_journals and not self._pending:
+            try:
+                os.remove(self.journal_path)
+            except OSError:
+                pass
+
+    # ========== Writes ==========
+
+    def create_trade(self, **kwargs) -> int:
+        """Create a new trade record (written through - the database assigns the ID)."""
+        trade_id = self.db.create_trade(**kwargs)
+        trade = self.db.get_trade_by_id(trade_id)
+        if trade is not None:
+            with self._lock:
+                self._trades[trade_id] = trade
+        return trade_id
+
+    def update_trade_fields(self, trade_id: int, **fields):
+        """Set arbitrary columns on a trade record."""
+        self._mutate(trade_id, fields)
+
+    def update_trade_fill(
+        self,
+        trade_id: int,
+        filled_shares: float,
+        fill_price: float,
+        dollars_spent: float,
+        fee: float,
+        order_status: str = "filled",
+    ):
+        """Update trade with fill information."""
+        self._mutate(trade_id, {
+            "filled_shares": filled_shares,
+            "fill_price": fill_price,
+            "dollars_spent": dollars_spent,
+            "fee": fee,
+            "order_status": order_status,
+            "order_filled_at": datetime.now(timezone.utc),
+        })
+
+    def update_trade_outcome(
+        self,
+        trade_id: int,
+        outcome_price: float,
+        payout: float,
+        net_payout: float,
+        roi: float,
+        is_win: Optional[bool],
+        principal_after: float,
+        winning_side: Optional[str] = None,
+    ):
+        """Update trade with outcome information."""
+        fields = {
+            "outcome_price": outcome_price,
+            "payout": payout,
+            "net_payout": net_payout,
+            "roi": roi,
+            "is_win": is_win,
+            "principal_after": principal_after,
+            "market_resolved_at": datetime.now(timezone.utc),
+        }
+        if winning_side:
+            fields["winning_side"] = winning_side
+        self._mutate(trade_id, fields)
+
+    def update_order_status(
+        self,
+        trade_id: int,
+        order_status: str,
+        order_id: Optional[str] = None,
+        error_message: Optional[str] = None,
+    ):
+        """Update order status."""
+        fields = {"order_status": order_status}
+        if order_id:
+            fields["order_id"] = order_id
+        if error_message:
+            fields["error_message"] = error_message
+        self._mutate(trade_id, fields)
+
+    def update_sell_order(
+        self,
+        trade_id: int,
+        sell_order_id: str,
+        sell_order_price: float,
+        sell_order_size: float,
+        sell_order_status: str = "open",
+    ):
+        """Update trade with sell order information."""
+        self._mutate(trade_id, {
+            "sell_order_id": sell_order_id,
+            "sell_order_price": sell_order_price,
+            "sell_order_size": sell_order_size,
+            "sell_order_status": sell_order_status,
+            "sell_order_placed_at": datetime.now(timezone.utc),
+        })
+
+    def update_sell_order_fill(
+        self,
+        trade_id: int,
+        sell_order_status: str,
+        sell_shares_filled: Optional[float] = None,
+        sell_dollars_received: Optional[float] = None,
+        sell_fee: Optional[float] = None,
+    ):
+        """Update sell order with fill information."""
+        fields = {"sell_order_status": sell_order_status}
+        if sell_shares_filled is not None:
+            fields["sell_shares_filled"] = sell_shares_filled
+        if sell_dollars_received is not None:
+            fields["sell_dollars_received"] = sell_dollars_received
+        if sell_fee is not None:
+            fields["sell_fee"] = sell_fee
+        if sell_order_status == "filled":
+            fields["sell_order_filled_at"] = datetime.now(timezone.utc)
+        self._mutate(trade_id, fields)
+
+    # ========== Reads (served from memory) ==========
+
+    def _select(self, predicate, deployment_id: Optional[str] = None) -> List[RealTradeThreshold]:
+        with self._lock:
+            return [
+                trade for trade in self._trades.values()
+                if (deployment_id is None or trade.deployment_id == deployment_id) and predicate(trade)
+            ]
+
+    def get_trade_by_id(self, trade_id: int) -> Optional[RealTradeThreshold]:
+        """Get trade by ID."""
+        with self._lock:
+            trade = self._trades.get(trade_id)
+        if trade is None:
+            # Not created by this process - load and cache it
+            trade = self.db.get_trade_by_id(trade_id)
+            if trade is not None:
+                with self._lock:
+                    trade = self._trades.setdefault(trade_id, trade)
+        return trade
+
+    def _with_history(self, db_trades: List[RealTradeThreshold], predicate, deployment_id: Optional[str] = None) -> List[RealTradeThreshold]:
+        """Database rows (resolved history) overlaid with the in-memory trades, which win by ID."""
+        with self._lock:
+            combined = {trade.id: self._trades.get(trade.id, trade) for trade in db_trades}
+        for trade in self._select(predicate, deployment_id):
+            combined[trade.id] = trade
+        return [trade for trade in combined.values() if predicate(trade)]
+
+    def get_trades_by_market_slug(self, market_slug: str) -> List[RealTradeThreshold]:
+        """Get all trades for a market slug."""
+        predicate = lambda t: t.market_slug == market_slug
+        return self._with_history(self.db.get_trades_by_market_slug(market_slug), predicate)
+
+    def get_trades_by_deployment(self, deployment_id: str) -> List[RealTradeThreshold]:
+        """Get all trades from a specific deployment."""
+        return self._with_history(self.db.get_trades_by_deployment(deployment_id), lambda t: True, deployment_id)
+
+    def get_open_trades(self, deployment_id: Optional[str] = None) -> List[RealTradeThreshold]:
+        """Get all trades with open buy orders."""
+        return self._select(lambda t: t.order_status in OPEN_STATUSES, deployment_id)
+
+    def get_open_sell_orders(self, deployment_id: Optional[str] = None) -> List[RealTradeThreshold]:
+        """Get all trades with open sell orders."""
+        return self._select(
+            lambda t: t.sell_order_status in OPEN_STATUSES and t.sell_order_id is not None,
+            deployment_id,
+        )
+
+    def get_unresolved_trades(self, deployment_id: Optional[str] = None) -> List[RealTradeThreshold]:
+        """Get all placed, non-cancelled trades whose market hasn't resolved yet."""
+        return self._select(
+            lambda t: (
+                t.market_resolved_at is None
+                and t.order_id is not None
+                and t.order_status not in ("cancelled", "failed")
+            ),
+            deployment_id,
+        )
+
+    def get_latest_resolved_trade(
+        self,
+        deployment_id: Optional[str] = None,
+        positive_principal: bool = False,
+    ) -> Optional[RealTradeThreshold]:
+        """
+        Get the most recently resolved trade that recorded a principal.
+
+        Includes outcomes still only in memory/the journal; older resolved trades come
+        from the database.
+        """
+        predicate = lambda t: (
+            t.principal_after is not None
+            and (not positive_principal or t.principal_after > 0)
+            and t.order_id is not None
+            and t.market_resolved_at is not None
+            and t.order_status != "failed"
+        )
+        db_trade = self.db.get_latest_resolved_trade(deployment_id, positive_principal=positive_principal)
+        resolved = self._with_history([db_trade] if db_trade is not None else [], predicate, deployment_id)
+        if not resolved:
+            return None
+        return max(resolved, key=lambda t: _sort_time(t.market_resolved_at))
+
+    def get_latest_principal(self, deployment_id: Optional[str] = None) -> Optional[float]:
+        """Get the latest positive principal from the most recent resolved trade."""
+        trade = self.get_latest_resolved_trade(deployment_id, positive_principal=True)
+        return trade.principal_after if trade is not None else None
+
+    def has_bet_on_market(self, market_slug: str) -> bool:
+        """
+        Check if ANY deployment has already bet on this market.
+
+        Answered from memory when this process knows of a bet; otherwise falls back to
+        the database, since other deployments write to it independently.
+        """
+        if self._select(
+            lambda t: (
+                t.market_slug == market_slug
+                and t.order_id is not None
+                and t.order_status not in ("cancelled", "failed")
+            )
+        ):
+            return True
+        return self.db.has_bet_on_market(market_slug)
+
+    def get_most_recent_filled_trade_without_sell(self, deployment_id: Optional[str] = None) -> Optional[RealTradeThreshold]:
+        """Get the most recent filled trade that doesn't have a sell order yet."""
+        trades = self._select(
+            lambda t: (
+                t.order_status == "filled"
+                and t.filled_shares is not None
+                and t.filled_shares > 0
+                and t.sell_order_id is None
+            ),
+            deployment_id,
+        )
+        if not trades:
+            return None
+        return max(trades, key=lambda t: _sort_time(t.order_placed_at))
+
+    def get_filled_trades_without_sell(
+        self,
+        deployment_id: Optional[str] = None,
+        market_slugs: Optional[List[str]] = None,
+    ) -> List[RealTradeThreshold]:
+        """Get unresolved filled trades that don't have a sell order yet, most recent first."""
+        slugs = set(market_slugs) if market_slugs is not None else None
+        trades = self._select(
+            lambda t: (
+                t.order_status == "filled"
+                and t.filled_shares is not None
+                and t.filled_shares > 0
+                and t.sell_order_id is None
+                and t.market_resolved_at is None
+                and (slugs is None or t.market_slug in slugs)
+            ),
+            deployment_id,
+        )
+        return sorted(trades, key=lambda t: _sort_time(t.order_placed_at), reverse=True)
+
+    def get_filled_trades_with_sell_order(
+        self,
+        deployment_id: Optional[str] = None,
+        market_slugs: Optional[List[str]] = None,
+        sell_order_status: Optional[str] = None,
+        sell_order_price: Optional[float] = None,
+        sell_order_placed_after: Optional[datetime] = None,
+    ) -> List[RealTradeThreshold]:
+        """Get unresolved filled trades that have a sell order, most recent first."""
+        slugs = set(market_slugs) if market_slugs is not None else None
+        placed_after = _sort_time(sell_order_placed_after) if sell_order_placed_after is not None else None
+        trades = self._select(
+            lambda t: (
+                t.order_status == "filled"
+                and t.filled_shares is not None
+                and t.filled_shares > 0
+                and t.sell_order_id is not None
+                and t.market_resolved_at is None
+                and (slugs is None or t.market_slug in slugs)
+                and (sell_order_status is None or t.sell_order_status == sell_order_status)
+                and (sell_order_price is None or t.sell_order_price == sell_order_price)
+                and (
+                    placed_after is None
+                    or (t.sell_order_placed_at is not None and _sort_time(t.sell_order_placed_at) >= placed_after)
+                )
+            ),
+            deployment_id,
+        )
+        return sorted(trades, key=lambda t: _sort_time(t.order_placed_at), reverse=True)
@@ -12,6 +12,9 @@ from typing import Dict, List, Optional, Set, Any, Callable, Awaitable
 from datetime import datetime, timezone
 import threading
 
+from agents.utils import json_codec, metrics
+from agents.utils.frame_recorder import FrameRecorder
+
 try:
     import websockets
     from websockets.client import WebSocketClientProtocol
@@ -43,6 +46,8 @@ class WebSocketOrderStatusService:
         reconnect_delay: float = 5.0,
         on_order_update: Optional[Callable[[Dict], Awaitable[None]]] = None,
         on_trade_update: Optional[Callable[[Dict], Awaitable[None]]] = None,
+        ws_url: Optional[str] = None,
+        record_path: Optional[str] = None,
     ):
         """
         Initialize WebSocket order status service.
@@ -56,6 +61,8 @@ class WebSocketOrderStatusService:
             reconnect_delay: Initial delay before reconnecting (default: 5.0)
             on_order_update: Optional async callback(order_data) for order status updates
             on_trade_update: Optional async callback(trade_data) for trade/fill updates
+            ws_url: Endpoint override, e.g. a local FrameReplayServer (default: USER_WS_URL)
+            record_path: Record raw received frames to this file for offline replay
         """
         if websockets is None:
             raise ImportError("websockets library not installed. Install with: pip install websockets")
@@ -63,6 +70,7 @@ class WebSocketOrderStatusService:
         self.api_key = api_key
         self.api_secret = api_secret
         self.api_passphrase = api_passphrase
+        self.ws_url = ws_url or self.USER_WS_URL
         self.proxy_url = proxy_url
         self.health_check_timeout = health_check_timeout
         self.reconnect_delay = reconnect_delay
@@ -89,6 +97,9 @@ class WebSocketOrderStatusService:
         
         # Track known orders for verbose logging
         self._known_orders: Set[str] = set()
+        
+        # Raw frame recording (for offline replay / load testing)
+        self.recorder = FrameRecorder(record_path, channel="user") if record_path else None
     
     def _generate_auth_signature(self, timestamp: str) -> str:
         """
@@ -146,6 +157,9 @@ class WebSocketOrderStatusService:
             except Exception as e:
                 logger.debug(f"Error closing WebSocket: {e}")
         
+        if self.recorder:
+            self.recorder.close()
+        
         self.connected = False
         logger.info("✓ WebSocket order status service stopped")
     
@@ -162,8 +176,8 @@ class WebSocketOrderStatusService:
                 logger.info(f"Connecting to User WebSocket via proxy: {self.proxy_url.split('@')[1] if '@' in self.proxy_url else 'configured'}")
             
             try:
-                self.websocket = await websockets.connect(self.USER_WS_URL)
-                logger.info(f"✓ Connected to User WebSocket: {self.USER_WS_URL}")
+                self.websocket = await websockets.connect(self.ws_url)
+                logger.info(f"✓ Connected to User WebSocket: {self.ws_url}")
                 
                 # Authenticate with API credentials
                 # CLOB User WebSocket authentication format per Polymarket docs
@@ -186,6 +200,8 @@ class WebSocketOrderStatusService:
                 # Wait for authentication/subscription response (should come quickly)
                 try:
                     response = await asyncio.wait_for(self.websocket.recv(), timeout=2.0)
+                    if self.recorder:
+                        self.recorder.record(response)
                     await self._handle_message(response)
                     logger.info("✓ Received authentication/subscription response from User WebSocket")
                 except asyncio.TimeoutError:
@@ -248,7 +264,7 @@ class WebSocketOrderStatusService:
                     logger.info(f"📨 User WebSocket plain text message: {message}")
                     return
             
-            data = json.loads(message)
+            data = json_codec.loads(message)
             
             # Log raw message for debugging (first 10 messages)
             if not hasattr(self, '_raw_message_count'):
@@ -358,6 +374,10 @@ class WebSocketOrderStatusService:
                         timeout=self.health_check_timeout
                     )
                     if message:
+                        if self.recorder:
+                            self.recorder.record(message)
+                        if metrics.ENABLED:
+                            metrics.inc("ws_messages", {"connection": "user"})
                         await self._handle_message(message)
                 except asyncio.TimeoutError:
                     # No message received - health check will handle this
@@ -2,17 +2,25 @@
 WebSocket-based orderbook service for real-time orderbook updates.
 
 Provides a single WebSocket connection to CLOB endpoint with dynamic token subscription
-and in-memory caching for fast orderbook lookups.
+and in-memory caching for fast orderbook lookups. For large subscription sets,
+ShardedWebSocketOrderbookService spreads tokens over several connections that feed
+one shared cache.
 """
 import asyncio
+import bisect
+import hashlib
 import json
 import logging
 import os
+import time
 from typing import Dict, List, Optional, Set, Any
 from datetime import datetime, timezone
 from collections import defaultdict
 import threading
 
+from agents.utils import json_codec, metrics
+from agents.utils.frame_recorder import FrameRecorder
+
 try:
     import websockets
     from websockets.client import WebSocketClientProtocol
@@ -23,6 +31,14 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def book_ages(cache: Dict[str, Dict[str, Any]], cache_lock) -> List:
+    """(labels, seconds since last update) per cached token, for the metrics endpoint."""
+    now = datetime.now(timezone.utc)
+    with cache_lock:
+        updates = [(token_id, entry.get("last_update")) for token_id, entry in cache.items()]
+    return [({"token": token_id}, (now - last_update).total_seconds()) for token_id, last_update in updates if last_update]
+
+
 class WebSocketOrderbookService:
     """
     WebSocket service for real-time Polymarket orderbook streaming.
@@ -34,11 +50,21 @@ class WebSocketOrderbookService:
     # CLOB WebSocket endpoint for orderbook data
     CLOB_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
     
+    # Max asset IDs per subscribe/unsubscribe message
+    SUBSCRIBE_CHUNK_SIZE = 100
+    
     def __init__(
         self,
         proxy_url: Optional[str] = None,
         health_check_timeout: float = 14.0,
         reconnect_delay: float = 5.0,
+        subscribe_chunk_size: int = SUBSCRIBE_CHUNK_SIZE,
+        cache: Optional[Dict[str, Dict[str, Any]]] = None,
+        cache_lock: Optional[threading.RLock] = None,
+        ws_url: Optional[str] = None,
+        recorder: Optional[FrameRecorder] = None,
+        record_path: Optional[str] = None,
+        connection_name: str = "market",
     ):
         """
         Initialize WebSocket orderbook service.
@@ -47,10 +73,19 @@ class WebSocketOrderbookService:
             proxy_url: Optional proxy URL for VPN/proxy support
             health_check_timeout: Seconds of silence before considering connection dead (default: 14.0)
             reconnect_delay: Initial delay before reconnecting (default: 5.0)
+            subscribe_chunk_size: Max asset IDs per subscription message (default: 100)
+            cache: Optional orderbook cache dict shared with other connections (pool mode)
+            cache_lock: Lock guarding a shared cache (required with cache)
+            ws_url: Endpoint override, e.g. a local FrameReplayServer (default: CLOB_WS_URL)
+            recorder: Optional FrameRecorder for raw received frames (shared in pool mode)
+            record_path: Record raw frames to this file (creates a FrameRecorder)
+            connection_name: Connection label for metrics (default: "market")
         """
         if websockets is None:
             raise ImportError("websockets library not installed. Install with: pip install websockets")
         
+        self.ws_url = ws_url or self.CLOB_WS_URL
+        self.connection_name = connection_name
         self.proxy_url = proxy_url
         self.health_check_timeout = health_check_timeout
         self.reconnect_delay = reconnect_delay
@@ -61,12 +96,25 @@ class WebSocketOrderbookService:
         self.connected = False
         
         # Token subscription management
-        self.subscribed_tokens: Set[str] = set()  # Set of token IDs we're subscribed to
+        self.subscribed_tokens: Set[str] = set()  # Set of token IDs we want to be subscribed to
         self.token_to_market_slug: Dict[str, str] = {}  # Map token_id -> market_slug for logging
+        self.subscribe_chunk_size = subscribe_chunk_size
+        # Tokens the current connection is actually subscribed to (reset on reconnect);
+        # _resubscribe() sends the diff between this and subscribed_tokens
+        self._active_tokens: Set[str] = set()
+        self._initial_subscription_sent = False
+        self._subscription_lock: Optional[asyncio.Lock] = None
+        self._subscription_task: Optional[asyncio.Task] = None
+        self._resubscribe_pending = False
+        
+        # Time-to-first-book tracking: when each token's subscribe was sent, and how long
+        # until its first book arrived
+        self._subscribe_sent_at: Dict[str, float] = {}
+        self.time_to_first_book: Dict[str, float] = {}
         
         # Orderbook cache: {token_id: {"bids": [...], "asks": [...], "last_update": datetime}}
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_lock = threading.RLock()  # Thread-safe access
+        self._cache: Dict[str, Dict[str, Any]] = cache if cache is not None else {}
+        self._cache_lock = cache_lock or threading.RLock()  # Thread-safe access
         
         # Connection health tracking
         self.last_message_time: Optional[datetime] = None
@@ -84,6 +132,14 @@ class WebSocketOrderbookService:
         self._listen_task: Optional[asyncio.Task] = None
         self._ping_task: Optional[asyncio.Task] = None
         self._health_check_task: Optional[asyncio.Task] = None
+        
+        # Raw frame recording (for offline replay / load testing)
+        self._owns_recorder = recorder is None and record_path is not None
+        self.recorder = recorder or (FrameRecorder(record_path, channel="market") if record_path else None)
+        
+        # Book staleness is reported by whoever owns the cache (the pool, for shared caches)
+        self._owns_cache = cache is None
+        self._metrics_handle: Optional[int] = None
     
     async def start(self):
         """Start the WebSocket service (connect and begin listening)."""
@@ -93,6 +149,10 @@ class WebSocketOrderbookService:
         
         self.running = True
         logger.info("🚀 Starting WebSocket orderbook service...")
+        if self._owns_cache:
+            self._metrics_handle = metrics.register_callback(
+                "orderbook_book_age_seconds", lambda: book_ages(self._cache, self._cache_lock)
+            )
         await self._connect_and_subscribe()
         
         # Start background tasks
@@ -123,6 +183,11 @@ class WebSocketOrderbookService:
             except Exception as e:
                 logger.debug(f"Error closing WebSocket: {e}")
         
+        if self.recorder and self._owns_recorder:
+            self.recorder.close()
+        metrics.unregister_callback(self._metrics_handle)
+        self._metrics_handle = None
+        
         self.connected = False
         logger.info("✓ WebSocket orderbook service stopped")
     
@@ -139,10 +204,13 @@ class WebSocketOrderbookService:
                 logger.info(f"Connecting to WebSocket via proxy: {self.proxy_url.split('@')[1] if '@' in self.proxy_url else 'configured'}")
             
             try:
-                self.websocket = await websockets.connect(self.CLOB_WS_URL)
+                self.websocket = await websockets.connect(self.ws_url)
                 self.connected = True
                 self._reconnect_attempts = 0
-                logger.info(f"✓ Connected to CLOB WebSocket: {self.CLOB_WS_URL}")
+                # New connection starts with no subscriptions
+                self._active_tokens = set()
+                self._initial_subscription_sent = False
+                logger.info(f"✓ Connected to CLOB WebSocket: {self.ws_url}")
                 
                 # Reset fallback logging flags
                 self._fallback_logged = False
@@ -171,34 +239,81 @@ class WebSocketOrderbookService:
             logger.error(f"Failed to connect to WebSocket: {e}", exc_info=True)
             raise
     
+    async def _send_subscription(self, token_ids: List[str], operation: str):
+        """Send subscribe/unsubscribe messages for token_ids in chunks."""
+        for start in range(0, len(token_ids), self.subscribe_chunk_size):
+            chunk = token_ids[start:start + self.subscribe_chunk_size]
+            if operation == "subscribe" and not self._initial_subscription_sent:
+                # First message on a connection declares the channel
+                message = {"type": "market", "assets_ids": chunk}
+                self._initial_subscription_sent = True
+            else:
+                message = {"assets_ids": chunk, "operation": operation}
+            await self.websocket.send(json.dumps(message))
+            if operation == "subscribe":
+                sent_at = time.monotonic()
+                for token_id in chunk:
+                    self._subscribe_sent_at[token_id] = sent_at
+    
     async def _resubscribe(self):
-        """Re-subscribe to all current tokens (sends full subscription list)."""
+        """
+        Bring the connection's subscriptions in line with subscribed_tokens.
+        
+        Computes the diff against what this connection is already subscribed to and
+        sends only the changes, in chunks. Runs under a lock so concurrent calls apply
+        one consistent diff each; after a reconnect the diff is the full token set.
+        """
         if not self.websocket or not self.connected:
             logger.warning("Cannot subscribe: WebSocket not connected")
             return
         
-        if not self.subscribed_tokens:
-            logger.debug("No tokens to subscribe to")
-            return
-        
-        subscribe_message = {
-            "type": "market",
-            "assets_ids": list(self.subscribed_tokens)
-        }
+        if self._subscription_lock is None:
+            self._subscription_lock = asyncio.Lock()
         
-        try:
-            await self.websocket.send(json.dumps(subscribe_message))
-            logger.info(f"📡 Re-subscribed to {len(self.subscribed_tokens)} token(s)")
-            logger.debug(f"  Subscription: {json.dumps(subscribe_message)}")
-            # Wait a moment for initial data
-            await asyncio.sleep(0.5)
-        except Exception as e:
-            logger.error(f"Error re-subscribing: {e}", exc_info=True)
-            raise
+        async with self._subscription_lock:
+            desired = set(self.subscribed_tokens)
+            to_add = sorted(desired - self._active_tokens)
+            to_remove = sorted(self._active_tokens - desired)
+            if not to_add and not to_remove:
+                logger.debug("Subscriptions already up to date")
+                return
+            
+            try:
+                if to_remove:
+                    await self._send_subscription(to_remove, "unsubscribe")
+                    self._active_tokens.difference_update(to_remove)
+                if to_add:
+                    await self._send_subscription(to_add, "subscribe")
+                    self._active_tokens.update(to_add)
+                logger.info(
+                    f"📡 Subscriptions updated: +{len(to_add)} / -{len(to_remove)} "
+                    f"({len(self._active_tokens)} active)"
+                )
+            except Exception as e:
+                logger.error(f"Error re-subscribing: {e}", exc_info=True)
+                raise
+    
+    def _schedule_resubscribe(self):
+        """Apply subscription changes in the background, coalescing bursts of calls."""
+        if not (self.connected and self.running):
+            return
+        self._resubscribe_pending = True
+        if self._subscription_task is None or self._subscription_task.done():
+            self._subscription_task = asyncio.create_task(self._subscription_loop())
+    
+    async def _subscription_loop(self):
+        """Keep syncing until no changes arrived during the last sync."""
+        while self._resubscribe_pending and self.connected:
+            self._resubscribe_pending = False
+            try:
+                await self._resubscribe()
+            except Exception:
+                # Already logged; the next reconnect resubscribes everything
+                break
     
     def subscribe_tokens(self, token_ids: List[str], market_slug: Optional[str] = None):
         """
-        Subscribe to additional tokens (non-blocking, will re-subscribe on next iteration).
+        Subscribe to additional tokens (non-blocking; sent in the background in batches).
         
         Args:
             token_ids: List of token IDs to subscribe to
@@ -213,14 +328,12 @@ class WebSocketOrderbookService:
                     self.token_to_market_slug[token_id] = market_slug
         
         if new_tokens:
-            logger.info(f"➕ Added {len(new_tokens)} token(s) to subscription list (will re-subscribe)")
-            # Trigger re-subscription in background
-            if self.connected and self.running:
-                asyncio.create_task(self._resubscribe())
+            logger.info(f"➕ Added {len(new_tokens)} token(s) to subscription list")
+            self._schedule_resubscribe()
     
     def unsubscribe_tokens(self, token_ids: List[str]):
         """
-        Unsubscribe from tokens (non-blocking, will re-subscribe on next iteration).
+        Unsubscribe from tokens (non-blocking; sent in the background in batches).
         
         Args:
             token_ids: List of token IDs to unsubscribe from
@@ -231,16 +344,32 @@ class WebSocketOrderbookService:
                 self.subscribed_tokens.discard(token_id)
                 removed_tokens.append(token_id)
                 self.token_to_market_slug.pop(token_id, None)
+                self._subscribe_sent_at.pop(token_id, None)
+                self.time_to_first_book.pop(token_id, None)
         
         if removed_tokens:
-            logger.info(f"➖ Removed {len(removed_tokens)} token(s) from subscription list (will re-subscribe)")
+            logger.info(f"➖ Removed {len(removed_tokens)} token(s) from subscription list")
             # Clear cache for removed tokens
             with self._cache_lock:
                 for token_id in removed_tokens:
                     self._cache.pop(token_id, None)
-            # Trigger re-subscription in background
-            if self.connected and self.running:
-                asyncio.create_task(self._resubscribe())
+            self._schedule_resubscribe()
+    
+    def get_subscription_stats(self) -> Dict[str, Any]:
+        """
+        Subscription state and time-to-first-book (seconds from subscribe sent to first book).
+        
+        Returns:
+            Dict with subscribed/active/awaiting_first_book counts and avg/max time to first book
+        """
+        latencies = [self.time_to_first_book[t] for t in self.subscribed_tokens if t in self.time_to_first_book]
+        return {
+            "subscribed": len(self.subscribed_tokens),
+            "active": len(self._active_tokens),
+            "awaiting_first_book": len(self._subscribe_sent_at),
+            "avg_time_to_first_book": sum(latencies) / len(latencies) if latencies else None,
+            "max_time_to_first_book": max(latencies) if latencies else None,
+        }
     
     def get_orderbook(self, token_id: str) -> Optional[Dict]:
         """
@@ -295,51 +424,26 @@ class WebSocketOrderbookService:
                     await self.websocket.send("PONG")
                 return
             
-            # Try to parse as JSON
+            # Book, price_change and initial snapshot frames decode straight to float levels
             try:
-                data = json.loads(message)
+                events = json_codec.decode_market_events(message)
             except json.JSONDecodeError:
                 # If it's not JSON and not a known control message, log at debug level
                 logger.debug(f"Received non-JSON WebSocket message: {message[:100]}")
                 return
-            
-            # Handle array of orderbook snapshots (initial message)
-            if isinstance(data, list):
-                for orderbook_snapshot in data:
-                    asset_id = orderbook_snapshot.get("asset_id")
-                    bids = orderbook_snapshot.get("bids", [])
-                    asks = orderbook_snapshot.get("asks", [])
-                    
-                    if asset_id and (bids or asks):
-                        await self._update_cache(asset_id, bids, asks)
+            if events is not None:
+                for event in events:
+                    await self._update_cache(event.asset_id, event.bids, event.asks)
                 return
             
-            # Handle single message objects
+            # Other (rare) messages: subscription acks, errors, pings
+            data = json_codec.loads(message)
+            if not isinstance(data, dict):
+                return
             event_type = data.get("event_type", "unknown")
             msg_type = data.get("type", "unknown")
             
-            # CLOB WebSocket sends orderbook updates with event_type == "book"
-            if event_type == "book":
-                asset_id = data.get("asset_id")
-                bids = data.get("bids", [])
-                asks = data.get("sells", [])  # CLOB uses "sells" for asks
-                
-                if asset_id:
-                    await self._update_cache(asset_id, bids, asks)
-            
-            # Handle price_change events (incremental updates)
-            elif event_type == "price_change":
-                price_changes = data.get("price_changes", [])
-                for change in price_changes:
-                    asset_id = change.get("asset_id")
-                    best_bid = change.get("best_bid")
-                    best_ask = change.get("best_ask")
-                    
-                    if asset_id and best_bid and best_ask:
-                        # Create minimal orderbook from best bid/ask
-                        await self._update_cache(asset_id, [{"price": best_bid, "size": 0.0}], [{"price": best_ask, "size": 0.0}])
-            
-            elif event_type == "subscribed" or msg_type == "subscribed":
+            if event_type == "subscribed" or msg_type == "subscribed":
                 subscribed_ids = data.get("assets_ids") or data.get("asset_id")
                 logger.info(f"✓ Confirmed subscription: {subscribed_ids}")
             
@@ -360,24 +464,24 @@ class WebSocketOrderbookService:
         except Exception as e:
             logger.error(f"Error handling WebSocket message: {e}", exc_info=True)
     
-    async def _update_cache(self, token_id: str, bids: List, asks: List):
-        """Update orderbook cache with new data (verbose logging)."""
-        # Convert to standard format
-        bids_formatted = []
-        if bids:
-            for bid in bids:
-                if isinstance(bid, dict):
-                    bids_formatted.append([float(bid.get("price", 0)), float(bid.get("size", 0))])
-                elif isinstance(bid, list) and len(bid) >= 2:
-                    bids_formatted.append([float(bid[0]), float(bid[1])])
-        
-        asks_formatted = []
-        if asks:
-            for ask in asks:
-                if isinstance(ask, dict):
-                    asks_formatted.append([float(ask.get("price", 0)), float(ask.get("size", 0))])
-                elif isinstance(ask, list) and len(ask) >= 2:
-                    asks_formatted.append([float(ask[0]), float(ask[1])])
+    async def _update_cache(self, token_id: str, bids: List[List[float]], asks: List[List[float]]):
+        """
+        Update orderbook cache with new data (verbose logging).
+        
+        bids/asks are already-decoded [[price, size], ...] float levels (json_codec.decode_market_events).
+        """
+        bids_formatted = bids
+        asks_formatted = asks
+        
+        # Time-to-first-book for newly subscribed tokens
+        sent_at = self._subscribe_sent_at.pop(token_id, None)
+        if sent_at is not None:
+            latency = time.monotonic() - sent_at
+            self.time_to_first_book[token_id] = latency
+            logger.info(
+                f"⏱️ First book for {self.token_to_market_slug.get(token_id) or 'unknown'} "
+                f"token {token_id[:20]}... {latency:.2f}s after subscribe"
+            )
         
         # Calculate best bid/ask before updating cache
         best_bid = bids_formatted[0][0] if bids_formatted else None
@@ -444,6 +548,10 @@ class WebSocketOrderbookService:
                         timeout=self.health_check_timeout
                     )
                     if message:
+                        if self.recorder:
+                            self.recorder.record(message)
+                        if metrics.ENABLED:
+                            metrics.inc("ws_messages", {"connection": self.connection_name})
                         await self._handle_message(message)
                 except asyncio.TimeoutError:
                     # No message received - health check will handle this
@@ -529,3 +637,187 @@ class WebSocketOrderbookService:
         except Exception as e:
             logger.error(f"Reconnection failed: {e}")
             # Will retry on next health check
+
+
+class _HashRing:
+    """Consistent hash ring mapping token IDs to shard indexes."""
+    
+    def __init__(self, num_shards: int, virtual_nodes: int = 100):
+        self._ring: List[tuple] = sorted(
+            (self._hash(f"shard-{shard}-{vnode}"), shard)
+            for shard in range(num_shards)
+            for vnode in range(virtual_nodes)
+        )
+        self._keys = [key for key, _ in self._ring]
+    
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+    
+    def shard_for(self, token_id: str) -> int:
+        index = bisect.bisect(self._keys, self._hash(token_id)) % len(self._ring)
+        return self._ring[index][1]
+
+
+class ShardedWebSocketOrderbookService:
+    """
+    Pool of WebSocket connections with token subscriptions sharded by consistent hashing.
+    
+    Each shard is a WebSocketOrderbookService with its own reader, ping and health-check
+    tasks; all shards write into one shared orderbook cache. A reconnect only drops the
+    books of one shard, and message throughput is spread over several connections.
+    Exposes the same interface as WebSocketOrderbookService.
+    """
+    
+    def __init__(
+        self,
+        num_connections: int = 4,
+        proxy_url: Optional[str] = None,
+        health_check_timeout: float = 14.0,
+        reconnect_delay: float = 5.0,
+        subscribe_chunk_size: int = WebSocketOrderbookService.SUBSCRIBE_CHUNK_SIZE,
+        ws_url: Optional[str] = None,
+        record_path: Optional[str] = None,
+    ):
+        """
+        Initialize sharded WebSocket orderbook service.
+        
+        Args:
+            num_connections: Number of WebSocket connections (shards) (default: 4)
+            proxy_url: Optional proxy URL for VPN/proxy support
+            health_check_timeout: Seconds of silence before a shard reconnects (default: 14.0)
+            reconnect_delay: Initial delay before reconnecting a shard (default: 5.0)
+            subscribe_chunk_size: Max asset IDs per subscription message (default: 100)
+            ws_url: Endpoint override, e.g. a local FrameReplayServer (default: CLOB_WS_URL)
+            record_path: Record raw frames from all shards to this file
+        """
+        if num_connections < 1:
+            raise ValueError(f"num_connections must be >= 1, got {num_connections}")
+        
+        self.recorder = FrameRecorder(record_path, channel="market") if record_path else None
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_lock = threading.RLock()
+        self.shards: List[WebSocketOrderbookService] = [
+            WebSocketOrderbookService(
+                proxy_url=proxy_url,
+                health_check_timeout=health_check_timeout,
+                reconnect_delay=reconnect_delay,
+                subscribe_chunk_size=subscribe_chunk_size,
+                cache=self._cache,
+                cache_lock=self._cache_lock,
+                ws_url=ws_url,
+                recorder=self.recorder,
+                connection_name=f"market-{index}",
+            )
+            for index in range(num_connections)
+        ]
+        self._metrics_handle: Optional[int] = None
+        self._ring = _HashRing(num_connections)
+    
+    def _shard_for(self, token_id: str) -> WebSocketOrderbookService:
+        return self.shards[self._ring.shard_for(token_id)]
+    
+    def _group_by_shard(self, token_ids: List[str]) -> Dict[int, List[str]]:
+        groups: Dict[int, List[str]] = defaultdict(list)
+        for token_id in token_ids:
+            groups[self._ring.shard_for(token_id)].append(token_id)
+        return groups
+    
+    @property
+    def running(self) -> bool:
+        return any(shard.running for shard in self.shards)
+    
+    @property
+    def subscribed_tokens(self) -> Set[str]:
+        return set().union(*(shard.subscribed_tokens for shard in self.shards))
+    
+    @property
+    def token_to_market_slug(self) -> Dict[str, str]:
+        merged: Dict[str, str] = {}
+        for shard in self.shards:
+            merged.update(shard.token_to_market_slug)
+        return merged
+    
+    @property
+    def time_to_first_book(self) -> Dict[str, float]:
+        merged: Dict[str, float] = {}
+        for shard in self.shards:
+            merged.update(shard.time_to_first_book)
+        return merged
+    
+    async def start(self):
+        """Connect all shards and start their background tasks."""
+        logger.info(f"🚀 Starting sharded WebSocket orderbook service ({len(self.shards)} connections)...")
+        self._metrics_handle = metrics.register_callback(
+            "orderbook_book_age_seconds", lambda: book_ages(self._cache, self._cache_lock)
+        )
+        try:
+            await asyncio.gather(*(shard.start() for shard in self.shards))
+        except Exception:
+            await self.stop()
+            raise
+        logger.info(f"✓ Sharded WebSocket orderbook service started ({len(self.shards)} connections)")
+    
+    async def stop(self):
+        """Stop all shards."""
+        await asyncio.gather(*(shard.stop() for shard in self.shards), return_exceptions=True)
+        if self.recorder:
+            self.recorder.close()
+        metrics.unregister_callback(self._metrics_handle)
+        self._metrics_handle = None
+    
+    def subscribe_tokens(self, token_ids: List[str], market_slug: Optional[str] = None):
+        """Subscribe to tokens, each on the shard its ID hashes to (non-blocking)."""
+        for shard_index, shard_tokens in self._group_by_shard(token_ids).items():
+            self.shards[shard_index].subscribe_tokens(shard_tokens, market_slug=market_slug)
+    
+    def unsubscribe_tokens(self, token_ids: List[str]):
+        """Unsubscribe from tokens on their shards (non-blocking)."""
+        for shard_index, shard_tokens in self._group_by_shard(token_ids).items():
+            self.shards[shard_index].unsubscribe_tokens(shard_tokens)
+    
+    def get_orderbook(self, token_id: str) -> Optional[Dict]:
+        """
+        Get orderbook from the shared cache (thread-safe).
+        
+        Returns None while the token's shard is disconnected, so callers fall back to
+        HTTP for that shard's tokens only.
+        """
+        shard = self._shard_for(token_id)
+        if not shard.is_connected():
+            return None
+        return shard.get_orderbook(token_id)
+    
+    def is_connected(self) -> bool:
+        """True if at least one shard is connected (per-token health is checked in get_orderbook)."""
+        return any(shard.is_connected() for shard in self.shards)
+    
+    def get_subscription_stats(self) -> Dict[str, Any]:
+        """Aggregated subscription stats plus per-shard connection state and token counts."""
+        per_shard = [shard.get_subscription_stats() for shard in self.shards]
+        latencies = list(self.time_to_first_book.values())
+        return {
+            "subscribed": sum(s["subscribed"] for s in per_shard),
+            "active": sum(s["active"] for s in per_shard),
+            "awaiting_first_book": sum(s["awaiting_first_book"] for s in per_shard),
+            "avg_time_to_first_book": sum(latencies) / len(latencies) if latencies else None,
+            "max_time_to_first_book": max(latencies) if latencies else None,
+            "shards": [
+                {"connected": shard.is_connected(), "subscribed": stats["subscribed"]}
+                for shard, stats in zip(self.shards, per_shard)
+            ],
+        }
+
+
+def create_websocket_orderbook_service(num_connections: int = 1, **kwargs):
+    """
+    Create a single-connection or sharded WebSocket orderbook service.
+    
+    Args:
+        num_connections: 1 for WebSocketOrderbookService, >1 for ShardedWebSocketOrderbookService
+        **kwargs: proxy_url, health_check_timeout, reconnect_delay, subscribe_chunk_size,
+            ws_url, record_path
+    """
+    if num_connections > 1:
+        return ShardedWebSocketOrderbookService(num_connections=num_connections, **kwargs)
+    return WebSocketOrderbookService(**kwargs)
@@ -0,0 +1,294 @@
+"""
+Raw websocket frame recording and replay.
+
+FrameRecorder appends every received frame with its receive timestamp to a gzip-compressed
+JSONL file ({"ts": ..., "ch": "market", "frame": "..."} per line). Each recording session
+adds a new gzip member, so files are append-only and can be read back as one stream. If the
+previous session died mid-write, its torn member is repaired before appending.
+
+FrameReplayServer serves a recording from a local websocket server at 1x, Nx or max speed,
+so a market-open burst can be reproduced offline against WebSocketOrderbookService /
+WebSocketOrderStatusService (pass ws_url=server.url) without a live Polymarket connection.
+
+Usage:
+    recorder = FrameRecorder("frames/btc_open.jsonl.gz", channel="market")
+    service = WebSocketOrderbookService(recorder=recorder)
+
+    server = FrameReplayServer("frames/btc_open.jsonl.gz", speed=10.0)
+    await server.start()
+    service = WebSocketOrderbookService(ws_url=server.url)
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+_READ_CHUNK = 1 << 20
+
+
+def _repair_gzip_tail(path: str) -> bool:
+    """
+    Repair a gzip recording whose last member was torn by an unclean exit.
+
+    A new member appended after a truncated deflate stream can't be read back, so the
+    torn member is cut off and its complete lines (everything sync-flushed before the
+    crash) are rewritten as a fresh, properly terminated member.
+
+    Args:
+        path: Gzip recording to check
+
+    Returns:
+        True if the file was repaired, False if it was already clean
+    """
+    member_start = 0
+    offset = 0
+    decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    with tempfile.TemporaryFile(dir=os.path.dirname(path) or None) as salvage:
+        with open(path, "rb") as f:
+            pending = b""
+            while True:
+                data = pending or f.read(_READ_CHUNK)
+                pending = b""
+                if not data:
+                    break
+                try:
+                    salvage.write(decomp.decompress(data))
+                except zlib.error:
+                    break
+                offset += len(data) - len(decomp.unused_data)
+                if decomp.eof:
+                    # Member complete; start the next one from the leftover bytes
+                    pending = decomp.unused_data
+                    member_start = offset
+                    decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    salvage.seek(0)
+                    salvage.truncate()
+
+        if member_start == os.path.getsize(path):
+            return False
+
+        with open(path, "r+b") as f:
+            f.truncate(member_start)
+        # Re-append only the complete lines of the torn member
+        salvage.seek(0)
+        frames_kept = 0
+        carry = b""
+        with gzip.open(path, "ab") as out:
+            for chunk in iter(lambda: salvage.read(_READ_CHUNK), b""):
+                buf = carry + chunk
+                cut = buf.rfind(b"\n") + 1
+                out.write(buf[:cut])
+                frames_kept += buf.count(b"\n", 0, cut)
+                carry = buf[cut:]
+    logger.warning(f"📼 Repaired torn recording {path}: kept {frames_kept} frames from the interrupted session")
+    return True
+
+
+class FrameRecorder:
+    """Thread-safe append-only recorder for raw websocket frames."""
+
+    def __init__(self, path: str, channel: Optional[str] = None, flush_interval: float = 1.0):
+        """
+        Initialize frame recorder.
+
+        Args:
+            path: Output file; gzip-compressed unless it doesn't end in .gz
+            channel: Default channel tag for recorded frames (e.g. "market", "user")
+            flush_interval: Seconds between flushes to disk (default: 1.0)
+        """
+        self.path = path
+        self.channel = channel
+        self.flush_interval = flush_interval
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith(".gz"):
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                _repair_gzip_tail(path)
+            self._file = gzip.open(path, "at", encoding="utf-8")
+        else:
+            self._file = open(path, "a", encoding="utf-8")
+
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.frames_recorded = 0
+        self.closed = False
+        logger.info(f"📼 Recording websocket frames to {path}")
+
+    def record(self, frame, channel: Optional[str] = None, ts: Optional[float] = None):
+        """
+        Append one frame.
+
+        Args:
+            frame: Raw frame as received (str or bytes)
+            channel: Channel tag override (default: recorder channel)
+            ts: Receive time as epoch seconds (default: now)
+        """
+        if isinstance(frame, bytes):
+            frame = frame.decode("utf-8", errors="replace")
+        line = json.dumps({
+            "ts": time.time() if ts is None else ts,
+            "ch": channel or self.channel,
+            "frame": frame,
+        })
+        with self._lock:
+            if self.closed:
+                return
+            self._file.write(line + "\n")
+            self.frames_recorded += 1
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                # Sync-flush the gzip stream so a crash keeps everything up to here readable
+                self._file.flush()
+                self._last_flush = now
+
+    def flush(self):
+        with self._lock:
+            if not self.closed:
+                self._file.flush()
+                self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._file.close()
+        logger.info(f"📼 Recorded {self.frames_recorded} frames to {self.path}")
+
+
+def read_frames(path: str, channel: Optional[str] = None) -> Iterator[Tuple[float, Optional[str], str]]:
+    """
+    Read a recording.
+
+    Args:
+        path: Recording written by FrameRecorder
+        channel: Only yield frames with this channel tag (default: all)
+
+    Yields:
+        (receive_ts, channel, frame) tuples in file order
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partial last line from an unclean shutdown
+                    continue
+                if channel and record.get("ch") != channel:
+                    continue
+                yield record.get("ts", 0.0), record.get("ch"), record.get("frame", "")
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            # Recording process died mid-write; everything up to the last flush is usable
+            logger.debug(f"Truncated recording {path}, stopping at last complete frame")
+
+
+class FrameReplayServer:
+    """Local websocket server that replays a recording to every client that connects."""
+
+    def __init__(
+        self,
+        path: str,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        speed: float = 1.0,
+        channel: Optional[str] = None,
+        wait_for_subscribe: bool = True,
+    ):
+        """
+        Initialize replay server.
+
+        Args:
+            path: Recording written by FrameRecorder
+            host: Bind address (default: 127.0.0.1)
+            port: Bind port; 0 picks a free port (see .url after start)
+            speed: Replay speed multiplier; 1.0 = recorded pace, 0 = as fast as possible
+            channel: Only replay frames with this channel tag (default: all)
+            wait_for_subscribe: Wait for the client's first message (its subscription)
+                before replaying, like the real server (default: True)
+        """
+        if websockets is None:
+            raise ImportError("websockets library not installed. Install with: pip install websockets")
+
+        self.path = path
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.wait_for_subscribe = wait_for_subscribe
+        self.frames: List[Tuple[float, str]] = [(ts, frame) for ts, _, frame in read_frames(path, channel)]
+        self.replay_complete = asyncio.Event()
+        self.stats: Dict[str, float] = {"connections": 0, "frames_sent": 0, "last_replay_seconds": 0.0}
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        if self.port == 0:
+            self.port = next(iter(self._server.sockets)).getsockname()[1]
+        logger.info(f"📼 Replaying {len(self.frames)} frames from {self.path} on {self.url} "
+                    f"(speed: {'max' if self.speed <= 0 else f'{self.speed}x'})")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _drain_client(self, websocket):
+        """Read and ignore client messages (pings, later subscribe/unsubscribe)."""
+        try:
+            async for _ in websocket:
+                pass
+        except Exception:
+            pass
+
+    async def _handler(self, websocket, path=None):
+        self.stats["connections"] += 1
+        if self.wait_for_subscribe:
+            try:
+                await asyncio.wait_for(websocket.recv(), timeout=5.0)
+            except (asyncio.TimeoutError, websockets.exceptions.ConnectionClosed):
+                pass
+
+        drain_task = asyncio.create_task(self._drain_client(websocket))
+        try:
+            base_ts = self.frames[0][0] if self.frames else 0.0
+            start = time.monotonic()
+            for ts, frame in self.frames:
+                if self.speed > 0:
+                    delay = (ts - base_ts) / self.speed - (time.monotonic() - start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await websocket.send(frame)
+                self.stats["frames_sent"] += 1
+            self.stats["last_replay_seconds"] = time.monotonic() - start
+            self.replay_complete.set()
+            logger.info(f"📼 Replay finished: {len(self.frames)} frames in {self.stats['last_replay_seconds']:.2f}s")
+            # Keep the connection open until the client leaves
+            await websocket.wait_closed()
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            drain_task.cancel()
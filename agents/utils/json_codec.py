@@ -0,0 +1,242 @@
+"""
+Fast JSON decoding for websocket frames and REST orderbook responses.
+
+Picks the fastest installed backend:
+- msgspec: typed decoders parse book events straight into float price/size levels
+  (no intermediate dicts, no per-level float() calls in Python)
+- orjson: fast generic decoding
+- json (stdlib): always available fallback
+
+Usage:
+    from agents.utils import json_codec
+    data = json_codec.loads(message)
+    events = json_codec.decode_market_events(message)  # CLOB market channel frames
+    bids, asks, last_trade_price = json_codec.decode_rest_book(response.content)
+
+Set JSON_CODEC=json|orjson|msgspec to force a backend (e.g. for benchmarking).
+"""
+import json
+import logging
+import os
+from typing import Any, List, NamedTuple, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+Levels = List[List[float]]
+
+
+class MarketEvent(NamedTuple):
+    """Orderbook update for one asset: full book, or best bid/ask from a price_change."""
+    asset_id: str
+    bids: Levels
+    asks: Levels
+
+
+def parse_levels(levels: Optional[List]) -> Levels:
+    """Convert [{"price": "0.5", "size": "10"}, ...] or [["0.5", "10"], ...] to [[0.5, 10.0], ...]."""
+    if not levels:
+        return []
+    if isinstance(levels[0], dict):
+        return [[float(level.get("price", 0)), float(level.get("size", 0))] for level in levels]
+    return [[float(level[0]), float(level[1])] for level in levels if len(level) >= 2]
+
+
+# ========== Generic (stdlib/orjson) path ==========
+
+def _stdlib_loads(data: Union[str, bytes]) -> Any:
+    return json.loads(data)
+
+
+def _orjson_loads(data: Union[str, bytes]) -> Any:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads(data)
+
+
+def _events_from_decoded(data: Any) -> Optional[List[MarketEvent]]:
+    """Extract book/price_change updates from an already-decoded market channel message."""
+    if isinstance(data, list):
+        # Initial snapshot: array of books
+        events = []
+        for book in data:
+            if not isinstance(book, dict):
+                continue
+            asset_id = book.get("asset_id")
+            bids = book.get("bids", [])
+            asks = book.get("asks") or book.get("sells", [])
+            if asset_id and (bids or asks):
+                events.append(MarketEvent(asset_id, parse_levels(bids), parse_levels(asks)))
+        return events
+    if not isinstance(data, dict):
+        return None
+
+    event_type = data.get("event_type")
+    if event_type == "book":
+        asset_id = data.get("asset_id")
+        if not asset_id:
+            return []
+        # CLOB uses "sells" for asks
+        asks = data.get("sells") or data.get("asks", [])
+        return [MarketEvent(asset_id, parse_levels(data.get("bids", [])), parse_levels(asks))]
+    if event_type == "price_change":
+        events = []
+        for change in data.get("price_changes", []):
+            asset_id = change.get("asset_id")
+            best_bid = change.get("best_bid")
+            best_ask = change.get("best_ask")
+            if asset_id and best_bid and best_ask:
+                # Minimal orderbook from best bid/ask
+                events.append(MarketEvent(asset_id, [[float(best_bid), 0.0]], [[float(best_ask), 0.0]]))
+        return events
+    return None
+
+
+# ========== msgspec typed path ==========
+
+if msgspec is not None:
+    class _Level(msgspec.Struct):
+        price: float
+        size: float
+
+    class _BookEvent(msgspec.Struct, tag_field="event_type", tag="book"):
+        asset_id: str = ""
+        bids: List[_Level] = []
+        asks: List[_Level] = []
+        sells: List[_Level] = []
+
+    class _PriceChange(msgspec.Struct):
+        asset_id: str = ""
+        best_bid: Optional[str] = None
+        best_ask: Optional[str] = None
+
+    class _PriceChangeEvent(msgspec.Struct, tag_field="event_type", tag="price_change"):
+        price_changes: List[_PriceChange] = []
+
+    class _RestBook(msgspec.Struct):
+        bids: List[_Level] = []
+        asks: List[_Level] = []
+        last_trade_price: Optional[Union[str, float]] = None
+
+    # strict=False lets "0.52" decode into float fields
+    _market_decoder = msgspec.json.Decoder(
+        Union[_BookEvent, _PriceChangeEvent, List[_BookEvent]], strict=False
+    )
+    _rest_book_decoder = msgspec.json.Decoder(_RestBook, strict=False)
+    _generic_decoder = msgspec.json.Decoder()
+
+    def _msgspec_loads(data: Union[str, bytes]) -> Any:
+        try:
+            return _generic_decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from None
+
+    def _book_event(book: "_BookEvent") -> MarketEvent:
+        # CLOB uses "sells" for asks
+        return MarketEvent(
+            book.asset_id,
+            [[level.price, level.size] for level in book.bids],
+            [[level.price, level.size] for level in (book.sells or book.asks)],
+        )
+
+    def _msgspec_market_events(message: Union[str, bytes]) -> Optional[List[MarketEvent]]:
+        try:
+            decoded = _market_decoder.decode(message)
+        except msgspec.ValidationError:
+            # Not a typed book/price_change frame (control message, unexpected shape)
+            return _events_from_decoded(_msgspec_loads(message))
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), message if isinstance(message, str) else "", 0) from None
+
+        if isinstance(decoded, list):
+            # Initial snapshot: skip entries without an asset or any levels
+            return [
+                _book_event(book) for book in decoded
+                if book.asset_id and (book.bids or book.sells or book.asks)
+            ]
+        if isinstance(decoded, _BookEvent):
+            return [_book_event(decoded)] if decoded.asset_id else []
+        return [
+            MarketEvent(change.asset_id, [[float(change.best_bid), 0.0]], [[float(change.best_ask), 0.0]])
+            for change in decoded.price_changes
+            if change.asset_id and change.best_bid and change.best_ask
+        ]
+
+    def _msgspec_rest_book(content: Union[str, bytes]) -> Tuple[Levels, Levels, Optional[float]]:
+        book = _rest_book_decoder.decode(content)
+        last_trade_price = float(book.last_trade_price) if book.last_trade_price not in (None, "") else None
+        return (
+            [[level.price, level.size] for level in book.bids],
+            [[level.price, level.size] for level in book.asks],
+            last_trade_price,
+        )
+
+
+# ========== Backend selection ==========
+
+def _select_backend() -> str:
+    requested = os.getenv("JSON_CODEC", "").lower()
+    available = {"json": True, "orjson": orjson is not None, "msgspec": msgspec is not None}
+    if requested:
+        if available.get(requested):
+            return requested
+        logger.warning(f"⚠️ JSON_CODEC={requested} not available, using fastest installed backend")
+    if msgspec is not None:
+        return "msgspec"
+    if orjson is not None:
+        return "orjson"
+    return "json"
+
+
+BACKEND = _select_backend()
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON with the selected backend (raises json.JSONDecodeError on invalid input)."""
+    if BACKEND == "msgspec":
+        return _msgspec_loads(data)
+    if BACKEND == "orjson":
+        return _orjson_loads(data)
+    return _stdlib_loads(data)
+
+
+def decode_market_events(message: Union[str, bytes]) -> Optional[List[MarketEvent]]:
+    """
+    Decode a CLOB market channel frame into orderbook updates.
+
+    Returns:
+        List of MarketEvent for book / price_change / initial snapshot frames (possibly empty),
+        or None for any other message (subscription acks, errors, pings) - decode those with loads()
+
+    Raises:
+        json.JSONDecodeError: If the frame is not valid JSON
+    """
+    if BACKEND == "msgspec":
+        return _msgspec_market_events(message)
+    return _events_from_decoded(loads(message))
+
+
+def decode_rest_book(content: Union[str, bytes]) -> Tuple[Levels, Levels, Optional[float]]:
+    """
+    Decode a CLOB REST /book response body.
+
+    Returns:
+        Tuple of (bids, asks, last_trade_price) with [[price, size], ...] float levels
+    """
+    if BACKEND == "msgspec":
+        return _msgspec_rest_book(content)
+    data = loads(content)
+    last_trade_price = data.get("last_trade_price")
+    return (
+        parse_levels(data.get("bids", [])),
+        parse_levels(data.get("asks", [])),
+        float(last_trade_price) if last_trade_price not in (None, "") else None,
+    )
@@ -0,0 +1,324 @@
+"""
+Lightweight ingestion metrics in Prometheus text format.
+
+Disabled by default: recording helpers return after a single module-level flag check, so
+instrumented hot paths cost close to nothing unless the process starts the endpoint.
+Hot loops can also guard with `if metrics.ENABLED:` to skip building label dicts.
+
+Exposed at http://127.0.0.1:<port>/metrics once start_metrics_server() is called
+(or METRICS_PORT is set and start_metrics_server_from_env() is called):
+- Counters as <name>_total, plus <name>_per_second (rate since the previous scrape)
+- Gauges, including callback gauges evaluated at scrape time (queue depths, book staleness)
+- Summaries with rolling-window quantiles (DB write latency, event-loop lag)
+
+Usage:
+    from agents.utils import metrics
+    metrics.start_metrics_server_from_env()
+    asyncio.run(metrics.run_with_loop_lag_monitor(main()))
+
+    metrics.inc("ws_messages", {"connection": "market-0"})
+    metrics.observe("orderbook_db_write_seconds", elapsed, {"table": "btc_15_min_table"})
+"""
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Checked by every recording helper; flipped on by start_metrics_server()
+ENABLED = False
+
+LabelKey = Tuple[Tuple[str, str], ...]
+GaugeCallback = Callable[[], Iterable[Tuple[Dict[str, str], float]]]
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Summary:
+    __slots__ = ("window", "sum", "count")
+
+    def __init__(self, window_size: int):
+        self.window: Deque[float] = deque(maxlen=window_size)
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and summaries rendered in Prometheus text format."""
+
+    def __init__(self, summary_window: int = 1024):
+        """
+        Initialize metrics registry.
+
+        Args:
+            summary_window: Most recent observations kept per summary for quantiles (default: 1024)
+        """
+        self.summary_window = summary_window
+        self._lock = threading.Lock()
+        self._help: Dict[str, str] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._summaries: Dict[str, Dict[LabelKey, _Summary]] = {}
+        self._callbacks: Dict[int, Tuple[str, GaugeCallback]] = {}
+        self._callback_ids = itertools.count(1)
+        # Previous scrape (time, counter values) for <name>_per_second
+        self._last_scrape_time = time.monotonic()
+        self._last_scrape_values: Dict[Tuple[str, LabelKey], float] = {}
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, labels: Optional[Dict[str, Any]] = None, value: float = 1.0):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            summary = series.get(key)
+            if summary is None:
+                summary = series[key] = _Summary(self.summary_window)
+            summary.window.append(value)
+            summary.sum += value
+            summary.count += 1
+
+    def register_callback(self, name: str, callback: GaugeCallback, help_text: Optional[str] = None) -> int:
+        """
+        Register a gauge computed at scrape time.
+
+        Args:
+            name: Gauge name (several callbacks may share one name with different labels)
+            callback: Returns an iterable of (labels, value)
+            help_text: Optional HELP line
+
+        Returns:
+            Handle for unregister_callback()
+        """
+        handle = next(self._callback_ids)
+        with self._lock:
+            self._callbacks[handle] = (name, callback)
+            if help_text:
+                self._help.setdefault(name, help_text)
+        return handle
+
+    def unregister_callback(self, handle: Optional[int]):
+        if handle is None:
+            return
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        now = time.monotonic()
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            summaries = {
+                name: {key: (sorted(s.window), s.sum, s.count) for key, s in series.items()}
+                for name, series in self._summaries.items()
+            }
+            callbacks = list(self._callbacks.values())
+            elapsed = max(now - self._last_scrape_time, 1e-9)
+            last_values = self._last_scrape_values
+            self._last_scrape_time = now
+            self._last_scrape_values = {
+                (name, key): value for name, series in counters.items() for key, value in series.items()
+            }
+
+        # Callback gauges run outside the lock (they may take other locks)
+        for name, callback in callbacks:
+            try:
+                series = gauges.setdefault(name, {})
+                for labels, value in callback():
+                    series[_label_key(labels)] = value
+            except Exception as e:
+                logger.debug(f"Metrics callback for {name} failed: {e}")
+
+        lines: List[str] = []
+
+        def header(name: str, metric_type: str, help_name: Optional[str] = None):
+            help_text = self._help.get(help_name or name)
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        for name in sorted(counters):
+            header(f"{name}_total", "counter", name)
+            for key, value in counters[name].items():
+                lines.append(f"{name}_total{_format_labels(key)} {value:.15g}")
+            header(f"{name}_per_second", "gauge", name)
+            for key, value in counters[name].items():
+                rate = (value - last_values.get((name, key), 0.0)) / elapsed
+                lines.append(f"{name}_per_second{_format_labels(key)} {rate:.6g}")
+
+        for name in sorted(gauges):
+            header(name, "gauge")
+            for key, value in gauges[name].items():
+                lines.append(f"{name}{_format_labels(key)} {value:.6g}")
+
+        for name in sorted(summaries):
+            header(name, "summary")
+            for key, (window, total, count) in summaries[name].items():
+                for q in QUANTILES:
+                    value = window[min(len(window) - 1, int(q * len(window)))] if window else float("nan")
+                    lines.append(f"{name}{_format_labels(key, ('quantile', str(q)))} {value:.6g}")
+                lines.append(f"{name}_sum{_format_labels(key)} {total:.6g}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# ========== Hot-path helpers (no-ops while disabled) ==========
+
+def inc(name: str, labels: Optional[Dict[str, Any]] = None, value: float = 1.0):
+    if ENABLED:
+        registry.inc(name, labels, value)
+
+
+def set_gauge(name: str, value: float, labels: Optional[Dict[str, Any]] = None):
+    if ENABLED:
+        registry.set(name, value, labels)
+
+
+def observe(name: str, value: float, labels: Optional[Dict[str, Any]] = None):
+    if ENABLED:
+        registry.observe(name, value, labels)
+
+
+def register_callback(name: str, callback: GaugeCallback, help_text: Optional[str] = None) -> Optional[int]:
+    """Register a scrape-time gauge (returns None and registers nothing while disabled)."""
+    if not ENABLED:
+        return None
+    return registry.register_callback(name, callback, help_text)
+
+
+def unregister_callback(handle: Optional[int]):
+    registry.unregister_callback(handle)
+
+
+# ========== HTTP endpoint ==========
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes are not worth a log line each
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Enable metrics and serve them on http://host:port/metrics (daemon thread, idempotent).
+
+    Args:
+        port: TCP port (0 picks a free port, see server.server_address)
+        host: Bind address (default: localhost only)
+    """
+    global ENABLED, _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+            logger.info(f"📊 Metrics endpoint: http://{host}:{_server.server_address[1]}/metrics")
+        ENABLED = True
+    _describe_defaults()
+    return _server
+
+
+def start_metrics_server_from_env() -> bool:
+    """Start the metrics endpoint if METRICS_PORT is set (METRICS_HOST optional)."""
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return False
+    try:
+        start_metrics_server(int(port), os.getenv("METRICS_HOST", "127.0.0.1"))
+        return True
+    except (ValueError, OSError) as e:
+        logger.warning(f"⚠️ Could not start metrics endpoint on METRICS_PORT={port}: {e}")
+        return False
+
+
+def stop_metrics_server():
+    global ENABLED, _server
+    with _server_lock:
+        ENABLED = False
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
+
+
+def _describe_defaults():
+    registry.describe("ws_messages", "WebSocket frames received per connection")
+    registry.describe("orderbook_snapshots_persisted", "Orderbook snapshots written per table")
+    registry.describe("orderbook_db_write_seconds", "Orderbook snapshot commit latency per table")
+    registry.describe("orderbook_fetch", "orderbook_helper.fetch_orderbook results by source (websocket/http/http_error)")
+    registry.describe("orderbook_pipeline_queue_depth", "OrderbookLogger queue depth per stage")
+    registry.describe("orderbook_book_age_seconds", "Seconds since each cached token's book was last updated")
+    registry.describe("event_loop_lag_seconds", "Event-loop scheduling delay (sleep overshoot)")
+
+
+# ========== Event-loop lag ==========
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """Observe how late a fixed sleep wakes up - a direct measure of event-loop blocking."""
+    while True:
+        start = time.monotonic()
+        await asyncio.sleep(interval)
+        observe("event_loop_lag_seconds", max(0.0, time.monotonic() - start - interval))
+
+
+async def run_with_loop_lag_monitor(coro: Awaitable, interval: float = 0.5):
+    """Await coro, measuring event-loop lag alongside it while metrics are enabled."""
+    lag_task = asyncio.create_task(monitor_event_loop_lag(interval)) if ENABLED else None
+    try:
+        return await coro
+    finally:
+        if lag_task:
+            lag_task.cancel()
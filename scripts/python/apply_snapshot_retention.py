@@ -0,0 +1,68 @@
+"""
+Roll up and drop old day partitions of the BTC snapshot tables.
+
+Requires the tables to be partitioned (monitor_btc_markets.py with ORDERBOOK_PARTITIONING=true).
+Partitions older than --days are summarized into orderbook_rollups (1s/10s/1m mid, spread,
+top-of-book sizes and depth bands) and then dropped. Run it daily, e.g. from cron.
+
+Usage:
+    python scripts/python/apply_snapshot_retention.py --days 7 --dry-run
+    python scripts/python/apply_snapshot_retention.py --days 7 [--15m] [--1h]
+    python scripts/python/apply_snapshot_retention.py --rollup-only   # summarize without dropping
+"""
+import argparse
+import logging
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    force=True
+)
+
+from agents.polymarket.orderbook_db import OrderbookDatabase
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll up and drop old snapshot partitions")
+    parser.add_argument("--days", type=int, default=int(os.getenv("ORDERBOOK_RETENTION_DAYS", "7")),
+                        help="Days of full-depth snapshots to keep (default: ORDERBOOK_RETENTION_DAYS or 7)")
+    parser.add_argument("--15m", action="store_true", help="Only btc_15_min_table")
+    parser.add_argument("--1h", action="store_true", help="Only btc_1_hour_table")
+    parser.add_argument("--dry-run", action="store_true", help="List partitions that would be dropped")
+    parser.add_argument("--rollup-only", action="store_true",
+                        help="Roll up expired partitions that aren't rolled up yet, but keep them")
+    args = parser.parse_args()
+
+    tables = []
+    if args.__dict__["15m"] or not args.__dict__["1h"]:
+        tables.append(("btc_15_min_table", {"use_btc_15_min_table": True}))
+    if args.__dict__["1h"] or not args.__dict__["15m"]:
+        tables.append(("btc_1_hour_table", {"use_btc_1_hour_table": True}))
+
+    for table_name, kwargs in tables:
+        db = OrderbookDatabase(partitioned=True, **kwargs)
+        expired = db.apply_retention(args.days, dry_run=True)
+        if args.dry_run:
+            print(f"{table_name}: {len(expired)} partition(s) older than {args.days} days")
+            for name in expired:
+                print(f"  {name}")
+            continue
+
+        if args.rollup_only:
+            partitions = {p.partition_name: p for p in db.partitioner.partitions()}
+            for name in expired:
+                if partitions[name].rolled_up_at is None:
+                    db.partitioner.rollup(partitions[name])
+            print(f"✓ {table_name}: rolled up {len(expired)} expired partition(s)")
+            continue
+
+        dropped = db.apply_retention(args.days)
+        print(f"✓ {table_name}: dropped {len(dropped)} partition(s)")
+
+
+if __name__ == "__main__":
+    main()
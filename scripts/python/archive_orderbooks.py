@@ -0,0 +1,148 @@
+"""
+Export closed BTC markets to the Parquet archive and benchmark archive queries.
+
+Export every market past its market_end_date that isn't archived yet (run periodically):
+    python scripts/python/archive_orderbooks.py export --archive data/orderbook_archive [--15m] [--1h]
+
+Compare a historical scan through SQLAlchemy (OrderbookDatabase.get_snapshots) with the
+archive (DuckDB if installed, else pyarrow). Without --database-url, a temporary SQLite
+database is filled with synthetic closed markets first:
+    python scripts/python/archive_orderbooks.py bench
+    python scripts/python/archive_orderbooks.py bench --markets 40 --snapshots 2000
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    force=True
+)
+
+from agents.polymarket.orderbook_db import OrderbookDatabase
+from agents.polymarket.orderbook_archive import ParquetArchiver, ParquetSnapshotStore, duckdb
+
+
+def export(args):
+    tables = []
+    if args.__dict__["15m"] or not args.__dict__["1h"]:
+        tables.append({"use_btc_15_min_table": True})
+    if args.__dict__["1h"] or not args.__dict__["15m"]:
+        tables.append({"use_btc_1_hour_table": True})
+    for kwargs in tables:
+        db = OrderbookDatabase(database_url=args.database_url, sqlite_mode="read_only", **kwargs)
+        archiver = ParquetArchiver(args.archive, db, settle_seconds=args.settle_seconds)
+        exported = archiver.export_closed_markets(overwrite=args.overwrite)
+        print(f"✓ {db.table_label}: exported {len(exported)} markets ({sum(exported.values())} snapshots)")
+
+
+def fill_synthetic(db: OrderbookDatabase, markets: int, snapshots: int, levels: int = 20):
+    """Closed 15-minute markets, 2 tokens each, one snapshot per token every ~second."""
+    rng = random.Random(7)
+    start = datetime.now(timezone.utc) - timedelta(days=3)
+    for m in range(markets):
+        market_start = start + timedelta(minutes=15 * m)
+        rows = []
+        for i in range(snapshots):
+            mid = rng.uniform(0.05, 0.95)
+            rows.append({
+                "token_id": f"{m}-{i % 2}",
+                "market_id": str(500000 + m),
+                "bids": [[round(max(0.01, mid - 0.01 * (n + 1)), 2), round(rng.uniform(1, 5000), 2)] for n in range(levels)],
+                "asks": [[round(min(0.99, mid + 0.01 * (n + 1)), 2), round(rng.uniform(1, 5000), 2)] for n in range(levels)],
+                "outcome": "Up" if i % 2 == 0 else "Down",
+                "metadata": {"outcome_price": mid},
+                "market_start_date": market_start,
+                "market_end_date": market_start + timedelta(minutes=15),
+                "timestamp": market_start + timedelta(seconds=i * 900 / snapshots),
+            })
+        db.save_snapshots(rows)
+
+
+def timed(label: str, fn, baseline: float = None) -> float:
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    rows = len(result)
+    speedup = f"   {baseline / elapsed:6.1f}x" if baseline else ""
+    print(f"{label:44s} {elapsed * 1000:9.1f} ms  ({rows} rows){speedup}")
+    return elapsed
+
+
+def bench(args):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database_url = args.database_url
+        if database_url is None:
+            database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+            writer = OrderbookDatabase(database_url=database_url, use_btc_15_min_table=True)
+            fill_synthetic(writer, args.markets, args.snapshots)
+            writer.engine.dispose()
+
+        db = OrderbookDatabase(database_url=database_url, use_btc_15_min_table=True, sqlite_mode="read_only")
+        archive = args.archive or os.path.join(tmpdir, "archive")
+        ParquetArchiver(archive, db).export_closed_markets(overwrite=True)
+
+        market_ids = sorted(ParquetArchiver(archive, db).archived_market_ids())
+        market_id = market_ids[len(market_ids) // 2]
+        engines = ["pyarrow"] + (["duckdb"] if duckdb is not None else [])
+        print()
+        print(f"{len(market_ids)} archived markets; scanning market {market_id} and the whole history")
+        print()
+
+        full_limit = 10 ** 9
+        base = timed("sqlalchemy: one market (ORM rows)", lambda: db.get_snapshots(market_id=market_id, limit=full_limit))
+        for engine in engines:
+            store = ParquetSnapshotStore(archive, engine=engine)
+            timed(f"{engine}: one market (arrow table)", lambda: store.query_table(market_id=market_id), base)
+        print()
+        base = timed("sqlalchemy: full history (ORM rows)", lambda: db.get_snapshots(limit=full_limit))
+        for engine in engines:
+            store = ParquetSnapshotStore(archive, engine=engine)
+            timed(f"{engine}: full history, top-of-book columns", lambda: store.query_table(
+                columns=["timestamp", "token_id", "best_bid_price", "best_ask_price"]), base)
+        print()
+        from sqlalchemy import text
+        base = timed("sqlalchemy: per-market summary (GROUP BY)", lambda: db.engine.connect().execute(text(
+            "SELECT market_id, COUNT(*), MIN(timestamp), MAX(timestamp) FROM btc_15_min_table GROUP BY market_id"
+        )).fetchall())
+        for engine in engines:
+            store = ParquetSnapshotStore(archive, engine=engine)
+            timed(f"{engine}: per-market summary", lambda: store.market_summaries(), base)
+        if duckdb is None:
+            print("\nduckdb not installed (pip install duckdb) - only pyarrow was measured")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parquet archive for closed BTC markets")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export closed markets to the archive")
+    export_parser.add_argument("--archive", default=os.getenv("ORDERBOOK_ARCHIVE_PATH", "./orderbook_archive"),
+                               help="Archive root (default: ORDERBOOK_ARCHIVE_PATH or ./orderbook_archive)")
+    export_parser.add_argument("--database-url", default=None, help="Source database (default: DATABASE_URL / ORDERBOOK_DB_PATH)")
+    export_parser.add_argument("--15m", action="store_true", help="Only btc_15_min_table")
+    export_parser.add_argument("--1h", action="store_true", help="Only btc_1_hour_table")
+    export_parser.add_argument("--overwrite", action="store_true", help="Re-export markets already archived")
+    export_parser.add_argument("--settle-seconds", type=float, default=60.0,
+                               help="Only export markets that ended at least this long ago (default: 60)")
+
+    bench_parser = subparsers.add_parser("bench", help="Compare SQLAlchemy scans with archive queries")
+    bench_parser.add_argument("--database-url", default=None, help="Benchmark an existing database (btc_15_min_table)")
+    bench_parser.add_argument("--archive", default=None, help="Archive root (default: temporary directory)")
+    bench_parser.add_argument("--markets", type=int, default=20, help="Synthetic markets (default: 20)")
+    bench_parser.add_argument("--snapshots", type=int, default=1800, help="Synthetic snapshots per market (default: 1800)")
+
+    args = parser.parse_args()
+    {"export": export, "bench": bench}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
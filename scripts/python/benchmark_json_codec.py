@@ -0,0 +1,164 @@
+"""
+Benchmark websocket frame decoding: stdlib json + Python float loops vs agents.utils.json_codec.
+
+Decodes a set of CLOB market channel frames with:
+- baseline: json.loads + per-level float() loops (the previous handler code path)
+- each installed json_codec backend (json, orjson, msgspec)
+
+Frames come from a recording (one raw frame per line, or JSONL from the frame recorder
+with a "frame" field) or, if none is given, from synthetic book/price_change frames.
+
+Usage:
+    python scripts/python/benchmark_json_codec.py
+    python scripts/python/benchmark_json_codec.py --frames recorded_frames.jsonl --repeat 20
+"""
+import sys
+import os
+import argparse
+import json
+import random
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from agents.utils import json_codec
+
+
+def synthetic_frames(count: int = 2000, levels: int = 30) -> list:
+    """Book and price_change frames shaped like the CLOB market channel."""
+    rng = random.Random(42)
+    frames = []
+    for i in range(count):
+        asset_id = str(10**76 + rng.randrange(200))
+        if i % 3 == 0:
+            mid = rng.uniform(0.05, 0.95)
+            frames.append(json.dumps({
+                "event_type": "book",
+                "asset_id": asset_id,
+                "market": "0x" + "ab" * 32,
+                "timestamp": str(1767393900000 + i),
+                "hash": "%040x" % rng.getrandbits(160),
+                "bids": [
+                    {"price": f"{max(0.01, mid - 0.01 * (n + 1)):.2f}", "size": f"{rng.uniform(1, 5000):.2f}"}
+                    for n in range(levels)
+                ],
+                "sells": [
+                    {"price": f"{min(0.99, mid + 0.01 * (n + 1)):.2f}", "size": f"{rng.uniform(1, 5000):.2f}"}
+                    for n in range(levels)
+                ],
+            }))
+        else:
+            frames.append(json.dumps({
+                "event_type": "price_change",
+                "market": "0x" + "ab" * 32,
+                "timestamp": str(1767393900000 + i),
+                "price_changes": [
+                    {
+                        "asset_id": asset_id,
+                        "price": "0.52",
+                        "size": f"{rng.uniform(1, 5000):.2f}",
+                        "side": "BUY",
+                        "best_bid": "0.51",
+                        "best_ask": "0.53",
+                    }
+                ],
+            }))
+    return frames
+
+
+def load_frames(path: str) -> list:
+    frames = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                frames.append(line)
+                continue
+            # Frame recorder JSONL: {"ts": ..., "frame": "..."}
+            if isinstance(record, dict) and isinstance(record.get("frame"), str):
+                frames.append(record["frame"])
+            else:
+                frames.append(line)
+    return frames
+
+
+def baseline_decode(message: str) -> int:
+    """Previous handler path: json.loads, then float() per level in Python loops."""
+    data = json.loads(message)
+    levels = 0
+    if isinstance(data, list):
+        for book in data:
+            levels += len([[float(b.get("price", 0)), float(b.get("size", 0))] for b in book.get("bids", [])])
+            levels += len([[float(a.get("price", 0)), float(a.get("size", 0))] for a in book.get("asks", [])])
+    elif data.get("event_type") == "book":
+        levels += len([[float(b.get("price", 0)), float(b.get("size", 0))] for b in data.get("bids", [])])
+        levels += len([[float(a.get("price", 0)), float(a.get("size", 0))] for a in data.get("sells", [])])
+    elif data.get("event_type") == "price_change":
+        for change in data.get("price_changes", []):
+            if change.get("best_bid") and change.get("best_ask"):
+                levels += len([[float(change["best_bid"]), 0.0], [float(change["best_ask"]), 0.0]])
+    return levels
+
+
+def codec_decode(message: str) -> int:
+    events = json_codec.decode_market_events(message)
+    if events is None:
+        return 0
+    return sum(len(event.bids) + len(event.asks) for event in events)
+
+
+def run(frames: list, decode, repeat: int) -> float:
+    """Return frames/second (best of `repeat` passes)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            decode(frame)
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark websocket frame decoding")
+    parser.add_argument("--frames", default=None, help="Recorded frames file (default: synthetic frames)")
+    parser.add_argument("--repeat", type=int, default=10, help="Passes per decoder (best is reported)")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames) if args.frames else synthetic_frames()
+    print(f"Decoding {len(frames)} frames ({'recorded' if args.frames else 'synthetic'}), best of {args.repeat}")
+    print()
+
+    # Sanity check: every backend extracts the same number of levels as the baseline
+    expected = sum(baseline_decode(f) for f in frames)
+
+    baseline_rate = run(frames, baseline_decode, args.repeat)
+    print(f"{'baseline (json + float loops)':32s} {baseline_rate:12,.0f} frames/s   1.00x")
+
+    backends = ["json"]
+    if json_codec.orjson is not None:
+        backends.append("orjson")
+    if json_codec.msgspec is not None:
+        backends.append("msgspec")
+
+    original_backend = json_codec.BACKEND
+    try:
+        for backend in backends:
+            json_codec.BACKEND = backend
+            got = sum(codec_decode(f) for f in frames)
+            check = "" if got == expected else f"   (level count {got} != {expected}!)"
+            rate = run(frames, codec_decode, args.repeat)
+            print(f"{'json_codec[' + backend + ']':32s} {rate:12,.0f} frames/s   {rate / baseline_rate:.2f}x{check}")
+    finally:
+        json_codec.BACKEND = original_backend
+
+    missing = [name for name, mod in (("orjson", json_codec.orjson), ("msgspec", json_codec.msgspec)) if mod is None]
+    if missing:
+        print(f"\nNot installed: {', '.join(missing)} (pip install {' '.join(missing)})")
+
+
+if __name__ == "__main__":
+    main()
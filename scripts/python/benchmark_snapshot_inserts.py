@@ -0,0 +1,112 @@
+"""
+Benchmark snapshot insert throughput under the "ingest" and "analytics" index profiles.
+
+Inserts the same synthetic snapshots into btc_15_min_table on a fresh SQLite database per
+profile (via OrderbookDatabase.save_snapshots in batches) and reports rows/second, plus the
+time to build the analytics indexes afterwards on the ingest database.
+
+Usage:
+    python scripts/python/benchmark_snapshot_inserts.py
+    python scripts/python/benchmark_snapshot_inserts.py --rows 50000 --batch 100
+    python scripts/python/benchmark_snapshot_inserts.py --database-url postgresql://... --rows 20000
+
+Build the secondary indexes offline on a database that was logged with
+ORDERBOOK_INDEX_PROFILE=ingest (uses DATABASE_URL / ORDERBOOK_DB_PATH like the monitors):
+    python scripts/python/benchmark_snapshot_inserts.py --build-analytics
+"""
+import sys
+import os
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from agents.polymarket.orderbook_db import (
+    BTC15MinOrderbookSnapshot,
+    OrderbookDatabase,
+    secondary_indexes,
+)
+
+
+def synthetic_snapshots(count: int, markets: int = 8, levels: int = 20) -> list:
+    """save_snapshot() kwargs for `markets` markets x 2 tokens, one snapshot per second."""
+    rng = random.Random(42)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    snapshots = []
+    for i in range(count):
+        market = i % markets
+        token = f"{10**76 + market * 2 + (i // markets) % 2}"
+        mid = rng.uniform(0.05, 0.95)
+        market_start = start + timedelta(minutes=15 * market)
+        snapshots.append({
+            "token_id": token,
+            "market_id": str(100000 + market),
+            "bids": [[round(max(0.01, mid - 0.01 * (n + 1)), 2), round(rng.uniform(1, 5000), 2)] for n in range(levels)],
+            "asks": [[round(min(0.99, mid + 0.01 * (n + 1)), 2), round(rng.uniform(1, 5000), 2)] for n in range(levels)],
+            "metadata": {"outcome_price": mid, "last_trade_price": mid},
+            "market_start_date": market_start,
+            "market_end_date": market_start + timedelta(minutes=15),
+            "timestamp": market_start + timedelta(seconds=i // markets),
+        })
+    return snapshots
+
+
+def run(database_url: str, profile: str, snapshots: list, batch: int) -> tuple:
+    """Insert all snapshots; return (db, rows/second)."""
+    db = OrderbookDatabase(database_url=database_url, use_btc_15_min_table=True, index_profile=profile)
+    start = time.perf_counter()
+    for i in range(0, len(snapshots), batch):
+        db.save_snapshots(snapshots[i:i + batch])
+    return db, len(snapshots) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot inserts per index profile")
+    parser.add_argument("--rows", type=int, default=20000, help="Snapshots to insert per profile")
+    parser.add_argument("--batch", type=int, default=50, help="Snapshots per save_snapshots() call")
+    parser.add_argument("--database-url", default=None,
+                        help="Benchmark against this database instead of temporary SQLite files "
+                             "(btc_15_min_table is written to - use a scratch database)")
+    parser.add_argument("--build-analytics", action="store_true",
+                        help="Don't benchmark; build the analytics indexes on the configured database")
+    args = parser.parse_args()
+
+    if args.build_analytics:
+        db = OrderbookDatabase(database_url=args.database_url, use_btc_15_min_table=True, use_btc_1_hour_table=True)
+        db.build_analytics_indexes()
+        return
+
+    snapshots = synthetic_snapshots(args.rows)
+    secondary = len(secondary_indexes(BTC15MinOrderbookSnapshot))
+    total = len(BTC15MinOrderbookSnapshot.__table__.indexes)
+    print(f"Inserting {args.rows} snapshots in batches of {args.batch}")
+    print(f"btc_15_min_table indexes: {total} declared, {total - secondary} kept by the ingest profile")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rates = {}
+        ingest_db = None
+        for profile in ("analytics", "ingest"):
+            url = args.database_url or f"sqlite:///{os.path.join(tmpdir, profile + '.db')}"
+            db, rates[profile] = run(url, profile, snapshots, args.batch)
+            print(f"{profile:10s} {rates[profile]:10,.0f} rows/s   {rates[profile] / rates['analytics']:.2f}x")
+            if profile == "ingest":
+                ingest_db = db
+            else:
+                if args.database_url:
+                    # Same scratch table for both runs: start the ingest run from empty
+                    with db.engine.begin() as conn:
+                        conn.exec_driver_sql(f"DELETE FROM {BTC15MinOrderbookSnapshot.__tablename__}")
+                db.engine.dispose()
+
+        start = time.perf_counter()
+        ingest_db.build_analytics_indexes()
+        print(f"\nBuilding {secondary} analytics indexes afterwards: {time.perf_counter() - start:.2f}s")
+        ingest_db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,7 @@ except ImportError:
     pass  # dotenv not installed, skip (Railway sets env vars directly)
 
 from agents.polymarket.orderbook_db import OrderbookDatabase
+from agents.utils import metrics
 from agents.polymarket.orderbook_stream import OrderbookLogger
 from agents.polymarket.orderbook_poller import OrderbookPoller
 from agents.polymarket.btc_market_detector import (
@@ -140,6 +141,8 @@ class BTCMarketsMonitor:
                     self.monitored_15m_event_slugs.discard(event_slug)
                     for token_id in token_ids:
                         self.monitored_token_ids.discard(token_id)
+                    if self.poller_15m:
+                        self.poller_15m.remove_tokens(token_ids)
                 continue
             
             # Check if already monitoring - verify both event slug AND tokens are actually monitored
@@ -238,6 +241,8 @@ class BTCMarketsMonitor:
                     self.monitored_1h_event_slugs.discard(event_slug)
                     for token_id in token_ids:
                         self.monitored_token_ids.discard(token_id)
+                    if self.poller_1h:
+                        self.poller_1h.remove_tokens(token_ids)
                 continue
             
             # Check if already monitoring - verify both event slug AND tokens are actually monitored
@@ -385,9 +390,9 @@ class BTCMarketsMonitor:
                 else:
                     # Add new subscriptions to existing stream
                     if logger_service.stream and logger_service.stream.websocket:
+                        logger_service.market_info.update(market_info)
+                        await logger_service.stream.subscribe_to_orderbooks(token_ids)
                         for token_id in token_ids:
-                            await logger_service.stream.subscribe_to_orderbook(token_id)
-                            logger_service.market_info.update(market_info)
                             if token_id not in logger_service.token_ids:
                                 logger_service.token_ids.append(token_id)
                         logger.info(f"Added {len(token_ids)} new subscriptions to {market_type} WebSocket")
@@ -406,13 +411,18 @@ class BTCMarketsMonitor:
             from agents.polymarket.orderbook_poller import OrderbookPoller
             
             if poller is None:
-                # Poll every 0.5 seconds
+                # Poll every 0.5 seconds, or adaptively (dense near market close) with
+                # ORDERBOOK_ADAPTIVE_POLLING=true and an optional ORDERBOOK_POLL_BUDGET req/s cap
+                adaptive = os.getenv("ORDERBOOK_ADAPTIVE_POLLING", "false").lower() == "true"
+                budget = os.getenv("ORDERBOOK_POLL_BUDGET")
                 new_poller = OrderbookPoller(
                     db,
                     token_ids,
                     poll_interval=0.5,
                     market_info=market_info,
                     track_top_n=0,  # Save all snapshots
+                    adaptive=adaptive,
+                    request_budget=float(budget) if budget else None,
                 )
                 new_poller_task = asyncio.create_task(new_poller.poll_loop())
                 
@@ -424,15 +434,12 @@ class BTCMarketsMonitor:
                     self.poller_1h = new_poller
                     self.poller_task_1h = new_poller_task
                 
-                logger.info(f"Started polling for {market_type} markets (0.5s interval)")
+                logger.info(f"Started polling for {market_type} markets ({'adaptive' if adaptive else '0.5s'} interval)")
                 return True  # Success
             else:
-                # Add tokens to existing poller
-                for token_id in token_ids:
-                    if token_id not in poller.token_ids:
-                        poller.token_ids.append(token_id)
-                poller.market_info.update(market_info)
-                logger.info(f"Added {len(token_ids)} tokens to existing {market_type} poller")
+                # Add tokens to the running poller (ended markets expire at market_end_date)
+                added = poller.add_tokens(token_ids, market_info=market_info)
+                logger.info(f"Added {len(added)} tokens to existing {market_type} poller")
                 return True  # Success
         
         # If we get here, monitoring didn't start
@@ -542,26 +549,29 @@ class BTCMarketsMonitor:
         
         # Stop pollers
         if self.poller_15m:
-            try:
-                await self.poller_15m.stop()
-            except:
-                pass
+            self.poller_15m.stop()
         if self.poller_1h:
-            try:
-                await self.poller_1h.stop()
-            except:
-                pass
+            self.poller_1h.stop()
 
 
 async def main():
     """Main entry point."""
     # Initialize databases
+    # ORDERBOOK_INDEX_PROFILE=ingest drops the secondary snapshot indexes while logging
+    # (build them later with scripts/python/benchmark_snapshot_inserts.py --build-analytics)
+    index_profile = os.getenv("ORDERBOOK_INDEX_PROFILE") or None
+    # ORDERBOOK_PARTITIONING=true stores snapshots in daily partitions
+    # (roll up and drop old days with scripts/python/apply_snapshot_retention.py)
+    partitioned = os.getenv("ORDERBOOK_PARTITIONING", "false").lower() == "true"
+    
+    # On SQLite both databases share one WAL-mode writer thread, so backtests and
+    # query scripts can read the capture while it is being written
     # 15-minute markets -> btc_15_min_table
-    db_15m = OrderbookDatabase(use_btc_15_min_table=True)
+    db_15m = OrderbookDatabase(use_btc_15_min_table=True, index_profile=index_profile, sqlite_mode="ingest", partitioned=partitioned)
     logger.info("✓ Initialized database for BTC 15-minute markets (btc_15_min_table)")
     
     # 1-hour markets -> btc_1_hour_table
-    db_1h = OrderbookDatabase(use_btc_1_hour_table=True)
+    db_1h = OrderbookDatabase(use_btc_1_hour_table=True, index_profile=index_profile, sqlite_mode="ingest", partitioned=partitioned)
     logger.info("✓ Initialized database for BTC 1-hour markets (btc_1_hour_table)")
     
     # Create monitor
@@ -583,5 +593,6 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    metrics.start_metrics_server_from_env()  # Serves /metrics when METRICS_PORT is set
+    asyncio.run(metrics.run_with_loop_lag_monitor(main()))
 
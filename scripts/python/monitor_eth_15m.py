@@ -192,9 +192,9 @@ class ETH15mMonitor:
                 else:
                     # Add new subscriptions to existing stream
                     if self.logger_service.stream and self.logger_service.stream.websocket:
+                        self.logger_service.market_info.update(market_info)
+                        await self.logger_service.stream.subscribe_to_orderbooks(token_ids)
                         for token_id in token_ids:
-                            await self.logger_service.stream.subscribe_to_orderbook(token_id)
-                            self.logger_service.market_info.update(market_info)
                             if token_id not in self.logger_service.token_ids:
                                 self.logger_service.token_ids.append(token_id)
                         logger.info(f"Added {len(token_ids)} new subscriptions to WebSocket")
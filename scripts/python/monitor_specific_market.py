@@ -24,6 +24,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 from agents.polymarket.orderbook_db import OrderbookDatabase
 from agents.polymarket.orderbook_poller import OrderbookPoller
 from agents.polymarket.market_finder import get_token_ids_from_market, get_market_info_for_logging
+from agents.polymarket.market_cache import get_market_cache
 import httpx
 import ast
 import asyncio
@@ -77,17 +78,6 @@ def get_orderbook_direct(token_id: str):
     return None
 
 
-def get_market_by_id(market_id: str) -> dict:
-    """Get market by ID."""
-    markets_url = f"https://gamma-api.polymarket.com/markets/{market_id}"
-    response = httpx.get(markets_url)
-    
-    if response.status_code == 200:
-        return response.json()
-    
-    return None
-
-
 async def monitor_markets(event_slugs: List[str], market_ids: List[str]):
     """Monitor specific markets/events."""
     db = OrderbookDatabase()
@@ -117,7 +107,7 @@ async def monitor_markets(event_slugs: List[str], market_ids: List[str]):
     # Process market IDs
     for market_id in market_ids:
         logger.info(f"Fetching market with ID: {market_id}")
-        market = get_market_by_id(market_id)
+        market = get_market_cache().get_market_by_id(market_id)
         
         if not market:
             logger.error(f"Could not find market with ID: {market_id}")
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
-Query historical orderbook data for BTC 15-minute markets.
+Query historical orderbook data for BTC markets.
+
+Snapshots are read from whichever tables hold the market or token (btc_15_min_table,
+btc_1_hour_table, btc_eth_table, per-market tables), resolved through the orderbook_routes
+catalog by UnifiedSnapshotQuery.
 
 This script allows you to:
 1. Query orderbook snapshots at different timesteps for a historical market
@@ -19,6 +23,9 @@ Usage:
     
     # Export to CSV for analysis:
     python scripts/python/query_btc_market_orderbooks.py --market MARKET_ID --export orderbooks.csv
+    
+    # Index a database logged before the routing catalog existed (once):
+    python scripts/python/query_btc_market_orderbooks.py --rebuild-routes
 """
 import argparse
 import sys
@@ -30,7 +37,9 @@ import json
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 
 import httpx
-from agents.polymarket.orderbook_query import OrderbookQuery, get_market_token_ids
+from agents.polymarket.orderbook_db import OrderbookDatabase
+from agents.polymarket.orderbook_query import get_market_token_ids
+from agents.polymarket.orderbook_routing import UnifiedSnapshotQuery
 from agents.backtesting.market_fetcher import HistoricalMarketFetcher
 
 try:
@@ -107,7 +116,7 @@ def get_market_info(market_id: str) -> dict:
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Query historical orderbook data for BTC 15-minute markets",
+        description="Query historical orderbook data for BTC markets",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
@@ -132,8 +141,16 @@ Examples:
     parser.add_argument("--show-all-levels", action="store_true", help="Show all orderbook levels (not just top 10)")
     parser.add_argument("--export", help="Export to CSV file")
     parser.add_argument("--db-path", help="Path to SQLite database (default: uses DATABASE_URL env var)")
+    parser.add_argument("--rebuild-routes", action="store_true",
+                        help="Index existing snapshots into the orderbook_routes catalog and exit")
     
     args = parser.parse_args()
+    database_url = f"sqlite:///{args.db_path}" if args.db_path else None
+    
+    if args.rebuild_routes:
+        routes = UnifiedSnapshotQuery(db=OrderbookDatabase(database_url=database_url)).rebuild_routes()
+        print(f"✓ Indexed {routes} token route(s)")
+        return
     
     if not args.market and not args.token:
         parser.error("Must provide either --market or --token")
@@ -150,10 +167,8 @@ Examples:
     if args.at_time:
         at_time = datetime.fromisoformat(args.at_time.replace("Z", "+00:00"))
     
-    # Initialize query - use btc_eth_table like monitor_btc_15m.py does
-    from agents.polymarket.orderbook_db import OrderbookDatabase
-    db = OrderbookDatabase(use_btc_eth_table=True)
-    query = OrderbookQuery(db=db)
+    # One query layer over every snapshot table (routes to the tables holding the market)
+    query = UnifiedSnapshotQuery(database_url=database_url)
     
     # Get token IDs if market ID provided
     token_ids = []
@@ -161,19 +176,16 @@ Examples:
         # First try to get token IDs from database (works for closed markets)
         print(f"Looking for token IDs in database for market {args.market}...")
         try:
-            snapshots_with_market = query.get_snapshots(market_id=args.market, limit=100)
-            print(f"  Query returned {len(snapshots_with_market)} snapshots")
-            if snapshots_with_market:
-                token_ids = list(set(s.token_id for s in snapshots_with_market))
+            token_ids = query.token_ids(args.market)
+            if token_ids:
                 print(f"✓ Found {len(token_ids)} token ID(s) in database: {token_ids}")
-                print(f"  Found {len(snapshots_with_market)} snapshots for this market")
+                print(f"  Tables: {', '.join(query.tables_for(market_id=args.market))}")
             else:
                 print(f"  No snapshots found in database for market {args.market}")
         except Exception as e:
             print(f"  Error querying database: {e}")
-            snapshots_with_market = []
         
-        if not snapshots_with_market:
+        if not token_ids:
             # Fallback: try API (may fail for closed markets)
             print(f"Not found in database, trying API...")
             try:
@@ -198,26 +210,26 @@ Examples:
     
     # Query orderbooks
     all_snapshots = []
-    for token_id in token_ids:
-        if at_time:
-            # Get snapshot at specific time
-            snapshot = query.get_orderbook_at_time(
+    if at_time:
+        for token_id in token_ids:
+            # Get snapshot closest to the specific time (within 60 seconds)
+            nearby = query.get_snapshots(
                 token_id=token_id,
-                target_time=at_time,
-                tolerance_seconds=60,
+                start_time=at_time - timedelta(seconds=60),
+                end_time=at_time + timedelta(seconds=60),
             )
-            if snapshot:
-                all_snapshots.append(snapshot)
-        else:
-            # Get snapshots in time range
-            snapshots = query.get_snapshots(
-                token_id=token_id,
-                market_id=args.market,
-                start_time=start_time,
-                end_time=end_time,
-                limit=args.limit,
-            )
-            all_snapshots.extend(snapshots)
+            target = at_time.replace(tzinfo=None) if at_time.tzinfo else at_time
+            if nearby:
+                all_snapshots.append(min(nearby, key=lambda s: abs((s.timestamp - target).total_seconds())))
+    else:
+        # Get snapshots in time range (all tokens and tables in one query)
+        all_snapshots = query.get_snapshots(
+            token_id=args.token,
+            market_id=args.market,
+            start_time=start_time,
+            end_time=end_time,
+            limit=args.limit,
+        )
     
     if not all_snapshots:
         print("\n⚠️  No orderbook snapshots found!")
@@ -241,8 +253,8 @@ Examples:
             return
         
         # Export to CSV
-        df = query.get_snapshots_dataframe(
-            token_id=token_ids[0] if len(token_ids) == 1 else None,
+        df = query.frame(
+            token_id=args.token,
             market_id=args.market,
             start_time=start_time,
             end_time=end_time,
@@ -13,11 +13,14 @@ Usage:
     
     # Get statistics:
     python scripts/python/query_orderbook.py --token TOKEN_ID --stats
+    
+    # Current book of every token (latest_orderbook):
+    python scripts/python/query_orderbook.py --latest [--market MARKET_ID]
 """
 import argparse
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
@@ -68,6 +71,21 @@ def main():
         action="store_true",
         help="Show statistics",
     )
+    parser.add_argument(
+        "--by-outcome",
+        action="store_true",
+        help="With --stats: also break statistics down per outcome",
+    )
+    parser.add_argument(
+        "--bucket-seconds",
+        type=int,
+        help="With --stats: also break statistics down per time bucket of this many seconds",
+    )
+    parser.add_argument(
+        "--latest",
+        action="store_true",
+        help="Show the current book per token (from latest_orderbook) instead of history",
+    )
     parser.add_argument(
         "--export",
         help="Export to CSV file",
@@ -79,7 +97,7 @@ def main():
     
     args = parser.parse_args()
     
-    if not args.token and not args.market:
+    if not args.token and not args.market and not args.latest:
         parser.error("Must provide either --token or --market")
     
     # Parse time arguments
@@ -92,6 +110,18 @@ def main():
     
     query = OrderbookQuery(db_path=args.db_path)
     
+    if args.latest:
+        books = query.get_latest_books(market_id=args.market)
+        if args.token:
+            books = {token_id: book for token_id, book in books.items() if token_id == args.token}
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        print(f"{len(books)} current book(s)")
+        for token_id, book in sorted(books.items(), key=lambda item: item[1]["updated_at"], reverse=True):
+            age = (now - book["updated_at"]).total_seconds()
+            print(f"  {token_id[:30]:30s} market {book['market_id']}  bid {book['best_bid_price']}  "
+                  f"ask {book['best_ask_price']}  at {book['timestamp']}  ({age:.0f}s ago, {book['source_table']})")
+        return
+    
     # Get snapshots
     snapshots = query.get_snapshots(
         token_id=args.token,
@@ -109,18 +139,32 @@ def main():
     
     # Handle different output modes
     if args.stats:
-        if not args.token:
-            print("Statistics require --token")
+        if not args.token and not args.market:
+            print("Statistics require --token or --market")
             return
         
         stats = query.get_statistics(
             token_id=args.token,
             start_time=start_time,
             end_time=end_time,
+            market_id=args.market,
+            by_outcome=args.by_outcome,
+            bucket_seconds=args.bucket_seconds,
         )
+        by_outcome = stats.pop("by_outcome", {})
+        buckets = stats.pop("buckets", [])
         print("\nStatistics:")
         for key, value in stats.items():
             print(f"  {key}: {value}")
+        for outcome, outcome_stats in by_outcome.items():
+            print(f"\n  {outcome}:")
+            for key, value in outcome_stats.items():
+                print(f"    {key}: {value}")
+        if buckets:
+            print("\n  bucket_start                 count  avg_spread  avg_spread_bps  avg_mid_price")
+            for bucket in buckets:
+                print(f"  {bucket['bucket_start'].isoformat():28s} {bucket['count']:6d}  {bucket['avg_spread'] or 0:10.4f}"
+                      f"  {bucket['avg_spread_bps'] or 0:14.1f}  {bucket['avg_mid_price'] or 0:13.4f}")
     
     elif args.spread_history:
         if not args.token:
@@ -0,0 +1,142 @@
+"""
+Record and replay raw CLOB websocket frames for offline load testing.
+
+Record live market channel frames for a set of tokens:
+    python scripts/python/replay_websocket_frames.py record --token TOKEN_ID1 --token TOKEN_ID2 \
+        --seconds 120 --out frames/btc_open.jsonl.gz
+
+Serve a recording on a local websocket (point any service at it with ws_url=...):
+    python scripts/python/replay_websocket_frames.py serve frames/btc_open.jsonl.gz --speed 10 --port 8765
+
+Replay into WebSocketOrderbookService and measure cache update throughput
+(--speed 0 = as fast as possible):
+    python scripts/python/replay_websocket_frames.py bench frames/btc_open.jsonl.gz --speed 0
+"""
+import asyncio
+import argparse
+import logging
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    force=True
+)
+logger = logging.getLogger(__name__)
+
+from agents.utils import json_codec
+from agents.utils.frame_recorder import FrameReplayServer, read_frames
+from agents.trading.websocket_orderbook_service import WebSocketOrderbookService
+
+
+def tokens_in_recording(path: str) -> list:
+    """Asset ids that appear in book / price_change frames of a recording."""
+    tokens = set()
+    for _, _, frame in read_frames(path, channel="market"):
+        try:
+            events = json_codec.decode_market_events(frame)
+        except ValueError:
+            continue
+        for event in events or []:
+            tokens.add(event.asset_id)
+    return sorted(tokens)
+
+
+async def record(args):
+    service = WebSocketOrderbookService(record_path=args.out)
+    await service.start()
+    service.subscribe_tokens(args.token)
+    logger.info(f"Recording {len(args.token)} tokens for {args.seconds}s...")
+    try:
+        await asyncio.sleep(args.seconds)
+    finally:
+        await service.stop()
+
+
+async def serve(args):
+    server = FrameReplayServer(args.path, host=args.host, port=args.port, speed=args.speed)
+    await server.start()
+    logger.info(f"Serving on {server.url} - Ctrl+C to stop")
+    try:
+        await asyncio.Future()
+    finally:
+        await server.stop()
+
+
+async def bench(args):
+    server = FrameReplayServer(args.path, speed=args.speed, channel="market")
+    await server.start()
+    total_frames = len(server.frames)
+    tokens = tokens_in_recording(args.path)
+
+    service = WebSocketOrderbookService(ws_url=server.url)
+    handled = 0
+    handle_seconds = 0.0
+    all_handled = asyncio.Event()
+    original_handle = service._handle_message
+
+    async def counting_handle(message):
+        nonlocal handled, handle_seconds
+        start = time.perf_counter()
+        await original_handle(message)
+        handle_seconds += time.perf_counter() - start
+        handled += 1
+        if handled >= total_frames:
+            all_handled.set()
+
+    service._handle_message = counting_handle
+
+    await service.start()
+    service.subscribe_tokens(tokens)
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(all_handled.wait(), timeout=args.timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"⚠️ Timed out after {args.timeout}s ({handled}/{total_frames} frames handled)")
+    elapsed = time.perf_counter() - start
+    await service.stop()
+    await server.stop()
+
+    cached = sum(1 for token in tokens if service.get_orderbook(token))
+    print()
+    print(f"Frames replayed:     {handled}/{total_frames} ({len(tokens)} tokens)")
+    print(f"Wall time:           {elapsed:.2f}s ({handled / elapsed if elapsed else 0:,.0f} frames/s end to end)")
+    print(f"Handler time:        {handle_seconds:.2f}s ({handled / handle_seconds if handle_seconds else 0:,.0f} frames/s in _handle_message)")
+    print(f"Tokens with a book:  {cached}/{len(tokens)}")
+    print(f"JSON codec backend:  {json_codec.BACKEND}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay raw CLOB websocket frames")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Record live market channel frames")
+    record_parser.add_argument("--token", action="append", required=True, help="Token ID (repeatable)")
+    record_parser.add_argument("--seconds", type=float, default=60.0, help="Recording duration")
+    record_parser.add_argument("--out", required=True, help="Output file (.jsonl.gz)")
+
+    serve_parser = subparsers.add_parser("serve", help="Serve a recording on a local websocket")
+    serve_parser.add_argument("path", help="Recording file")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--speed", type=float, default=1.0, help="Speed multiplier (0 = max)")
+
+    bench_parser = subparsers.add_parser("bench", help="Replay into WebSocketOrderbookService and time it")
+    bench_parser.add_argument("path", help="Recording file")
+    bench_parser.add_argument("--speed", type=float, default=0.0, help="Speed multiplier (0 = max)")
+    bench_parser.add_argument("--timeout", type=float, default=300.0, help="Give up after this many seconds")
+
+    args = parser.parse_args()
+    command = {"record": record, "serve": serve, "bench": bench}[args.command]
+    try:
+        asyncio.run(command(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Test script for the in-memory TradeStore with write-behind journal.
+
+Uses a throwaway SQLite database and journal in a temp directory. Checks that:
+- Reads reflect updates immediately (before the database flush)
+- Updates reach the database after flush()
+- Journaled updates that were never flushed are recovered on restart
+- Per-process journals: a dead process's journal is replayed, a live one is left alone
+- Resolved outcomes still only in the journal are visible to principal reads
+"""
+import sys
+import os
+import json
+import fcntl
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from agents.trading.trade_db import TradeDatabase
+from agents.trading.trade_store import TradeStore
+
+
+def create_test_trade(store: TradeStore) -> int:
+    return store.create_trade(
+        deployment_id="test-deployment-store",
+        threshold=0.40,
+        margin=0.02,
+        kelly_fraction=0.25,
+        kelly_scale_factor=1.0,
+        market_type="15m",
+        market_id="test-market-123",
+        market_slug="test-market-slug",
+        token_id="test-token-yes",
+        order_id="test-order-123",
+        order_price=0.42,
+        order_size=10.0,
+        order_side="YES",
+        principal_before=100.0,
+        order_status="open",
+    )
+
+
+def test_trade_store():
+    print("Testing trade store...")
+    print()
+
+    tmp_dir = tempfile.mkdtemp()
+    database_url = f"sqlite:///{os.path.join(tmp_dir, 'trades.db')}"
+    journal_path = os.path.join(tmp_dir, "trade_journal.jsonl")
+
+    # Long flush interval so nothing is flushed in the background during the test
+    store = TradeStore(TradeDatabase(database_url), journal_path=journal_path, flush_interval=3600)
+    trade_id = create_test_trade(store)
+    print(f"1. Created trade {trade_id}")
+
+    store.update_trade_fill(trade_id, filled_shares=10.0, fill_price=0.42, dollars_spent=4.2, fee=0.05)
+    trade = store.get_trade_by_id(trade_id)
+    assert trade.order_status == "filled", trade.order_status
+    assert store.get_open_trades() == []
+    print("2. ✓ Fill visible in memory immediately")
+
+    db_trade = store.db.get_trade_by_id(trade_id)
+    assert db_trade.order_status == "open", db_trade.order_status
+    assert store.pending_count() == 1
+    print("3. ✓ Database not yet updated (write-behind)")
+
+    store.flush()
+    db_trade = store.db.get_trade_by_id(trade_id)
+    assert db_trade.order_status == "filled", db_trade.order_status
+    assert store.pending_count() == 0
+    print("4. ✓ Database updated after flush")
+
+    # Simulate a crash: journal an update, then abandon the store without flushing
+    store.update_sell_order(trade_id, sell_order_id="sell-1", sell_order_price=0.99, sell_order_size=10.0)
+    store._write_journal()  # What the writer thread does right after the update
+    store._stop_event.set()
+    store._wake.set()
+    store._flush_thread.join()
+    store._journal.close()
+    assert store.db.get_trade_by_id(trade_id).sell_order_id is None
+    print("5. Simulated crash with 1 unflushed update")
+
+    recovered = TradeStore(TradeDatabase(database_url), journal_path=journal_path, flush_interval=3600)
+    assert recovered.get_trade_by_id(trade_id).sell_order_id == "sell-1"
+    assert recovered.db.get_trade_by_id(trade_id).sell_order_id == "sell-1"
+    assert len(recovered.get_open_sell_orders()) == 1
+    print("6. ✓ Unflushed update recovered from journal on restart")
+
+    recovered.update_trade_outcome(
+        trade_id, outcome_price=1.0, payout=10.0, net_payout=5.75, roi=1.3,
+        is_win=True, principal_after=105.75,
+    )
+    assert recovered.db.get_latest_principal() is None
+    assert recovered.get_latest_principal() == 105.75
+    assert recovered.get_latest_resolved_trade().id == trade_id
+    recovered.close()
+    print("7. ✓ Unflushed outcome visible to principal reads")
+
+    # Per-process journals: one left by a dead process, one held by a live process
+    journal_dir = os.path.join(tmp_dir, "journals")
+    os.makedirs(journal_dir)
+    dead_path = os.path.join(journal_dir, "threshold.999999991.jsonl")
+    with open(dead_path, "w") as f:
+        f.write(json.dumps({"seq": 1, "trade_id": trade_id, "fields": {"error_message": "from dead process"}}) + "\n")
+    live_path = os.path.join(journal_dir, "threshold.999999992.jsonl")
+    live = open(live_path, "a")
+    fcntl.flock(live.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    live.write(json.dumps({"seq": 1, "trade_id": trade_id, "fields": {"error_message": "from live process"}}) + "\n")
+    live.flush()
+
+    store = TradeStore(TradeDatabase(database_url), journal_dir=journal_dir, flush_interval=3600)
+    assert store.db.get_trade_by_id(trade_id).error_message == "from dead process"
+    assert not os.path.exists(dead_path)
+    assert os.path.getsize(live_path) > 0
+    assert os.path.exists(store.journal_path)
+    store.close()
+    live.close()
+    assert not os.path.exists(store.journal_path)
+    print("8. ✓ Dead process journal replayed, live process journal untouched")
+
+    print()
+    print("✅ All trade store checks passed")
+
+
+if __name__ == "__main__":
+    test_trade_store()
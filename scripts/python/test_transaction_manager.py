@@ -0,0 +1,192 @@
+"""
+Test script for the non-blocking TransactionManager.
+
+Runs against a local chain (no real funds):
+- eth-tester (default): pip install "web3[tester]"
+- anvil: start `anvil` and pass --rpc-url http://127.0.0.1:8545
+
+Sends several transfers concurrently from one wallet - from the event loop and,
+interleaved with them, blocking send_and_wait_sync() calls from worker threads (the
+path Polymarket's approval/split/merge methods take) - and checks that every
+transaction gets a distinct nonce and a successful receipt.
+
+Also covers managers built outside the loop they send on (Python 3.9 binds asyncio
+primitives at construction): one built before asyncio.run, like MarketMaker does, and
+one built on a worker thread with no event loop, like the first approval sent from an
+RPC pool thread.
+
+Usage:
+    python scripts/python/test_transaction_manager.py
+    python scripts/python/test_transaction_manager.py --rpc-url http://127.0.0.1:8545 --count 20
+"""
+import sys
+import os
+import argparse
+import asyncio
+import logging
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from web3 import Web3
+
+from agents.polymarket.transaction_manager import TransactionManager
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Default first anvil account (well-known test key, never holds real funds)
+ANVIL_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+def connect(rpc_url: str = None):
+    """Return (web3, private_key) for eth-tester or an anvil node."""
+    if rpc_url:
+        w3 = Web3(Web3.HTTPProvider(rpc_url))
+        return w3, ANVIL_PRIVATE_KEY
+
+    from eth_tester import EthereumTester, PyEVMBackend
+
+    backend = PyEVMBackend()
+    w3 = Web3(Web3.EthereumTesterProvider(EthereumTester(backend)))
+    private_key = backend.account_keys[0].to_hex()
+    return w3, private_key
+
+
+async def run_test(rpc_url: str = None, count: int = 10) -> bool:
+    print("=" * 70)
+    print("Testing TransactionManager (concurrent sends from one wallet)")
+    print("=" * 70)
+
+    w3, private_key = connect(rpc_url)
+    chain_id = w3.eth.chain_id
+    tx_manager = TransactionManager(w3, private_key, chain_id, receipt_poll_interval=0.2)
+    recipient = w3.eth.account.create().address
+
+    sync_count = count // 2
+
+    start = time.monotonic()
+    sync_receipts = asyncio.gather(*(
+        asyncio.to_thread(
+            tx_manager.send_and_wait_sync,
+            {"to": recipient, "value": 1000 + i},
+            gas=21000,
+            description=f"sync transfer {i}",
+        )
+        for i in range(sync_count)
+    ))
+    pending = await asyncio.gather(*(
+        tx_manager.submit(
+            {"to": recipient, "value": 1000 + i},
+            gas=21000,
+            description=f"transfer {i}",
+        )
+        for i in range(sync_count, count)
+    ))
+    submitted_in = time.monotonic() - start
+    receipts = list(await sync_receipts) + list(await asyncio.gather(*(p.future for p in pending)))
+    confirmed_in = time.monotonic() - start
+    await tx_manager.close()
+
+    ok = check_receipts(w3, receipts, recipient, sum(1000 + i for i in range(count)))
+    print(f"\nSubmitted in {submitted_in:.2f}s, all confirmed in {confirmed_in:.2f}s")
+    return ok
+
+
+def check_receipts(w3, receipts, recipient: str, expected_balance: int) -> bool:
+    """Distinct nonces, successful receipts and the recipient balance they add up to."""
+    count = len(receipts)
+    nonces = [w3.eth.get_transaction(r["transactionHash"])["nonce"] for r in receipts]
+    ok = True
+    if len(set(nonces)) != count:
+        print(f"✗ Duplicate nonces: {sorted(nonces)}")
+        ok = False
+    else:
+        print(f"✓ {count} distinct nonces: {min(nonces)}..{max(nonces)}")
+
+    failed = [r for r in receipts if r.get("status") != 1]
+    if failed:
+        print(f"✗ {len(failed)} transactions failed")
+        ok = False
+    else:
+        print(f"✓ {count} successful receipts")
+
+    balance = w3.eth.get_balance(recipient)
+    if balance != expected_balance:
+        print(f"✗ Recipient balance {balance} != expected {expected_balance}")
+        ok = False
+    else:
+        print(f"✓ Recipient balance {balance} wei")
+    return ok
+
+
+def run_prebuilt_test(rpc_url: str = None, count: int = 3) -> bool:
+    """Manager constructed before asyncio.run, then concurrent send_and_wait calls inside it."""
+    print("\n" + "=" * 70)
+    print("Testing TransactionManager built before asyncio.run (concurrent send_and_wait)")
+    print("=" * 70)
+
+    w3, private_key = connect(rpc_url)
+    tx_manager = TransactionManager(w3, private_key, w3.eth.chain_id, receipt_poll_interval=0.2)
+    recipient = w3.eth.account.create().address
+
+    async def send_all():
+        try:
+            return await asyncio.gather(*(
+                tx_manager.send_and_wait({"to": recipient, "value": 2000 + i}, gas=21000,
+                                         description=f"prebuilt transfer {i}")
+                for i in range(count)
+            ))
+        finally:
+            await tx_manager.close()
+
+    receipts = asyncio.run(send_all())
+    return check_receipts(w3, receipts, recipient, sum(2000 + i for i in range(count)))
+
+
+def run_worker_thread_test(rpc_url: str = None) -> bool:
+    """Manager constructed and used from a worker thread that has no event loop."""
+    print("\n" + "=" * 70)
+    print("Testing TransactionManager built on a worker thread (send_and_wait_sync)")
+    print("=" * 70)
+
+    w3, private_key = connect(rpc_url)
+    recipient = w3.eth.account.create().address
+    result = {}
+
+    def worker():
+        try:
+            tx_manager = TransactionManager(w3, private_key, w3.eth.chain_id, receipt_poll_interval=0.2)
+            result["receipt"] = tx_manager.send_and_wait_sync({"to": recipient, "value": 3000}, gas=21000,
+                                                              description="worker transfer")
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        print(f"✗ Worker thread send failed: {result['error']!r}")
+        return False
+    return check_receipts(w3, [result["receipt"]], recipient, 3000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test TransactionManager against a local chain")
+    parser.add_argument("--rpc-url", default=None, help="Anvil RPC URL (default: in-process eth-tester)")
+    parser.add_argument("--count", type=int, default=10, help="Number of concurrent transactions")
+    args = parser.parse_args()
+
+    ok = asyncio.run(run_test(args.rpc_url, args.count))
+    ok = run_prebuilt_test(args.rpc_url) and ok
+    ok = run_worker_thread_test(args.rpc_url) and ok
+    print("\n" + ("✓ All checks passed" if ok else "✗ Some checks failed"))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,7 @@ load_dotenv()
 
 # Configure proxy BEFORE importing modules that use httpx/requests
 from agents.utils.proxy_config import configure_proxy, get_proxy
+from agents.utils import metrics
 configure_proxy(auto_detect=True)
 proxy_url = get_proxy()
 if proxy_url:
@@ -34,6 +35,7 @@ if proxy_url:
 
 from agents.trading.trade_db import TradeDatabase, RealTradeLimitBuy
 from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.async_polymarket import AsyncPolymarket
 from py_clob_client.order_builder.constants import SELL, BUY
 from py_clob_client.clob_types import OrderType
 from agents.polymarket.btc_market_detector import (
@@ -223,6 +225,7 @@ class LimitBuyTrader:
         self.config = LimitBuyConfig(config_path)
         self.db = TradeDatabase()
         self.pm = Polymarket()
+        self.async_pm = AsyncPolymarket(self.pm)
         
         # Generate deployment ID
         self.deployment_id = str(uuid.uuid4())
@@ -394,6 +397,8 @@ class LimitBuyTrader:
                         await task
                     except asyncio.CancelledError:
                         pass
+            
+            await self.async_pm.close()
     
     async def _resume_monitoring(self):
         """Resume monitoring markets we've bet on (for script restart recovery)."""
@@ -527,7 +532,7 @@ class LimitBuyTrader:
         yes_trade_id = None
         try:
             logger.info(f"Placing YES limit buy order: price=${self.config.yes_buy_price:.4f}, size={self.config.order_size}")
-            yes_order_response = self.pm.execute_order(
+            yes_order_response = await self.async_pm.execute_order(
                 price=self.config.yes_buy_price,
                 size=self.config.order_size,
                 side=BUY,
@@ -566,7 +571,7 @@ class LimitBuyTrader:
         no_trade_id = None
         try:
             logger.info(f"Placing NO limit buy order: price=${self.config.no_buy_price:.4f}, size={self.config.order_size}")
-            no_order_response = self.pm.execute_order(
+            no_order_response = await self.async_pm.execute_order(
                 price=self.config.no_buy_price,
                 size=self.config.order_size,
                 side=BUY,
@@ -767,7 +772,7 @@ class LimitBuyTrader:
                     continue
                 
                 logger.debug(f"  🔍 Checking sell order {sell_order_id[:10]}... (trade_id={trade_id})")
-                order_status = self.pm.get_order_status(sell_order_id)
+                order_status = await self.async_pm.get_order_status(sell_order_id)
                 if not order_status:
                     # Order not found - track retry count
                     retry_count = self.sell_orders_not_found.get(sell_order_id, 0)
@@ -863,7 +868,7 @@ class LimitBuyTrader:
         """Check if order is filled and handle accordingly."""
         try:
             logger.info(f"  🔍 Checking {side} order {order_id[:10]}... for market {market_slug} (trade_id={trade_id})")
-            order_status = self.pm.get_order_status(order_id)
+            order_status = await self.async_pm.get_order_status(order_id)
             if not order_status:
                 logger.warning(f"  ⚠️ No order status returned for {side} order {order_id[:10]}... (order may not exist or API error)")
                 return
@@ -918,7 +923,7 @@ class LimitBuyTrader:
                 # Cancel the other order if it exists
                 if other_order_id:
                     logger.info(f"Cancelling {('NO' if side == 'YES' else 'YES')} order {other_order_id}")
-                    cancel_response = self.pm.cancel_order(other_order_id)
+                    cancel_response = await self.async_pm.cancel_order(other_order_id)
                     if cancel_response:
                         logger.info(f"✅ Cancelled {('NO' if side == 'YES' else 'YES')} order {other_order_id}")
                         if other_trade_id:
@@ -972,7 +977,7 @@ class LimitBuyTrader:
         logger.info("🔍 Pre-flight check: Verifying conditional token allowances before placing sell order...")
         if hasattr(self.pm, 'ensure_conditional_token_allowances'):
             try:
-                allowances_ok = self.pm.ensure_conditional_token_allowances()
+                allowances_ok = await self.async_pm.ensure_conditional_token_allowances()
                 if allowances_ok:
                     logger.info("✅ Conditional token allowances verified - ready to place sell order")
                 else:
@@ -1011,13 +1016,13 @@ class LimitBuyTrader:
                     try:
                         # First check direct wallet (where execute_order expects shares for SELL)
                         direct_wallet = self.pm.get_address_for_private_key()
-                        balance = self.pm.get_conditional_token_balance(trade.token_id, wallet_address=direct_wallet)
+                        balance = await self.async_pm.get_conditional_token_balance(trade.token_id, wallet_address=direct_wallet)
                         logger.info(f"  📊 Direct wallet balance: {balance:.6f} shares" if balance is not None else "  📊 Direct wallet balance: None")
                         
                         # If no balance in direct wallet and proxy wallet exists, check proxy wallet too
                         if (balance is None or balance == 0) and self.pm.proxy_wallet_address:
                             logger.info(f"  🔍 No balance in direct wallet, checking proxy wallet...")
-                            proxy_balance = self.pm.get_conditional_token_balance(trade.token_id, wallet_address=self.pm.proxy_wallet_address)
+                            proxy_balance = await self.async_pm.get_conditional_token_balance(trade.token_id, wallet_address=self.pm.proxy_wallet_address)
                             logger.info(f"  📊 Proxy wallet balance: {proxy_balance:.6f} shares" if proxy_balance is not None else "  📊 Proxy wallet balance: None")
                             if proxy_balance and proxy_balance > 0:
                                 logger.warning(
@@ -1053,7 +1058,7 @@ class LimitBuyTrader:
                     if hasattr(self.pm, 'ensure_conditional_token_allowances'):
                         try:
                             logger.info(f"  🔧 Calling ensure_conditional_token_allowances()...")
-                            allowances_ok = self.pm.ensure_conditional_token_allowances()
+                            allowances_ok = await self.async_pm.ensure_conditional_token_allowances()
                             logger.info(f"  📊 ensure_conditional_token_allowances() returned: {allowances_ok}")
                             if not allowances_ok:
                                 logger.warning(
@@ -1140,7 +1145,7 @@ class LimitBuyTrader:
                         f"size={sell_size_int} shares (filled_shares={trade.filled_shares}, {balance_info})"
                     )
                 
-                sell_order_response = self.pm.execute_order(
+                sell_order_response = await self.async_pm.execute_order(
                     price=self.config.sell_price,
                     size=sell_size_int,
                     side=SELL,
@@ -1155,7 +1160,7 @@ class LimitBuyTrader:
                         logger.info(f"  🔍 Verifying sell order {sell_order_id} exists...")
                         await asyncio.sleep(2.0)  # Wait for order to propagate
                         
-                        order_status = self.pm.get_order_status(sell_order_id)
+                        order_status = await self.async_pm.get_order_status(sell_order_id)
                         if not order_status:
                             logger.warning(
                                 f"  ⚠️ Sell order {sell_order_id} not found in API after placement. "
@@ -1273,7 +1278,7 @@ class LimitBuyTrader:
                 # Cancel both orders
                 if yes_order_id:
                     logger.info(f"Cancelling YES order {yes_order_id}")
-                    cancel_response = self.pm.cancel_order(yes_order_id)
+                    cancel_response = await self.async_pm.cancel_order(yes_order_id)
                     if cancel_response:
                         logger.info(f"✅ Cancelled YES order {yes_order_id}")
                         yes_trade_id = order_info.get("yes_trade_id")
@@ -1285,7 +1290,7 @@ class LimitBuyTrader:
                 
                 if no_order_id:
                     logger.info(f"Cancelling NO order {no_order_id}")
-                    cancel_response = self.pm.cancel_order(no_order_id)
+                    cancel_response = await self.async_pm.cancel_order(no_order_id)
                     if cancel_response:
                         logger.info(f"✅ Cancelled NO order {no_order_id}")
                         no_trade_id = order_info.get("no_trade_id")
@@ -1352,7 +1357,7 @@ class LimitBuyTrader:
                 # Quick status check - skip if already filled
                 # For cancelled orders, we'll still try to place a new sell if threshold reached
                 # (cancellation might have happened externally, but we still hold shares)
-                order_status = self.pm.get_order_status(sell_order_id)
+                order_status = await self.async_pm.get_order_status(sell_order_id)
                 order_already_cancelled = False
                 if order_status:
                     status, filled_amount, total_amount = parse_order_status(order_status)
@@ -1447,7 +1452,7 @@ class LimitBuyTrader:
                     cancel_response = False
                     if not order_already_cancelled:
                         logger.info(f"🔄 Attempting to cancel original limit sell order {sell_order_id}...")
-                        cancel_response = self.pm.cancel_order(sell_order_id)
+                        cancel_response = await self.async_pm.cancel_order(sell_order_id)
                     else:
                         logger.info(
                             f"⏭️ Skipping cancellation - order {sell_order_id[:10]}... is already cancelled. "
@@ -1565,7 +1570,7 @@ class LimitBuyTrader:
                 # Verify sell orders actually exist
                 for trade in trades_with_invalid_sell:
                     if trade.sell_order_id:
-                        order_status = self.pm.get_order_status(trade.sell_order_id)
+                        order_status = await self.async_pm.get_order_status(trade.sell_order_id)
                         if not order_status:
                             # Order doesn't exist - add to retry list
                             logger.warning(
@@ -1634,7 +1639,7 @@ class LimitBuyTrader:
                     try:
                         # Check direct wallet first (where execute_order expects shares for SELL)
                         direct_wallet = self.pm.get_address_for_private_key()
-                        balance = self.pm.get_conditional_token_balance(
+                        balance = await self.async_pm.get_conditional_token_balance(
                             trade.token_id, 
                             wallet_address=direct_wallet,
                             retry_on_rate_limit=False  # Disable retries - outer loop handles retries
@@ -1643,7 +1648,7 @@ class LimitBuyTrader:
                         # If no balance in direct wallet and proxy wallet exists, check proxy wallet too
                         if (balance is None or balance == 0) and self.pm.proxy_wallet_address:
                             logger.info(f"  🔍 No balance in direct wallet, checking proxy wallet...")
-                            proxy_balance = self.pm.get_conditional_token_balance(
+                            proxy_balance = await self.async_pm.get_conditional_token_balance(
                                 trade.token_id, 
                                 wallet_address=self.pm.proxy_wallet_address,
                                 retry_on_rate_limit=False  # Disable retries - outer loop handles retries
@@ -1670,7 +1675,7 @@ class LimitBuyTrader:
                     logger.info("  🔍 Checking conditional token allowances before limit sell...")
                     if hasattr(self.pm, 'ensure_conditional_token_allowances'):
                         try:
-                            allowances_ok = self.pm.ensure_conditional_token_allowances()
+                            allowances_ok = await self.async_pm.ensure_conditional_token_allowances()
                             if allowances_ok:
                                 logger.info("  ✅ Conditional token allowances verified")
                             else:
@@ -1808,7 +1813,7 @@ class LimitBuyTrader:
                 
                 # Place limit sell order (GTC)
                 try:
-                    order_response = self.pm.execute_order(
+                    order_response = await self.async_pm.execute_order(
                         price=sell_price,
                         size=sell_size,
                         side=SELL,
@@ -2072,7 +2077,7 @@ class LimitBuyTrader:
             
             # Check sell order status via API
             if trade.sell_order_id:
-                order_status = self.pm.get_order_status(trade.sell_order_id)
+                order_status = await self.async_pm.get_order_status(trade.sell_order_id)
                 if order_status:
                     status, filled_amount, total_amount = parse_order_status(order_status)
                     is_filled = is_order_filled(status, filled_amount, total_amount)
@@ -2176,7 +2181,8 @@ def main():
     trader = LimitBuyTrader(args.config)
     
     try:
-        asyncio.run(trader.start())
+        metrics.start_metrics_server_from_env()  # Serves /metrics when METRICS_PORT is set
+        asyncio.run(metrics.run_with_loop_lag_monitor(trader.start()))
     except KeyboardInterrupt:
         logger.info("Shutting down...")
 
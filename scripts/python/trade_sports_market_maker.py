@@ -20,6 +20,7 @@ load_dotenv()
 
 # Configure proxy BEFORE importing modules that use httpx/requests
 from agents.utils.proxy_config import configure_proxy, get_proxy
+from agents.utils import metrics
 configure_proxy(auto_detect=True)
 proxy_url = get_proxy()
 if proxy_url:
@@ -70,7 +71,8 @@ def main():
     market_maker = SportsMarketMaker(args.config, proxy_url=proxy_url)
     
     try:
-        asyncio.run(market_maker.start())
+        metrics.start_metrics_server_from_env()  # Serves /metrics when METRICS_PORT is set
+        asyncio.run(metrics.run_with_loop_lag_monitor(market_maker.start()))
     except KeyboardInterrupt:
         logger.info("Sports market maker stopped by user")
     except Exception as e:
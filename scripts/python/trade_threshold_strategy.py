@@ -25,6 +25,7 @@ load_dotenv()
 # Configure proxy BEFORE importing modules that use httpx/requests
 # This ensures environment variables are set before ClobClient initializes
 from agents.utils.proxy_config import configure_proxy, get_proxy
+from agents.utils import metrics
 configure_proxy(auto_detect=True)
 proxy_url = get_proxy()
 if proxy_url:
@@ -32,6 +33,7 @@ if proxy_url:
     os.environ['HTTP_PROXY'] = proxy_url
 
 from agents.trading.trade_db import TradeDatabase, RealTradeThreshold
+from agents.trading.trade_store import TradeStore
 from agents.trading.config_loader import TradingConfig
 from agents.trading.orderbook_helper import (
     fetch_orderbook,
@@ -41,6 +43,7 @@ from agents.trading.orderbook_helper import (
     set_websocket_service,
 )
 from agents.polymarket.polymarket import Polymarket
+from agents.polymarket.async_polymarket import AsyncPolymarket
 from py_clob_client.order_builder.constants import SELL
 from agents.polymarket.btc_market_detector import (
     get_latest_btc_15m_market_proactive,
@@ -118,8 +121,10 @@ class ThresholdTrader:
             logger.warning("No proxy configured - trading requests may be blocked by Cloudflare")
         
         self.config = TradingConfig(config_path)
-        self.db = TradeDatabase()
+        # Reads served from memory; updates journaled and written to the DB in batches
+        self.db = TradeStore(TradeDatabase())
         self.pm = Polymarket()
+        self.async_pm = AsyncPolymarket(self.pm)
         self.market_fetcher = HistoricalMarketFetcher()
         
         # Generate deployment ID
@@ -183,9 +188,10 @@ class ThresholdTrader:
         self.websocket_service = None
         if self.config.use_websocket_orderbook:
             try:
-                from agents.trading.websocket_orderbook_service import WebSocketOrderbookService
+                from agents.trading.websocket_orderbook_service import create_websocket_orderbook_service
                 # Use module-level proxy_url (already configured)
-                self.websocket_service = WebSocketOrderbookService(
+                self.websocket_service = create_websocket_orderbook_service(
+                    num_connections=self.config.websocket_connections,
                     proxy_url=proxy_url,  # Use module-level proxy_url
                     health_check_timeout=self.config.websocket_health_check_timeout,
                     reconnect_delay=self.config.websocket_reconnect_delay,
@@ -224,6 +230,7 @@ class ThresholdTrader:
             place_early_sell_callback=self._place_early_sell_order,
             get_minutes_until_resolution=get_minutes_until_resolution,
             websocket_service=self.websocket_service,
+            async_pm=self.async_pm,
         )
         
         # Initialize OrderManager first (needed for WebSocket callbacks)
@@ -238,6 +245,7 @@ class ThresholdTrader:
             is_running=lambda: self.running,
             place_sell_order_callback=self._place_initial_sell_order,
             websocket_order_status_service=None,  # Will be set below
+            async_pm=self.async_pm,
         )
         
         # Initialize WebSocket order status service if enabled
@@ -289,7 +297,7 @@ class ThresholdTrader:
         
         # Check wallet balance
         try:
-            wallet_balance = self.pm.get_polymarket_balance()
+            wallet_balance = await self.async_pm.get_polymarket_balance()
             if wallet_balance is not None:
                 logger.info(f"Wallet balance: ${wallet_balance:.2f}")
                 amount_invested = self.config.get_amount_invested(self.principal)
@@ -442,6 +450,14 @@ class ThresholdTrader:
                         logger.error(f"Error cancelling task '{name}': {e}")
             
             logger.info("All tasks cancelled")
+            
+            await self.orderbook_monitor.close()
+            await self.order_manager.close()
+            await self.async_pm.close()
+            
+            # Write any journaled trade updates to the database before exiting
+            self.db.close()
+            logger.info("✓ Trade store flushed")
             sys.stdout.flush()
             sys.stderr.flush()
     
@@ -586,7 +602,7 @@ class ThresholdTrader:
                     if hasattr(self.pm, 'get_conditional_token_balance'):
                         logger.info(f"  🔍 Checking conditional token balance for token_id={trade.token_id}...")
                         try:
-                            balance = self.pm.get_conditional_token_balance(trade.token_id)
+                            balance = await self.async_pm.get_conditional_token_balance(trade.token_id)
                             logger.info(f"  📊 Balance check returned: {balance} (type: {type(balance)})")
                             if balance is not None:
                                 logger.info(
@@ -627,7 +643,7 @@ class ThresholdTrader:
                         logger.info("  🔍 Checking conditional token allowances (first attempt only)...")
                         if hasattr(self.pm, 'ensure_conditional_token_allowances'):
                             try:
-                                allowances_ok = self.pm.ensure_conditional_token_allowances()
+                                allowances_ok = await self.async_pm.ensure_conditional_token_allowances()
                                 if not allowances_ok:
                                     logger.warning(
                                         "  ⚠️ Conditional token allowances may not be set. "
@@ -693,7 +709,7 @@ class ThresholdTrader:
                         f"token_id={trade.token_id[:20]}..."
                     )
                     
-                    sell_order_response = self.pm.execute_order(
+                    sell_order_response = await self.async_pm.execute_order(
                         price=0.99,
                         size=sell_size_int,  # Use actual available balance
                         side=SELL,
@@ -805,20 +821,13 @@ class ThresholdTrader:
                                     sell_order_size=error_sell_size,
                                     sell_order_status="failed",
                                 )
-                                session = self.db.SessionLocal()
-                                try:
-                                    from agents.trading.trade_db import RealTradeThreshold
-                                    trade_obj = session.query(RealTradeThreshold).filter(
-                                        RealTradeThreshold.id == trade.id
-                                    ).first()
-                                    if trade_obj:
-                                        trade_obj.error_message = (
-                                            f"Sell order failed: minimum size {min_size_required} shares required, "
-                                            f"but only {balance:.6f} shares available (attempt {attempt + 1})"
-                                        )
-                                        session.commit()
-                                finally:
-                                    session.close()
+                                self.db.update_trade_fields(
+                                    trade.id,
+                                    error_message=(
+                                        f"Sell order failed: minimum size {min_size_required} shares required, "
+                                        f"but only {balance:.6f} shares available (attempt {attempt + 1})"
+                                    ),
+                                )
                             except Exception as db_error:
                                 logger.debug(f"Could not log minimum size error to database: {db_error}")
                             return  # Don't retry - we can't meet minimum size
@@ -871,17 +880,10 @@ class ThresholdTrader:
                             sell_order_status="failed",
                         )
                         # Update error message
-                        session = self.db.SessionLocal()
-                        try:
-                            from agents.trading.trade_db import RealTradeThreshold
-                            trade_obj = session.query(RealTradeThreshold).filter(
-                                RealTradeThreshold.id == trade.id
-                            ).first()
-                            if trade_obj:
-                                trade_obj.error_message = f"Sell order failed (attempt {attempt + 1}): {error_str}"
-                                session.commit()
-                        finally:
-                            session.close()
+                        self.db.update_trade_fields(
+                            trade.id,
+                            error_message=f"Sell order failed (attempt {attempt + 1}): {error_str}",
+                        )
                     except Exception as db_error:
                         logger.debug(f"Could not log error to database: {db_error}")
                         if attempt == max_retries - 1:
@@ -945,7 +947,7 @@ class ThresholdTrader:
                     f"Canceling existing sell order {trade.sell_order_id} at $0.99 "
                     f"before placing early sell at ${sell_price:.4f}"
                 )
-                cancel_response = self.pm.cancel_order(trade.sell_order_id)
+                cancel_response = await self.async_pm.cancel_order(trade.sell_order_id)
                 if cancel_response:
                     logger.info(
                         f"🚫 ORDER CANCELLED: Sell order {trade.sell_order_id} (trade {trade.id}, market {trade.market_slug}) "
@@ -956,20 +958,13 @@ class ThresholdTrader:
                     # Update database to mark as cancelled AND clear sell_order_id
                     # This prevents _place_initial_sell_order() from placing a new 0.99 order
                     # We'll set the new sell_order_id when we place the threshold sell order below
-                    session = self.db.SessionLocal()
                     try:
-                        trade_obj = session.query(RealTradeThreshold).filter_by(id=trade.id).first()
-                        if trade_obj:
-                            trade_obj.sell_order_status = "cancelled"
-                            trade_obj.sell_order_id = None  # Clear it so we can place new order
-                            session.commit()
-                            logger.debug(f"Updated database: cancelled sell order and cleared sell_order_id for trade {trade.id}")
-                            order_cancelled = True
+                        # Clear sell_order_id so we can place new order
+                        self.db.update_trade_fields(trade.id, sell_order_status="cancelled", sell_order_id=None)
+                        logger.debug(f"Updated database: cancelled sell order and cleared sell_order_id for trade {trade.id}")
+                        order_cancelled = True
                     except Exception as e:
-                        session.rollback()
                         logger.error(f"Error updating database after cancellation: {e}")
-                    finally:
-                        session.close()
                 else:
                     logger.warning(
                         f"❌ Failed to cancel sell order {trade.sell_order_id}. "
@@ -993,7 +988,7 @@ class ThresholdTrader:
             balance = None
             if hasattr(self.pm, 'get_conditional_token_balance'):
                 try:
-                    balance = self.pm.get_conditional_token_balance(trade.token_id)
+                    balance = await self.async_pm.get_conditional_token_balance(trade.token_id)
                     if balance is not None:
                         logger.info(
                             f"  📊 Balance check for early sell: {balance:.6f} shares available "
@@ -1062,7 +1057,7 @@ class ThresholdTrader:
                 f"  📤 Placing EARLY SELL order: price=${sell_price:.4f}, size={sell_size_int} shares "
                 f"(filled_shares={trade.filled_shares}, balance={balance_str})"
             )
-            sell_order_response = self.pm.execute_order(
+            sell_order_response = await self.async_pm.execute_order(
                 price=sell_price,
                 size=sell_size_int,  # Use actual available balance
                 side=SELL,
@@ -1218,7 +1213,7 @@ class ThresholdTrader:
                                 f"for trade {trade.id}, sell_order_id={trade.sell_order_id}"
                             )
                         
-                        order_status = self.pm.get_order_status(trade.sell_order_id)
+                        order_status = await self.async_pm.get_order_status(trade.sell_order_id)
                         if order_status:
                             # Parse order status using utility function
                             sell_order_api_status, sell_order_filled_amount, sell_order_total_amount = parse_order_status(order_status)
@@ -1253,23 +1248,19 @@ class ThresholdTrader:
                                         f"⚠️ Database says sell order is '{trade.sell_order_status}' but API says it's filled. "
                                         f"Updating database to match API."
                                     )
-                                    session = self.db.SessionLocal()
                                     try:
-                                        trade_obj = session.query(RealTradeThreshold).filter_by(id=trade.id).first()
-                                        if trade_obj:
-                                            trade_obj.sell_order_status = "filled"
-                                            trade_obj.sell_shares_filled = sell_shares_filled  # Update filled shares
-                                            # If we don't have sell_dollars_received, estimate it
-                                            if not trade_obj.sell_dollars_received and trade_obj.sell_order_price:
-                                                trade_obj.sell_dollars_received = sell_shares_filled * trade_obj.sell_order_price
-                                            session.commit()
-                                            # Reload trade object to get updated values
-                                            trade = self.db.get_trade_by_id(trade.id)
+                                        fields = {
+                                            "sell_order_status": "filled",
+                                            "sell_shares_filled": sell_shares_filled,  # Update filled shares
+                                        }
+                                        # If we don't have sell_dollars_received, estimate it
+                                        if not trade.sell_dollars_received and trade.sell_order_price:
+                                            fields["sell_dollars_received"] = sell_shares_filled * trade.sell_order_price
+                                        self.db.update_trade_fields(trade.id, **fields)
+                                        # Reload trade object to get updated values
+                                        trade = self.db.get_trade_by_id(trade.id)
                                     except Exception as e:
-                                        session.rollback()
                                         logger.error(f"Error updating sell order status from API: {e}")
-                                    finally:
-                                        session.close()
                                 
                                 # Remove from open_sell_orders so new trades can proceed
                                 self.open_sell_orders.pop(trade.sell_order_id, None)
@@ -1288,34 +1279,30 @@ class ThresholdTrader:
                                 )
                                 
                                 # Update database with partial fill information
-                                session = self.db.SessionLocal()
                                 try:
-                                    trade_obj = session.query(RealTradeThreshold).filter_by(id=trade.id).first()
-                                    if trade_obj:
-                                        # Update sell_shares_filled with current filled amount
-                                        trade_obj.sell_shares_filled = sell_order_filled_amount
-                                        trade_obj.sell_order_status = "partial"
-                                        # Update sell_dollars_received based on filled shares
-                                        if trade_obj.sell_order_price:
-                                            trade_obj.sell_dollars_received = sell_order_filled_amount * trade_obj.sell_order_price
-                                            # Recalculate sell_fee based on actual filled amount
-                                            from agents.backtesting.backtesting_utils import calculate_polymarket_fee
-                                            trade_obj.sell_fee = calculate_polymarket_fee(
-                                                trade_obj.sell_order_price, 
-                                                trade_obj.sell_dollars_received
-                                            )
-                                        session.commit()
-                                        # Reload trade object to get updated values
-                                        trade = self.db.get_trade_by_id(trade.id)
-                                        logger.info(
-                                            f"✅ Updated database: sell_shares_filled={sell_order_filled_amount}, "
-                                            f"status=partial"
+                                    # Update sell_shares_filled with current filled amount
+                                    fields = {
+                                        "sell_shares_filled": sell_order_filled_amount,
+                                        "sell_order_status": "partial",
+                                    }
+                                    # Update sell_dollars_received based on filled shares
+                                    if trade.sell_order_price:
+                                        fields["sell_dollars_received"] = sell_order_filled_amount * trade.sell_order_price
+                                        # Recalculate sell_fee based on actual filled amount
+                                        from agents.backtesting.backtesting_utils import calculate_polymarket_fee
+                                        fields["sell_fee"] = calculate_polymarket_fee(
+                                            trade.sell_order_price, 
+                                            fields["sell_dollars_received"]
                                         )
+                                    self.db.update_trade_fields(trade.id, **fields)
+                                    # Reload trade object to get updated values
+                                    trade = self.db.get_trade_by_id(trade.id)
+                                    logger.info(
+                                        f"✅ Updated database: sell_shares_filled={sell_order_filled_amount}, "
+                                        f"status=partial"
+                                    )
                                 except Exception as e:
-                                    session.rollback()
                                     logger.error(f"Error updating partial fill: {e}")
-                                finally:
-                                    session.close()
                                 
                                 # Retry a few more times (up to max_retries) to see if order fully fills
                                 # Only retry if we haven't exhausted all attempts
@@ -1352,7 +1339,7 @@ class ThresholdTrader:
                                         # Verify order belongs to this market
                                         order_belongs_to_market = False
                                         try:
-                                            order_status_check = self.pm.get_order_status(trade.sell_order_id)
+                                            order_status_check = await self.async_pm.get_order_status(trade.sell_order_id)
                                             if order_status_check:
                                                 order_market = order_status_check.get("market")
                                                 order_asset_id = order_status_check.get("asset_id")
@@ -1371,7 +1358,7 @@ class ThresholdTrader:
                                         
                                         if order_belongs_to_market:
                                             logger.info(f"🔄 Cancelling sell order {trade.sell_order_id} for market {trade.market_slug} via API...")
-                                            cancel_result = self.pm.cancel_order(trade.sell_order_id)
+                                            cancel_result = await self.async_pm.cancel_order(trade.sell_order_id)
                                             if cancel_result:
                                                 logger.info(
                                                     f"🚫 ORDER CANCELLED: Sell order {trade.sell_order_id} (trade {trade.id}, market {trade.market_slug}) "
@@ -1380,19 +1367,12 @@ class ThresholdTrader:
                                             else:
                                                 logger.warning(f"⚠️ Failed to cancel sell order {trade.sell_order_id} via API")
                                     # Update database to reflect that order is cancelled
-                                    session = self.db.SessionLocal()
                                     try:
-                                        trade_obj = session.query(RealTradeThreshold).filter_by(id=trade.id).first()
-                                        if trade_obj:
-                                            trade_obj.sell_order_status = "cancelled"
-                                            session.commit()
-                                            trade = self.db.get_trade_by_id(trade.id)
-                                            logger.info(f"✅ Updated database: sell order {trade.sell_order_id} marked as cancelled")
+                                        self.db.update_trade_fields(trade.id, sell_order_status="cancelled")
+                                        trade = self.db.get_trade_by_id(trade.id)
+                                        logger.info(f"✅ Updated database: sell order {trade.sell_order_id} marked as cancelled")
                                     except Exception as e:
-                                        session.rollback()
                                         logger.error(f"Error updating sell order status: {e}")
-                                    finally:
-                                        session.close()
                                     
                                     # Remove from open_sell_orders so new trades can proceed
                                     self.open_sell_orders.pop(trade.sell_order_id, None)
@@ -1414,19 +1394,12 @@ class ThresholdTrader:
                                     f"Market resolved - marking as cancelled to allow trading in next market."
                                 )
                                 # Update database to mark as cancelled
-                                session = self.db.SessionLocal()
                                 try:
-                                    trade_obj = session.query(RealTradeThreshold).filter_by(id=trade.id).first()
-                                    if trade_obj:
-                                        trade_obj.sell_order_status = "cancelled"
-                                        session.commit()
-                                        trade = self.db.get_trade_by_id(trade.id)
-                                        logger.info(f"✅ Updated database: sell order {trade.sell_order_id} marked as cancelled (not found in API)")
+                                    self.db.update_trade_fields(trade.id, sell_order_status="cancelled")
+                                    trade = self.db.get_trade_by_id(trade.id)
+                                    logger.info(f"✅ Updated database: sell order {trade.sell_order_id} marked as cancelled (not found in API)")
                                 except Exception as e:
-                                    session.rollback()
                                     logger.error(f"Error updating sell order status: {e}")
-                                finally:
-                                    session.close()
                                 
                                 # Remove from open_sell_orders so new trades can proceed
                                 self.open_sell_orders.pop(trade.sell_order_id, None)
@@ -1447,7 +1420,7 @@ class ThresholdTrader:
                 if not sell_order_filled_via_api and trade.sell_order_id:
                     # Final check: is the order still open?
                     try:
-                        final_order_status = self.pm.get_order_status(trade.sell_order_id)
+                        final_order_status = await self.async_pm.get_order_status(trade.sell_order_id)
                         if final_order_status:
                             final_status = final_order_status.get("status", "unknown")
                             if final_status in ["live", "LIVE", "open", "OPEN"]:
@@ -1468,26 +1441,19 @@ class ThresholdTrader:
                                         f"🔄 Market {trade.market_slug} resolved but sell order {trade.sell_order_id} is still open. "
                                         f"Cancelling to allow trading in next market..."
                                     )
-                                    cancel_result = self.pm.cancel_order(trade.sell_order_id)
+                                    cancel_result = await self.async_pm.cancel_order(trade.sell_order_id)
                                     if cancel_result:
                                         logger.info(f"✅ Successfully cancelled sell order {trade.sell_order_id} for market {trade.market_slug}")
                                     else:
                                         logger.warning(f"⚠️ Failed to cancel sell order {trade.sell_order_id} via API")
                                 
                                 # Update database
-                                session = self.db.SessionLocal()
                                 try:
-                                    trade_obj = session.query(RealTradeThreshold).filter_by(id=trade.id).first()
-                                    if trade_obj:
-                                        trade_obj.sell_order_status = "cancelled"
-                                        session.commit()
-                                        trade = self.db.get_trade_by_id(trade.id)
-                                        logger.info(f"✅ Updated database: sell order {trade.sell_order_id} marked as cancelled")
+                                    self.db.update_trade_fields(trade.id, sell_order_status="cancelled")
+                                    trade = self.db.get_trade_by_id(trade.id)
+                                    logger.info(f"✅ Updated database: sell order {trade.sell_order_id} marked as cancelled")
                                 except Exception as e:
-                                    session.rollback()
                                     logger.error(f"Error updating sell order status: {e}")
-                                finally:
-                                    session.close()
                                 
                                 # Remove from open_sell_orders so new trades can proceed
                                 self.open_sell_orders.pop(trade.sell_order_id, None)
@@ -1728,18 +1694,11 @@ class ThresholdTrader:
                     estimated_sell_fee = calculate_polymarket_fee(1.0, payout)  # Fee for selling at $1
                     
                     if not trade.sell_fee:
-                        session = self.db.SessionLocal()
                         try:
-                            trade_obj = session.query(RealTradeThreshold).filter_by(id=trade.id).first()
-                            if trade_obj:
-                                trade_obj.sell_fee = estimated_sell_fee
-                                session.commit()
-                                logger.debug(f"Updated sell_fee to ${estimated_sell_fee:.2f} for trade {trade.id}")
+                            self.db.update_trade_fields(trade.id, sell_fee=estimated_sell_fee)
+                            logger.debug(f"Updated sell_fee to ${estimated_sell_fee:.2f} for trade {trade.id}")
                         except Exception as e:
-                            session.rollback()
                             logger.warning(f"Could not update sell_fee: {e}")
-                        finally:
-                            session.close()
                     
                     logger.info(
                         f"Trade {trade.id} won but sell order did not fill, was cancelled, or failed "
@@ -1822,15 +1781,9 @@ class ThresholdTrader:
             # (including negative values) to see what the database actually has
             # This is just for logging/debugging - we don't overwrite principal_after_value
             # because that should reflect THIS trade's outcome
-            session = self.db.SessionLocal()
+            # Read from the trade store so outcomes not yet flushed from its journal count
             try:
-                latest_trade_db = session.query(RealTradeThreshold).filter(
-                    RealTradeThreshold.deployment_id == self.deployment_id,
-                    RealTradeThreshold.principal_after.isnot(None),
-                    RealTradeThreshold.order_id.isnot(None),
-                    RealTradeThreshold.market_resolved_at.isnot(None),
-                    RealTradeThreshold.order_status != "failed",
-                ).order_by(RealTradeThreshold.market_resolved_at.desc()).first()
+                latest_trade_db = self.db.get_latest_resolved_trade(deployment_id=self.deployment_id)
                 
                 if latest_trade_db and latest_trade_db.id != trade.id:
                     # Check previous trade's principal_after (not the current one we're processing)
@@ -1856,8 +1809,6 @@ class ThresholdTrader:
                         )
             except Exception as e:
                 logger.error(f"Error checking principal consistency: {e}", exc_info=True)
-            finally:
-                session.close()
             
             # Calculate principal_after_value correctly: principal_before + net_payout
             # Use trade.principal_before (stored when trade was created) + net_payout
@@ -1979,7 +1930,8 @@ def main():
         sys.stderr.flush()
         
         try:
-            asyncio.run(trader.start())
+            metrics.start_metrics_server_from_env()  # Serves /metrics when METRICS_PORT is set
+            asyncio.run(metrics.run_with_loop_lag_monitor(trader.start()))
         except KeyboardInterrupt:
             logger.info("=" * 80)
             logger.info("Received shutdown signal (KeyboardInterrupt)")